@@ -3,6 +3,7 @@ import threading
 import random
 from core.utils.resource_manager import ResourceManager
 from core.communication.grpc_client import BlockchainClient
+from core.ledger.block import Block
 from core.utils.metric_utils import MetricUtils
 from core.utils.log_utils import LogUtils
 from typing import List
@@ -23,6 +24,7 @@ class DistributedAgent:
         self.logger = logger or logging.getLogger(__name__)
         self.resource_manager = ResourceManager(logger=self.logger)
         self.blockchain_client = BlockchainClient(server_address=server_address)
+        self.known_blocks: List[Block] = []  # Blocks retrieved from the server so far
         self.metric_utils = MetricUtils(logger=self.logger)
         self.heartbeat_interval = 5  # Interval in seconds for heartbeat
         self.is_active = False
@@ -91,23 +93,30 @@ class DistributedAgent:
 
     def request_blockchain_state(self):
         """
-        Requests the current blockchain state from the server.
+        Requests the current blockchain state from the server. Blocks already retrieved are kept locally,
+        so each call only transfers the chain tip and any new blocks.
+        :return: The list of blocks known to the agent, or None if the server could not be reached.
         """
-        blockchain_state = self.blockchain_client.get_blockchain_state()
-        if blockchain_state:
-            self.logger.info(f"Agent {self.agent_id} retrieved blockchain state.")
-            return blockchain_state
-        else:
+        new_blocks = self.blockchain_client.get_new_blocks(self.known_blocks)
+        if new_blocks is None:
             self.logger.error(f"Agent {self.agent_id} failed to retrieve blockchain state.")
             return None
 
+        common_height, blocks = new_blocks
+        self.known_blocks = self.known_blocks[:common_height + 1] + blocks
+        self.logger.info(f"Agent {self.agent_id} retrieved blockchain state ({len(blocks)} new blocks).")
+        return self.known_blocks
+
     def add_data_to_blockchain(self, data: str):
         """
-        Requests the server to add a new block with the provided data.
+        Requests the server to add the provided data to the blockchain. The server only queues the data,
+        use the returned transaction id with the blockchain client to wait for its confirmation.
         :param data: Data to add to the blockchain.
+        :return: The transaction id, or None if the submission failed.
         """
-        self.blockchain_client.add_block(data=data)
+        transaction_id = self.blockchain_client.add_block(data=data)
         self.logger.info(f"Agent {self.agent_id} requested to add data to blockchain: {data}")
+        return transaction_id
 
 # Example usage
 if __name__ == "__main__":
@@ -1,6 +1,56 @@
 import grpc
+import json
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import core.communication.grpc_server_pb2 as pb2
 import core.communication.grpc_server_pb2_grpc as pb2_grpc
+from core.ledger.block import Block, LazyBlock
+
+
+def proto_to_block(message: pb2.Block) -> Block:
+    """
+    Converts a protobuf block message into a ledger block, recomputing its hash from the received contents.
+    A block whose body the server pruned becomes a header-only LazyBlock hashed over the received data digest.
+    :param message: The protobuf Block message.
+    :return: The ledger Block.
+    """
+    if message.data_digest:
+        block = LazyBlock(
+            index=message.index,
+            previous_hash=message.previous_hash,
+            timestamp=float(message.timestamp),
+            data_digest=message.data_digest,
+            nonce=message.nonce,
+            block_hash="",
+            load_data=None,
+            signature=message.signature or None
+        )
+        block.hash = block.compute_hash()
+        return block
+    return Block(
+        index=message.index,
+        previous_hash=message.previous_hash,
+        timestamp=float(message.timestamp),
+        data=list(message.transactions) if message.transactions else message.data,
+        nonce=message.nonce,
+        signature=message.signature or None
+    )
+
+
+def header_to_block(message: pb2.BlockHeader) -> LazyBlock:
+    """
+    Converts a protobuf header into a header-only ledger block whose hash can be verified without its data.
+    :param message: The protobuf BlockHeader message.
+    :return: A LazyBlock without a data loader.
+    """
+    return LazyBlock(
+        index=message.index,
+        previous_hash=message.previous_hash,
+        timestamp=message.timestamp,
+        data_digest=message.data_digest,
+        nonce=message.nonce,
+        block_hash=message.hash,
+        load_data=None
+    )
 
 class BlockchainClient:
     def __init__(self, server_address: str):
@@ -28,19 +78,150 @@ class BlockchainClient:
             print(f"RPC failed: {e.code()} - {e.details()}")
             return None
 
-    def add_block(self, data: str):
+    def add_block(self, data: str) -> Optional[str]:
         """
-        Sends a request to add a new block with the provided data.
+        Submits data to be stored in a block. The server returns as soon as the data is in its mempool.
         :param data: Data to be stored in the new block.
+        :return: The transaction id to wait on with wait_for_transaction, or None if the submission failed.
         """
         try:
             response = self.stub.AddBlock(pb2.BlockData(data=data))
             if response.success:
-                print(f"Block added successfully with data: {data}")
-            else:
-                print(f"Failed to add block with data: {data}")
+                print(f"Block data submitted successfully with data: {data}")
+                return response.transaction_id
+            print(f"Failed to add block with data: {data}")
+        except grpc.RpcError as e:
+            print(f"RPC failed: {e.code()} - {e.details()}")
+        return None
+
+    def wait_for_transaction(self, transaction_id: str, timeout: float = 10.0) -> Optional[pb2.TransactionStatus]:
+        """
+        Waits until a submitted transaction is confirmed in a block.
+        :param transaction_id: The id returned by add_block.
+        :param timeout: Seconds to wait for the confirmation.
+        :return: The transaction status, whose status is still "pending" if the timeout expired, or None if the call failed.
+        """
+        try:
+            return self.stub.GetTransactionStatus(pb2.TransactionQuery(transaction_id=transaction_id, wait_timeout=timeout),
+                                                  timeout=timeout + 5.0)
+        except grpc.RpcError as e:
+            print(f"RPC failed: {e.code()} - {e.details()}")
+            return None
+
+    def get_tip(self, timeout: Optional[float] = None) -> Optional[pb2.ChainTip]:
+        """
+        Retrieves the height and hash of the server's latest block.
+        :param timeout: Seconds to wait for the server before giving up.
+        :return: The chain tip, or None if the call failed.
+        """
+        try:
+            return self.stub.GetTip(pb2.Empty(), timeout=timeout)
         except grpc.RpcError as e:
             print(f"RPC failed: {e.code()} - {e.details()}")
+            return None
+
+    def iter_headers(self, from_height: int, to_height: int, timeout: Optional[float] = None) -> Iterator[LazyBlock]:
+        """
+        Streams the headers of the blocks in an inclusive height range.
+        :param from_height: The first height to retrieve.
+        :param to_height: The last height to retrieve.
+        :param timeout: Seconds allowed for the whole stream.
+        :return: An iterator of header-only blocks; grpc.RpcError is raised if the stream fails.
+        """
+        for header in self.stub.GetHeaders(pb2.HeightRange(from_height=from_height, to_height=to_height), timeout=timeout):
+            yield header_to_block(header)
+
+    def iter_blocks(self, from_height: int, to_height: int, timeout: Optional[float] = None) -> Iterator[Block]:
+        """
+        Streams the blocks in an inclusive height range without holding the whole range in one message.
+        :param from_height: The first height to retrieve.
+        :param to_height: The last height to retrieve.
+        :param timeout: Seconds allowed for the whole stream.
+        :return: An iterator of blocks; grpc.RpcError is raised if the stream fails.
+        """
+        for block in self.stub.GetBlocks(pb2.HeightRange(from_height=from_height, to_height=to_height), timeout=timeout):
+            yield proto_to_block(block)
+
+    def get_headers(self, from_height: int, to_height: int, timeout: Optional[float] = None) -> Optional[List[LazyBlock]]:
+        """
+        Retrieves the headers of the blocks in an inclusive height range.
+        :param from_height: The first height to retrieve.
+        :param to_height: The last height to retrieve.
+        :param timeout: Seconds to wait for the server before giving up.
+        :return: Header-only blocks, or None if the call failed.
+        """
+        try:
+            return list(self.iter_headers(from_height, to_height, timeout=timeout))
+        except grpc.RpcError as e:
+            print(f"RPC failed: {e.code()} - {e.details()}")
+            return None
+
+    def get_blocks(self, from_height: int, to_height: int, timeout: Optional[float] = None) -> Optional[List[Block]]:
+        """
+        Retrieves the blocks in an inclusive height range.
+        :param from_height: The first height to retrieve.
+        :param to_height: The last height to retrieve.
+        :param timeout: Seconds to wait for the server before giving up.
+        :return: The blocks, or None if the call failed.
+        """
+        try:
+            return list(self.iter_blocks(from_height, to_height, timeout=timeout))
+        except grpc.RpcError as e:
+            print(f"RPC failed: {e.code()} - {e.details()}")
+            return None
+
+    def get_new_blocks(self, known_blocks: List[Block], timeout: Optional[float] = None) -> Optional[Tuple[int, List[Block]]]:
+        """
+        Polls the server for the blocks missing from a locally known chain. Only the tip is fetched when nothing
+        changed; after a reorganisation on the server, the local chain is walked back until a common block is found.
+        :param known_blocks: The blocks already known locally, in height order.
+        :param timeout: Seconds to wait for each call before giving up.
+        :return: A (common height, new blocks) tuple such that known_blocks[:common height + 1] + new blocks
+                 is the server chain, or None if a call failed.
+        """
+        tip = self.get_tip(timeout=timeout)
+        if tip is None:
+            return None
+        if known_blocks and known_blocks[-1].index == tip.height and known_blocks[-1].hash == tip.hash:
+            return tip.height, []
+
+        # Step back exponentially from the highest height both chains have until the hashes agree
+        height = min(len(known_blocks) - 1, tip.height)
+        step = 1
+        while height >= 0:
+            headers = self.get_headers(height, height, timeout=timeout)
+            if headers is None:
+                return None
+            if headers and headers[0].hash == known_blocks[height].hash:
+                break
+            height -= step
+            step *= 2
+        height = max(height, -1)
+
+        new_blocks = self.get_blocks(height + 1, tip.height, timeout=timeout)
+        if new_blocks is None:
+            return None
+        return height, new_blocks
+
+    def get_checkpoint(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Retrieves the server's latest signed state checkpoint.
+        :param timeout: Seconds to wait for the server before giving up.
+        :return: The checkpoint dictionary, or None if the call failed or the server has no checkpoint.
+        """
+        try:
+            checkpoint = self.stub.GetCheckpoint(pb2.Empty(), timeout=timeout)
+        except grpc.RpcError as e:
+            print(f"RPC failed: {e.code()} - {e.details()}")
+            return None
+        return {"height": checkpoint.height, "hash": checkpoint.hash, "state_root": checkpoint.state_root,
+                "state": json.loads(checkpoint.state), "signature": checkpoint.signature}
+
+    def close(self):
+        """
+        Closes the channel to the server.
+        """
+        self.channel.close()
 
 # Example usage
 if __name__ == "__main__":
@@ -53,4 +234,6 @@ if __name__ == "__main__":
 
     # Add a new block to the blockchain via the server
     print("Adding a new block to the blockchain...")
-    client.add_block(data="Block added via gRPC client")
+    transaction_id = client.add_block(data="Block added via gRPC client")
+    if transaction_id:
+        print(client.wait_for_transaction(transaction_id))
@@ -1,41 +1,351 @@
 import grpc
+import json
 from concurrent import futures
+import threading
 import time
 import core.communication.grpc_server_pb2 as pb2
 import core.communication.grpc_server_pb2_grpc as pb2_grpc
-from core.ledger.blockchain_ledger import Blockchain
+from core.ledger.blockchain import Blockchain
+from core.ledger.block import Block, LazyBlock
+from core.ledger.mempool import BlockAssembler
+from typing import List, Optional, Tuple
 
-class BlockchainService(pb2_grpc.BlockchainServicer):
+# Upper bound on how long a GetTransactionStatus call may hold a server thread
+MAX_STATUS_WAIT = 30.0
+
+# Wire tag of BlockchainState.blocks (field 1, length-delimited)
+BLOCKS_FIELD_TAG = b"\x0a"
+
+# Times the block cache reads the tail of a chain that is being reorganised before serving it as it is
+REFRESH_ATTEMPTS = 3
+
+
+def _encode_varint(value: int) -> bytes:
+    """
+    Encodes a non-negative integer as a protobuf varint.
+    """
+    encoded = bytearray()
+    while value > 0x7F:
+        encoded.append((value & 0x7F) | 0x80)
+        value >>= 7
+    encoded.append(value)
+    return bytes(encoded)
+
+
+def block_to_proto(block: Block) -> pb2.Block:
+    """
+    Converts a ledger block into its protobuf message.
+    :param block: The block to convert.
+    :return: The protobuf Block message.
+    """
+    data = block.data
+    if isinstance(data, (list, tuple)):
+        return pb2.Block(
+            index=block.index,
+            previous_hash=block.previous_hash,
+            timestamp=str(block.timestamp),
+            transactions=data,
+            nonce=block.nonce,
+            hash=block.hash,
+            signature=block.signature or ""
+        )
+    return pb2.Block(
+        index=block.index,
+        previous_hash=block.previous_hash,
+        timestamp=str(block.timestamp),
+        data=data,
+        nonce=block.nonce,
+        hash=block.hash,
+        signature=block.signature or ""
+    )
+
+
+def pruned_block_to_proto(block: Block) -> pb2.Block:
+    """
+    Converts a block whose body was pruned into a protobuf message carrying the data digest instead of the data,
+    so that receivers can still verify the block hash.
+    :param block: The block to convert.
+    :return: The protobuf Block message.
+    """
+    return pb2.Block(
+        index=block.index,
+        previous_hash=block.previous_hash,
+        timestamp=str(block.timestamp),
+        nonce=block.nonce,
+        hash=block.hash,
+        signature=block.signature or "",
+        data_digest=block.data_digest
+    )
+
+
+def block_to_header_proto(block: Block) -> pb2.BlockHeader:
+    """
+    Converts a ledger block into a protobuf header carrying the data digest instead of the data.
+    :param block: The block to convert.
+    :return: The protobuf BlockHeader message.
+    """
+    return pb2.BlockHeader(
+        index=block.index,
+        previous_hash=block.previous_hash,
+        timestamp=float(block.timestamp),
+        data_digest=block.data_digest,
+        nonce=block.nonce,
+        hash=block.hash
+    )
+
+class SerializedBlockCache:
     def __init__(self, blockchain: Blockchain):
+        """
+        Initializes a cache of serialized protobuf blocks. Appended blocks never change, so each block is
+        serialized once and responses are assembled from the cached bytes. Blocks whose bodies are read from disk
+        are serialized on each request instead, so that the cache does not bring pruned bodies back into memory.
+        :param blockchain: The blockchain whose blocks are cached.
+        """
+        self.blockchain = blockchain
+        # (header, field prefix, serialized block) per height; the serialized block is None for blocks read from disk
+        self._entries: List[Tuple[Block, bytes, Optional[bytes]]] = []
+        self._pruned_height = 0
+        self._stored_height = 0  # Heights below this one were checked for bodies moved to disk
+        self._lock = threading.Lock()
+        self.invalidations = 0
+
+    @staticmethod
+    def _hash_at(chain: List[Block], height: int) -> Optional[str]:
+        # Slicing rather than indexing, so a chain truncated by another thread meanwhile reads as shorter
+        blocks = chain[height:height + 1]
+        return blocks[0].hash if blocks else None
+
+    def _valid_length(self, chain: List[Block]) -> int:
+        """
+        Finds how many cached entries still hold the chain's blocks. The chain only changes by appending or by
+        truncating above a fork point, so the cached entries that are still valid form a prefix. Blocks are compared
+        by hash, since pruning replaces blocks by headers with the same hash.
+        """
+        low, high = 0, min(len(self._entries), len(chain))
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self._entries[middle - 1][0].hash == self._hash_at(chain, middle - 1):
+                low = middle
+            else:
+                high = middle - 1
+        return low
+
+    @staticmethod
+    def _entry(block: Block, pruned: bool) -> Tuple[Block, bytes, Optional[bytes]]:
+        if pruned:
+            serialized = pruned_block_to_proto(block).SerializeToString()
+        elif isinstance(block, LazyBlock) and block.has_stored_data:
+            return block, b"", None
+        else:
+            serialized = block_to_proto(block).SerializeToString()
+        # The header stands in for the block, so a body pruned from the chain later is not kept alive by the cache
+        return block.to_header(), BLOCKS_FIELD_TAG + _encode_varint(len(serialized)), serialized
+
+    @staticmethod
+    def _serialized(entry: Tuple[Block, bytes, Optional[bytes]]) -> Tuple[bytes, bytes]:
+        block, prefix, serialized = entry
+        if serialized is None:
+            serialized = block_to_proto(block).SerializeToString()
+            prefix = BLOCKS_FIELD_TAG + _encode_varint(len(serialized))
+        return prefix, serialized
+
+    def refresh(self):
+        """
+        Drops entries for blocks removed by a reorganisation and serializes blocks appended since the last refresh.
+        Only the new tail of the chain is read, so a refresh costs O(log n) plus the appended blocks rather than a
+        copy of the chain. Blocks whose bodies were pruned are served with their data digest instead of their data,
+        and blocks whose bodies were moved to disk are read from disk when requested.
+        """
+        with self._lock:
+            # A tail that does not link to the cached blocks was read while the chain was being reorganised, so it
+            # is read again; a chain that stays unlinked, which validation rejects anyway, is served as it is
+            for attempt in range(REFRESH_ATTEMPTS):
+                if self._refresh_locked(check_links=attempt < REFRESH_ATTEMPTS - 1):
+                    break
+
+    def _refresh_locked(self, check_links: bool) -> bool:
+        chain = self.blockchain.chain
+        pruned_height = self.blockchain.pruned_height
+        valid_length = self._valid_length(chain)
+        if pruned_height < self._pruned_height:
+            # A lower pruned height means a replaced chain, whose blocks above it are served with their bodies again
+            valid_length = min(valid_length, pruned_height)
+        if valid_length < len(self._entries):
+            del self._entries[valid_length:]
+            self.invalidations += 1
+        for height in range(self._pruned_height, min(pruned_height, len(self._entries))):
+            self._entries[height] = self._entry(self._entries[height][0], pruned=True)
+        self._pruned_height = pruned_height
+
+        # Pruning moves bodies to disk from the bottom of the chain up, so only the heights above the last check
+        # are looked at, until the first block still held in memory
+        self._stored_height = max(min(self._stored_height, len(self._entries)), pruned_height)
+        while self._stored_height < len(self._entries):
+            blocks = chain[self._stored_height:self._stored_height + 1]
+            if not blocks or not isinstance(blocks[0], LazyBlock):
+                break
+            if self._entries[self._stored_height][2] is not None and blocks[0].has_stored_data:
+                self._entries[self._stored_height] = self._entry(blocks[0], pruned=False)
+            self._stored_height += 1
+
+        tail = chain[len(self._entries):]
+        previous_hash = self._entries[-1][0].hash if self._entries else None
+        for block in tail:
+            if check_links and previous_hash is not None and block.previous_hash != previous_hash:
+                return False
+            previous_hash = block.hash
+        self._entries.extend(self._entry(block, pruned=block.index < pruned_height) for block in tail)
+        return True
+
+    def serialized_state(self) -> bytes:
+        """
+        Returns the serialized BlockchainState message holding every block.
+        """
+        self.refresh()
+        with self._lock:
+            entries = self._entries[:]
+        return b"".join(part for entry in entries for part in self._serialized(entry))
+
+    def serialized_range(self, from_height: int, to_height: int) -> List[bytes]:
+        """
+        Returns the serialized Block messages of an inclusive height range, clamped to the chain and to the blocks
+        whose bodies were not pruned.
+        """
+        self.refresh()
+        with self._lock:
+            start = max(from_height, self._pruned_height, 0)
+            entries = self._entries[start:max(to_height + 1, 0)]
+        return [self._serialized(entry)[1] for entry in entries]
+
+class BlockchainService(pb2_grpc.BlockchainServicer):
+    def __init__(self, blockchain: Blockchain, block_assembler: Optional[BlockAssembler] = None):
         """
         Initializes the BlockchainService with an instance of Blockchain.
         :param blockchain: The blockchain instance to provide service for.
+        :param block_assembler: Assembler sealing submitted data into blocks; one with default batching is created if omitted.
         """
         self.blockchain = blockchain
+        self.block_cache = SerializedBlockCache(blockchain)
+        # Sealed blocks are serialized right away so that readers only find cached bytes
+        self.block_assembler = block_assembler or BlockAssembler(blockchain, on_block=lambda block: self.block_cache.refresh())
 
     def GetBlockchainState(self, request, context):
         """
         Returns the current state of the blockchain as a list of blocks.
         """
-        blockchain_data = []
-        for block in self.blockchain.chain:
-            blockchain_data.append(pb2.Block(
-                index=block.index,
-                previous_hash=block.previous_hash,
-                timestamp=str(block.timestamp),
-                data=block.data,
-                nonce=block.nonce,
-                hash=block.hash
-            ))
-        return pb2.BlockchainState(blocks=blockchain_data)
+        return pb2.BlockchainState.FromString(self.block_cache.serialized_state())
+
+    def serialized_blockchain_state(self, request, context) -> bytes:
+        """
+        Returns the current state of the blockchain as already serialized bytes.
+        Used by add_blockchain_service_to_server so the response is sent without serializing it again.
+        """
+        return self.block_cache.serialized_state()
 
     def AddBlock(self, request, context):
         """
-        Adds a new block to the blockchain with the provided data.
+        Submits the provided data to the mempool and returns its transaction id without waiting for mining.
+        The data is sealed into a block by the block assembler.
+        """
+        try:
+            transaction_id = self.block_assembler.submit(request.data)
+        except RuntimeError as e:
+            context.set_code(grpc.StatusCode.RESOURCE_EXHAUSTED)
+            context.set_details(str(e))
+            return pb2.BlockResponse(success=False)
+        return pb2.BlockResponse(success=True, transaction_id=transaction_id)
+
+    def GetTransactionStatus(self, request, context):
+        """
+        Returns the status of a submitted transaction, waiting up to the requested timeout for its confirmation.
+        """
+        mempool = self.block_assembler.mempool
+        wait_timeout = min(max(request.wait_timeout, 0.0), MAX_STATUS_WAIT)
+        if wait_timeout > 0:
+            status = mempool.wait_for_confirmation(request.transaction_id, timeout=wait_timeout)
+        else:
+            status = mempool.status(request.transaction_id)
+        return pb2.TransactionStatus(**status)
+
+    def stop(self):
+        """
+        Stops the block assembler.
         """
-        data = request.data
-        self.blockchain.add_block(data)
-        return pb2.BlockResponse(success=True)
+        self.block_assembler.stop()
+
+    def _blocks_in_range(self, request):
+        """
+        Returns the blocks of an inclusive height range, clamped to the local chain.
+        The slice only copies references, so a reorganisation during streaming cannot mix two forks.
+        """
+        chain = self.blockchain.chain
+        from_height = max(request.from_height, 0)
+        to_height = min(request.to_height, len(chain) - 1)
+        return chain[from_height:to_height + 1]
+
+    def GetTip(self, request, context):
+        """
+        Returns the height and hash of the latest block.
+        """
+        last_block = self.blockchain.get_last_block()
+        return pb2.ChainTip(height=last_block.index, hash=last_block.hash)
+
+    def GetHeaders(self, request, context):
+        """
+        Streams the headers of the blocks in the requested height range.
+        """
+        for block in self._blocks_in_range(request):
+            yield block_to_header_proto(block)
+
+    def GetBlocks(self, request, context):
+        """
+        Streams the blocks in the requested height range, one message per block, so that
+        large ranges are not limited by the maximum message size.
+        """
+        for serialized in self.block_cache.serialized_range(request.from_height, request.to_height):
+            yield pb2.Block.FromString(serialized)
+
+    def serialized_blocks(self, request, context):
+        """
+        Streams the blocks in the requested height range as already serialized bytes.
+        Used by add_blockchain_service_to_server so the cached bytes are sent as-is.
+        """
+        yield from self.block_cache.serialized_range(request.from_height, request.to_height)
+
+    def GetCheckpoint(self, request, context):
+        """
+        Returns the latest signed state checkpoint of the blockchain.
+        """
+        checkpoint = self.blockchain.state_checkpoint
+        if checkpoint is None:
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            context.set_details("No state checkpoint has been created.")
+            return pb2.StateCheckpoint()
+        return pb2.StateCheckpoint(height=checkpoint["height"], hash=checkpoint["hash"], state_root=checkpoint["state_root"],
+                                   state=json.dumps(checkpoint["state"]), signature=checkpoint["signature"])
+
+def add_blockchain_service_to_server(service: BlockchainService, server: grpc.Server):
+    """
+    Registers the blockchain service on a server. GetBlockchainState and GetBlocks send the cached serialized
+    blocks as-is, the other RPCs use the generated handlers.
+    :param service: The blockchain service.
+    :param server: The gRPC server.
+    """
+    cached_handlers = {
+        'GetBlockchainState': grpc.unary_unary_rpc_method_handler(
+            service.serialized_blockchain_state,
+            request_deserializer=pb2.Empty.FromString,
+            response_serializer=bytes,
+        ),
+        'GetBlocks': grpc.unary_stream_rpc_method_handler(
+            service.serialized_blocks,
+            request_deserializer=pb2.HeightRange.FromString,
+            response_serializer=bytes,
+        ),
+    }
+    # Generic handlers are consulted in registration order, so these take precedence over the generated ones
+    server.add_generic_rpc_handlers((grpc.method_handlers_generic_handler('core.communication.Blockchain', cached_handlers),))
+    pb2_grpc.add_BlockchainServicer_to_server(service, server)
 
 # Example usage
 if __name__ == "__main__":
@@ -44,7 +354,8 @@ if __name__ == "__main__":
 
     # Start the gRPC server
     server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-    pb2_grpc.add_BlockchainServicer_to_server(BlockchainService(blockchain), server)
+    service = BlockchainService(blockchain)
+    add_blockchain_service_to_server(service, server)
     server.add_insecure_port('[::]:50051')
     server.start()
     print("gRPC server running on port 50051...")
@@ -54,3 +365,4 @@ if __name__ == "__main__":
             time.sleep(86400)  # Keep the server running
     except KeyboardInterrupt:
         server.stop(0)
+        service.stop()
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # Generated by the protocol buffer compiler.  DO NOT EDIT!
 # source: grpc_server.proto
-# Protobuf Python Version: 4.25.3
+# Protobuf Python Version: 4.25.1
 """Generated protocol buffer code."""
 from google.protobuf import descriptor as _descriptor
 from google.protobuf import descriptor_pool as _descriptor_pool
@@ -14,7 +14,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x11grpc_server.proto\x12\x12\x63ore.communication\"\x07\n\x05\x45mpty\"\x19\n\tBlockData\x12\x0c\n\x04\x64\x61ta\x18\x01 \x01(\t\"k\n\x05\x42lock\x12\r\n\x05index\x18\x01 \x01(\x05\x12\x15\n\rprevious_hash\x18\x02 \x01(\t\x12\x11\n\ttimestamp\x18\x03 \x01(\t\x12\x0c\n\x04\x64\x61ta\x18\x04 \x01(\t\x12\r\n\x05nonce\x18\x05 \x01(\x05\x12\x0c\n\x04hash\x18\x06 \x01(\t\"<\n\x0f\x42lockchainState\x12)\n\x06\x62locks\x18\x01 \x03(\x0b\x32\x19.core.communication.Block\" \n\rBlockResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x32\xb0\x01\n\nBlockchain\x12T\n\x12GetBlockchainState\x12\x19.core.communication.Empty\x1a#.core.communication.BlockchainState\x12L\n\x08\x41\x64\x64\x42lock\x12\x1d.core.communication.BlockData\x1a!.core.communication.BlockResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x11grpc_server.proto\x12\x12\x63ore.communication\"\x07\n\x05\x45mpty\"\x19\n\tBlockData\x12\x0c\n\x04\x64\x61ta\x18\x01 \x01(\t\"\xa9\x01\n\x05\x42lock\x12\r\n\x05index\x18\x01 \x01(\x05\x12\x15\n\rprevious_hash\x18\x02 \x01(\t\x12\x11\n\ttimestamp\x18\x03 \x01(\t\x12\x0c\n\x04\x64\x61ta\x18\x04 \x01(\t\x12\r\n\x05nonce\x18\x05 \x01(\x05\x12\x0c\n\x04hash\x18\x06 \x01(\t\x12\x14\n\x0ctransactions\x18\x07 \x03(\t\x12\x11\n\tsignature\x18\x08 \x01(\t\x12\x13\n\x0b\x64\x61ta_digest\x18\t \x01(\x0c\"<\n\x0f\x42lockchainState\x12)\n\x06\x62locks\x18\x01 \x03(\x0b\x32\x19.core.communication.Block\"8\n\rBlockResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x16\n\x0etransaction_id\x18\x02 \x01(\t\"@\n\x10TransactionQuery\x12\x16\n\x0etransaction_id\x18\x01 \x01(\t\x12\x14\n\x0cwait_timeout\x18\x02 \x01(\x01\"q\n\x11TransactionStatus\x12\x16\n\x0etransaction_id\x18\x01 \x01(\t\x12\x0e\n\x06status\x18\x02 \x01(\t\x12\x0e\n\x06height\x18\x03 \x01(\x03\x12\x12\n\nblock_hash\x18\x04 \x01(\t\x12\x10\n\x08position\x18\x05 \x01(\x03\"5\n\x0bHeightRange\x12\x13\n\x0b\x66rom_height\x18\x01 \x01(\x03\x12\x11\n\tto_height\x18\x02 \x01(\x03\"(\n\x08\x43hainTip\x12\x0e\n\x06height\x18\x01 \x01(\x03\x12\x0c\n\x04hash\x18\x02 \x01(\t\"x\n\x0b\x42lockHeader\x12\r\n\x05index\x18\x01 \x01(\x03\x12\x15\n\rprevious_hash\x18\x02 \x01(\t\x12\x11\n\ttimestamp\x18\x03 \x01(\x01\x12\x13\n\x0b\x64\x61ta_digest\x18\x04 \x01(\x0c\x12\r\n\x05nonce\x18\x05 \x01(\x03\x12\x0c\n\x04hash\x18\x06 \x01(\t\"e\n\x0fStateCheckpoint\x12\x0e\n\x06height\x18\x01 \x01(\x03\x12\x0c\n\x04hash\x18\x02 \x01(\t\x12\x12\n\nstate_root\x18\x03 \x01(\t\x12\r\n\x05state\x18\x04 \x01(\t\x12\x11\n\tsignature\x18\x05 \x01(\t2\xc6\x04\n\nBlockchain\x12T\n\x12GetBlockchainState\x12\x19.core.communication.Empty\x1a#.core.communication.BlockchainState\x12L\n\x08\x41\x64\x64\x42lock\x12\x1d.core.communication.BlockData\x1a!.core.communication.BlockResponse\x12\x63\n\x14GetTransactionStatus\x12$.core.communication.TransactionQuery\x1a%.core.communication.TransactionStatus\x12\x41\n\x06GetTip\x12\x19.core.communication.Empty\x1a\x1c.core.communication.ChainTip\x12P\n\nGetHeaders\x12\x1f.core.communication.HeightRange\x1a\x1f.core.communication.BlockHeader0\x01\x12I\n\tGetBlocks\x12\x1f.core.communication.HeightRange\x1a\x19.core.communication.Block0\x01\x12O\n\rGetCheckpoint\x12\x19.core.communication.Empty\x1a#.core.communication.StateCheckpointb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -25,12 +25,24 @@ if _descriptor._USE_C_DESCRIPTORS == False:
   _globals['_EMPTY']._serialized_end=48
   _globals['_BLOCKDATA']._serialized_start=50
   _globals['_BLOCKDATA']._serialized_end=75
-  _globals['_BLOCK']._serialized_start=77
-  _globals['_BLOCK']._serialized_end=184
-  _globals['_BLOCKCHAINSTATE']._serialized_start=186
-  _globals['_BLOCKCHAINSTATE']._serialized_end=246
-  _globals['_BLOCKRESPONSE']._serialized_start=248
-  _globals['_BLOCKRESPONSE']._serialized_end=280
-  _globals['_BLOCKCHAIN']._serialized_start=283
-  _globals['_BLOCKCHAIN']._serialized_end=459
+  _globals['_BLOCK']._serialized_start=78
+  _globals['_BLOCK']._serialized_end=247
+  _globals['_BLOCKCHAINSTATE']._serialized_start=249
+  _globals['_BLOCKCHAINSTATE']._serialized_end=309
+  _globals['_BLOCKRESPONSE']._serialized_start=311
+  _globals['_BLOCKRESPONSE']._serialized_end=367
+  _globals['_TRANSACTIONQUERY']._serialized_start=369
+  _globals['_TRANSACTIONQUERY']._serialized_end=433
+  _globals['_TRANSACTIONSTATUS']._serialized_start=435
+  _globals['_TRANSACTIONSTATUS']._serialized_end=548
+  _globals['_HEIGHTRANGE']._serialized_start=550
+  _globals['_HEIGHTRANGE']._serialized_end=603
+  _globals['_CHAINTIP']._serialized_start=605
+  _globals['_CHAINTIP']._serialized_end=645
+  _globals['_BLOCKHEADER']._serialized_start=647
+  _globals['_BLOCKHEADER']._serialized_end=767
+  _globals['_STATECHECKPOINT']._serialized_start=769
+  _globals['_STATECHECKPOINT']._serialized_end=870
+  _globals['_BLOCKCHAIN']._serialized_start=873
+  _globals['_BLOCKCHAIN']._serialized_end=1455
 # @@protoc_insertion_point(module_scope)
@@ -24,20 +24,80 @@ class BlockchainStub(object):
                 request_serializer=grpc__server__pb2.BlockData.SerializeToString,
                 response_deserializer=grpc__server__pb2.BlockResponse.FromString,
                 )
+        self.GetTransactionStatus = channel.unary_unary(
+                '/core.communication.Blockchain/GetTransactionStatus',
+                request_serializer=grpc__server__pb2.TransactionQuery.SerializeToString,
+                response_deserializer=grpc__server__pb2.TransactionStatus.FromString,
+                )
+        self.GetTip = channel.unary_unary(
+                '/core.communication.Blockchain/GetTip',
+                request_serializer=grpc__server__pb2.Empty.SerializeToString,
+                response_deserializer=grpc__server__pb2.ChainTip.FromString,
+                )
+        self.GetHeaders = channel.unary_stream(
+                '/core.communication.Blockchain/GetHeaders',
+                request_serializer=grpc__server__pb2.HeightRange.SerializeToString,
+                response_deserializer=grpc__server__pb2.BlockHeader.FromString,
+                )
+        self.GetBlocks = channel.unary_stream(
+                '/core.communication.Blockchain/GetBlocks',
+                request_serializer=grpc__server__pb2.HeightRange.SerializeToString,
+                response_deserializer=grpc__server__pb2.Block.FromString,
+                )
+        self.GetCheckpoint = channel.unary_unary(
+                '/core.communication.Blockchain/GetCheckpoint',
+                request_serializer=grpc__server__pb2.Empty.SerializeToString,
+                response_deserializer=grpc__server__pb2.StateCheckpoint.FromString,
+                )
 
 
 class BlockchainServicer(object):
     """Missing associated documentation comment in .proto file."""
 
     def GetBlockchainState(self, request, context):
-        """RPC to get the current blockchain state
+        """RPC to get the current blockchain state in a single message; prefer GetBlocks for large chains
         """
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
     def AddBlock(self, request, context):
-        """RPC to add a new block to the blockchain
+        """RPC to submit data to the mempool; it is sealed into a block in the background
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetTransactionStatus(self, request, context):
+        """RPC to get the status of a submitted transaction, optionally waiting for its confirmation
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetTip(self, request, context):
+        """RPC to get the height and hash of the latest block
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetHeaders(self, request, context):
+        """RPC to stream the headers of the blocks in a height range
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetBlocks(self, request, context):
+        """RPC to stream the blocks in a height range, one message per block
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetCheckpoint(self, request, context):
+        """RPC to get the latest signed state checkpoint, used to bootstrap a node without replaying the chain
         """
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details('Method not implemented!')
@@ -56,6 +116,31 @@ def add_BlockchainServicer_to_server(servicer, server):
                     request_deserializer=grpc__server__pb2.BlockData.FromString,
                     response_serializer=grpc__server__pb2.BlockResponse.SerializeToString,
             ),
+            'GetTransactionStatus': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetTransactionStatus,
+                    request_deserializer=grpc__server__pb2.TransactionQuery.FromString,
+                    response_serializer=grpc__server__pb2.TransactionStatus.SerializeToString,
+            ),
+            'GetTip': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetTip,
+                    request_deserializer=grpc__server__pb2.Empty.FromString,
+                    response_serializer=grpc__server__pb2.ChainTip.SerializeToString,
+            ),
+            'GetHeaders': grpc.unary_stream_rpc_method_handler(
+                    servicer.GetHeaders,
+                    request_deserializer=grpc__server__pb2.HeightRange.FromString,
+                    response_serializer=grpc__server__pb2.BlockHeader.SerializeToString,
+            ),
+            'GetBlocks': grpc.unary_stream_rpc_method_handler(
+                    servicer.GetBlocks,
+                    request_deserializer=grpc__server__pb2.HeightRange.FromString,
+                    response_serializer=grpc__server__pb2.Block.SerializeToString,
+            ),
+            'GetCheckpoint': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetCheckpoint,
+                    request_deserializer=grpc__server__pb2.Empty.FromString,
+                    response_serializer=grpc__server__pb2.StateCheckpoint.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'core.communication.Blockchain', rpc_method_handlers)
@@ -99,3 +184,88 @@ class Blockchain(object):
             grpc__server__pb2.BlockResponse.FromString,
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetTransactionStatus(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/core.communication.Blockchain/GetTransactionStatus',
+            grpc__server__pb2.TransactionQuery.SerializeToString,
+            grpc__server__pb2.TransactionStatus.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetTip(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/core.communication.Blockchain/GetTip',
+            grpc__server__pb2.Empty.SerializeToString,
+            grpc__server__pb2.ChainTip.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetHeaders(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(request, target, '/core.communication.Blockchain/GetHeaders',
+            grpc__server__pb2.HeightRange.SerializeToString,
+            grpc__server__pb2.BlockHeader.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetBlocks(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(request, target, '/core.communication.Blockchain/GetBlocks',
+            grpc__server__pb2.HeightRange.SerializeToString,
+            grpc__server__pb2.Block.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetCheckpoint(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/core.communication.Blockchain/GetCheckpoint',
+            grpc__server__pb2.Empty.SerializeToString,
+            grpc__server__pb2.StateCheckpoint.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
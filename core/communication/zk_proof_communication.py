@@ -1,9 +1,307 @@
+import asyncio
 import logging
+import multiprocessing
+import os
 import threading
-from typing import Any, Dict, Optional
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from py_ecc import bn128  # Using bn128 curve for proof generation
 import secrets
 
+# Scalar bits handled by one row of the G1 table; 8 bits give 32 rows of 255 points, about 1.5 MB
+G1_TABLE_WINDOW = 8
+
+_g1_table: Optional[List[List[Tuple[int, int]]]] = None
+_g1_table_lock = threading.Lock()
+
+
+def _jacobian_double(point: Tuple[int, int, int]) -> Tuple[int, int, int]:
+    """
+    Doubles a point in Jacobian coordinates on y^2 = x^3 + b, using plain integers modulo the field modulus.
+    """
+    p = bn128.field_modulus
+    x, y, z = point
+    if z == 0 or y == 0:
+        return 0, 1, 0
+    a = x * x % p
+    b = y * y % p
+    c = b * b % p
+    d = 2 * ((x + b) ** 2 - a - c) % p
+    e = 3 * a % p
+    x3 = (e * e - 2 * d) % p
+    return x3, (e * (d - x3) - 8 * c) % p, 2 * y * z % p
+
+
+def _jacobian_add_affine(point: Tuple[int, int, int], other: Tuple[int, int]) -> Tuple[int, int, int]:
+    """
+    Adds an affine point to a point in Jacobian coordinates (mixed addition).
+    """
+    p = bn128.field_modulus
+    x1, y1, z1 = point
+    x2, y2 = other
+    if z1 == 0:
+        return x2, y2, 1
+    z1z1 = z1 * z1 % p
+    h = (x2 * z1z1 - x1) % p
+    r = (y2 * z1 * z1z1 - y1) % p
+    if h == 0:
+        return _jacobian_double(point) if r == 0 else (0, 1, 0)
+    hh = h * h % p
+    hhh = h * hh % p
+    v = x1 * hh % p
+    x3 = (r * r - hhh - 2 * v) % p
+    return x3, (r * (v - x3) - y1 * hhh) % p, z1 * h % p
+
+
+def _normalize_all(points: List[Tuple[int, int, int]]) -> List[Tuple[int, int]]:
+    """
+    Converts finite Jacobian points to affine coordinates with a single field inversion (Montgomery's trick).
+    """
+    p = bn128.field_modulus
+    prefix = [1]
+    for _, _, z in points:
+        prefix.append(prefix[-1] * z % p)
+    inverse = pow(prefix[-1], p - 2, p)
+    affine = [None] * len(points)
+    for position in range(len(points) - 1, -1, -1):
+        x, y, z = points[position]
+        z_inverse = inverse * prefix[position] % p
+        inverse = inverse * z % p
+        z_inverse_squared = z_inverse * z_inverse % p
+        affine[position] = (x * z_inverse_squared % p, y * z_inverse_squared * z_inverse % p)
+    return affine
+
+
+def _build_g1_table(window: int) -> List[List[Tuple[int, int]]]:
+    """
+    Builds the fixed-base table of G1: row i holds d * 2 ** (window * i) * G1 in affine coordinates for every
+    non-zero window digit d.
+    """
+    rows = []
+    row_base = (int(bn128.G1[0]), int(bn128.G1[1]))
+    for _ in range(-(-bn128.curve_order.bit_length() // window)):
+        multiples = [(row_base[0], row_base[1], 1)]
+        # The last multiple, 2 ** window * row_base, is the base of the next row
+        for _ in range((1 << window) - 1):
+            multiples.append(_jacobian_add_affine(multiples[-1], row_base))
+        affine = _normalize_all(multiples)
+        rows.append(affine[:-1])
+        row_base = affine[-1]
+    return rows
+
+
+def g1_table() -> List[List[Tuple[int, int]]]:
+    """
+    Returns the fixed-base table of G1, building it on first use; the table is shared by the whole process.
+    """
+    global _g1_table
+    if _g1_table is None:
+        with _g1_table_lock:
+            if _g1_table is None:
+                _g1_table = _build_g1_table(G1_TABLE_WINDOW)
+    return _g1_table
+
+
+def g1_multiply_raw(scalar: int) -> Optional[Tuple[int, int]]:
+    """
+    Computes scalar * G1 from the precomputed table with one mixed addition per scalar window and no doublings.
+    :param scalar: The scalar, reduced modulo the curve order.
+    :return: The affine coordinates as plain integers, or None for the point at infinity.
+    """
+    scalar %= bn128.curve_order
+    table = g1_table()
+    mask = (1 << G1_TABLE_WINDOW) - 1
+    point = (0, 1, 0)
+    row = 0
+    while scalar:
+        digit = scalar & mask
+        if digit:
+            point = _jacobian_add_affine(point, table[row][digit - 1])
+        scalar >>= G1_TABLE_WINDOW
+        row += 1
+    if point[2] == 0:
+        return None
+    return _normalize_all([point])[0]
+
+
+def to_bn128_point(point: Optional[Tuple[int, int]]):
+    """
+    Converts plain integer coordinates into a py_ecc bn128 point.
+    """
+    if point is None:
+        return None
+    return bn128.FQ(point[0]), bn128.FQ(point[1])
+
+
+def g1_multiply(scalar: int):
+    """
+    Computes scalar * G1 like bn128.multiply(bn128.G1, scalar), with the precomputed table instead of a
+    double-and-add over py_ecc field objects (well over an order of magnitude faster).
+    :param scalar: The scalar.
+    :return: The py_ecc bn128 point, or None for the point at infinity.
+    """
+    return to_bn128_point(g1_multiply_raw(scalar))
+
+
+def _raw_point(point) -> Optional[Tuple[int, int]]:
+    """
+    Converts a py_ecc bn128 point into plain integer coordinates, e.g. to send it to a worker process.
+    """
+    if point is None:
+        return None
+    return int(point[0]), int(point[1])
+
+
+def _generate_proof_batch(secret_values: Sequence[int]) -> List[Tuple[Optional[Tuple[int, int]], Optional[Tuple[int, int]], int]]:
+    """
+    Generates the proofs of a batch of secrets inside a worker process.
+    :return: One (public key, commitment, challenge) tuple per secret, with plain integer coordinates.
+    """
+    proofs = []
+    for secret in secret_values:
+        public_key = g1_multiply_raw(secret)
+        commitment = g1_multiply_raw(secrets.randbelow(bn128.curve_order))
+        proofs.append((public_key, commitment, secrets.randbelow(bn128.curve_order)))
+    return proofs
+
+
+def _verify_proof_batch(items: Sequence[Tuple[Optional[Tuple[int, int]], Optional[Tuple[int, int]], int]]) -> List[bool]:
+    """
+    Verifies a batch of (public key, commitment, secret) tuples inside a worker process, with the same checks as
+    ZKPCommunication.verify_proof.
+    """
+    p = bn128.field_modulus
+    results = []
+    for public_key, commitment, secret in items:
+        on_curve = commitment is None or (commitment[1] ** 2 - commitment[0] ** 3 - 3) % p == 0
+        results.append(on_curve and g1_multiply_raw(secret) == public_key)
+    return results
+
+
+class ZKPProofPool:
+    def __init__(self, workers: Optional[int] = None, batch_size: int = 64, logger: Optional[logging.Logger] = None):
+        """
+        Initializes a process pool that generates and verifies bn128 proofs in batches, so thousands of agent proofs
+        per round are spread over all CPU cores and never run on the caller's thread. Each worker builds the G1 table
+        once, when the pool starts.
+        :param workers: Number of worker processes, defaults to the number of CPU cores.
+        :param batch_size: Number of proofs handled by a worker in one task.
+        :param logger: Logger instance to log throughput.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.logger = logger or logging.getLogger(__name__)
+        self._context = multiprocessing.get_context("spawn")
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.last_stats: Dict[str, Any] = {"operation": None, "proofs": 0, "elapsed": 0.0, "proofs_per_second": 0.0}
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """
+        Lazily starts the worker pool so the process start-up and table cost is paid once per pool.
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=self._context, initializer=g1_table)
+            return self._executor
+
+    def _batches(self, items: Sequence) -> List[Sequence]:
+        return [items[start:start + self.batch_size] for start in range(0, len(items), self.batch_size)]
+
+    def _record(self, operation: str, proofs: int, elapsed: float):
+        """
+        Records the throughput of the last call.
+        """
+        self.last_stats = {
+            "operation": operation,
+            "proofs": proofs,
+            "elapsed": elapsed,
+            "proofs_per_second": proofs / elapsed if elapsed > 0 else 0.0,
+        }
+        self.logger.info(f"{operation.capitalize()} of {proofs} proofs at {self.last_stats['proofs_per_second']:.0f} proofs/sec.")
+
+    @staticmethod
+    def _to_proofs(results) -> List[Dict[str, Any]]:
+        return [{"public_key": to_bn128_point(public_key), "commitment": to_bn128_point(commitment), "challenge": challenge}
+                for batch in results for public_key, commitment, challenge in batch]
+
+    def _verification_batches(self, proofs: Sequence[Dict[str, Any]], secret_values: Sequence[int]) -> List[Sequence]:
+        if len(proofs) != len(secret_values):
+            raise ValueError("Every proof needs its secret.")
+        items = [(_raw_point(proof["public_key"]), _raw_point(proof["commitment"]), secret)
+                 for proof, secret in zip(proofs, secret_values)]
+        return self._batches(items)
+
+    def generate_proofs(self, secret_values: Sequence[int]) -> List[Dict[str, Any]]:
+        """
+        Generates one proof per secret on the worker processes, blocking until all of them are done.
+        :param secret_values: The secrets.
+        :return: The proofs in the order of the secrets, in the format of ZKPCommunication.generate_proof.
+        """
+        start = time.perf_counter()
+        results = list(self._get_executor().map(_generate_proof_batch, self._batches(list(secret_values))))
+        self._record("generation", len(secret_values), time.perf_counter() - start)
+        return self._to_proofs(results)
+
+    def verify_proofs(self, proofs: Sequence[Dict[str, Any]], secret_values: Sequence[int]) -> List[bool]:
+        """
+        Verifies proofs against their secrets on the worker processes, blocking until all of them are done.
+        :param proofs: The proofs.
+        :param secret_values: The secret of each proof.
+        :return: One verification result per proof, in order.
+        """
+        start = time.perf_counter()
+        results = list(self._get_executor().map(_verify_proof_batch, self._verification_batches(proofs, secret_values)))
+        self._record("verification", len(proofs), time.perf_counter() - start)
+        return [valid for batch in results for valid in batch]
+
+    async def generate_proofs_async(self, secret_values: Sequence[int]) -> List[Dict[str, Any]]:
+        """
+        Generates one proof per secret on the worker processes without blocking the event loop.
+        :param secret_values: The secrets.
+        :return: The proofs in the order of the secrets.
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        start = time.perf_counter()
+        results = await asyncio.gather(*(loop.run_in_executor(executor, _generate_proof_batch, batch)
+                                         for batch in self._batches(list(secret_values))))
+        self._record("generation", len(secret_values), time.perf_counter() - start)
+        return self._to_proofs(results)
+
+    async def verify_proofs_async(self, proofs: Sequence[Dict[str, Any]], secret_values: Sequence[int]) -> List[bool]:
+        """
+        Verifies proofs against their secrets on the worker processes without blocking the event loop.
+        :param proofs: The proofs.
+        :param secret_values: The secret of each proof.
+        :return: One verification result per proof, in order.
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        start = time.perf_counter()
+        results = await asyncio.gather(*(loop.run_in_executor(executor, _verify_proof_batch, batch)
+                                         for batch in self._verification_batches(proofs, secret_values)))
+        self._record("verification", len(proofs), time.perf_counter() - start)
+        return [valid for batch in results for valid in batch]
+
+    def throughput(self) -> float:
+        """
+        Reports the throughput of the last generation or verification call.
+        :return: The number of proofs per second.
+        """
+        return self.last_stats["proofs_per_second"]
+
+    def shutdown(self):
+        """
+        Terminates the worker processes.
+        """
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
 class ZKPCommunication:
     def __init__(self, logger: Optional[logging.Logger] = None):
         """
@@ -18,13 +316,12 @@ class ZKPCommunication:
         :param secret: The secret to generate the proof for.
         :return: A dictionary containing proof data (public key, commitment, and challenge).
         """
-        # Generate public/private keys
-        g = bn128.G1
-        h = bn128.multiply(g, secret)
+        # Generate public/private keys from the precomputed multiples of the generator G1
+        h = g1_multiply(secret)
 
         # Generate a commitment
         r = secrets.randbelow(bn128.curve_order)   # Random number for the commitment
-        c = bn128.multiply(g, r)
+        c = g1_multiply(r)
 
         # Generate a challenge
         challenge = secrets.randbelow(bn128.curve_order)   # Normally, this should be generated in a verifiable way
@@ -45,13 +342,12 @@ class ZKPCommunication:
         :return: True if the proof is verified, False otherwise.
         """
         # Extract proof data
-        g = bn128.G1
         h = proof["public_key"]
         commitment = proof["commitment"]
         challenge = proof["challenge"]
 
         # Recalculate the public value
-        recalculated_h = bn128.multiply(g, secret)
+        recalculated_h = g1_multiply(secret)
         if recalculated_h != h:
             self.logger.error("Verification failed: recalculated public key does not match provided public key.")
             return False
@@ -82,3 +378,12 @@ if __name__ == "__main__":
     proof = zkp_comm.generate_proof(secret=secret_value)
     verification_result = zkp_comm.verify_proof(proof=proof, secret=secret_value)
     print(f"Proof verification result: {verification_result}")
+
+    # Generate and verify a round of agent proofs on all CPU cores
+    proof_pool = ZKPProofPool()
+    agent_secrets = [secrets.randbelow(bn128.curve_order) for _ in range(1000)]
+    agent_proofs = proof_pool.generate_proofs(agent_secrets)
+    print(f"Generated {len(agent_proofs)} proofs at {proof_pool.throughput():.0f} proofs/sec")
+    print(f"All proofs valid: {all(proof_pool.verify_proofs(agent_proofs, agent_secrets))} "
+          f"({proof_pool.throughput():.0f} proofs/sec)")
+    proof_pool.shutdown()
@@ -1,29 +1,216 @@
 import hashlib
+import struct
 import time
-from typing import List
+from typing import Callable, List, Optional, Tuple, Union
+from core.ledger.merkle import merkle_proof, merkle_root
+
+# Fixed binary header layout: index, previous hash, timestamp, data digest (Merkle root for transaction lists), nonce
+HEADER_PREFIX_FORMAT = ">Q32sd32s"
+NONCE_FORMAT = ">Q"
+HEADER_PREFIX_SIZE = struct.calcsize(HEADER_PREFIX_FORMAT)
+HEADER_SIZE = HEADER_PREFIX_SIZE + struct.calcsize(NONCE_FORMAT)
+
+_pack_prefix = struct.Struct(HEADER_PREFIX_FORMAT).pack
+pack_nonce = struct.Struct(NONCE_FORMAT).pack
+
+
+def hash_to_bytes(block_hash: str) -> bytes:
+    """
+    Converts a hex block hash into its 32 raw bytes.
+    Values that are not SHA-256 hex digests (such as the genesis previous hash "0") are hashed instead.
+    :param block_hash: The hash string to convert.
+    :return: 32 bytes identifying the hash.
+    """
+    if len(block_hash) == 64:
+        try:
+            return bytes.fromhex(block_hash)
+        except ValueError:
+            pass
+    return hashlib.sha256(block_hash.encode()).digest()
+
+
+def compute_data_digest(data) -> bytes:
+    """
+    Computes the digest committed to by the block header for a data payload.
+    A list of transactions is committed to by its Merkle root, any other payload by its SHA-256 digest.
+    :param data: The block data.
+    :return: The 32-byte digest of the data.
+    """
+    if isinstance(data, (list, tuple)):
+        return merkle_root(data)
+    if not isinstance(data, bytes):
+        data = str(data).encode()
+    return hashlib.sha256(data).digest()
+
+
+def compute_legacy_hash(index: int, previous_hash: str, timestamp: float, data, nonce: int) -> str:
+    """
+    Computes a block hash in the string format used before the binary header, to recognise chains stored in it.
+    :return: The SHA-256 hash of the concatenated block fields.
+    """
+    block_string = f"{index}{previous_hash}{timestamp}{data}{nonce}"
+    return hashlib.sha256(block_string.encode()).hexdigest()
+
 
 class Block:
-    def __init__(self, index: int, previous_hash: str, timestamp: float, data: str, nonce: int = 0):
+    __slots__ = ("index", "previous_hash", "timestamp", "_data", "_data_digest", "nonce", "hash", "signature")
+
+    def __init__(self, index: int, previous_hash: str, timestamp: float, data: Union[str, List[str]], nonce: int = 0,
+                 block_hash: Optional[str] = None, signature: Optional[str] = None):
         """
         Initializes a blockchain block.
         :param index: Index of the block in the blockchain.
         :param previous_hash: Hash of the previous block in the chain.
         :param timestamp: Time when the block was created.
-        :param data: Data to be stored in the block.
+        :param data: Data to be stored in the block, either a single string or a list of transaction strings.
         :param nonce: The nonce value used for proof of work.
+        :param block_hash: A trusted hash for the block (e.g. from a snapshot); computed from the header if omitted.
+        :param signature: Hex signature of the block hash by the authority that produced it, in Proof of Authority mode.
         """
         self.index = index
         self.previous_hash = previous_hash
         self.timestamp = timestamp
         self.data = data
         self.nonce = nonce
-        self.hash = self.compute_hash()
+        self.hash = block_hash if block_hash is not None else self.compute_hash()
+        self.signature = signature
+
+    @property
+    def data(self):
+        """
+        The data stored in the block. Assigning new data invalidates the cached data digest,
+        so a transaction list must be replaced rather than modified in place.
+        """
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self._data = value
+        self._data_digest = None
+
+    @property
+    def data_digest(self) -> bytes:
+        """
+        The digest of the block data, computed once and cached until the data changes.
+        """
+        if self._data_digest is None:
+            self._data_digest = compute_data_digest(self._data)
+        return self._data_digest
+
+    @property
+    def transactions(self) -> List[str]:
+        """
+        The transactions stored in the block. A block holding a single data string has no transactions.
+        """
+        data = self.data
+        return list(data) if isinstance(data, (list, tuple)) else []
+
+    def transaction_proof(self, position: int) -> List[Tuple[str, str]]:
+        """
+        Builds the Merkle inclusion proof of one of the block's transactions against the data digest in its header.
+        :param position: The position of the transaction in the block.
+        :return: A list of (side, sibling hash hex) pairs from the leaf upwards.
+        """
+        return merkle_proof(self.transactions, position)
+
+    def to_header(self, load_data: Optional[Callable[[int, str], str]] = None) -> "LazyBlock":
+        """
+        Builds a header-only copy of the block, e.g. when its body is pruned from memory.
+        :param load_data: Optional callable reading the data back from disk; the data is dropped entirely without it.
+        :return: A LazyBlock with the same header, hash and signature.
+        """
+        return LazyBlock(self.index, self.previous_hash, self.timestamp, self.data_digest, self.nonce, self.hash,
+                         load_data, signature=self.signature)
+
+    def header_prefix(self) -> bytes:
+        """
+        Packs the constant part of the block header (everything except the nonce).
+        :return: The fixed-size binary header prefix.
+        """
+        return _pack_prefix(self.index, hash_to_bytes(self.previous_hash), float(self.timestamp), self.data_digest)
+
+    def header_bytes(self) -> bytes:
+        """
+        Packs the full binary block header including the nonce.
+        :return: The fixed-size binary block header.
+        """
+        return self.header_prefix() + pack_nonce(self.nonce)
+
+    def header_midstate(self):
+        """
+        Hashes the constant header prefix once so that proof of work only has to hash the nonce for each attempt.
+        Callers should use .copy() on the returned object for each nonce they try.
+        :return: A hashlib SHA-256 object that has consumed the header prefix.
+        """
+        return hashlib.sha256(self.header_prefix())
 
     def compute_hash(self) -> str:
         """
-        Computes the hash of the block using SHA-256.
+        Computes the hash of the block using SHA-256 over the binary header.
         :return: A SHA-256 hash of the block.
         """
-        block_string = f"{self.index}{self.previous_hash}{self.timestamp}{self.data}{self.nonce}"
-        return hashlib.sha256(block_string.encode()).hexdigest()
+        return hashlib.sha256(self.header_bytes()).hexdigest()
+
+
+class LazyBlock(Block):
+    __slots__ = ("_load_data",)
+
+    def __init__(self, index: int, previous_hash: str, timestamp: float, data_digest: bytes, nonce: int,
+                 block_hash: str, load_data: Callable[[int, str], str], signature: Optional[str] = None):
+        """
+        Initializes a block from its header only. The data is fetched from disk and checked against the data
+        digest whenever it is accessed, while hashing and validation work from the stored data digest.
+        :param index: Index of the block in the blockchain.
+        :param previous_hash: Hash of the previous block in the chain.
+        :param timestamp: Time when the block was created.
+        :param data_digest: The SHA-256 digest of the block data committed to by the header.
+        :param nonce: The nonce value used for proof of work.
+        :param block_hash: The trusted hash of the block.
+        :param load_data: Callable returning the data for a (height, block hash) pair.
+        :param signature: Hex signature of the block hash by the authority that produced it, if any.
+        """
+        self.index = index
+        self.previous_hash = previous_hash
+        self.timestamp = timestamp
+        self._data = None
+        self._data_digest = data_digest
+        self._load_data = load_data
+        self.nonce = nonce
+        self.hash = block_hash
+        self.signature = signature
+
+    @property
+    def data(self):
+        """
+        The data stored in the block, read from disk on each access until it is replaced in memory. The data is not
+        cached, since lazy blocks stand in for pruned bodies and for bodies not yet needed after a snapshot start;
+        keeping what was read would bring the whole chain back into memory after a full audit or a range query.
+        :raises ValueError: If the stored data does not match the data digest in the block header.
+        """
+        if self._load_data is None:
+            return self._data
+        data = self.read_stored_data()
+        if compute_data_digest(data) != self._data_digest:
+            raise ValueError(f"Stored data of block {self.index} does not match the data digest in its header.")
+        return data
+
+    @data.setter
+    def data(self, value):
+        self._load_data = None
+        self._data = value
+        self._data_digest = None
 
+    @property
+    def has_stored_data(self) -> bool:
+        """
+        Whether the block data is read from disk rather than held in memory or dropped.
+        """
+        return self._load_data is not None
+
+    def read_stored_data(self):
+        """
+        Reads the stored data without checking it against the data digest, for callers that check it elsewhere,
+        e.g. a verifier hashing the bodies in worker processes.
+        :return: The stored block data.
+        """
+        return self._load_data(self.index, self.hash)
@@ -0,0 +1,436 @@
+import bisect
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from core.ledger.block import Block, hash_to_bytes
+
+# Every record in a segment is prefixed with its payload length and CRC32
+RECORD_HEADER = struct.Struct(">II")
+# Every index entry holds the segment number, offset, record length and block hash for one height
+INDEX_ENTRY = struct.Struct(">IQI32s")
+
+INDEX_FILE = "index.idx"
+SEGMENT_SUFFIX = ".seg"
+
+
+class BlockStore:
+    def __init__(self, directory: str, segment_size: int = 64 * 1024 * 1024, sync_batch_size: int = 64,
+                 sync_interval: float = 0.05, logger: Optional[logging.Logger] = None):
+        """
+        Initializes an append-only block log split into fixed-size segment files with an offset index.
+        Appends are made durable with group-commit fsync batching and reads go through memory-mapped segments.
+        :param directory: Directory holding the segment files and the index.
+        :param segment_size: Maximum size in bytes of a segment file before a new one is started.
+        :param sync_batch_size: Number of unsynced records that triggers an fsync.
+        :param sync_interval: Maximum number of seconds an appended record stays unsynced when appends continue.
+        :param logger: Logger instance to log storage activities.
+        """
+        self.directory = directory
+        self.segment_size = segment_size
+        self.sync_batch_size = sync_batch_size
+        self.sync_interval = sync_interval
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._write_lock = threading.RLock()
+        self._sync_lock = threading.Lock()
+        self._entries: List[Tuple[int, int, int, bytes]] = []
+        self._maps: Dict[int, mmap.mmap] = {}
+        self._written_seq = 0
+        self._synced_seq = 0
+        self._last_sync = time.monotonic()
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._recover()
+        self._open_for_append()
+        self.pruned_height = self._first_height_in_segment(min(self._segment_numbers(), default=0))
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.directory, f"{segment:08d}{SEGMENT_SUFFIX}")
+
+    def _index_path(self) -> str:
+        return os.path.join(self.directory, INDEX_FILE)
+
+    def _segment_numbers(self) -> List[int]:
+        return sorted(int(name[:-len(SEGMENT_SUFFIX)]) for name in os.listdir(self.directory) if name.endswith(SEGMENT_SUFFIX))
+
+    def _first_height_in_segment(self, segment: int) -> int:
+        """
+        Returns the first height stored in a segment or a later one; segments hold consecutive heights in order.
+        """
+        return bisect.bisect_left(self._entries, (segment,))
+
+    def _open_for_append(self):
+        """
+        Opens the active segment and the index for appending.
+        """
+        if self._entries:
+            segment, offset, length, _ = self._entries[-1]
+            self._segment = segment
+            self._segment_offset = offset + RECORD_HEADER.size + length
+        else:
+            self._segment = 0
+            self._segment_offset = 0
+        self._segment_fd = os.open(self._segment_path(self._segment), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        self._index_fd = os.open(self._index_path(), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+
+    def _roll_segment(self):
+        """
+        Closes the active segment and starts the next one.
+        """
+        self._fsync()
+        os.close(self._segment_fd)
+        self._segment += 1
+        self._segment_offset = 0
+        self._segment_fd = os.open(self._segment_path(self._segment), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+
+    def _read_record_from_file(self, segment: int, offset: int) -> Optional[bytes]:
+        """
+        Reads and checksums a record straight from its segment file.
+        :return: The record payload, or None if the record is missing, torn or corrupt.
+        """
+        path = self._segment_path(segment)
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as segment_file:
+            segment_file.seek(offset)
+            header = segment_file.read(RECORD_HEADER.size)
+            if len(header) < RECORD_HEADER.size:
+                return None
+            length, checksum = RECORD_HEADER.unpack(header)
+            payload = segment_file.read(length)
+        if len(payload) < length or zlib.crc32(payload) != checksum:
+            return None
+        return payload
+
+    def _recover(self):
+        """
+        Reconciles the index with the segment files after an unclean shutdown.
+        Index entries pointing at torn records are dropped, complete records missing from the index are re-indexed,
+        and any torn tail is truncated away.
+        """
+        index_path = self._index_path()
+        raw_index = b""
+        if os.path.exists(index_path):
+            with open(index_path, "rb") as index_file:
+                raw_index = index_file.read()
+        whole_entries = len(raw_index) // INDEX_ENTRY.size
+        self._entries = [INDEX_ENTRY.unpack_from(raw_index, i * INDEX_ENTRY.size) for i in range(whole_entries)]
+
+        # Drop trailing index entries whose records never fully reached disk
+        while self._entries and self._read_record_from_file(self._entries[-1][0], self._entries[-1][1]) is None:
+            self._entries.pop()
+
+        if self._entries:
+            segment, offset, length, _ = self._entries[-1]
+            offset += RECORD_HEADER.size + length
+        else:
+            segment, offset = 0, 0
+
+        # Re-index complete records that were written after the last durable index entry
+        recovered = 0
+        segments = self._segment_numbers()
+        while True:
+            payload = self._read_record_from_file(segment, offset)
+            if payload is None:
+                path = self._segment_path(segment)
+                if os.path.exists(path) and os.path.getsize(path) == offset and segment + 1 in segments:
+                    segment, offset = segment + 1, 0
+                    continue
+                break
+            record = json.loads(payload)
+            self._entries.append((segment, offset, len(payload), hash_to_bytes(record["hash"])))
+            offset += RECORD_HEADER.size + len(payload)
+            recovered += 1
+
+        # Truncate the torn tail and remove segments beyond it
+        path = self._segment_path(segment)
+        if os.path.exists(path) and os.path.getsize(path) > offset:
+            self.logger.warning(f"Truncating torn tail of segment {segment} at offset {offset}.")
+            os.truncate(path, offset)
+        for extra_segment in segments:
+            if extra_segment > segment:
+                os.remove(self._segment_path(extra_segment))
+
+        if recovered or whole_entries != len(self._entries) or len(raw_index) % INDEX_ENTRY.size:
+            self._rewrite_index()
+            self.logger.info(f"Block store recovered with {len(self._entries)} blocks ({recovered} re-indexed).")
+
+    def _rewrite_index(self):
+        """
+        Rewrites the index file from the in-memory entries.
+        """
+        tmp_path = self._index_path() + ".tmp"
+        with open(tmp_path, "wb") as index_file:
+            index_file.write(b"".join(INDEX_ENTRY.pack(*entry) for entry in self._entries))
+            index_file.flush()
+            os.fsync(index_file.fileno())
+        os.replace(tmp_path, self._index_path())
+
+    @staticmethod
+    def block_to_record(block: Block) -> Dict[str, Any]:
+        """
+        Converts a block into the dictionary stored in the log.
+        :param block: The block to convert.
+        :return: A JSON-serializable dictionary describing the block.
+        """
+        return {
+            "index": block.index,
+            "previous_hash": block.previous_hash,
+            "timestamp": block.timestamp,
+            "data": block.data,
+            "nonce": block.nonce,
+            "hash": block.hash,
+            "signature": block.signature,
+        }
+
+    def append(self, block: Block, wait_for_sync: bool = False) -> int:
+        """
+        Appends a block to the log.
+        :param block: The block to append; its index must equal the current number of stored blocks.
+        :param wait_for_sync: Whether to block until the record has been fsynced.
+        :return: The height at which the block was stored.
+        """
+        return self.append_blocks([block], wait_for_sync)[-1]
+
+    def append_blocks(self, blocks: Iterable[Block], wait_for_sync: bool = False) -> List[int]:
+        """
+        Appends several blocks to the log with a single group commit.
+        :param blocks: The blocks to append, in chain order.
+        :param wait_for_sync: Whether to block until the records have been fsynced.
+        :return: The heights at which the blocks were stored.
+        """
+        heights = []
+        with self._write_lock:
+            for block in blocks:
+                if block.index != len(self._entries):
+                    raise ValueError(f"Block {block.index} does not extend the store at height {len(self._entries)}.")
+                payload = json.dumps(self.block_to_record(block), separators=(",", ":")).encode()
+                record = RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+                if self._segment_offset and self._segment_offset + len(record) > self.segment_size:
+                    self._roll_segment()
+
+                os.write(self._segment_fd, record)
+                entry = (self._segment, self._segment_offset, len(payload), hash_to_bytes(block.hash))
+                os.write(self._index_fd, INDEX_ENTRY.pack(*entry))
+                self._entries.append(entry)
+                self._segment_offset += len(record)
+                self._written_seq += 1
+                heights.append(block.index)
+            sequence = self._written_seq
+            due = (self._written_seq - self._synced_seq >= self.sync_batch_size
+                   or time.monotonic() - self._last_sync >= self.sync_interval)
+
+        if wait_for_sync or due:
+            self.sync(sequence)
+        return heights
+
+    def _fsync(self):
+        os.fsync(self._segment_fd)
+        os.fsync(self._index_fd)
+
+    def sync(self, sequence: Optional[int] = None):
+        """
+        Makes appended records durable. Concurrent callers share one fsync: whoever holds the sync lock
+        flushes every record written so far, and later callers whose records are already covered return immediately.
+        :param sequence: The append sequence number that must be durable, defaults to everything written so far.
+        """
+        with self._sync_lock:
+            with self._write_lock:
+                target = self._written_seq
+            if sequence is not None and self._synced_seq >= sequence:
+                return
+            if self._synced_seq >= target:
+                return
+            with self._write_lock:
+                self._fsync()
+            self._synced_seq = target
+            self._last_sync = time.monotonic()
+
+    def truncate(self, height: int):
+        """
+        Removes every block at or above the given height, e.g. when the chain is reorganised.
+        :param height: The first height to remove, which must not be below the pruned height.
+        """
+        with self._write_lock:
+            if height >= len(self._entries):
+                return
+            if height < self.pruned_height:
+                raise ValueError(f"Cannot truncate to height {height}, blocks below {self.pruned_height} were pruned.")
+            self._close_maps()
+            os.close(self._segment_fd)
+            os.close(self._index_fd)
+
+            if height > 0:
+                segment, offset, length, _ = self._entries[height - 1]
+                offset += RECORD_HEADER.size + length
+            else:
+                segment, offset = 0, 0
+            for existing_segment in self._segment_numbers():
+                if existing_segment > segment:
+                    os.remove(self._segment_path(existing_segment))
+            if os.path.exists(self._segment_path(segment)):
+                os.truncate(self._segment_path(segment), offset)
+            os.truncate(self._index_path(), height * INDEX_ENTRY.size)
+
+            del self._entries[height:]
+            self._open_for_append()
+            self._fsync()
+            self._synced_seq = self._written_seq
+            self.logger.info(f"Block store truncated to {height} blocks.")
+
+    def prune(self, height: int) -> int:
+        """
+        Deletes the segment files whose blocks are all below a height, e.g. bodies older than a state checkpoint.
+        Index entries are kept, so stored hashes can still be matched, but pruned bodies can no longer be read.
+        The active segment is never deleted.
+        :param height: The first height whose body must be kept.
+        :return: The number of blocks whose bodies were deleted.
+        """
+        with self._write_lock:
+            keep_segment = self._entries[height][0] if height < len(self._entries) else self._segment
+            removed_segments = [segment for segment in self._segment_numbers() if segment < min(keep_segment, self._segment)]
+            for segment in removed_segments:
+                segment_map = self._maps.pop(segment, None)
+                if segment_map is not None:
+                    segment_map.close()
+                os.remove(self._segment_path(segment))
+            previous_height = self.pruned_height
+            self.pruned_height = max(self.pruned_height, self._first_height_in_segment(min(keep_segment, self._segment)))
+        if removed_segments:
+            self.logger.info(f"Pruned {len(removed_segments)} segments holding blocks {previous_height}-{self.pruned_height - 1}.")
+        return self.pruned_height - previous_height
+
+    def _segment_map(self, segment: int, end: int) -> mmap.mmap:
+        """
+        Returns a read-only memory map of a segment that covers at least the given end offset.
+        The active segment keeps growing, so its map is recreated when a read goes past the mapped size.
+        """
+        segment_map = self._maps.get(segment)
+        if segment_map is None or len(segment_map) < end:
+            if segment_map is not None:
+                segment_map.close()
+            with open(self._segment_path(segment), "rb") as segment_file:
+                segment_map = mmap.mmap(segment_file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[segment] = segment_map
+        return segment_map
+
+    def _close_maps(self):
+        for segment_map in self._maps.values():
+            segment_map.close()
+        self._maps.clear()
+
+    def read_record(self, height: int) -> Dict[str, Any]:
+        """
+        Reads the stored record for a block through the memory-mapped segment.
+        :param height: The height of the block.
+        :return: A dictionary with the block fields and hash.
+        """
+        if height < self.pruned_height:
+            raise LookupError(f"Block {height} was pruned from the block store.")
+        with self._write_lock:
+            segment, offset, length, _ = self._entries[height]
+            start = offset + RECORD_HEADER.size
+            payload = self._segment_map(segment, start + length)[start:start + length]
+        return json.loads(payload)
+
+    def get_block(self, height: int) -> Block:
+        """
+        Reads a block from the store. The stored hash is reused rather than recomputed; validating the chain
+        still rehashes the block.
+        :param height: The height of the block.
+        :return: The reconstructed Block.
+        """
+        record = self.read_record(height)
+        return Block(
+            index=record["index"],
+            previous_hash=record["previous_hash"],
+            timestamp=record["timestamp"],
+            data=record["data"],
+            nonce=record["nonce"],
+            block_hash=record["hash"],
+            signature=record.get("signature"),
+        )
+
+    def read_data(self, height: int, block_hash: str):
+        """
+        Reads only the data of a stored block, making sure the stored block is the expected one.
+        Used as the loader of lazily loaded blocks.
+        :param height: The height of the block.
+        :param block_hash: The hash of the block whose data is requested.
+        :return: The block data.
+        """
+        if not self.matches(height, block_hash):
+            raise LookupError(f"Block {block_hash} is no longer stored at height {height}.")
+        return self.read_record(height)["data"]
+
+    def get_hash(self, height: int) -> str:
+        """
+        Returns the hash of a stored block from the index without touching the segment files.
+        :param height: The height of the block.
+        :return: The hex block hash.
+        """
+        return self._entries[height][3].hex()
+
+    def location(self, height: int) -> Tuple[int, int, int]:
+        """
+        Returns where a stored block lives on disk, from the in-memory height index.
+        :param height: The height of the block.
+        :return: A (segment number, offset, record length) tuple.
+        """
+        segment, offset, length, _ = self._entries[height]
+        return segment, offset, length
+
+    def matches(self, height: int, block_hash: str) -> bool:
+        """
+        Checks whether the block stored at a height has the given hash, using only the index.
+        :param height: The height of the block.
+        :param block_hash: The expected block hash.
+        :return: True if a block with that hash is stored at the height, False otherwise.
+        """
+        return height < len(self._entries) and self._entries[height][3] == hash_to_bytes(block_hash)
+
+    def iter_records(self, start: int = 0) -> Iterator[Dict[str, Any]]:
+        """
+        Iterates over the stored records from the given height.
+        :param start: The first height to read.
+        """
+        for height in range(start, len(self)):
+            yield self.read_record(height)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def close(self):
+        """
+        Syncs outstanding appends and releases file handles and memory maps. Closing twice has no effect.
+        """
+        if self._segment_fd is None:
+            return
+        self.sync()
+        with self._write_lock:
+            self._close_maps()
+            os.close(self._segment_fd)
+            os.close(self._index_fd)
+            self._segment_fd = None
+            self._index_fd = None
+
+# Example usage
+if __name__ == "__main__":
+    import tempfile
+    from core.ledger.blockchain import Blockchain
+
+    blockchain = Blockchain()
+    blockchain.add_block("Block 1 Data")
+    blockchain.add_block("Block 2 Data")
+
+    store = BlockStore(tempfile.mkdtemp())
+    store.append_blocks(blockchain.chain, wait_for_sync=True)
+    for height in range(len(store)):
+        print(f"Height {height}: {store.read_record(height)}")
+    store.close()
@@ -1,16 +1,90 @@
 import hashlib
+import hmac
 import time
-from typing import List
-from core.ledger.block import Block
+from typing import Any, Dict, List, Optional, Tuple, Union
+from core.ledger.block import Block, pack_nonce
+from core.ledger.chain_verifier import ChainVerifier
+from core.ledger.merkle import verify_merkle_proof
 
 class Blockchain:
-    def __init__(self):
+    def __init__(self, mining_engine=None, difficulty: int = 4, ledger_index=None, authority=None, contract_state=None):
         """
         Initializes the blockchain.
+        :param mining_engine: Optional MiningEngine used to search nonces on multiple cores.
+        :param difficulty: The difficulty level used when mining new blocks.
+        :param ledger_index: Optional LedgerIndex kept up to date with the chain for hash and payload lookups.
+        :param authority: Optional ProofOfAuthority; blocks are then signed by authorities in turn instead of mined,
+                          and every block above genesis must carry a valid authority signature.
+        :param contract_state: Optional ContractState executing the contract calls of appended blocks.
         """
+        self.ledger_index = ledger_index
+        self.contract_state = contract_state
+        self.authority = authority
         self.chain: List[Block] = []
+        self.mining_engine = mining_engine
+        self.difficulty = difficulty
+        self.checkpoints: List[Dict[str, Any]] = []
+        self.state_checkpoint: Optional[Dict[str, Any]] = None
+        self.pruned_height = 0  # Bodies of the blocks below this height may no longer be available
+        self._header_height = 0  # Blocks below this height are held in memory as headers only
         self.create_genesis_block()
 
+    @property
+    def chain(self) -> List[Block]:
+        """
+        The list of blocks in the chain. Assigning a new list resets the validated-height watermark.
+        """
+        return self._chain
+
+    @chain.setter
+    def chain(self, chain: List[Block]):
+        self.replace_chain(chain)
+
+    def replace_chain(self, chain: List[Block], validated_height: int = 0):
+        """
+        Replaces the chain, keeping the validated-height watermark only as far as the new chain is known to be valid.
+        :param chain: The new list of blocks.
+        :param validated_height: Height up to which the new chain has already been validated.
+        """
+        self._chain = chain
+        self._set_watermark(validated_height)
+        self.pruned_height = self._header_height = 0
+
+    def _update_index(self):
+        """
+        Brings the ledger index and contract state, if any, in line with the chain. Only blocks appended or replaced
+        since the previous update are indexed and applied. Appends and reorganisations update them right away;
+        a replaced chain is indexed and applied on the next lookup.
+        """
+        if self.ledger_index is not None:
+            self.ledger_index.sync(self._chain)
+        if self.contract_state is not None:
+            self.contract_state.sync(self._chain)
+
+    def _set_watermark(self, height: int):
+        """
+        Records the highest height verified so far, anchored to the block object at that height.
+        :param height: The highest validated height.
+        """
+        if not self._chain:
+            self.validated_height = 0
+            self._validated_block = None
+            return
+        height = max(0, min(height, len(self._chain) - 1))
+        self.validated_height = height
+        self._validated_block = self._chain[height]
+
+    def _watermark_height(self) -> int:
+        """
+        Returns the validated height, falling back to genesis if the blocks below it were replaced or truncated.
+        :return: The height from which incremental validation can resume.
+        """
+        height = self.validated_height
+        if height < len(self._chain) and self._chain[height] is self._validated_block:
+            return height
+        self._set_watermark(0)
+        return 0
+
     def create_genesis_block(self):
         """
         Creates the genesis block and adds it to the chain.
@@ -26,79 +100,419 @@ class Blockchain:
         """
         return self.chain[-1]
 
-    def add_block(self, data: str):
+    def add_block(self, data: Union[str, List[str]]) -> Optional[Block]:
         """
-        Adds a new block to the blockchain after performing proof of work.
-        :param data: The data to be stored in the block.
+        Adds a new block to the blockchain after performing proof of work, or after signing it in Proof of Authority mode.
+        A list of transactions is committed to by its Merkle root, so one proof of work covers all of them.
+        :param data: The data to be stored in the block, either a single string or a list of transaction strings.
+        :return: The new block, or None if mining was cancelled, a competing block was appended meanwhile,
+                 or it is another authority's turn.
         """
+        if isinstance(data, (list, tuple)):
+            if not data:
+                raise ValueError("A block must contain at least one transaction.")
+            data = list(data)
         last_block = self.get_last_block()
         new_block = Block(index=last_block.index + 1, previous_hash=last_block.hash, timestamp=time.time(), data=data)
-        new_block = self.proof_of_work(new_block)
+        if self.authority is not None:
+            if not self.authority.is_proposer(new_block.index):
+                print(f"Block {new_block.index} must be produced by authority {self.authority.proposer(new_block.index)}.")
+                return None
+            new_block = self.authority.sign_block(new_block)
+        else:
+            new_block = self.proof_of_work(new_block, self.difficulty)
+        if new_block is None:
+            print("Mining cancelled, block discarded.")
+            return None
+        if self.get_last_block() is not last_block:
+            print(f"Block {new_block.index} discarded, the chain tip changed while mining.")
+            return None
         self.chain.append(new_block)
+        self._update_index()
         print(f"Block {new_block.index} added with hash: {new_block.hash}")
+        return new_block
 
-    def proof_of_work(self, block: Block, difficulty: int = 4) -> Block:
+    def proof_of_work(self, block: Block, difficulty: int = 4) -> Optional[Block]:
         """
         Performs the proof of work algorithm to find a valid nonce for the block.
+        Delegates to the mining engine when one is configured, otherwise searches on the calling thread.
         :param block: The block that needs proof of work.
         :param difficulty: The difficulty level for mining the block.
-        :return: The block with a valid nonce that meets the difficulty criteria.
+        :return: The block with a valid nonce that meets the difficulty criteria, or None if mining was cancelled.
         """
+        if self.mining_engine is not None:
+            return self.mining_engine.mine(block, difficulty)
+
         prefix = "0" * difficulty
-        while not block.hash.startswith(prefix):
-            block.nonce += 1
-            block.hash = block.compute_hash()
+        if block.hash.startswith(prefix):
+            return block
+
+        # Hash the constant header prefix once and only feed the nonce for each attempt
+        midstate = block.header_midstate()
+        nonce = block.nonce
+        while True:
+            nonce += 1
+            sha = midstate.copy()
+            sha.update(pack_nonce(nonce))
+            block_hash = sha.hexdigest()
+            if block_hash.startswith(prefix):
+                break
+        block.nonce = nonce
+        block.hash = block_hash
         return block
 
-    def is_chain_valid(self) -> bool:
+    def add_transactions(self, transactions: List[str]) -> Optional[Block]:
+        """
+        Adds a new block holding a batch of transactions.
+        :param transactions: The transactions to store, in block order.
+        :return: The new block, or None if mining was cancelled or a competing block was appended meanwhile.
+        """
+        return self.add_block(list(transactions))
+
+    def get_transaction_proof(self, height: int, position: int) -> Dict[str, Any]:
+        """
+        Builds an inclusion proof that lets an auditor check one transaction against a block header,
+        without the other transactions of the block.
+        :param height: The height of the block holding the transaction.
+        :param position: The position of the transaction in the block.
+        :return: A dictionary containing the transaction, its Merkle proof, the Merkle root and the block hash.
+        """
+        block = self.chain[height]
+        return {
+            "height": height,
+            "position": position,
+            "transaction": block.transactions[position],
+            "proof": block.transaction_proof(position),
+            "merkle_root": block.data_digest.hex(),
+            "block_hash": block.hash,
+        }
+
+    def verify_transaction_proof(self, transaction_proof: Dict[str, Any]) -> bool:
+        """
+        Verifies a transaction inclusion proof against the header of the block at its height in the local chain.
+        :param transaction_proof: The proof returned by get_transaction_proof.
+        :return: True if the transaction is included in the block, False otherwise.
+        """
+        height = transaction_proof["height"]
+        if height >= len(self.chain) or self.chain[height].hash != transaction_proof["block_hash"]:
+            return False
+        # The Merkle root must be the one committed to by the header, not just the one claimed by the proof
+        root = self.chain[height].data_digest
+        if root.hex() != transaction_proof["merkle_root"]:
+            return False
+        return verify_merkle_proof(transaction_proof["transaction"], transaction_proof["proof"], root)
+
+    def get_block_by_hash(self, block_hash: str) -> Optional[Block]:
+        """
+        Finds a block by its hash, through the ledger index when one is configured.
+        :param block_hash: The block hash.
+        :return: The block, or None if it is not in the chain.
+        """
+        if self.ledger_index is None:
+            return next((block for block in self.chain if block.hash == block_hash), None)
+        self._update_index()
+        height = self.ledger_index.height_of(block_hash)
+        return self.chain[height] if height is not None else None
+
+    def find_transactions(self, index_name: str, key: str) -> List[Tuple[int, int]]:
+        """
+        Finds the transactions holding a value in a secondary index of the ledger index, e.g. every
+        transaction mentioning an agent id.
+        :param index_name: The secondary index, e.g. "agent_id".
+        :param key: The value to look up.
+        :return: A list of (height, position in block) pairs in chain order.
+        """
+        if self.ledger_index is None:
+            raise ValueError("Transaction lookups require a ledger index.")
+        self._update_index()
+        return self.ledger_index.lookup(index_name, key)
+
+    def get_contract_state(self):
+        """
+        Returns the contract state brought up to date with the chain, so that registrations, reward balances and
+        contributions are answered without replaying the ledger.
+        :return: The ContractState.
+        """
+        if self.contract_state is None:
+            raise ValueError("Contract queries require a contract state.")
+        self._update_index()
+        return self.contract_state
+
+    def is_chain_valid(self, incremental: bool = False) -> bool:
         """
         Validates the blockchain to ensure integrity.
+        By default every block is rehashed from genesis. In incremental mode only the blocks appended above the
+        validated-height watermark are checked, so periodic validation cost does not grow with chain length.
+        :param incremental: Whether to resume from the validated-height watermark instead of genesis.
         :return: True if the blockchain is valid, False otherwise.
         """
-        for i in range(1, len(self.chain)):
+        start = self._watermark_height() if incremental else 0
+        for i in range(start + 1, len(self.chain)):
             current_block = self.chain[i]
             previous_block = self.chain[i - 1]
 
             # Check if the current block's hash is correct
             if current_block.hash != current_block.compute_hash():
                 print(f"Invalid block hash at index {i}")
+                self._set_watermark(i - 1)
                 return False
 
             # Check if the previous hash matches the hash of the previous block
             if current_block.previous_hash != previous_block.hash:
                 print(f"Invalid chain link between block {i-1} and block {i}")
+                self._set_watermark(i - 1)
                 return False
+
+        invalid_height = self._first_invalid_signature(self.chain, start + 1)
+        if invalid_height >= 0:
+            self._set_watermark(invalid_height - 1)
+            return False
+        self._set_watermark(len(self.chain) - 1)
+        return True
+
+    def _first_invalid_signature(self, chain: List[Block], start: int) -> int:
+        """
+        Verifies the authority signatures of a chain's blocks in one batch, once their hashes and links are checked.
+        :param chain: The chain to verify.
+        :param start: The first height to verify.
+        :return: The height of the first block with an invalid signature, or -1 if they are valid or PoA is disabled.
+        """
+        if self.authority is None:
+            return -1
+        invalid_height = self.authority.first_invalid_height(chain, start)
+        if invalid_height >= 0:
+            print(f"Invalid authority signature at index {invalid_height}")
+        return invalid_height
+
+    def first_invalid_height(self, workers: Optional[int] = None) -> int:
+        """
+        Re-verifies every block from genesis on all CPU cores. The chain is split into height ranges checked in
+        a process pool, with each range checking the link to the range before it. Bodies of blocks loaded from a
+        snapshot or the block store are read back and hashed against their header digests, so a body rewritten on
+        disk fails the audit. In Proof of Authority mode the block signatures are verified as well.
+        :param workers: Number of worker processes, defaults to the number of CPU cores.
+        :return: The height of the first invalid block, or -1 if the blockchain is valid.
+        """
+        height = ChainVerifier(workers=workers).first_invalid_height(self.chain)
+        signature_height = self._first_invalid_signature(self.chain[:height] if height >= 0 else self.chain, 1)
+        if signature_height >= 0:
+            height = signature_height
+        if height < 0:
+            self._set_watermark(len(self.chain) - 1)
+        else:
+            print(f"Invalid block at index {height}")
+            self._set_watermark(height - 1)
+        return height
+
+    def create_checkpoint(self, signing_key: bytes) -> Dict[str, Any]:
+        """
+        Creates a signed checkpoint of the validated chain tip that other nodes can trust without rehashing.
+        :param signing_key: Secret key used to sign the checkpoint with HMAC-SHA256.
+        :return: A dictionary containing the checkpoint height, block hash and signature.
+        """
+        height = self._watermark_height()
+        block_hash = self.chain[height].hash
+        signature = hmac.new(signing_key, f"{height}:{block_hash}".encode(), hashlib.sha256).hexdigest()
+        checkpoint = {"height": height, "hash": block_hash, "signature": signature}
+        self.checkpoints.append(checkpoint)
+        return checkpoint
+
+    def apply_checkpoint(self, checkpoint: Dict[str, Any], signing_key: bytes) -> bool:
+        """
+        Advances the validated-height watermark to a signed checkpoint that matches the local chain.
+        :param checkpoint: The checkpoint created by create_checkpoint.
+        :param signing_key: Secret key used to verify the checkpoint signature.
+        :return: True if the checkpoint was verified and applied, False otherwise.
+        """
+        height = checkpoint["height"]
+        expected_signature = hmac.new(signing_key, f"{height}:{checkpoint['hash']}".encode(), hashlib.sha256).hexdigest()
+        if not hmac.compare_digest(expected_signature, checkpoint["signature"]):
+            print(f"Checkpoint at height {height} has an invalid signature.")
+            return False
+        if height >= len(self.chain) or self.chain[height].hash != checkpoint["hash"]:
+            print(f"Checkpoint at height {height} does not match the local chain.")
+            return False
+
+        if height > self._watermark_height():
+            self._set_watermark(height)
+        self.checkpoints.append(checkpoint)
+        return True
+
+    @staticmethod
+    def _state_checkpoint_signature(checkpoint: Dict[str, Any], signing_key: bytes) -> str:
+        """
+        Signs the height, block hash and state root of a state checkpoint with HMAC-SHA256.
+        """
+        message = f"{checkpoint['height']}:{checkpoint['hash']}:{checkpoint['state_root']}".encode()
+        return hmac.new(signing_key, message, hashlib.sha256).hexdigest()
+
+    def create_state_checkpoint(self, signing_key: bytes) -> Dict[str, Any]:
+        """
+        Creates a signed checkpoint of the contract state at the chain tip. Block bodies up to the checkpoint can
+        then be pruned, and new nodes can bootstrap from the checkpoint instead of replaying the chain from genesis.
+        Reorganisations below the checkpoint are refused afterwards.
+        :param signing_key: Secret key used to sign the checkpoint with HMAC-SHA256.
+        :return: A dictionary containing the height, block hash, state root, state tables and signature.
+        """
+        if self.contract_state is None:
+            raise ValueError("State checkpoints require a contract state.")
+        if not self.is_chain_valid(incremental=True):
+            raise ValueError("Cannot checkpoint an invalid chain.")
+        state = self.get_contract_state()
+        tables = state.export_tables()
+        checkpoint = {
+            "height": len(self.chain) - 1,
+            "hash": self.chain[-1].hash,
+            "state_root": state.tables_root(tables),
+            "state": tables,
+        }
+        checkpoint["signature"] = self._state_checkpoint_signature(checkpoint, signing_key)
+        self.state_checkpoint = checkpoint
+        state.set_base(checkpoint["height"], tables)
+        return checkpoint
+
+    def verify_state_checkpoint(self, checkpoint: Dict[str, Any], signing_key: bytes) -> bool:
+        """
+        Verifies the signature of a state checkpoint and that its state tables match its state root.
+        :param checkpoint: The checkpoint created by create_state_checkpoint.
+        :param signing_key: Secret key used to verify the checkpoint signature.
+        :return: True if the checkpoint is authentic, False otherwise.
+        """
+        expected_signature = self._state_checkpoint_signature(checkpoint, signing_key)
+        if not hmac.compare_digest(expected_signature, checkpoint["signature"]):
+            print(f"State checkpoint at height {checkpoint['height']} has an invalid signature.")
+            return False
+        if self.contract_state is None or self.contract_state.tables_root(checkpoint["state"]) != checkpoint["state_root"]:
+            print(f"State checkpoint at height {checkpoint['height']} does not match its state root.")
+            return False
+        return True
+
+    def prune(self, retention: int, load_data=None) -> int:
+        """
+        Drops the bodies of blocks older than a retention horizon from memory, keeping their headers.
+        Only blocks at or below the latest state checkpoint are pruned, since the checkpoint replaces them for
+        rebuilding the contract state.
+        :param retention: Number of most recent blocks whose bodies are kept.
+        :param load_data: Optional callable reading pruned data back from disk, e.g. BlockStore.read_data;
+                          pruned data is dropped entirely without it.
+        :return: The number of blocks pruned by this call.
+        """
+        if self.state_checkpoint is None:
+            return 0
+        horizon = min(len(self._chain) - retention, self.state_checkpoint["height"] + 1)
+        if horizon <= self._header_height:
+            return 0
+        validated_height = self._watermark_height()
+        for height in range(self._header_height, horizon):
+            self._chain[height] = self._chain[height].to_header(load_data)
+        # The watermark is anchored to block objects, so re-anchor it to the header that replaced its block
+        self._set_watermark(validated_height)
+        pruned = horizon - self._header_height
+        self._header_height = horizon
+        if load_data is None:
+            self.pruned_height = horizon
+        print(f"Pruned the bodies of {pruned} blocks below height {horizon}.")
+        return pruned
+
+    def bootstrap_from_checkpoint(self, checkpoint: Dict[str, Any], chain: List[Block], signing_key: bytes) -> bool:
+        """
+        Adopts a chain from a state checkpoint instead of replaying it from genesis. Blocks up to the checkpoint
+        only need their headers; their hashes and links are checked and the checkpoint block must be on the chain.
+        Blocks above the checkpoint are validated in full and applied to the restored contract state.
+        :param checkpoint: A state checkpoint created by a trusted node.
+        :param chain: The headers up to the checkpoint followed by the full blocks above it.
+        :param signing_key: Secret key used to verify the checkpoint signature.
+        :return: True if the chain was adopted, False otherwise.
+        """
+        height = checkpoint["height"]
+        if not self.verify_state_checkpoint(checkpoint, signing_key):
+            return False
+        if height >= len(chain) or chain[height].hash != checkpoint["hash"]:
+            print(f"State checkpoint at height {height} is not on the bootstrap chain.")
+            return False
+        if ChainVerifier(workers=1).first_invalid_height(chain) >= 0 or self._first_invalid_signature(chain, height + 1) >= 0:
+            print("Bootstrap chain is invalid.")
+            return False
+
+        self.replace_chain(chain, validated_height=len(chain) - 1)
+        self.contract_state.restore(checkpoint["state"], chain[:height + 1])
+        self.state_checkpoint = checkpoint
+        self.pruned_height = self._header_height = height + 1
+        self._update_index()
+        print(f"Bootstrapped from the state checkpoint at height {height} with {len(chain) - height - 1} blocks above it.")
         return True
 
     def consensus(self, chains: List[List[Block]]) -> List[Block]:
         """
         Implements a consensus mechanism to replace the current chain with the longest valid chain.
+        Candidate chains usually share most of their prefix with the local chain, so only the blocks after the
+        common ancestor are validated and the local chain is switched over by truncating and appending.
         :param chains: A list of chains from other nodes in the network.
         :return: The longest valid chain that replaces the current chain if applicable.
         """
-        longest_chain = self.chain
+        longest_chain = None
+        longest_fork_height = -1
         max_length = len(self.chain)
 
         for chain in chains:
-            if len(chain) > max_length and self.is_chain_valid_external(chain):
+            if len(chain) <= max_length:
+                continue
+            fork_height = self.find_fork_point(chain)
+            if self.state_checkpoint is not None and fork_height < self.state_checkpoint["height"]:
+                print(f"Chain forking at height {fork_height} below the state checkpoint rejected.")
+                continue
+            if self.is_chain_valid_external(chain, start=max(fork_height + 1, 1)):
                 longest_chain = chain
+                longest_fork_height = fork_height
                 max_length = len(chain)
 
         # Replace the current chain only if we find a strictly longer valid chain
-        if longest_chain != self.chain:
-            self.chain = longest_chain
-            print("Chain replaced with the longest valid chain from the network.")
+        if longest_chain is not None:
+            self.switch_to_fork(longest_chain, longest_fork_height)
+            print(f"Chain reorganised at height {longest_fork_height + 1} to the longest valid chain from the network.")
         else:
             print("Current chain is already the longest valid chain, or chains are of equal length.")
         return self.chain
 
-    def is_chain_valid_external(self, chain: List[Block]) -> bool:
+    def find_fork_point(self, chain: List[Block]) -> int:
+        """
+        Finds the common ancestor of the local chain and another chain by binary search over block hashes.
+        Because every block commits to its predecessor's hash, chains that agree at a height agree at every lower height.
+        :param chain: The other chain.
+        :return: The highest height at which both chains hold the same block, or -1 if they share no block.
+        """
+        low, high = -1, min(len(self.chain), len(chain)) - 1
+        while low < high:
+            middle = (low + high + 1) // 2
+            if chain[middle].hash == self.chain[middle].hash:
+                low = middle
+            else:
+                high = middle - 1
+        return low
+
+    def switch_to_fork(self, chain: List[Block], fork_height: int):
+        """
+        Switches to another chain that was validated above the fork point by truncating the local chain
+        after the common ancestor and appending the other chain's blocks.
+        :param chain: The chain to switch to.
+        :param fork_height: The height of the common ancestor, or -1 if the chains share no block.
+        """
+        # The watermark survives if everything up to the fork point had already been validated locally
+        keep_watermark = fork_height < 0 or self._watermark_height() >= fork_height
+        del self._chain[fork_height + 1:]
+        self._chain.extend(chain[fork_height + 1:])
+        if keep_watermark:
+            self._set_watermark(len(self._chain) - 1)
+        self._update_index()
+
+    def is_chain_valid_external(self, chain: List[Block], start: int = 1) -> bool:
         """
         Validates an external chain to ensure integrity.
         :param chain: The chain to validate.
+        :param start: The first height to check, e.g. the block after the common ancestor with the local chain.
         :return: True if the chain is valid, False otherwise.
         """
-        for i in range(1, len(chain)):
+        for i in range(start, len(chain)):
             current_block = chain[i]
             previous_block = chain[i - 1]
 
@@ -111,7 +525,7 @@ class Blockchain:
             if current_block.previous_hash != previous_block.hash:
                 print(f"Invalid chain link between block {i-1} and block {i} in the external chain")
                 return False
-        return True
+        return self._first_invalid_signature(chain, start) < 0
 
 # Example usage
 if __name__ == "__main__":
@@ -120,6 +534,9 @@ if __name__ == "__main__":
     # Add blocks to the blockchain
     blockchain.add_block(data="Block 1 Data")
     blockchain.add_block(data="Block 2 Data")
+    blockchain.add_transactions(["agent1:contribution:0.8", "agent2:model:ab12", "agent3:reward:10"])
+    transaction_proof = blockchain.get_transaction_proof(3, 1)
+    print(f"Transaction proof valid: {blockchain.verify_transaction_proof(transaction_proof)}")
 
     # Validate the blockchain
     is_valid = blockchain.is_chain_valid()
@@ -0,0 +1,186 @@
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Dict, List, Optional, Tuple
+from core.ledger.block import Block, LazyBlock
+
+# Blocks checked by one task; large enough to amortise task overhead, small enough to balance the workers
+DEFAULT_RANGE_SIZE = 20000
+
+# Chain inherited by forked worker processes, so ranges are verified without pickling any blocks
+_chain: Optional[List[Block]] = None
+
+
+def _first_invalid(blocks: List[Block], previous_hash: str, start: int) -> Optional[Tuple[int, str]]:
+    """
+    Finds the first block of a range whose hash or link to its predecessor is wrong, or whose body stored on disk
+    no longer matches the data digest its hash was computed from.
+    :param blocks: The blocks of the range.
+    :param previous_hash: The hash of the block before the range.
+    :param start: The height of the first block of the range.
+    :return: A (height, reason) tuple for the first invalid block, or None if the range is valid.
+    """
+    for offset, block in enumerate(blocks):
+        if block.hash != block.compute_hash():
+            return start + offset, "hash"
+        if block.previous_hash != previous_hash:
+            return start + offset, "link"
+        if isinstance(block, LazyBlock) and block.has_stored_data:
+            try:
+                block.data  # Hashes the body against the data digest
+            except (ValueError, LookupError):
+                return start + offset, "data"
+        previous_hash = block.hash
+    return None
+
+
+def _verify_inherited_range(start: int, end: int) -> Optional[Tuple[int, str]]:
+    """
+    Verifies heights start to end - 1 of the chain inherited from the parent process.
+    The link of the first block is checked against the last block of the previous range, which stitches ranges together.
+    """
+    return _first_invalid(_chain[start:end], _chain[start - 1].hash, start)
+
+
+def _verify_shipped_range(records: List[Tuple[Any, ...]], previous_hash: str, start: int) -> Optional[Tuple[int, str]]:
+    """
+    Verifies a range of headers sent to the worker as plain field tuples, when the workers are not forked.
+    Blocks held in memory only ship their data digest, which the hash check covers; bodies stored on disk are
+    shipped as read, unchecked, so that hashing them against their digests is spread over the workers too.
+    """
+    blocks = [LazyBlock(index, block_previous_hash, timestamp, data_digest, nonce, block_hash,
+                        _shipped_loader(body) if body is not None else None)
+              for index, block_previous_hash, timestamp, data_digest, nonce, block_hash, body in records]
+    return _first_invalid(blocks, previous_hash, start)
+
+
+def _shipped_record(block: Block) -> Tuple[Any, ...]:
+    """
+    Packs a block for _verify_shipped_range. The body is None for blocks without a body on disk, a 1-tuple holding
+    the stored data, or an empty tuple if the block is no longer stored.
+    """
+    body = None
+    if isinstance(block, LazyBlock) and block.has_stored_data:
+        try:
+            body = (block.read_stored_data(),)
+        except LookupError:
+            body = ()
+    return block.index, block.previous_hash, block.timestamp, block.data_digest, block.nonce, block.hash, body
+
+
+def _shipped_loader(body: Tuple[Any, ...]):
+    def load_data(height: int, block_hash: str):
+        if not body:
+            raise LookupError(f"Block {block_hash} is no longer stored at height {height}.")
+        return body[0]
+    return load_data
+
+
+class ChainVerifier:
+    def __init__(self, workers: Optional[int] = None, range_size: int = DEFAULT_RANGE_SIZE,
+                 start_method: Optional[str] = None, logger: Optional[logging.Logger] = None):
+        """
+        Initializes a verifier that checks every block hash and link of a chain on several cores, and hashes the
+        bodies of blocks read from disk against their header digests.
+        The chain is split into height ranges that are checked independently in a process pool; each range also
+        checks the link of its first block to the last block of the previous range.
+        :param workers: Number of worker processes, defaults to the number of CPU cores.
+        :param range_size: Number of blocks checked by one task.
+        :param start_method: Start method of the worker processes. Defaults to fork only while the calling process
+                             runs a single thread, as forking a process with gRPC server or sync threads can leave
+                             the children blocked on locks held at fork time; forkserver or spawn otherwise.
+        :param logger: Logger instance to log verification activities.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.range_size = range_size
+        self.start_method = start_method
+        self.logger = logger or logging.getLogger(__name__)
+        self.last_stats: Dict[str, Any] = {"blocks": 0, "elapsed": 0.0, "blocks_per_second": 0.0}
+
+    def first_invalid_height(self, chain: List[Block], start: int = 1) -> int:
+        """
+        Verifies the blocks of a chain from a height onwards.
+        :param chain: The chain to verify.
+        :param start: The first height to verify; the genesis block has no predecessor to check.
+        :return: The height of the first invalid block, or -1 if every block is valid.
+        """
+        started = time.perf_counter()
+        start = max(start, 1)
+        ranges = [(range_start, min(range_start + self.range_size, len(chain)))
+                  for range_start in range(start, len(chain), self.range_size)]
+        if len(ranges) <= 1 or self.workers == 1:
+            result = _first_invalid(chain[start:], chain[start - 1].hash, start) if start < len(chain) else None
+        else:
+            result = self._verify_ranges(chain, ranges)
+
+        elapsed = time.perf_counter() - started
+        verified = len(chain) - start if result is None else result[0] - start
+        self.last_stats = {"blocks": verified, "elapsed": elapsed, "blocks_per_second": verified / elapsed if elapsed > 0 else 0.0}
+        if result is None:
+            self.logger.info(f"Verified {verified} blocks in {elapsed:.2f} s.")
+            return -1
+        self.logger.warning(f"Invalid block {result[1]} at height {result[0]}.")
+        return result[0]
+
+    def _start_method(self) -> str:
+        if self.start_method is not None:
+            return self.start_method
+        methods = multiprocessing.get_all_start_methods()
+        if "fork" in methods and threading.active_count() == 1:
+            return "fork"
+        return "forkserver" if "forkserver" in methods else "spawn"
+
+    def _verify_ranges(self, chain: List[Block], ranges: List[Tuple[int, int]]) -> Optional[Tuple[int, str]]:
+        """
+        Verifies the ranges in a process pool. Once an invalid block is found, ranges above it are cancelled,
+        but ranges below it are still awaited since they may hold an earlier invalid block.
+        """
+        global _chain
+        start_method = self._start_method()
+        use_fork = start_method == "fork"
+        if use_fork:
+            # Worker processes are forked after the chain is published, so they see it without copying
+            _chain = chain
+        executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context(start_method))
+
+        try:
+            pending = {}
+            for range_start, range_end in ranges:
+                if use_fork:
+                    future = executor.submit(_verify_inherited_range, range_start, range_end)
+                else:
+                    records = [_shipped_record(block) for block in chain[range_start:range_end]]
+                    future = executor.submit(_verify_shipped_range, records, chain[range_start - 1].hash, range_start)
+                pending[future] = range_start
+
+            first_invalid = None
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    del pending[future]
+                    result = future.result()
+                    if result is not None and (first_invalid is None or result[0] < first_invalid[0]):
+                        first_invalid = result
+                if first_invalid is not None:
+                    for future, range_start in list(pending.items()):
+                        if range_start > first_invalid[0]:
+                            future.cancel()
+                            del pending[future]
+            return first_invalid
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            _chain = None
+
+# Example usage
+if __name__ == "__main__":
+    chain = [Block(index=0, previous_hash="0", timestamp=time.time(), data="Genesis Block")]
+    for index in range(1, 100001):
+        chain.append(Block(index=index, previous_hash=chain[-1].hash, timestamp=time.time(), data=f"Block {index} Data"))
+    chain[75000].data = "Tampered Data"
+
+    verifier = ChainVerifier(range_size=10000)
+    print(f"First invalid height: {verifier.first_invalid_height(chain)}")
+    print(f"Verification stats: {verifier.last_stats}")
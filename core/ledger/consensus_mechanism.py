@@ -1,16 +1,34 @@
 import hashlib
 import time
-from typing import List
+from typing import List, Optional, Union
 from core.ledger.blockchain import Blockchain
 from core.ledger.block import Block
+from core.ledger.validator_registry import ValidatorRegistry
 
 class ConsensusMechanism:
-    def __init__(self, nodes: List[Blockchain]):
+    def __init__(self, nodes: List[Blockchain], validator_registry: Optional[ValidatorRegistry] = None):
         """
         Initializes the consensus mechanism for blockchain nodes in a network.
         :param nodes: A list of Blockchain instances representing nodes in the network.
+        :param validator_registry: Optional registry of node ids and stakes used for stake-weighted elections.
         """
         self.nodes = nodes
+        self.validator_registry = validator_registry or ValidatorRegistry()
+        self._nodes_by_id = {id(node): node for node in nodes}
+
+    def _node_by_id(self, node_id: int) -> Blockchain:
+        """
+        Resolves a node id through an index rebuilt only when the node list changed.
+        :param node_id: The id of the node.
+        :return: The node with that id.
+        """
+        node = self._nodes_by_id.get(node_id)
+        if node is None or len(self._nodes_by_id) != len(self.nodes):
+            self._nodes_by_id = {id(node): node for node in self.nodes}
+            node = self._nodes_by_id.get(node_id)
+        if node is None:
+            raise ValueError(f"No node with id {node_id}.")
+        return node
 
     def longest_chain_rule(self) -> Blockchain:
         """
@@ -22,44 +40,55 @@ class ConsensusMechanism:
         
         for node in self.nodes:
             # Find the node with the longest valid chain
-            if len(node.chain) > len(longest_chain_node.chain) and node.is_chain_valid():
+            if len(node.chain) > len(longest_chain_node.chain) and node.is_chain_valid(incremental=True):
                 longest_chain_node = node
 
         # Set the consensus chain as the longest chain for all nodes
         for node in self.nodes:
             if node.chain != longest_chain_node.chain:
-                node.chain = longest_chain_node.chain  # Update chain for the node
+                # Update chain for the node, carrying over how far the adopted chain has been validated
+                node.replace_chain(longest_chain_node.chain, validated_height=longest_chain_node.validated_height)
                 print(f"Node {id(node)} updated its chain to the longest chain.")
 
         # Return the node with the longest chain (not just the chain itself)
         return longest_chain_node
 
-    def proof_of_stake(self, stake_distribution: dict) -> Blockchain:
+    def proof_of_stake(self, stake_distribution: Optional[dict] = None, seed: Optional[Union[str, bytes, int]] = None) -> Blockchain:
         """
-        Applies a simple Proof of Stake mechanism for consensus.
-        The node with the highest stake is selected to add the next block.
-        :param stake_distribution: A dictionary mapping node ids to their respective stakes.
+        Applies a Proof of Stake mechanism for consensus.
+        Without a seed, the node with the highest stake is selected to add the next block. With a seed, the node is
+        elected at random with a probability proportional to its stake through the validator registry, in O(log n);
+        every node using the same seed (e.g. the latest block hash) and stakes elects the same node.
+        :param stake_distribution: A dictionary mapping node ids to their respective stakes. In seeded elections it is
+                                   applied to the validator registry and may hold only the stakes that changed.
+        :param seed: Optional election seed.
         :return: The blockchain representing the selected node.
         """
+        if seed is not None:
+            if stake_distribution:
+                self.validator_registry.update(stake_distribution)
+            elected_node = self.validator_registry.elect(seed)
+            print(f"Node {elected_node} elected to add the next block based on Proof of Stake.")
+            return self._node_by_id(elected_node)
+
         # Select the node with the maximum stake
         highest_stake_node = max(stake_distribution, key=stake_distribution.get)
         print(f"Node {highest_stake_node} selected to add the next block based on Proof of Stake.")
 
-        selected_node = next(node for node in self.nodes if id(node) == highest_stake_node)
-        return selected_node
+        return self._node_by_id(highest_stake_node)
 
-    def proof_of_authority(self, authorities: List[int]) -> Blockchain:
+    def proof_of_authority(self, authorities: List[int], height: int = 0) -> Blockchain:
         """
-        Implements Proof of Authority to select a trusted authority node to validate the chain.
-        :param authorities: A list of node ids representing authority nodes.
+        Implements Proof of Authority to select the trusted authority node whose turn it is to add a block.
+        Authorities take turns in a fixed rotation, so every node selects the same authority for a height.
+        :param authorities: A list of node ids representing authority nodes, in rotation order.
+        :param height: The height of the block to add.
         :return: The blockchain representing the selected authority node.
         """
-        # Select the first authority node from the list for simplicity
-        selected_authority = authorities[0]
+        selected_authority = authorities[height % len(authorities)]
         print(f"Node {selected_authority} selected to validate and add new blocks as authority.")
 
-        selected_node = next(node for node in self.nodes if id(node) == selected_authority)
-        return selected_node
+        return self._node_by_id(selected_authority)
 
 # Example usage
 if __name__ == "__main__":
@@ -95,7 +124,11 @@ if __name__ == "__main__":
     selected_node_pos = consensus.proof_of_stake(stake_distribution)
     print(f"Node {id(selected_node_pos)} selected for the next block based on stake.")
 
+    # Example of a stake-weighted election reproducible from the latest block hash
+    elected_node = consensus.proof_of_stake(stake_distribution, seed=node3.get_last_block().hash)
+    print(f"Node {id(elected_node)} elected for the next block based on stake.")
+
     # Example of Proof of Authority consensus
     authorities = [id(node1), id(node2)]
-    selected_node_poa = consensus.proof_of_authority(authorities)
+    selected_node_poa = consensus.proof_of_authority(authorities, height=len(node1.chain))
     print(f"Node {id(selected_node_poa)} selected as authority for adding blocks.")
@@ -0,0 +1,327 @@
+import hashlib
+import json
+import logging
+import os
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from core.ledger.block import Block
+
+# Contracts of core/orchestrator/blockchain_smart_contracts executed natively, with the methods that change state
+REGISTRATION_CONTRACT = "registration"
+REWARDS_CONTRACT = "rewards"
+AGGREGATION_CONTRACT = "aggregation"
+
+# State tables: registered agents, reward balances, withdrawn rewards and the latest contribution of each agent
+STATE_TABLES = ["agents", "rewards", "withdrawn", "contributions"]
+
+# Number of recent blocks whose state changes are kept so that a reorganisation can be undone
+DEFAULT_UNDO_DEPTH = 1000
+
+_MISSING = object()
+
+
+class ContractRevert(Exception):
+    """
+    Raised when a contract call fails one of its require checks; the transaction leaves the state unchanged.
+    """
+
+
+def contract_call(contract: str, method: str, agent_id: str, **arguments) -> str:
+    """
+    Encodes a contract call as a ledger transaction.
+    :param contract: The contract name, e.g. "registration".
+    :param method: The contract method, e.g. "registerAgent".
+    :param agent_id: The calling agent (msg.sender).
+    :param arguments: The method arguments.
+    :return: The JSON transaction string.
+    """
+    return json.dumps(dict(contract=contract, method=method, agent_id=agent_id, **arguments), sort_keys=True)
+
+
+class ContractState:
+    def __init__(self, undo_depth: int = DEFAULT_UNDO_DEPTH, logger: Optional[logging.Logger] = None):
+        """
+        Initializes a state database for the registration, rewards and aggregation contracts, executed natively
+        as blocks are appended instead of replaying the ledger for every query. Contract calls are JSON
+        transactions built with contract_call; other transactions are ignored. State changes of recent blocks are
+        recorded so that reorganisations roll the state back instead of rebuilding it.
+        :param undo_depth: Number of recent blocks that can be rolled back without a rebuild from genesis.
+        :param logger: Logger instance to log state transitions.
+        """
+        self.undo_depth = undo_depth
+        self.logger = logger or logging.getLogger(__name__)
+        self._tables: Dict[str, Dict[str, Any]] = {table: {} for table in STATE_TABLES}
+        self._hashes: List[str] = []
+        self._undo: Deque[List[Tuple[str, str, Any]]] = deque(maxlen=undo_depth)
+        self._base: Optional[Tuple[int, str]] = None  # (height, encoded tables) of the latest state checkpoint
+        self.reverted = 0
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def reset(self):
+        """
+        Clears the state, e.g. before a rebuild from genesis. If a state checkpoint was set as the base,
+        the state is reset to the checkpoint instead, since older block bodies may have been pruned.
+        """
+        if self._base is not None:
+            height, tables = self._base
+            self._tables = json.loads(tables)
+            del self._hashes[height + 1:]
+        else:
+            self._tables = {table: {} for table in STATE_TABLES}
+            self._hashes = []
+        self._undo.clear()
+
+    def export_tables(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns a copy of the state tables, e.g. to embed them in a state checkpoint.
+        """
+        return json.loads(json.dumps(self._tables))
+
+    @staticmethod
+    def tables_root(tables: Dict[str, Dict[str, Any]]) -> str:
+        """
+        Computes the state root of exported state tables.
+        """
+        return hashlib.sha256(json.dumps(tables, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+    def set_base(self, height: int, tables: Dict[str, Dict[str, Any]]):
+        """
+        Records the state at a checkpoint height as the base that rebuilds start from.
+        :param height: The checkpoint height.
+        :param tables: The state tables at that height.
+        """
+        self._base = (height, json.dumps(tables))
+
+    def restore(self, tables: Dict[str, Dict[str, Any]], chain: List[Block]):
+        """
+        Restores the state from a checkpoint instead of applying every block from genesis.
+        :param tables: The state tables at the checkpoint.
+        :param chain: The chain up to and including the checkpoint block; only the headers are used.
+        """
+        if set(tables) != set(STATE_TABLES):
+            raise ValueError("State tables do not match the contract state.")
+        self.set_base(len(chain) - 1, tables)
+        self._hashes = [block.hash for block in chain]
+        self.reset()
+        self.logger.info(f"Contract state restored from the checkpoint at height {len(chain) - 1}.")
+
+    def is_agent_registered(self, agent_address: str) -> bool:
+        """
+        Mirrors RegistrationContract.isAgentRegistered.
+        """
+        return agent_address in self._tables["agents"]
+
+    def get_agent_details(self, agent_address: str) -> Optional[Dict[str, Any]]:
+        """
+        Mirrors RegistrationContract.getAgentDetails.
+        :return: The agent's address, name, registration timestamp and status, or None if it is not registered.
+        """
+        agent = self._tables["agents"].get(agent_address)
+        return dict(agent) if agent is not None else None
+
+    def get_reward_balance(self, agent: str) -> int:
+        """
+        Mirrors RewardContract.getRewardBalance.
+        """
+        return self._tables["rewards"].get(agent, 0)
+
+    def get_withdrawn_rewards(self, agent: str) -> int:
+        """
+        Returns the total rewards withdrawn by an agent.
+        """
+        return self._tables["withdrawn"].get(agent, 0)
+
+    def get_contribution(self, agent: str) -> Optional[Dict[str, Any]]:
+        """
+        Mirrors AggregationContract.getContribution.
+        :return: The timestamp, model hash and weight of the agent's latest contribution, or None.
+        """
+        contribution = self._tables["contributions"].get(agent)
+        return dict(contribution) if contribution is not None else None
+
+    def _set(self, changes: List[Tuple[str, str, Any]], table: str, key: str, value: Any):
+        """
+        Writes a state entry and records its previous value in the block's undo log.
+        """
+        changes.append((table, key, self._tables[table].get(key, _MISSING)))
+        self._tables[table][key] = value
+
+    def _execute(self, call: Dict[str, Any], timestamp: float, changes: List[Tuple[str, str, Any]]):
+        """
+        Executes one contract call with the semantics of the Solidity contracts.
+        """
+        contract, method, sender = call.get("contract"), call.get("method"), call.get("agent_id")
+        if not sender:
+            raise ContractRevert("Invalid sender address.")
+
+        if contract == REGISTRATION_CONTRACT and method == "registerAgent":
+            if sender in self._tables["agents"]:
+                raise ContractRevert("Agent is already registered.")
+            self._set(changes, "agents", sender, {"agent_address": sender, "agent_name": str(call.get("agent_name", "")),
+                                                   "registration_timestamp": timestamp, "is_registered": True})
+        elif contract == REWARDS_CONTRACT and method == "distributeReward":
+            agent, amount = call.get("agent"), call.get("reward_amount")
+            if not agent:
+                raise ContractRevert("Invalid agent address.")
+            if not isinstance(amount, int) or amount <= 0:
+                raise ContractRevert("Reward amount must be greater than zero.")
+            self._set(changes, "rewards", agent, self.get_reward_balance(agent) + amount)
+        elif contract == REWARDS_CONTRACT and method == "withdrawReward":
+            amount = self.get_reward_balance(sender)
+            if amount <= 0:
+                raise ContractRevert("No rewards available for withdrawal.")
+            self._set(changes, "rewards", sender, 0)
+            self._set(changes, "withdrawn", sender, self.get_withdrawn_rewards(sender) + amount)
+        elif contract == AGGREGATION_CONTRACT and method == "addContribution":
+            self._set(changes, "contributions", sender, {"timestamp": timestamp, "model_hash": str(call.get("model_hash", "")),
+                                                          "weight": call.get("weight", 0)})
+        else:
+            raise ContractRevert(f"Unknown contract method {contract}.{method}.")
+
+    def apply_block(self, block: Block):
+        """
+        Applies the contract calls of a block appended to the chain. A reverted call leaves the state unchanged
+        and does not affect the other calls of the block.
+        :param block: The block, which must be at the height following the applied blocks.
+        """
+        if block.index != len(self._hashes):
+            raise ValueError(f"Block {block.index} does not extend the contract state at height {len(self._hashes)}.")
+        changes: List[Tuple[str, str, Any]] = []
+        for transaction in block.transactions or [block.data]:
+            if not isinstance(transaction, str) or not transaction.startswith("{"):
+                continue
+            try:
+                call = json.loads(transaction)
+            except ValueError:
+                continue
+            if not isinstance(call, dict) or "contract" not in call:
+                continue
+            checkpoint = len(changes)
+            try:
+                self._execute(call, float(block.timestamp), changes)
+            except ContractRevert as revert:
+                self._rollback(changes, checkpoint)
+                self.reverted += 1
+                self.logger.debug(f"Contract call reverted at height {block.index}: {revert}")
+        self._hashes.append(block.hash)
+        self._undo.append(changes)
+
+    def _rollback(self, changes: List[Tuple[str, str, Any]], checkpoint: int = 0):
+        """
+        Restores the previous values recorded after a position of an undo log, newest first.
+        """
+        while len(changes) > checkpoint:
+            table, key, previous = changes.pop()
+            if previous is _MISSING:
+                del self._tables[table][key]
+            else:
+                self._tables[table][key] = previous
+
+    def truncate(self, height: int) -> bool:
+        """
+        Rolls the state back to before a height, e.g. after a reorganisation.
+        :param height: The first height to roll back.
+        :return: True if the state was rolled back, False if the height is deeper than the undo logs reach.
+        """
+        height = max(height, 0)
+        if len(self._hashes) - height > len(self._undo):
+            return False
+        while len(self._hashes) > height:
+            self._rollback(self._undo.pop())
+            self._hashes.pop()
+        return True
+
+    def sync(self, chain: List[Block]) -> int:
+        """
+        Brings the state in line with a chain: the blocks above the last block shared with the chain are rolled back
+        and the chain's remaining blocks are applied. If the fork is deeper than the undo logs, or the applied blocks
+        are not on the chain, the state is rebuilt from genesis.
+        :param chain: The current chain.
+        :return: The number of blocks applied.
+        """
+        low, high = 0, min(len(self._hashes), len(chain))
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self._hashes[middle - 1] == chain[middle - 1].hash:
+                low = middle
+            else:
+                high = middle - 1
+        if low < len(self._hashes) and not self.truncate(low):
+            self.logger.warning(f"Reorganisation at height {low} is deeper than the undo logs, rebuilding the contract state.")
+            self.reset()
+            low = len(self._hashes)
+            if low > 0 and (low > len(chain) or chain[low - 1].hash != self._hashes[-1]):
+                raise ValueError("The chain no longer contains the state checkpoint, the contract state cannot be rebuilt.")
+        for block in chain[low:]:
+            self.apply_block(block)
+        return len(chain) - low
+
+    def state_root(self) -> str:
+        """
+        Computes a digest of the whole contract state, equal on every node that applied the same blocks.
+        :return: The SHA-256 hex digest of the canonical state encoding.
+        """
+        return self.tables_root(self._tables)
+
+    def save(self, path: str):
+        """
+        Persists a snapshot of the state atomically. Undo logs are not persisted, so a reorganisation below the
+        snapshot height after a restart rebuilds the state from genesis.
+        :param path: Path of the snapshot file.
+        """
+        state = {
+            "hashes": self._hashes,
+            "tables": self._tables,
+            "state_root": self.state_root(),
+        }
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as state_file:
+            json.dump(state, state_file)
+            state_file.flush()
+            os.fsync(state_file.fileno())
+        os.replace(tmp_path, path)
+        self.logger.info(f"Contract state saved at height {len(self._hashes) - 1}.")
+
+    def load(self, path: str) -> bool:
+        """
+        Loads a snapshot persisted by save. Call sync afterwards to apply the blocks appended since the snapshot.
+        :param path: Path of the snapshot file.
+        :return: True if the snapshot was loaded, False otherwise.
+        """
+        if not os.path.exists(path):
+            return False
+        try:
+            with open(path, "r") as state_file:
+                state = json.load(state_file)
+        except ValueError:
+            self.logger.warning("Contract state file is corrupt, ignoring it.")
+            return False
+        if set(state["tables"]) != set(STATE_TABLES):
+            self.logger.warning("Contract state file has other tables, ignoring it.")
+            return False
+
+        self._tables = state["tables"]
+        if self.state_root() != state["state_root"]:
+            self.reset()
+            self.logger.warning("Contract state file does not match its state root, ignoring it.")
+            return False
+        self._hashes = state["hashes"]
+        self._undo.clear()
+        self.logger.info(f"Contract state loaded at height {len(self._hashes) - 1}.")
+        return True
+
+# Example usage
+if __name__ == "__main__":
+    from core.ledger.blockchain import Blockchain
+
+    contract_state = ContractState()
+    blockchain = Blockchain(difficulty=2, contract_state=contract_state)
+    blockchain.add_transactions([
+        contract_call(REGISTRATION_CONTRACT, "registerAgent", "agent1", agent_name="Agent One"),
+        contract_call(AGGREGATION_CONTRACT, "addContribution", "agent1", model_hash="ab12", weight=3),
+        contract_call(REWARDS_CONTRACT, "distributeReward", "orchestrator", agent="agent1", reward_amount=10),
+    ])
+    state = blockchain.get_contract_state()
+    print(f"agent1 registered: {state.is_agent_registered('agent1')}, reward balance: {state.get_reward_balance('agent1')}")
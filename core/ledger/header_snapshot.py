@@ -0,0 +1,102 @@
+import hashlib
+import json
+import logging
+import os
+import struct
+from typing import List, Optional
+from core.ledger.block import Block, LazyBlock, hash_to_bytes
+from core.ledger.block_store import BlockStore
+
+# One fixed-width record per block: index, previous hash, timestamp, data digest, nonce, block hash
+HEADER_RECORD = struct.Struct(">Q32sd32sQ32s")
+
+
+class HeaderSnapshot:
+    def __init__(self, path: str, logger: Optional[logging.Logger] = None):
+        """
+        Initializes a snapshot of block headers and their trusted hashes, used to restart a node without
+        parsing and rehashing every block.
+        :param path: Path of the snapshot file.
+        :param logger: Logger instance to log snapshot activities.
+        """
+        self.path = path
+        self.logger = logger or logging.getLogger(__name__)
+
+    def write(self, chain: List[Block]):
+        """
+        Writes the headers of the chain to the snapshot file atomically.
+        :param chain: The blocks whose headers are written.
+        """
+        previous_hash_overrides = {}
+        signatures = {}
+        records = []
+        for block in chain:
+            if hash_to_bytes(block.previous_hash).hex() != block.previous_hash:
+                previous_hash_overrides[str(block.index)] = block.previous_hash
+            if block.signature:
+                signatures[str(block.index)] = block.signature
+            records.append(HEADER_RECORD.pack(
+                block.index,
+                hash_to_bytes(block.previous_hash),
+                float(block.timestamp),
+                block.data_digest,
+                block.nonce,
+                hash_to_bytes(block.hash),
+            ))
+        body = b"".join(records)
+        metadata = {
+            "height": len(chain),
+            "checksum": hashlib.sha256(body).hexdigest(),
+            "previous_hash_overrides": previous_hash_overrides,
+            "signatures": signatures,
+        }
+
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as snapshot_file:
+            snapshot_file.write(json.dumps(metadata).encode() + b"\n")
+            snapshot_file.write(body)
+            snapshot_file.flush()
+            os.fsync(snapshot_file.fileno())
+        os.replace(tmp_path, self.path)
+        self.logger.info(f"Header snapshot written with {len(chain)} headers.")
+
+    def load(self, block_store: BlockStore) -> List[Block]:
+        """
+        Loads the snapshot headers as lazily loaded blocks whose data is read from the block store on access.
+        The snapshot is ignored if it is missing, corrupt, or no longer matches the block store.
+        :param block_store: The block store holding the block bodies.
+        :return: The blocks covered by the snapshot, or an empty list if the snapshot cannot be used.
+        """
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, "rb") as snapshot_file:
+            metadata = json.loads(snapshot_file.readline())
+            body = snapshot_file.read()
+
+        height = metadata["height"]
+        if len(body) != height * HEADER_RECORD.size or hashlib.sha256(body).hexdigest() != metadata["checksum"]:
+            self.logger.warning("Header snapshot is corrupt, ignoring it.")
+            return []
+        if height == 0:
+            return []
+
+        overrides = metadata["previous_hash_overrides"]
+        signatures = metadata.get("signatures", {})
+        load_data = block_store.read_data
+        chain = []
+        for index, previous_hash, timestamp, digest, nonce, block_hash in HEADER_RECORD.iter_unpack(body):
+            chain.append(LazyBlock(
+                index=index,
+                previous_hash=overrides.get(str(index)) or previous_hash.hex(),
+                timestamp=timestamp,
+                data_digest=digest,
+                nonce=nonce,
+                block_hash=block_hash.hex(),
+                load_data=load_data,
+                signature=signatures.get(str(index)),
+            ))
+
+        if not block_store.matches(height - 1, chain[-1].hash):
+            self.logger.warning("Header snapshot does not match the block store, ignoring it.")
+            return []
+        return chain
@@ -0,0 +1,187 @@
+import json
+import logging
+import os
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from core.ledger.block import Block
+
+# Fields of JSON transactions indexed by default
+DEFAULT_INDEX_FIELDS = ["agent_id", "model_hash"]
+
+
+class LedgerIndex:
+    def __init__(self, fields: Optional[List[str]] = None,
+                 extractors: Optional[Dict[str, Callable[[Any], Iterable[str]]]] = None,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Initializes the ledger indexes: block hash to height, plus secondary indexes mapping values found in
+        block data to the transactions holding them. Secondary indexes are built over fields of JSON-object
+        transactions and over custom extractor functions.
+        :param fields: Names of the JSON fields to index; each becomes an index of the same name.
+        :param extractors: Mapping of index names to functions returning the keys of one transaction.
+        :param logger: Logger instance to log indexing activities.
+        """
+        self.fields = list(DEFAULT_INDEX_FIELDS if fields is None else fields)
+        self.extractors = dict(extractors or {})
+        self.logger = logger or logging.getLogger(__name__)
+        self._hashes: List[str] = []
+        self._heights: Dict[str, int] = {}
+        self._postings: Dict[str, Dict[str, List[Tuple[int, int]]]] = {name: {} for name in self.index_names()}
+        self._height_keys: List[List[Tuple[str, str, int]]] = []  # (index name, key, position) per height
+
+    def index_names(self) -> List[str]:
+        """
+        Returns the names of the secondary indexes.
+        """
+        return self.fields + sorted(self.extractors)
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def _keys(self, transaction: Any) -> List[Tuple[str, str]]:
+        """
+        Extracts the (index name, key) pairs of one transaction.
+        """
+        keys = []
+        if self.fields and isinstance(transaction, str) and transaction.startswith("{"):
+            try:
+                document = json.loads(transaction)
+            except ValueError:
+                document = None
+            if isinstance(document, dict):
+                for field in self.fields:
+                    if field not in document:
+                        continue
+                    values = document[field] if isinstance(document[field], list) else [document[field]]
+                    keys.extend((field, str(value)) for value in values)
+        for name in sorted(self.extractors):
+            keys.extend((name, str(key)) for key in self.extractors[name](transaction))
+        return keys
+
+    def add_block(self, block: Block):
+        """
+        Indexes a block appended to the chain.
+        :param block: The block, which must be at the height following the indexed blocks.
+        """
+        if block.index != len(self._hashes):
+            raise ValueError(f"Block {block.index} does not extend the index at height {len(self._hashes)}.")
+        transactions = block.transactions or [block.data]
+        height_keys = []
+        for position, transaction in enumerate(transactions):
+            for name, key in self._keys(transaction):
+                self._postings[name].setdefault(key, []).append((block.index, position))
+                height_keys.append((name, key, position))
+        self._hashes.append(block.hash)
+        self._heights[block.hash] = block.index
+        self._height_keys.append(height_keys)
+
+    def truncate(self, height: int):
+        """
+        Removes the blocks at and above a height from every index, e.g. after a reorganisation.
+        Postings are appended in height order, so the ones to remove are always at the end of their lists.
+        :param height: The first height to remove.
+        """
+        while len(self._hashes) > max(height, 0):
+            for name, key, _ in reversed(self._height_keys.pop()):
+                postings = self._postings[name][key]
+                postings.pop()
+                if not postings:
+                    del self._postings[name][key]
+            del self._heights[self._hashes.pop()]
+
+    def sync(self, chain: List[Block]) -> int:
+        """
+        Brings the indexes in line with a chain: the indexed blocks above the last block shared with the chain
+        are removed and the chain's remaining blocks are added.
+        :param chain: The current chain.
+        :return: The number of blocks added to the index.
+        """
+        low, high = 0, min(len(self._hashes), len(chain))
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self._hashes[middle - 1] == chain[middle - 1].hash:
+                low = middle
+            else:
+                high = middle - 1
+        if low < len(self._hashes):
+            self.truncate(low)
+        for block in chain[low:]:
+            self.add_block(block)
+        return len(chain) - low
+
+    def height_of(self, block_hash: str) -> Optional[int]:
+        """
+        Looks up the height of a block by its hash.
+        :param block_hash: The block hash.
+        :return: The height, or None if the block is not indexed.
+        """
+        return self._heights.get(block_hash)
+
+    def lookup(self, name: str, key: str) -> List[Tuple[int, int]]:
+        """
+        Looks up the transactions holding a key in a secondary index.
+        :param name: The index name, e.g. "agent_id".
+        :param key: The value to look up.
+        :return: A list of (height, position in block) pairs in chain order.
+        """
+        if name not in self._postings:
+            raise KeyError(f"No secondary index named {name}.")
+        return list(self._postings[name].get(key, []))
+
+    def save(self, path: str):
+        """
+        Persists the indexes to a file atomically.
+        :param path: Path of the index file.
+        """
+        state = {
+            "index_names": self.index_names(),
+            "hashes": self._hashes,
+            "height_keys": self._height_keys,
+        }
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as index_file:
+            json.dump(state, index_file)
+            index_file.flush()
+            os.fsync(index_file.fileno())
+        os.replace(tmp_path, path)
+        self.logger.info(f"Ledger index saved with {len(self._hashes)} blocks.")
+
+    def load(self, path: str) -> bool:
+        """
+        Loads indexes persisted by save. Indexes built with different index names are ignored.
+        Call sync afterwards to index blocks appended since the indexes were saved.
+        :param path: Path of the index file.
+        :return: True if the indexes were loaded, False otherwise.
+        """
+        if not os.path.exists(path):
+            return False
+        try:
+            with open(path, "r") as index_file:
+                state = json.load(index_file)
+        except ValueError:
+            self.logger.warning("Ledger index file is corrupt, ignoring it.")
+            return False
+        if state["index_names"] != self.index_names() or len(state["hashes"]) != len(state["height_keys"]):
+            self.logger.warning("Ledger index file was built with other indexes, ignoring it.")
+            return False
+
+        self._hashes = state["hashes"]
+        self._heights = {block_hash: height for height, block_hash in enumerate(self._hashes)}
+        self._height_keys = [[(name, key, position) for name, key, position in height_keys]
+                             for height_keys in state["height_keys"]]
+        self._postings = {name: {} for name in self.index_names()}
+        for height, height_keys in enumerate(self._height_keys):
+            for name, key, position in height_keys:
+                self._postings[name].setdefault(key, []).append((height, position))
+        self.logger.info(f"Ledger index loaded with {len(self._hashes)} blocks.")
+        return True
+
+# Example usage
+if __name__ == "__main__":
+    from core.ledger.blockchain import Blockchain
+
+    ledger_index = LedgerIndex()
+    blockchain = Blockchain(difficulty=2, ledger_index=ledger_index)
+    blockchain.add_transactions([json.dumps({"agent_id": "agent1", "reward": 10}), json.dumps({"agent_id": "agent2", "reward": 5})])
+    blockchain.add_transactions([json.dumps({"agent_id": "agent1", "model_hash": "ab12"})])
+    print(f"Transactions of agent1: {blockchain.find_transactions('agent_id', 'agent1')}")
+    print(f"Block 2 found by hash: {blockchain.get_block_by_hash(blockchain.chain[2].hash).index}")
@@ -0,0 +1,268 @@
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from core.ledger.block import Block
+from core.ledger.blockchain import Blockchain
+
+PENDING = "pending"
+CONFIRMED = "confirmed"
+UNKNOWN = "unknown"
+
+
+class Mempool:
+    def __init__(self, max_size: int = 100000, max_history: int = 100000, logger: Optional[logging.Logger] = None):
+        """
+        Initializes a thread-safe pool of transactions waiting to be sealed into a block.
+        :param max_size: Maximum number of pending transactions.
+        :param max_history: Number of confirmed transactions whose status is remembered.
+        :param logger: Logger instance to log mempool activities.
+        """
+        self.max_size = max_size
+        self.max_history = max_history
+        self.logger = logger or logging.getLogger(__name__)
+        self._pending = deque()
+        self._statuses: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._condition = threading.Condition()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def submit(self, transaction: str) -> str:
+        """
+        Adds a transaction to the pool without waiting for it to be mined.
+        :param transaction: The transaction string.
+        :return: The transaction id used to query its status.
+        """
+        with self._condition:
+            if len(self._pending) >= self.max_size:
+                raise RuntimeError("Mempool is full.")
+            transaction_id = uuid.uuid4().hex
+            self._pending.append((transaction_id, transaction, time.monotonic()))
+            self._statuses[transaction_id] = {"transaction_id": transaction_id, "status": PENDING}
+            self._condition.notify_all()
+        return transaction_id
+
+    def wait_for_batch(self, max_count: int, max_delay: float, timeout: Optional[float] = None) -> List[Tuple[str, str]]:
+        """
+        Waits until a batch is ready and removes it from the pool. A batch is ready when max_count transactions
+        are pending or when the oldest pending transaction has waited max_delay seconds.
+        :param max_count: Maximum number of transactions in the batch.
+        :param max_delay: Maximum time in seconds a transaction waits before a partial batch is sealed.
+        :param timeout: Maximum time in seconds to wait for a batch; an empty list is returned if it expires.
+        :return: A list of (transaction id, transaction) pairs.
+        """
+        wait_until = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                if len(self._pending) >= max_count or (self._pending and now >= self._pending[0][2] + max_delay):
+                    count = min(max_count, len(self._pending))
+                    return [self._pending.popleft()[:2] for _ in range(count)]
+                if wait_until is not None and now >= wait_until:
+                    return []
+                deadlines = [] if wait_until is None else [wait_until]
+                if self._pending:
+                    deadlines.append(self._pending[0][2] + max_delay)
+                self._condition.wait(min(deadlines) - now if deadlines else None)
+
+    def requeue(self, batch: List[Tuple[str, str]]):
+        """
+        Puts a batch that could not be sealed, or whose block was dropped from the chain, back at the front of the
+        pool, keeping its order. Transactions confirmed in a dropped block are pending again.
+        :param batch: The (transaction id, transaction) pairs returned by wait_for_batch.
+        """
+        now = time.monotonic()
+        with self._condition:
+            for transaction_id, transaction in reversed(batch):
+                self._pending.appendleft((transaction_id, transaction, now))
+                self._statuses[transaction_id] = {"transaction_id": transaction_id, "status": PENDING}
+                self._statuses.move_to_end(transaction_id)
+            self._condition.notify_all()
+
+    def confirm(self, batch: List[Tuple[str, str]], block: Block):
+        """
+        Marks the transactions of a batch as confirmed in a block and wakes up waiting clients.
+        :param batch: The (transaction id, transaction) pairs sealed into the block.
+        :param block: The block holding the transactions.
+        """
+        with self._condition:
+            for position, (transaction_id, _) in enumerate(batch):
+                self._statuses[transaction_id] = {
+                    "transaction_id": transaction_id,
+                    "status": CONFIRMED,
+                    "height": block.index,
+                    "block_hash": block.hash,
+                    "position": position,
+                }
+                self._statuses.move_to_end(transaction_id)
+            # Forget the oldest confirmations; pending transactions are never evicted
+            while len(self._statuses) > self.max_history + len(self._pending):
+                oldest_id, oldest_status = next(iter(self._statuses.items()))
+                if oldest_status["status"] == PENDING:
+                    break
+                del self._statuses[oldest_id]
+            self._condition.notify_all()
+
+    def status(self, transaction_id: str) -> Dict[str, Any]:
+        """
+        Retrieves the status of a transaction.
+        :param transaction_id: The id returned by submit.
+        :return: A dictionary with the status and, once confirmed, the block height, block hash and position.
+        """
+        with self._condition:
+            status = self._statuses.get(transaction_id)
+            return dict(status) if status is not None else {"transaction_id": transaction_id, "status": UNKNOWN}
+
+    def wait_for_confirmation(self, transaction_id: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Waits until a transaction is confirmed in a block.
+        :param transaction_id: The id returned by submit.
+        :param timeout: Maximum time in seconds to wait.
+        :return: The status of the transaction, which is still pending if the timeout expired.
+        """
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self._statuses.get(transaction_id, {"status": UNKNOWN})["status"] != PENDING, timeout)
+        return self.status(transaction_id)
+
+    def notify(self):
+        """
+        Wakes up every thread waiting on the pool, e.g. so that a stopping assembler notices.
+        """
+        with self._condition:
+            self._condition.notify_all()
+
+
+class BlockAssembler:
+    def __init__(self, blockchain: Blockchain, mempool: Optional[Mempool] = None, max_block_transactions: int = 256,
+                 max_block_delay: float = 1.0, on_block: Optional[Callable[[Block], None]] = None,
+                 reorg_depth: int = 64, logger: Optional[logging.Logger] = None):
+        """
+        Initializes a background assembler that seals pending transactions into mined blocks.
+        Submitting a transaction only enqueues it, so callers never wait for proof of work.
+        :param blockchain: The blockchain that sealed blocks are added to.
+        :param mempool: The pool of pending transactions; a new one is created if omitted.
+        :param max_block_transactions: A block is sealed as soon as this many transactions are pending.
+        :param max_block_delay: A partial block is sealed once its oldest transaction has waited this many seconds.
+                                It is also how long the assembler backs off after a batch could not be sealed.
+        :param on_block: Optional callback invoked with each sealed block, e.g. to persist the chain.
+        :param reorg_depth: Number of recently sealed blocks watched for being dropped by a switch to a fork.
+                            Transactions of a dropped block deeper than this stay confirmed.
+        :param logger: Logger instance to log assembler activities.
+        """
+        self.blockchain = blockchain
+        self.mempool = mempool or Mempool()
+        self.max_block_transactions = max_block_transactions
+        self.max_block_delay = max_block_delay
+        self.on_block = on_block
+        self.logger = logger or logging.getLogger(__name__)
+        self.is_running = False
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._sealed: "deque[Tuple[Block, List[Tuple[str, str]]]]" = deque(maxlen=reorg_depth)
+
+    def start(self):
+        """
+        Starts sealing blocks in a background thread. Calling start on a running assembler has no effect.
+        """
+        with self._lock:
+            if self.is_running:
+                return
+            self.is_running = True
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self.run, daemon=True)
+            self._thread.start()
+        self.logger.info("Block assembler started.")
+
+    def stop(self):
+        """
+        Stops the background thread after the block being sealed, if any, is finished.
+        """
+        with self._lock:
+            if not self.is_running:
+                return
+            self.is_running = False
+            self._stop_event.set()
+        self.mempool.notify()
+        self._thread.join()
+        self.logger.info("Block assembler stopped.")
+
+    def submit(self, transaction: str) -> str:
+        """
+        Enqueues a transaction, starting the assembler if needed.
+        :param transaction: The transaction string.
+        :return: The transaction id.
+        """
+        transaction_id = self.mempool.submit(transaction)
+        self.start()
+        return transaction_id
+
+    def run(self):
+        """
+        Seals batches of pending transactions until the assembler is stopped. In Proof of Authority mode batches
+        are only taken while the local authority is the proposer of the next block. After a batch could not be
+        sealed the assembler waits max_block_delay, since the requeued batch is ready again at once.
+        """
+        while self.is_running:
+            self.requeue_dropped()
+            authority = self.blockchain.authority
+            if authority is not None and not authority.is_proposer(self.blockchain.get_last_block().index + 1):
+                self._stop_event.wait(self.max_block_delay)
+                continue
+            batch = self.mempool.wait_for_batch(self.max_block_transactions, self.max_block_delay, timeout=self.max_block_delay)
+            if batch and self.seal_block(batch) is None:
+                self._stop_event.wait(self.max_block_delay)
+
+    def seal_block(self, batch: List[Tuple[str, str]]) -> Optional[Block]:
+        """
+        Mines a block holding a batch of transactions. If mining is cancelled or fails, or another block
+        wins the race, the batch is put back in the pool for the next block.
+        :param batch: The (transaction id, transaction) pairs to seal.
+        :return: The sealed block, or None if the batch was requeued.
+        """
+        try:
+            block = self.blockchain.add_transactions([transaction for _, transaction in batch])
+        except Exception:
+            self.logger.exception(f"Sealing a block with {len(batch)} transactions failed, requeuing them.")
+            block = None
+        if block is None:
+            self.mempool.requeue(batch)
+            return None
+        self._sealed.append((block, batch))
+        self.mempool.confirm(batch, block)
+        self.logger.info(f"Sealed block {block.index} with {len(batch)} transactions.")
+        if self.on_block is not None:
+            self.on_block(block)
+        return block
+
+    def requeue_dropped(self) -> int:
+        """
+        Puts the transactions of recently sealed blocks that are no longer on the chain, e.g. after consensus
+        switched to a peer's fork, back in the pool as pending.
+        :return: The number of requeued transactions.
+        """
+        chain = self.blockchain.chain
+        kept, dropped = deque(maxlen=self._sealed.maxlen), []
+        for block, batch in self._sealed:
+            if block.index < len(chain) and chain[block.index].hash == block.hash:
+                kept.append((block, batch))
+            else:
+                dropped.extend(batch)
+        if not dropped:
+            return 0
+        self._sealed = kept
+        self.mempool.requeue(dropped)
+        self.logger.warning(f"Requeued {len(dropped)} transactions of blocks dropped from the chain.")
+        return len(dropped)
+
+# Example usage
+if __name__ == "__main__":
+    assembler = BlockAssembler(Blockchain(), max_block_transactions=3, max_block_delay=0.5)
+    transaction_ids = [assembler.submit(f"agent{i}:reward:{i}") for i in range(5)]
+    for transaction_id in transaction_ids:
+        print(assembler.mempool.wait_for_confirmation(transaction_id, timeout=30))
+    assembler.stop()
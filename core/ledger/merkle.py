@@ -0,0 +1,93 @@
+import hashlib
+from typing import List, Tuple
+
+# Leaves and interior nodes are hashed with different prefixes so a leaf can never be passed off as a subtree
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+
+
+def hash_leaf(transaction: str) -> bytes:
+    """
+    Hashes a transaction into a Merkle leaf.
+    :param transaction: The transaction string.
+    :return: The 32-byte leaf hash.
+    """
+    return hashlib.sha256(LEAF_PREFIX + transaction.encode()).digest()
+
+
+def hash_node(left: bytes, right: bytes) -> bytes:
+    """
+    Hashes two child hashes into their parent node.
+    :param left: The left child hash.
+    :param right: The right child hash.
+    :return: The 32-byte parent hash.
+    """
+    return hashlib.sha256(NODE_PREFIX + left + right).digest()
+
+
+def _next_level(level: List[bytes]) -> List[bytes]:
+    """
+    Builds the level above the given one. An odd node at the end of a level is promoted unchanged,
+    so that no two different transaction lists share a root.
+    """
+    parents = [hash_node(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+    if len(level) % 2:
+        parents.append(level[-1])
+    return parents
+
+
+def merkle_root(transactions: List[str]) -> bytes:
+    """
+    Computes the Merkle root of a list of transactions.
+    :param transactions: The transactions, in block order.
+    :return: The 32-byte Merkle root.
+    """
+    if not transactions:
+        raise ValueError("Cannot compute the Merkle root of an empty transaction list.")
+    level = [hash_leaf(transaction) for transaction in transactions]
+    while len(level) > 1:
+        level = _next_level(level)
+    return level[0]
+
+
+def merkle_proof(transactions: List[str], position: int) -> List[Tuple[str, str]]:
+    """
+    Builds the inclusion proof of one transaction: the sibling hashes on the path from its leaf to the root.
+    :param transactions: The transactions, in block order.
+    :param position: The position of the transaction to prove.
+    :return: A list of (side, sibling hash hex) pairs from the leaf upwards, where side is "left" or "right".
+    """
+    if not 0 <= position < len(transactions):
+        raise IndexError(f"Transaction position {position} is out of range.")
+    level = [hash_leaf(transaction) for transaction in transactions]
+    proof = []
+    while len(level) > 1:
+        sibling = position ^ 1
+        if sibling < len(level):
+            proof.append(("left" if sibling < position else "right", level[sibling].hex()))
+        level = _next_level(level)
+        position //= 2
+    return proof
+
+
+def verify_merkle_proof(transaction: str, proof: List[Tuple[str, str]], root: bytes) -> bool:
+    """
+    Checks that a transaction is included under a Merkle root.
+    :param transaction: The transaction string.
+    :param proof: The inclusion proof returned by merkle_proof.
+    :param root: The expected 32-byte Merkle root.
+    :return: True if the proof leads from the transaction to the root, False otherwise.
+    """
+    node = hash_leaf(transaction)
+    for side, sibling_hex in proof:
+        sibling = bytes.fromhex(sibling_hex)
+        node = hash_node(sibling, node) if side == "left" else hash_node(node, sibling)
+    return node == root
+
+# Example usage
+if __name__ == "__main__":
+    transactions = ["agent1:contribution:0.8", "agent2:model:ab12", "agent3:reward:10"]
+    root = merkle_root(transactions)
+    proof = merkle_proof(transactions, 1)
+    print(f"Merkle root: {root.hex()}")
+    print(f"Proof for transaction 1 valid: {verify_merkle_proof(transactions[1], proof, root)}")
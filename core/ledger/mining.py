@@ -0,0 +1,186 @@
+import hashlib
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Dict, Optional
+from core.ledger.block import Block, pack_nonce
+
+# Largest nonce the gRPC Block message can carry (int32 field)
+MAX_NONCE = 2 ** 31 - 1
+
+# Number of hashes a worker computes between checks of the shared stop flag
+STOP_CHECK_INTERVAL = 4096
+
+_stop_event = None
+
+
+def _init_worker(stop_event):
+    """
+    Stores the shared stop flag in each worker process of the mining pool.
+    :param stop_event: multiprocessing.Event shared by every worker of the pool.
+    """
+    global _stop_event
+    _stop_event = stop_event
+
+
+def _search_nonces(header_prefix: bytes, prefix: str, start: int, stride: int, max_nonce: int) -> Dict[str, Any]:
+    """
+    Searches the nonces start, start + stride, start + 2 * stride, ... for a hash with the required prefix.
+    Runs inside a worker process and returns early once another worker has set the stop flag.
+    :param header_prefix: The binary block header without the nonce.
+    :param prefix: The required hash prefix (one "0" per difficulty level).
+    :param start: The first nonce tried by this worker.
+    :param stride: The distance between two nonces tried by this worker.
+    :param max_nonce: The largest nonce that may be tried.
+    :return: A dictionary with the winning nonce and hash (or None) and the number of hashes computed.
+    """
+    midstate = hashlib.sha256(header_prefix)
+    hashes = 0
+    nonce = start
+    while nonce <= max_nonce:
+        if hashes % STOP_CHECK_INTERVAL == 0 and _stop_event is not None and _stop_event.is_set():
+            break
+        sha = midstate.copy()
+        sha.update(pack_nonce(nonce))
+        block_hash = sha.hexdigest()
+        hashes += 1
+        if block_hash.startswith(prefix):
+            return {"nonce": nonce, "hash": block_hash, "hashes": hashes}
+        nonce += stride
+    return {"nonce": None, "hash": None, "hashes": hashes}
+
+
+class MiningEngine:
+    def __init__(self, workers: Optional[int] = None, max_nonce: int = MAX_NONCE, logger: Optional[logging.Logger] = None):
+        """
+        Initializes a multi-core proof of work engine backed by a process pool.
+        :param workers: Number of worker processes, defaults to the number of CPU cores.
+        :param max_nonce: The largest nonce tried before giving up on a block.
+        :param logger: Logger instance to log mining activities.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.max_nonce = max_nonce
+        self.logger = logger or logging.getLogger(__name__)
+        self._context = multiprocessing.get_context("spawn")
+        self._stop_event = self._context.Event()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._state_lock = threading.Lock()  # Guards the cancellation state without waiting for a running search
+        self._cancelled = False
+        self._mining_tip: Optional[str] = None  # Previous hash of the block being mined
+        self._cancelled_tip: Optional[str] = None  # Tip whose blocks are not mined any more
+        self.last_stats: Dict[str, Any] = {"hashes": 0, "elapsed": 0.0, "hash_rate": 0.0}
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """
+        Lazily starts the worker pool so the process start-up cost is paid once per engine.
+        :return: The process pool used for nonce searches.
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=self._context,
+                initializer=_init_worker,
+                initargs=(self._stop_event,),
+            )
+        return self._executor
+
+    def mine(self, block: Block, difficulty: int = 4) -> Optional[Block]:
+        """
+        Finds a nonce for the block by splitting the nonce space across all worker processes.
+        All workers stop as soon as one of them finds a valid hash or the search is cancelled. A block extending a
+        tip cancelled with cancel(previous_hash) is not mined at all, even if the cancel came before this call.
+        :param block: The block that needs proof of work.
+        :param difficulty: The number of leading zeros required in the block hash.
+        :return: The block with a valid nonce and hash, or None if mining was cancelled or the nonce space was exhausted.
+        """
+        prefix = "0" * difficulty
+        header_prefix = block.header_prefix()
+
+        with self._lock:
+            with self._state_lock:
+                if block.previous_hash == self._cancelled_tip:
+                    self.logger.info(f"Block {block.index} not mined, its tip {block.previous_hash} was cancelled.")
+                    return None
+                # Mining on another tip means the caller moved on, so the cancelled tip no longer matters
+                self._cancelled_tip = None
+                self._cancelled = False
+                self._mining_tip = block.previous_hash
+                self._stop_event.clear()
+            executor = self._get_executor()
+            start_time = time.perf_counter()
+            pending = {
+                executor.submit(_search_nonces, header_prefix, prefix, block.nonce + offset, self.workers, self.max_nonce)
+                for offset in range(self.workers)
+            }
+
+            result = None
+            hashes = 0
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    outcome = future.result()
+                    hashes += outcome["hashes"]
+                    if outcome["nonce"] is not None and result is None:
+                        result = outcome
+                        self._stop_event.set()
+            elapsed = time.perf_counter() - start_time
+            with self._state_lock:
+                cancelled = self._cancelled
+                self._mining_tip = None
+
+        self.last_stats = {
+            "hashes": hashes,
+            "elapsed": elapsed,
+            "hash_rate": hashes / elapsed if elapsed > 0 else 0.0,
+        }
+        self.logger.info(f"Mining finished after {hashes} hashes at {self.last_stats['hash_rate']:.0f} hashes/sec.")
+
+        if result is None or cancelled:
+            return None
+        block.nonce = result["nonce"]
+        block.hash = result["hash"]
+        return block
+
+    def cancel(self, previous_hash: Optional[str] = None):
+        """
+        Cancels mining, e.g. when a competing block arrives from a peer. Safe to call from any thread.
+        :param previous_hash: The tip the competing block extends. Every block extending it is abandoned, including
+                              one whose mine() call only starts after the cancel, until a block on another tip is mined.
+                              If None, only the block currently being mined is abandoned.
+        """
+        with self._state_lock:
+            if previous_hash is not None:
+                self._cancelled_tip = previous_hash
+            if previous_hash is None or previous_hash == self._mining_tip:
+                self._cancelled = True
+                self._stop_event.set()
+        self.logger.info("Mining cancelled.")
+
+    def hash_rate(self) -> float:
+        """
+        Reports the hash rate of the last mining run, useful for sizing miner hosts.
+        :return: The number of hashes per second achieved across all workers.
+        """
+        return self.last_stats["hash_rate"]
+
+    def shutdown(self):
+        """
+        Stops any running search and terminates the worker processes.
+        """
+        self._stop_event.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+# Example usage
+if __name__ == "__main__":
+    engine = MiningEngine()
+    block = Block(index=1, previous_hash="0", timestamp=time.time(), data="Parallel mining example")
+    mined_block = engine.mine(block, difficulty=5)
+    print(f"Mined block hash: {mined_block.hash}, nonce: {mined_block.nonce}")
+    print(f"Hash rate: {engine.hash_rate():.0f} hashes/sec using {engine.workers} workers")
+    engine.shutdown()
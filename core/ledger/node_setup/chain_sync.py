@@ -0,0 +1,194 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, List, Optional, Tuple
+from core.communication.grpc_client import BlockchainClient
+from core.ledger.block import Block
+
+
+class ChainSynchronizer:
+    def __init__(self, peer_addresses: Dict[str, str], timeout: float = 5.0, chunk_size: int = 500,
+                 header_window: int = 100, max_workers: int = 8, logger: Optional[logging.Logger] = None):
+        """
+        Initializes the synchronizer that downloads missing blocks from peers over gRPC.
+        Tips are fetched from all peers concurrently, headers are fetched from the peer with the best tip,
+        and the missing block range is downloaded in parallel chunks from every peer that has it.
+        :param peer_addresses: Mapping of peer node identifiers to gRPC addresses (e.g., "localhost:50051").
+        :param timeout: Per-peer timeout in seconds for each RPC.
+        :param chunk_size: Number of blocks requested from a peer in one call.
+        :param header_window: Number of recent local heights searched for the fork point before falling back to genesis.
+        :param max_workers: Maximum number of concurrent RPCs.
+        :param logger: Logger instance to log synchronization activities.
+        """
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self.header_window = header_window
+        self.logger = logger or logging.getLogger(__name__)
+        self.clients = {peer_id: BlockchainClient(address) for peer_id, address in peer_addresses.items()}
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def fetch_tips(self) -> Dict[str, Tuple[int, str]]:
+        """
+        Fetches the chain tip of every peer concurrently. Peers that fail or time out are left out.
+        :return: A mapping of peer identifiers to (height, hash) tuples.
+        """
+        futures = {self.executor.submit(client.get_tip, self.timeout): peer_id for peer_id, client in self.clients.items()}
+        done, _ = wait(futures, timeout=self.timeout * 2)
+        tips = {}
+        for future in done:
+            tip = future.result()
+            if tip is not None:
+                tips[futures[future]] = (tip.height, tip.hash)
+        return tips
+
+    @staticmethod
+    def _headers_valid(headers: List[Block], from_height: int, tip: Tuple[int, str]) -> bool:
+        """
+        Checks that headers cover the requested range, hash correctly, link together and end at the advertised tip.
+        """
+        tip_height, tip_hash = tip
+        if len(headers) != tip_height - from_height + 1 or headers[-1].hash != tip_hash:
+            return False
+        for position, header in enumerate(headers):
+            if header.index != from_height + position or header.hash != header.compute_hash():
+                return False
+            if position > 0 and header.previous_hash != headers[position - 1].hash:
+                return False
+        return True
+
+    def fetch_headers(self, peer_id: str, local_chain: List[Block], tip: Tuple[int, str]) -> Optional[Tuple[int, List[Block]]]:
+        """
+        Fetches and verifies the headers of a peer's chain above the fork point with the local chain.
+        :param peer_id: The peer to fetch headers from.
+        :param local_chain: The local chain.
+        :param tip: The (height, hash) tip advertised by the peer.
+        :return: A (fork height, headers after the fork point) tuple, or None if the peer failed or sent invalid headers.
+        """
+        client = self.clients[peer_id]
+        from_height = max(0, min(len(local_chain), tip[0]) - self.header_window)
+        while True:
+            headers = client.get_headers(from_height, tip[0], timeout=self.timeout)
+            if not headers or not self._headers_valid(headers, from_height, tip):
+                self.logger.warning(f"Peer {peer_id} returned invalid headers.")
+                return None
+
+            fork_height = -1
+            for height in range(min(len(local_chain), tip[0] + 1) - 1, from_height - 1, -1):
+                if local_chain[height].hash == headers[height - from_height].hash:
+                    fork_height = height
+                    break
+            if fork_height >= 0 or from_height == 0:
+                return fork_height, headers[fork_height + 1 - from_height:]
+            # The fork point is older than the header window, search the whole chain
+            from_height = 0
+
+    def _download_chunk(self, peer_id: str, headers: List[Block]) -> Optional[List[Block]]:
+        """
+        Downloads the blocks matching a run of verified headers from one peer.
+        :return: The blocks, or None if the peer failed or sent blocks that do not match the headers.
+        """
+        blocks = self.clients[peer_id].get_blocks(headers[0].index, headers[-1].index, timeout=self.timeout)
+        if blocks is None or len(blocks) != len(headers):
+            return None
+        for block, header in zip(blocks, headers):
+            if block.hash != header.hash:
+                self.logger.warning(f"Peer {peer_id} sent block {block.index} that does not match its header.")
+                return None
+        return blocks
+
+    def download_blocks(self, headers: List[Block], peer_ids: List[str]) -> Optional[List[Block]]:
+        """
+        Downloads the blocks for the given headers in parallel chunks spread over several peers.
+        A chunk that fails or times out on one peer is retried on the next one, so a slow peer cannot stall the sync.
+        :param headers: Verified headers of the blocks to download, in height order.
+        :param peer_ids: Peers that have the blocks, in order of preference.
+        :return: The downloaded blocks in height order, or None if some chunk could not be downloaded from any peer.
+        """
+        chunks = [headers[start:start + self.chunk_size] for start in range(0, len(headers), self.chunk_size)]
+        results: List[Optional[List[Block]]] = [None] * len(chunks)
+        attempts = [0] * len(chunks)
+
+        pending = {}
+        for chunk_number, chunk in enumerate(chunks):
+            peer_id = peer_ids[chunk_number % len(peer_ids)]
+            pending[self.executor.submit(self._download_chunk, peer_id, chunk)] = chunk_number
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk_number = pending.pop(future)
+                blocks = future.result()
+                if blocks is not None:
+                    results[chunk_number] = blocks
+                    continue
+                attempts[chunk_number] += 1
+                if attempts[chunk_number] >= len(peer_ids):
+                    self.logger.error(f"No peer could provide blocks {chunks[chunk_number][0].index}-{chunks[chunk_number][-1].index}.")
+                    return None
+                peer_id = peer_ids[(chunk_number + attempts[chunk_number]) % len(peer_ids)]
+                pending[self.executor.submit(self._download_chunk, peer_id, chunks[chunk_number])] = chunk_number
+
+        return [block for chunk_blocks in results for block in chunk_blocks]
+
+    def sync(self, local_chain: List[Block]) -> Optional[List[Block]]:
+        """
+        Builds the best chain known to the peers, reusing the local blocks up to the fork point.
+        :param local_chain: The local chain.
+        :return: The candidate chain, or None if no peer has a longer valid chain or the download failed.
+        """
+        tips = self.fetch_tips()
+        local_height = len(local_chain) - 1
+        candidates = sorted((peer_id for peer_id, tip in tips.items() if tip[0] > local_height),
+                            key=lambda peer_id: tips[peer_id][0], reverse=True)
+
+        for best_peer in candidates:
+            best_tip = tips[best_peer]
+            fetched = self.fetch_headers(best_peer, local_chain, best_tip)
+            if fetched is None:
+                continue
+            fork_height, headers = fetched
+
+            # Peers that reported the same tip, or a higher one, can serve the missing range
+            peer_ids = [best_peer] + [peer_id for peer_id in candidates if peer_id != best_peer and tips[peer_id][0] >= best_tip[0]]
+            blocks = self.download_blocks(headers, peer_ids)
+            if blocks is None:
+                continue
+            self.logger.info(f"Downloaded {len(blocks)} blocks above height {fork_height} from {len(peer_ids)} peers.")
+            return list(local_chain[:fork_height + 1]) + blocks
+        return None
+
+    def bootstrap(self) -> Optional[Tuple[Dict, List[Block]]]:
+        """
+        Fetches what an empty node needs to start from the latest state checkpoint of the peers instead of genesis:
+        the checkpoint, the headers up to it and the full blocks above it.
+        The checkpoint signature and state root are verified by the caller.
+        :return: A (checkpoint, chain) tuple, or None if no peer could provide a checkpoint and its chain.
+        """
+        tips = self.fetch_tips()
+        for best_peer in sorted(tips, key=lambda peer_id: tips[peer_id][0], reverse=True):
+            best_tip = tips[best_peer]
+            checkpoint = self.clients[best_peer].get_checkpoint(timeout=self.timeout)
+            if checkpoint is None or checkpoint["height"] > best_tip[0]:
+                continue
+            headers = self.clients[best_peer].get_headers(0, best_tip[0], timeout=self.timeout)
+            if not headers or not self._headers_valid(headers, 0, best_tip):
+                self.logger.warning(f"Peer {best_peer} returned invalid headers.")
+                continue
+
+            height = checkpoint["height"]
+            blocks = []
+            if height < best_tip[0]:
+                peer_ids = [best_peer] + [peer_id for peer_id in tips if peer_id != best_peer and tips[peer_id][0] >= best_tip[0]]
+                blocks = self.download_blocks(headers[height + 1:], peer_ids)
+                if blocks is None:
+                    continue
+            self.logger.info(f"Fetched the state checkpoint at height {height} and {len(blocks)} blocks above it from {best_peer}.")
+            return checkpoint, headers[:height + 1] + blocks
+        return None
+
+    def close(self):
+        """
+        Stops the worker threads and closes the peer channels.
+        """
+        self.executor.shutdown(wait=False)
+        for client in self.clients.values():
+            client.close()
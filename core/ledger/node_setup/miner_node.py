@@ -1,19 +1,31 @@
 import time
+from typing import Optional
 from core.ledger.blockchain import Blockchain
+from core.ledger.block import Block
+from core.ledger.mining import MiningEngine
+from core.ledger.proof_of_authority import ProofOfAuthority
 from core.ledger.node_setup.node_init import NodeInitializer
 from threading import Thread
 
 class MinerNode(NodeInitializer):
-    def __init__(self, node_id: str, peers: list, data_dir: str = "./node_data", mining_interval: int = 5):
+    def __init__(self, node_id: str, peers: list, data_dir: str = "./node_data", mining_interval: int = 5,
+                 mining_engine: Optional[MiningEngine] = None, authority: Optional[ProofOfAuthority] = None):
         """
         Initializes a miner node with mining capabilities.
         :param node_id: Unique identifier for the node.
         :param peers: List of peer node identifiers.
         :param data_dir: Directory to store blockchain data.
         :param mining_interval: Interval in seconds between mining attempts.
+        :param mining_engine: Optional MiningEngine used to search nonces on all CPU cores.
+        :param authority: Optional ProofOfAuthority; the node then signs the blocks of its turns every
+                          authority.block_interval seconds instead of mining.
         """
         super().__init__(node_id, peers, data_dir)
         self.mining_interval = mining_interval
+        self.mining_engine = mining_engine
+        self.blockchain.mining_engine = mining_engine
+        self.authority = authority
+        self.blockchain.authority = authority
         self.mining_thread = Thread(target=self.mine)
         self.is_mining = False
 
@@ -32,30 +44,76 @@ class MinerNode(NodeInitializer):
         Stops the mining process.
         """
         self.is_mining = False
+        if self.mining_engine is not None:
+            self.mining_engine.cancel()
         self.mining_thread.join()
         print(f"Mining stopped for node {self.node_id}.")
 
     def mine(self):
         """
-        Continuously mines new blocks at a specified interval.
+        Continuously mines new blocks at a specified interval. In Proof of Authority mode the node instead waits
+        until the next block is due and produces it only when it is its turn.
         """
         while self.is_mining:
-            time.sleep(self.mining_interval)
-            self.mine_new_block()
+            if self.authority is None:
+                time.sleep(self.mining_interval)
+                self.mine_new_block()
+                continue
+            last_block = self.blockchain.get_last_block()
+            wait = self.authority.next_block_time(last_block) - time.time()
+            if wait > 0:
+                time.sleep(min(wait, self.authority.block_interval))
+            elif self.authority.is_proposer(last_block.index + 1):
+                self.mine_new_block()
+            else:
+                # Another authority's turn: check again shortly for its block
+                time.sleep(self.authority.block_interval / 10)
 
     def mine_new_block(self):
         """
         Mines a new block and adds it to the blockchain.
         """
         data = f"Mined by {self.node_id} at {time.time()}"
-        self.blockchain.add_block(data)
+        new_block = self.blockchain.add_block(data)
+        if new_block is None:
+            print(f"Node {self.node_id} abandoned the block it was mining.")
+            return
         self.save_blockchain_state()
         print(f"New block mined and added by {self.node_id}: {self.blockchain.get_last_block().hash}")
 
+    def receive_block(self, block: Block) -> bool:
+        """
+        Handles a competing block received from a peer. The peer block is appended if it correctly extends the
+        local chain, and the block mined on the same tip is abandoned, even if its mining has not started yet.
+        :param block: The block received from the peer.
+        :return: True if the block was appended to the local chain, False otherwise.
+        """
+        last_block = self.blockchain.get_last_block()
+        if block.index != last_block.index + 1 or block.previous_hash != last_block.hash or block.hash != block.compute_hash() \
+                or (self.authority is not None and not self.authority.verify_block(block)):
+            print(f"Node {self.node_id} rejected block {block.index} received from a peer.")
+            return False
+
+        if self.mining_engine is not None:
+            self.mining_engine.cancel(block.previous_hash)
+        self.blockchain.chain.append(block)
+        self.save_blockchain_state()
+        print(f"Node {self.node_id} accepted block {block.index} from a peer: {block.hash}")
+        return True
+
+    def get_hash_rate(self) -> float:
+        """
+        Reports the hash rate achieved during the last mined block.
+        :return: Hashes per second, or 0.0 when mining on a single thread without a mining engine.
+        """
+        if self.mining_engine is None:
+            return 0.0
+        return self.mining_engine.hash_rate()
+
 # Example usage
 if __name__ == "__main__":
     # Initialize miner node with some peers
-    miner_node = MinerNode(node_id="miner1", peers=["node2", "node3"], mining_interval=3)
+    miner_node = MinerNode(node_id="miner1", peers=["node2", "node3"], mining_interval=3, mining_engine=MiningEngine())
     miner_node.start_mining()
 
     # Allow mining for some time
@@ -63,6 +121,8 @@ if __name__ == "__main__":
         time.sleep(15)  # Simulate mining time
     finally:
         miner_node.stop_mining()
+        print(f"Hash rate: {miner_node.get_hash_rate():.0f} hashes/sec")
+        miner_node.mining_engine.shutdown()
 
     # Print the blockchain
     for block in miner_node.blockchain.chain:
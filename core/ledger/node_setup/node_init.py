@@ -1,23 +1,48 @@
 import os
 import json
 from core.ledger.blockchain import Blockchain  # Import Blockchain class
-from core.ledger.block import Block  # Import Block class
+from core.ledger.block import Block, compute_legacy_hash  # Import Block class
+from core.ledger.block_store import BlockStore
+from core.ledger.contract_state import ContractState
+from core.ledger.header_snapshot import HeaderSnapshot
+from core.ledger.ledger_index import LedgerIndex
 from core.ledger.consensus_mechanism import ConsensusMechanism
-from typing import List
+from typing import List, Optional
 
 class NodeInitializer:
-    def __init__(self, node_id: str, peers: List[str], data_dir: str = "./node_data"):
+    def __init__(self, node_id: str, peers: List[str], data_dir: str = "./node_data", snapshot_interval: int = 1000,
+                 index_fields: Optional[List[str]] = None, pruning_retention: Optional[int] = None,
+                 prune_block_store: bool = False, checkpoint_key: Optional[bytes] = None):
         """
         Initializes a blockchain node with given parameters.
         :param node_id: Unique identifier for the node.
         :param peers: List of peer node identifiers.
         :param data_dir: Directory to store blockchain data.
+        :param snapshot_interval: Number of new blocks after which the header snapshot, ledger index and contract state
+                                  are rewritten.
+        :param index_fields: JSON transaction fields to index; defaults to the agent id and model hash.
+        :param pruning_retention: Number of recent blocks whose bodies are kept in memory; every snapshot then also
+                                  creates a signed state checkpoint and prunes older bodies. Pruning is off if None.
+        :param prune_block_store: Whether pruned bodies are also deleted from the block store.
+        :param checkpoint_key: Secret key used to sign and verify state checkpoints; required for pruning.
         """
         self.node_id = node_id
         self.peers = peers
         self.data_dir = data_dir
-        self.blockchain = Blockchain()
+        self.snapshot_interval = snapshot_interval
+        self.pruning_retention = pruning_retention
+        self.prune_block_store = prune_block_store
+        self.checkpoint_key = checkpoint_key
+        self.ledger_index = LedgerIndex(fields=index_fields)
+        self.contract_state = ContractState()
+        self.blockchain = Blockchain(ledger_index=self.ledger_index, contract_state=self.contract_state)
         self.setup_data_directory()
+        self.block_store = BlockStore(os.path.join(self.data_dir, self.node_id, "blocks"))
+        self.header_snapshot = HeaderSnapshot(os.path.join(self.data_dir, self.node_id, "headers.snap"))
+        self.ledger_index_path = os.path.join(self.data_dir, self.node_id, "ledger_index.json")
+        self.contract_state_path = os.path.join(self.data_dir, self.node_id, "contract_state.json")
+        self.state_checkpoint_path = os.path.join(self.data_dir, self.node_id, "state_checkpoint.json")
+        self.snapshot_height = 0
 
     def setup_data_directory(self):
         """
@@ -32,7 +57,101 @@ class NodeInitializer:
 
     def save_blockchain_state(self):
         """
-        Saves the current blockchain state to a file.
+        Persists the blockchain to the append-only block store.
+        Only blocks that are not stored yet are written; if the chain was reorganised, the stored blocks above the
+        fork point are truncated first.
+        """
+        chain = self.blockchain.chain
+        common_height = min(len(self.block_store), len(chain))
+        while common_height > 0 and not self.block_store.matches(common_height - 1, chain[common_height - 1].hash):
+            common_height -= 1
+
+        if common_height < len(self.block_store):
+            self.block_store.truncate(common_height)
+        if common_height < len(chain):
+            self.block_store.append_blocks(chain[common_height:])
+        if common_height < self.snapshot_height or len(chain) - self.snapshot_height >= self.snapshot_interval:
+            if self.pruning_retention is not None and self.checkpoint_key is not None:
+                self.prune_blockchain_state()
+            else:
+                self.snapshot_blockchain_state()
+        print(f"Blockchain state saved for node {self.node_id} ({len(chain) - common_height} new blocks).")
+
+    def snapshot_blockchain_state(self):
+        """
+        Writes a snapshot of all block headers and their hashes so the next startup can skip parsing and rehashing,
+        and persists the ledger index and contract state so that only blocks appended afterwards are re-applied.
+        """
+        self.header_snapshot.write(self.blockchain.chain)
+        self.snapshot_height = len(self.blockchain.chain)
+        self.ledger_index.sync(self.blockchain.chain)
+        self.ledger_index.save(self.ledger_index_path)
+        self.contract_state.sync(self.blockchain.chain)
+        self.contract_state.save(self.contract_state_path)
+
+    def prune_blockchain_state(self) -> int:
+        """
+        Creates a signed state checkpoint at the chain tip, snapshots the node state, then drops the bodies of
+        blocks older than the retention horizon from memory and, if configured, from the block store.
+        :return: The number of blocks pruned from memory.
+        """
+        try:
+            checkpoint = self.blockchain.create_state_checkpoint(self.checkpoint_key)
+        except ValueError as e:
+            print(f"State checkpoint not created for node {self.node_id}: {e}")
+            self.snapshot_blockchain_state()
+            return 0
+        self.save_state_checkpoint(checkpoint)
+        self.snapshot_blockchain_state()
+
+        load_data = None if self.prune_block_store else self.block_store.read_data
+        pruned = self.blockchain.prune(self.pruning_retention, load_data=load_data)
+        if self.prune_block_store:
+            self.block_store.prune(self.blockchain.pruned_height)
+        return pruned
+
+    def save_state_checkpoint(self, checkpoint: dict):
+        """
+        Persists the latest state checkpoint atomically.
+        :param checkpoint: The checkpoint created by Blockchain.create_state_checkpoint.
+        """
+        tmp_path = self.state_checkpoint_path + ".tmp"
+        with open(tmp_path, "w") as checkpoint_file:
+            json.dump(checkpoint, checkpoint_file)
+            checkpoint_file.flush()
+            os.fsync(checkpoint_file.fileno())
+        os.replace(tmp_path, self.state_checkpoint_path)
+
+    def load_state_checkpoint(self) -> Optional[dict]:
+        """
+        Loads the persisted state checkpoint.
+        :return: The checkpoint, or None if there is none.
+        """
+        if not os.path.exists(self.state_checkpoint_path):
+            return None
+        with open(self.state_checkpoint_path, "r") as checkpoint_file:
+            return json.load(checkpoint_file)
+
+    def bootstrap_from_checkpoint(self, checkpoint: dict, chain: List[Block]) -> bool:
+        """
+        Initializes an empty node from a state checkpoint and the chain headers instead of replaying from genesis.
+        :param checkpoint: A state checkpoint, e.g. fetched from a peer.
+        :param chain: The headers up to the checkpoint followed by the full blocks above it.
+        :return: True if the node adopted the chain, False otherwise.
+        """
+        if self.checkpoint_key is None or not self.blockchain.bootstrap_from_checkpoint(checkpoint, chain, self.checkpoint_key):
+            return False
+        self.save_state_checkpoint(checkpoint)
+        self.save_blockchain_state()
+        if self.snapshot_height != len(self.blockchain.chain):
+            self.snapshot_blockchain_state()
+        if self.prune_block_store:
+            self.block_store.prune(self.blockchain.pruned_height)
+        return True
+
+    def export_blockchain_state(self):
+        """
+        Exports the full blockchain to a JSON file for inspection or tooling.
         """
         node_path = os.path.join(self.data_dir, self.node_id)
         blockchain_file = os.path.join(node_path, "blockchain.json")
@@ -46,12 +165,33 @@ class NodeInitializer:
         
         with open(blockchain_file, 'w') as file:
             json.dump(blockchain_data, file, indent=4)
-        print(f"Blockchain state saved for node {self.node_id}.")
+        print(f"Blockchain state exported for node {self.node_id}.")
 
     def load_blockchain_state(self):
         """
-        Loads the blockchain state from a file if it exists.
+        Loads the blockchain state from the block store, or from a legacy blockchain.json file if the store is empty.
+        Headers covered by the header snapshot are loaded with their trusted hashes and block data is read lazily;
+        only blocks appended after the snapshot are parsed from the store.
         """
+        if len(self.block_store) > 0:
+            chain = self.header_snapshot.load(self.block_store)
+            self.snapshot_height = len(chain)
+            for height in range(len(chain), len(self.block_store)):
+                chain.append(self.block_store.get_block(height))
+            # Replacing the chain re-indexes and re-applies only the blocks that the persisted index and state do not cover
+            self.ledger_index.load(self.ledger_index_path)
+            self.contract_state.load(self.contract_state_path)
+            # Headers from the snapshot carry trusted hashes, so incremental validation starts after them
+            self.blockchain.replace_chain(chain, validated_height=self.snapshot_height - 1)
+            self.blockchain.pruned_height = self.block_store.pruned_height
+            checkpoint = self.load_state_checkpoint()
+            if checkpoint is not None and checkpoint["height"] < len(chain) and chain[checkpoint["height"]].hash == checkpoint["hash"]:
+                self.blockchain.state_checkpoint = checkpoint
+                self.contract_state.set_base(checkpoint["height"], checkpoint["state"])
+            print(f"Blockchain state loaded for node {self.node_id} from the block store "
+                  f"({self.snapshot_height} headers from snapshot).")
+            return
+
         node_path = os.path.join(self.data_dir, self.node_id)
         blockchain_file = os.path.join(node_path, "blockchain.json")
         
@@ -60,7 +200,7 @@ class NodeInitializer:
                 blockchain_data = json.load(file)
                 
                 # Recreate blocks without providing the hash, let the block class handle it
-                self.blockchain.chain = [
+                chain = [
                     Block(
                         index=block["index"],
                         previous_hash=block["previous_hash"],
@@ -69,10 +209,38 @@ class NodeInitializer:
                         nonce=block["nonce"]
                     ) for block in blockchain_data
                 ]
+            if not all(chain[i].previous_hash == chain[i - 1].hash for i in range(1, len(chain))):
+                chain = self.migrate_legacy_chain(blockchain_data, blockchain_file)
+            self.blockchain.chain = chain
             print(f"Blockchain state loaded for node {self.node_id}.")
         else:
             print(f"No blockchain state found for node {self.node_id}. Starting with genesis block.")
 
+    @staticmethod
+    def migrate_legacy_chain(blockchain_data: List[dict], blockchain_file: str) -> List[Block]:
+        """
+        Rebuilds a chain exported before blocks were hashed over the binary header. Its links are checked with the
+        legacy string hash first, then every block is relinked to the new hash of its predecessor. Nonces are kept,
+        so the migrated blocks no longer meet the proof of work difficulty, which chain validation does not check.
+        :param blockchain_data: The blocks read from the JSON file.
+        :param blockchain_file: Path of the file, for the error message.
+        :return: The migrated chain.
+        :raises ValueError: If the chain does not link in the legacy format either.
+        """
+        for i in range(1, len(blockchain_data)):
+            previous = blockchain_data[i - 1]
+            if blockchain_data[i]["previous_hash"] != compute_legacy_hash(previous["index"], previous["previous_hash"],
+                                                                          previous["timestamp"], previous["data"],
+                                                                          previous["nonce"]):
+                raise ValueError(f"Invalid chain link between block {i - 1} and block {i} in {blockchain_file}, "
+                                 f"in both the current and the legacy block format.")
+        chain = []
+        for block in blockchain_data:
+            chain.append(Block(index=block["index"], previous_hash=chain[-1].hash if chain else block["previous_hash"],
+                               timestamp=block["timestamp"], data=block["data"], nonce=block["nonce"]))
+        print(f"Migrated {len(chain)} blocks of {blockchain_file} from the legacy block hash format.")
+        return chain
+
     def initiate_consensus(self, peer_blockchains: List[Blockchain]):
         """
         Initiates the consensus mechanism for the node to determine the correct chain.
@@ -81,7 +249,9 @@ class NodeInitializer:
         # Pass Blockchain objects, not just the chains
         all_blockchains = peer_blockchains + [self.blockchain]
         consensus_mechanism = ConsensusMechanism(nodes=all_blockchains)
-        self.blockchain.chain = consensus_mechanism.longest_chain_rule().chain  # Set the longest chain
+        longest_chain = consensus_mechanism.longest_chain_rule().chain
+        if longest_chain is not self.blockchain.chain:
+            self.blockchain.chain = longest_chain  # Set the longest chain
         print(f"Consensus applied for node {self.node_id}, updated chain length: {len(self.blockchain.chain)}")
 
 # Example usage
@@ -1,21 +1,27 @@
 from core.ledger.blockchain import Blockchain
 from core.ledger.node_setup.node_init import NodeInitializer
 from core.ledger.consensus_mechanism import ConsensusMechanism
+from core.ledger.node_setup.chain_sync import ChainSynchronizer
 from threading import Thread
 import time
-from typing import List
+from typing import Dict, List, Optional
 
 class ValidatorNode(NodeInitializer):
-    def __init__(self, node_id: str, peers: List[str], data_dir: str = "./node_data", validation_interval: int = 5):
+    def __init__(self, node_id: str, peers: List[str], data_dir: str = "./node_data", validation_interval: int = 5,
+                 peer_addresses: Optional[Dict[str, str]] = None, checkpoint_key: Optional[bytes] = None):
         """
         Initializes a validator node with validation capabilities.
         :param node_id: Unique identifier for the node.
         :param peers: List of peer node identifiers.
         :param data_dir: Directory to store blockchain data.
         :param validation_interval: Interval in seconds between validation checks.
+        :param peer_addresses: Optional mapping of peer node identifiers to gRPC addresses. When given, missing
+                               blocks are downloaded from the peers instead of simulating peer chains.
+        :param checkpoint_key: Optional secret key used to verify state checkpoints when bootstrapping from peers.
         """
-        super().__init__(node_id, peers, data_dir)
+        super().__init__(node_id, peers, data_dir, checkpoint_key=checkpoint_key)
         self.validation_interval = validation_interval
+        self.chain_synchronizer = ChainSynchronizer(peer_addresses) if peer_addresses else None
         self.validation_thread = Thread(target=self.validate_chain)
         self.is_validating = False
 
@@ -40,28 +46,77 @@ class ValidatorNode(NodeInitializer):
     def validate_chain(self):
         """
         Continuously validates the blockchain at a specified interval.
+        Only blocks appended since the previous check are verified; use audit_chain for a full re-verification.
         """
         while self.is_validating:
             time.sleep(self.validation_interval)
-            is_valid = self.blockchain.is_chain_valid()
+            is_valid = self.blockchain.is_chain_valid(incremental=True)
             if is_valid:
                 print(f"Node {self.node_id}: Blockchain is valid.")
             else:
                 print(f"Node {self.node_id}: Blockchain is invalid. Initiating consensus.")
                 self.initiate_consensus_with_peers()
 
+    def audit_chain(self) -> bool:
+        """
+        Re-verifies every block from genesis on all CPU cores, including the bodies stored on disk, regardless of
+        the validated-height watermark.
+        :return: True if the blockchain is valid, False otherwise.
+        """
+        is_valid = self.blockchain.first_invalid_height() < 0
+        print(f"Node {self.node_id}: Full audit {'passed' if is_valid else 'failed'} at height {self.blockchain.validated_height}.")
+        return is_valid
+
     def initiate_consensus_with_peers(self):
         """
         Gathers blockchain data from peers and initiates a consensus mechanism to resolve discrepancies.
         """
-        peer_blockchains = self.get_peer_blockchains()
-        self.initiate_consensus(peer_blockchains)
+        if self.chain_synchronizer is not None:
+            self.sync_with_peers()
+        else:
+            peer_blockchains = self.get_peer_blockchains()
+            self.initiate_consensus(peer_blockchains)
+        self.save_blockchain_state()
+
+    def sync_with_peers(self) -> bool:
+        """
+        Downloads the blocks above the fork point from the peers and adopts the resulting chain if it is longer and valid.
+        Only the downloaded suffix is validated, the local prefix up to the fork point is reused.
+        :return: True if the local chain was replaced, False otherwise.
+        """
+        candidate = self.chain_synchronizer.sync(self.blockchain.chain)
+        if candidate is None:
+            print(f"Node {self.node_id}: No longer chain available from peers.")
+            return False
+        self.blockchain.consensus([candidate])
+        return self.blockchain.get_last_block().hash == candidate[-1].hash
+
+    def bootstrap_from_peers(self) -> bool:
+        """
+        Initializes the node from the latest state checkpoint of the peers instead of replaying the chain from genesis.
+        Requires peer addresses and the checkpoint key.
+        :return: True if the node adopted the peers' chain, False otherwise.
+        """
+        fetched = self.chain_synchronizer.bootstrap()
+        if fetched is None:
+            print(f"Node {self.node_id}: No state checkpoint available from peers.")
+            return False
+        checkpoint, chain = fetched
+        return self.bootstrap_from_checkpoint(checkpoint, chain)
 
     def get_peer_blockchains(self) -> List[Blockchain]:
         """
-        Simulates fetching blockchain data from peer nodes.
+        Fetches blockchain data from peer nodes. Without peer addresses, peer chains are simulated.
         :return: A list of blockchain instances from peer nodes.
         """
+        if self.chain_synchronizer is not None:
+            candidate = self.chain_synchronizer.sync(self.blockchain.chain)
+            if candidate is None:
+                return []
+            peer_blockchain = Blockchain()
+            peer_blockchain.chain = candidate
+            return [peer_blockchain]
+
         peer_blockchains = []
         for peer_id in self.peers:
             # In a real-world scenario, this would be replaced by network requests to get peer blockchain states.
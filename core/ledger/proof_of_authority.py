@@ -0,0 +1,133 @@
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey, Ed25519PublicKey
+from core.ledger.block import Block
+
+
+def generate_authority_key() -> Tuple[Ed25519PrivateKey, bytes]:
+    """
+    Generates a signing key for an authority node.
+    :return: A tuple of the Ed25519 private key and its raw 32-byte public key.
+    """
+    signing_key = Ed25519PrivateKey.generate()
+    public_key = signing_key.public_key().public_bytes(encoding=serialization.Encoding.Raw,
+                                                       format=serialization.PublicFormat.Raw)
+    return signing_key, public_key
+
+
+class ProofOfAuthority:
+    def __init__(self, authorities: Dict[str, bytes], authority_id: Optional[str] = None,
+                 signing_key: Optional[Ed25519PrivateKey] = None, block_interval: float = 5.0,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Initializes Proof of Authority block production for a permissioned network. Authorities take turns in a
+        fixed rotation: the block at height h is produced by authority h modulo the number of authorities, which
+        signs the block hash instead of searching a nonce. Followers verify the signatures instead of mining work.
+        :param authorities: Mapping of authority ids to their raw Ed25519 public keys, in rotation order.
+        :param authority_id: The id of the local authority, or None on a follower node.
+        :param signing_key: The Ed25519 private key of the local authority.
+        :param block_interval: Seconds between two blocks, independent of any mining difficulty.
+        :param logger: Logger instance to log block production activities.
+        """
+        if not authorities:
+            raise ValueError("Proof of Authority requires at least one authority.")
+        if authority_id is not None and authority_id not in authorities:
+            raise ValueError(f"{authority_id} is not an authority.")
+        self.authority_ids = list(authorities)
+        # Public keys are parsed once so that verifying a batch of blocks only runs signature checks
+        self.public_keys: Dict[str, Ed25519PublicKey] = {
+            authority: Ed25519PublicKey.from_public_bytes(public_key) for authority, public_key in authorities.items()
+        }
+        self.authority_id = authority_id
+        self.signing_key = signing_key
+        self.block_interval = block_interval
+        self.logger = logger or logging.getLogger(__name__)
+
+    def proposer(self, height: int) -> str:
+        """
+        Returns the authority whose turn it is to produce the block at a height.
+        :param height: The block height.
+        :return: The authority id.
+        """
+        return self.authority_ids[height % len(self.authority_ids)]
+
+    def is_proposer(self, height: int) -> bool:
+        """
+        Checks whether the local authority produces the block at a height.
+        :param height: The block height.
+        :return: True if the local authority is the proposer, False otherwise.
+        """
+        return self.authority_id is not None and self.proposer(height) == self.authority_id
+
+    def next_block_time(self, last_block: Block) -> float:
+        """
+        Returns when the block following a block is due.
+        :param last_block: The latest block of the chain.
+        :return: The timestamp at which the next block should be produced.
+        """
+        return float(last_block.timestamp) + self.block_interval
+
+    def sign_block(self, block: Block) -> Block:
+        """
+        Signs a block header on behalf of the local authority. The block hash commits to every header field,
+        so the signature covers the whole header.
+        :param block: The block to sign.
+        :return: The block with its signature set.
+        """
+        if self.signing_key is None or not self.is_proposer(block.index):
+            raise ValueError(f"Block {block.index} must be signed by {self.proposer(block.index)}.")
+        block.signature = self.signing_key.sign(bytes.fromhex(block.hash)).hex()
+        return block
+
+    def verify_block(self, block: Block) -> bool:
+        """
+        Verifies that a block was signed by the authority whose turn it was.
+        :param block: The block to verify.
+        :return: True if the signature is valid, False otherwise.
+        """
+        if not block.signature:
+            return False
+        try:
+            self.public_keys[self.proposer(block.index)].verify(bytes.fromhex(block.signature), bytes.fromhex(block.hash))
+        except (InvalidSignature, ValueError):
+            return False
+        return True
+
+    def first_invalid_height(self, chain: List[Block], start: int = 1) -> int:
+        """
+        Verifies the signatures of a batch of blocks, e.g. every block received from a peer after the fork point.
+        Block hashes and links are checked by the blockchain; the genesis block carries no signature.
+        :param chain: The chain holding the blocks.
+        :param start: The first height to verify.
+        :return: The height of the first block with an invalid signature, or -1 if every signature is valid.
+        """
+        started = time.perf_counter()
+        for height in range(max(start, 1), len(chain)):
+            if not self.verify_block(chain[height]):
+                self.logger.warning(f"Invalid authority signature at height {height}.")
+                return height
+        self.logger.debug(f"Verified {len(chain) - max(start, 1)} signatures in {time.perf_counter() - started:.3f} s.")
+        return -1
+
+# Example usage
+if __name__ == "__main__":
+    from core.ledger.blockchain import Blockchain
+
+    keys = {authority: generate_authority_key() for authority in ["authority1", "authority2"]}
+    public_keys = {authority: public_key for authority, (_, public_key) in keys.items()}
+    producers = {authority: Blockchain(authority=ProofOfAuthority(public_keys, authority, signing_key, block_interval=1.0))
+                 for authority, (signing_key, _) in keys.items()}
+
+    # Each authority produces the blocks of its turns on a shared chain
+    chain = producers["authority1"].chain
+    for height in range(1, 5):
+        producer = producers[producers["authority1"].authority.proposer(height)]
+        producer.chain = chain
+        producer.add_block(f"Block {height} Data")
+
+    follower = Blockchain(authority=ProofOfAuthority(public_keys))
+    follower.consensus([chain])
+    print(f"Follower height: {len(follower.chain) - 1}, signatures valid: {follower.is_chain_valid()}")
@@ -0,0 +1,320 @@
+import hashlib
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Union
+from core.ledger.block import Block
+from core.ledger.blockchain import Blockchain
+
+# Marks root chain transactions that anchor a shard tip
+ANCHOR_TYPE = "shard_anchor"
+
+
+def anchor_transaction(shard_id: str, height: int, block_hash: str) -> str:
+    """
+    Encodes the anchor of a shard tip as a root chain transaction.
+    :param shard_id: The shard identifier.
+    :param height: The height of the anchored shard block.
+    :param block_hash: The hash of the anchored shard block.
+    :return: The canonical JSON transaction.
+    """
+    return json.dumps({"type": ANCHOR_TYPE, "shard": shard_id, "height": height, "hash": block_hash},
+                      sort_keys=True, separators=(",", ":"))
+
+
+def parse_anchor(transaction: str) -> Optional[Dict[str, Any]]:
+    """
+    Decodes a root chain transaction into an anchor.
+    :param transaction: The transaction string.
+    :return: A dictionary with the shard, height and hash, or None if the transaction is not an anchor.
+    """
+    if not transaction.startswith("{"):
+        return None
+    try:
+        anchor = json.loads(transaction)
+    except ValueError:
+        return None
+    if not isinstance(anchor, dict) or anchor.get("type") != ANCHOR_TYPE:
+        return None
+    return anchor
+
+
+class ShardedLedger:
+    def __init__(self, shard_ids: List[str], difficulty: int = 4, anchor_interval: int = 10,
+                 root_chain: Optional[Blockchain] = None, mining_engines: Optional[Dict[str, Any]] = None,
+                 authorities: Optional[Dict[str, Any]] = None, max_workers: Optional[int] = None,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Initializes a ledger split into independent shard chains, e.g. one per federated task or edge region.
+        Every shard has its own chain, lock and producers, so appends to different shards never wait for each other
+        and throughput grows with the number of shards. Shards periodically anchor their tip hash into a root chain;
+        an anchored shard block is final, since the root chain commits to it and forks below it are refused.
+        :param shard_ids: Identifiers of the shards.
+        :param difficulty: The proof of work difficulty of the shard chains and the root chain.
+        :param anchor_interval: Number of new blocks in a shard after which its tip is anchored automatically.
+        :param root_chain: Optional root chain to anchor into, a new chain is created if None.
+        :param mining_engines: Optional mapping of shard ids to their own MiningEngine.
+        :param authorities: Optional mapping of shard ids to their own ProofOfAuthority validator set.
+        :param max_workers: Maximum number of shards appended to concurrently by add_blocks.
+        :param logger: Logger instance to log shard and anchoring activities.
+        """
+        self.difficulty = difficulty
+        self.anchor_interval = anchor_interval
+        self.logger = logger or logging.getLogger(__name__)
+        self.root_chain = root_chain or Blockchain(difficulty=difficulty)
+        self.shards: Dict[str, Blockchain] = {}
+        self._shard_locks: Dict[str, threading.Lock] = {}
+        self._root_lock = threading.RLock()
+        self._anchors: Dict[str, Dict[str, Any]] = {}  # Latest anchor per shard
+        self._anchor_scan: List[str] = []  # Hashes of the root blocks scanned for anchors
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or max(len(shard_ids), 1))
+        # Automatic anchors are mined on one background thread, so shard appends never wait for the root chain
+        self._anchor_executor = ThreadPoolExecutor(max_workers=1)
+        self._anchor_lock = threading.Lock()
+        self._pending_anchors: List[str] = []  # Shards due for an anchor, in the order they became due
+        mining_engines = mining_engines or {}
+        authorities = authorities or {}
+        for shard_id in shard_ids:
+            self.add_shard(shard_id, mining_engine=mining_engines.get(shard_id), authority=authorities.get(shard_id))
+
+    @property
+    def shard_ids(self) -> List[str]:
+        return list(self.shards)
+
+    def add_shard(self, shard_id: str, mining_engine=None, authority=None) -> Blockchain:
+        """
+        Creates a new shard chain.
+        :param shard_id: The shard identifier.
+        :param mining_engine: Optional MiningEngine mining the shard's blocks.
+        :param authority: Optional ProofOfAuthority signing the shard's blocks instead of mining.
+        :return: The shard chain.
+        """
+        if shard_id in self.shards:
+            raise ValueError(f"Shard {shard_id} already exists.")
+        self.shards[shard_id] = Blockchain(mining_engine=mining_engine, difficulty=self.difficulty, authority=authority)
+        self._shard_locks[shard_id] = threading.Lock()
+        return self.shards[shard_id]
+
+    def get_shard(self, shard_id: str) -> Blockchain:
+        """
+        Returns the chain of a shard.
+        """
+        if shard_id not in self.shards:
+            raise ValueError(f"Unknown shard {shard_id}.")
+        return self.shards[shard_id]
+
+    def shard_for(self, key: str) -> str:
+        """
+        Maps a key, e.g. a task or region id, to a shard with a stable hash, so every node routes it the same way.
+        :param key: The routing key.
+        :return: The shard identifier.
+        """
+        shard_ids = sorted(self.shards)
+        digest = hashlib.sha256(key.encode()).digest()
+        return shard_ids[int.from_bytes(digest[:8], "big") % len(shard_ids)]
+
+    def add_block(self, shard_id: str, data: Union[str, List[str]]) -> Optional[Block]:
+        """
+        Appends a block to one shard, scheduling an anchor of the shard tip when anchor_interval blocks were added
+        since the last anchor. Only the shard's own lock is held while mining, so other shards keep appending, and
+        the anchor is mined in the background; use wait_for_anchors to wait until scheduled anchors are in the root chain.
+        :param shard_id: The shard identifier.
+        :param data: The block data, either a single string or a list of transaction strings.
+        :return: The new block, or None if it was not appended.
+        """
+        shard = self.get_shard(shard_id)
+        with self._shard_locks[shard_id]:
+            block = shard.add_block(data)
+        if block is not None and block.index - self._scanned_anchored_height(shard_id) >= self.anchor_interval:
+            self._schedule_anchor(shard_id)
+        return block
+
+    def add_blocks(self, batches: Dict[str, Union[str, List[str]]]) -> Dict[str, Optional[Block]]:
+        """
+        Appends one block to each of several shards concurrently. Proof of work only runs in parallel for shards
+        with their own mining_engines, which mine in worker processes; shards without one hash on the executor
+        threads, where the GIL serialises them.
+        :param batches: Mapping of shard ids to their block data.
+        :return: Mapping of shard ids to the new blocks, None where a block was not appended.
+        """
+        futures = {shard_id: self._executor.submit(self.add_block, shard_id, data) for shard_id, data in batches.items()}
+        return {shard_id: future.result() for shard_id, future in futures.items()}
+
+    def _scanned_anchored_height(self, shard_id: str) -> int:
+        """
+        Returns the anchored height of a shard as of the last scan of the root chain, without waiting for the
+        root lock held while an anchor is mined. It may lag behind the root chain, in which case an anchor is
+        scheduled early and skipped by anchor.
+        """
+        anchor = self._anchors.get(shard_id)
+        return anchor["height"] if anchor is not None else 0
+
+    def _schedule_anchor(self, shard_id: str):
+        """
+        Queues an anchor of a shard tip on the anchor thread. Shards that become due while an anchor is queued
+        join it, so they are anchored together in one root block.
+        """
+        with self._anchor_lock:
+            if shard_id in self._pending_anchors:
+                return
+            self._pending_anchors.append(shard_id)
+            if len(self._pending_anchors) > 1:
+                return
+        self._anchor_executor.submit(self._anchor_pending)
+
+    def _anchor_pending(self):
+        with self._anchor_lock:
+            shard_ids, self._pending_anchors = self._pending_anchors, []
+        try:
+            self.anchor(shard_ids)
+        except Exception:
+            self.logger.exception(f"Failed to anchor shards {shard_ids}.")
+
+    def wait_for_anchors(self):
+        """
+        Waits until the anchors scheduled by add_block so far were mined into the root chain.
+        """
+        # The anchor thread runs tasks in order, so an empty task completes after every task queued before it
+        self._anchor_executor.submit(lambda: None).result()
+
+    def anchor(self, shard_ids: Optional[List[str]] = None) -> Optional[Block]:
+        """
+        Anchors the tips of shards into one root chain block, one transaction per shard.
+        Shards whose tip is already anchored are skipped.
+        :param shard_ids: The shards to anchor, all shards if None.
+        :return: The root block holding the anchors, or None if there was nothing to anchor or the block was not appended.
+        """
+        with self._root_lock:
+            self._scan_anchors()
+            transactions = []
+            for shard_id in shard_ids or self.shard_ids:
+                tip = self.get_shard(shard_id).get_last_block()
+                if tip.index > self.anchored_height(shard_id):
+                    transactions.append(anchor_transaction(shard_id, tip.index, tip.hash))
+            if not transactions:
+                return None
+            root_block = self.root_chain.add_transactions(transactions)
+            if root_block is not None:
+                self._scan_anchors()
+                self.logger.info(f"Anchored {len(transactions)} shard tips in root block {root_block.index}.")
+            return root_block
+
+    def _scan_anchors(self):
+        """
+        Reads the anchors of root blocks appended since the previous scan. The anchors are read again from
+        genesis if the root chain was reorganised below the scanned height.
+        """
+        root = self.root_chain.chain
+        scanned = len(self._anchor_scan)
+        if scanned > len(root) or (scanned and root[scanned - 1].hash != self._anchor_scan[-1]):
+            self._anchors.clear()
+            self._anchor_scan = []
+            scanned = 0
+        for block in root[max(scanned, 1):]:
+            for position, transaction in enumerate(block.transactions):
+                anchor = parse_anchor(transaction)
+                if anchor is not None and anchor["shard"] in self.shards:
+                    anchor.update(root_height=block.index, position=position)
+                    self._anchors[anchor["shard"]] = anchor
+        self._anchor_scan.extend(block.hash for block in root[scanned:])
+
+    def get_anchor(self, shard_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the latest anchor of a shard.
+        :param shard_id: The shard identifier.
+        :return: A dictionary with the shard, anchored height and hash, and the root height and position of the
+                 anchor transaction, or None if the shard was never anchored.
+        """
+        with self._root_lock:
+            self._scan_anchors()
+            return self._anchors.get(shard_id)
+
+    def anchored_height(self, shard_id: str) -> int:
+        """
+        Returns the height of the latest anchored block of a shard, 0 if it was never anchored.
+        """
+        anchor = self.get_anchor(shard_id)
+        return anchor["height"] if anchor is not None else 0
+
+    def get_anchor_proof(self, shard_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Builds an inclusion proof of a shard's latest anchor in the root chain, e.g. for auditors that only follow
+        the root chain headers.
+        :param shard_id: The shard identifier.
+        :return: The root chain transaction proof, or None if the shard was never anchored.
+        """
+        anchor = self.get_anchor(shard_id)
+        if anchor is None:
+            return None
+        return self.root_chain.get_transaction_proof(anchor["root_height"], anchor["position"])
+
+    def verify_anchor(self, shard_id: str) -> bool:
+        """
+        Checks that the latest anchor of a shard still matches the shard chain.
+        :param shard_id: The shard identifier.
+        :return: True if the shard was never anchored or its chain holds the anchored block, False otherwise.
+        """
+        anchor = self.get_anchor(shard_id)
+        if anchor is None:
+            return True
+        chain = self.get_shard(shard_id).chain
+        return anchor["height"] < len(chain) and chain[anchor["height"]].hash == anchor["hash"]
+
+    def is_valid(self) -> bool:
+        """
+        Validates the root chain, every shard chain and every shard's latest anchor. Shards are validated
+        incrementally, so only blocks appended since the previous check are verified.
+        :return: True if the whole ledger is valid, False otherwise.
+        """
+        if not self.root_chain.is_chain_valid(incremental=True):
+            return False
+        for shard_id, shard in self.shards.items():
+            if not shard.is_chain_valid(incremental=True) or not self.verify_anchor(shard_id):
+                self.logger.warning(f"Shard {shard_id} is invalid.")
+                return False
+        return True
+
+    def consensus(self, shard_id: str, chains: List[List[Block]]) -> List[Block]:
+        """
+        Runs longest-chain consensus on one shard, refusing chains that fork below the shard's latest anchor.
+        :param shard_id: The shard identifier.
+        :param chains: Candidate chains of the shard from other nodes.
+        :return: The shard chain after consensus.
+        """
+        shard = self.get_shard(shard_id)
+        anchored_height = self.anchored_height(shard_id)
+        with self._shard_locks[shard_id]:
+            accepted = [chain for chain in chains if shard.find_fork_point(chain) >= anchored_height]
+            if len(accepted) < len(chains):
+                self.logger.warning(f"Rejected {len(chains) - len(accepted)} chains of shard {shard_id} forking below "
+                                    f"the anchor at height {anchored_height}.")
+            return shard.consensus(accepted)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Reports the height and latest anchored height of every shard.
+        """
+        return {shard_id: {"height": len(shard.chain) - 1, "anchored_height": self.anchored_height(shard_id)}
+                for shard_id, shard in self.shards.items()}
+
+    def close(self):
+        """
+        Stops the worker threads, after mining the anchors already scheduled.
+        """
+        self._executor.shutdown(wait=True)
+        self._anchor_executor.shutdown(wait=True)
+
+# Example usage
+if __name__ == "__main__":
+    ledger = ShardedLedger(["task-a", "task-b", "task-c"], difficulty=2, anchor_interval=3)
+    for round_number in range(4):
+        ledger.add_blocks({shard_id: [f"{shard_id}:update:{round_number}"] for shard_id in ledger.shard_ids})
+    ledger.add_block(ledger.shard_for("agent42"), "agent42:contribution:0.7")
+    ledger.wait_for_anchors()
+    ledger.anchor()
+    print(f"Shards: {ledger.stats()}")
+    print(f"Root chain height: {len(ledger.root_chain.chain) - 1}, ledger valid: {ledger.is_valid()}")
+    print(f"Anchor of task-a verified by the root chain: "
+          f"{ledger.root_chain.verify_transaction_proof(ledger.get_anchor_proof('task-a'))}")
+    ledger.close()
@@ -0,0 +1,202 @@
+import hashlib
+import random
+from typing import Dict, Hashable, List, Optional, Union
+
+
+def seed_to_int(seed: Union[str, bytes, int]) -> int:
+    """
+    Derives a 256-bit integer from an election seed, e.g. the hash of the latest block and the next height.
+    :param seed: The seed.
+    :return: The SHA-256 digest of the seed as an integer.
+    """
+    if isinstance(seed, int):
+        seed = str(seed)
+    if isinstance(seed, str):
+        seed = seed.encode()
+    return int.from_bytes(hashlib.sha256(seed).digest(), "big")
+
+
+class ValidatorRegistry:
+    def __init__(self, stakes: Optional[Dict[Hashable, int]] = None):
+        """
+        Initializes an indexed registry of validators and their stakes, used for stake-weighted leader election.
+        Stakes are kept in a Fenwick tree over validator slots, so updating a stake and sampling a validator
+        proportionally to its stake both take O(log n). Stakes are integers (e.g. in the smallest token unit)
+        so that sums stay exact and elections are reproducible on every node.
+        :param stakes: Optional initial mapping of validator ids to stakes.
+        """
+        self._validators: List[Hashable] = []
+        self._stakes: List[int] = []
+        self._tree: List[int] = [0]  # 1-based Fenwick tree over the slots
+        self._slots: Dict[Hashable, int] = {}
+        self._free_slots: List[int] = []
+        if stakes:
+            self._build(stakes)
+
+    def _build(self, stakes: Dict[Hashable, int]):
+        """
+        Fills the registry from a mapping of stakes in O(n).
+        """
+        for validator, stake in stakes.items():
+            self._check_stake(stake)
+            self._slots[validator] = len(self._validators)
+            self._validators.append(validator)
+            self._stakes.append(stake)
+        self._tree = [0] + list(self._stakes)
+        for position in range(1, len(self._tree)):
+            parent = position + (position & -position)
+            if parent < len(self._tree):
+                self._tree[parent] += self._tree[position]
+
+    @staticmethod
+    def _check_stake(stake: int):
+        if not isinstance(stake, int) or stake < 0:
+            raise ValueError(f"Stakes must be non-negative integers, got {stake!r}.")
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, validator: Hashable) -> bool:
+        return validator in self._slots
+
+    def _prefix_sum(self, position: int) -> int:
+        """
+        Sums the stakes of the first position slots.
+        """
+        total = 0
+        while position > 0:
+            total += self._tree[position]
+            position -= position & -position
+        return total
+
+    def _add(self, slot: int, delta: int):
+        """
+        Adds delta to the stake of a slot in the Fenwick tree.
+        """
+        position = slot + 1
+        while position < len(self._tree):
+            self._tree[position] += delta
+            position += position & -position
+
+    def total_stake(self) -> int:
+        """
+        Returns the sum of all stakes.
+        """
+        return self._prefix_sum(len(self._stakes))
+
+    def stake_of(self, validator: Hashable) -> int:
+        """
+        Returns the stake of a validator, or 0 if it is not registered.
+        """
+        slot = self._slots.get(validator)
+        return self._stakes[slot] if slot is not None else 0
+
+    def set_stake(self, validator: Hashable, stake: int):
+        """
+        Registers a validator or updates its stake in O(log n). A stake of 0 removes the validator.
+        :param validator: The validator id.
+        :param stake: The new stake.
+        """
+        self._check_stake(stake)
+        slot = self._slots.get(validator)
+        if slot is None:
+            if stake == 0:
+                return
+            slot = self._allocate_slot(validator)
+        elif stake == 0:
+            self.remove(validator)
+            return
+        self._add(slot, stake - self._stakes[slot])
+        self._stakes[slot] = stake
+
+    def update(self, stakes: Dict[Hashable, int]):
+        """
+        Applies several stake changes, in O(k log n) for k changes.
+        :param stakes: Mapping of validator ids to their new stakes.
+        """
+        for validator, stake in stakes.items():
+            self.set_stake(validator, stake)
+
+    def remove(self, validator: Hashable):
+        """
+        Removes a validator in O(log n); its slot is reused by the next registered validator.
+        :param validator: The validator id.
+        """
+        slot = self._slots.pop(validator, None)
+        if slot is None:
+            return
+        self._add(slot, -self._stakes[slot])
+        self._stakes[slot] = 0
+        self._validators[slot] = None
+        self._free_slots.append(slot)
+
+    def _allocate_slot(self, validator: Hashable) -> int:
+        """
+        Assigns a slot with a zero stake to a new validator, growing the tree in O(log n) if no slot is free.
+        """
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            slot = len(self._stakes)
+            self._stakes.append(0)
+            # The new tree node covers the slots (position - lowbit, position], whose stakes are all known already
+            position = slot + 1
+            self._tree.append(self._prefix_sum(position - 1) - self._prefix_sum(position - (position & -position)))
+            self._validators.append(None)
+        self._validators[slot] = validator
+        self._slots[validator] = slot
+        return slot
+
+    def find(self, point: int) -> Hashable:
+        """
+        Finds the validator whose stake interval contains a point, by descending the Fenwick tree in O(log n).
+        Validators cover consecutive intervals of [0, total stake) as wide as their stakes.
+        :param point: An integer in [0, total stake).
+        :return: The validator id.
+        """
+        if not 0 <= point < self.total_stake():
+            raise ValueError(f"Point {point} is outside the total stake.")
+        position = 0
+        step = 1 << (len(self._tree) - 1).bit_length()
+        while step:
+            next_position = position + step
+            if next_position < len(self._tree) and self._tree[next_position] <= point:
+                position = next_position
+                point -= self._tree[next_position]
+            step >>= 1
+        return self._validators[position]
+
+    def elect(self, seed: Union[str, bytes, int]) -> Hashable:
+        """
+        Elects one validator with a probability proportional to its stake. The same seed and stakes elect the same
+        validator on every node, so a seed such as the latest block hash makes the election verifiable.
+        :param seed: The election seed.
+        :return: The elected validator id.
+        """
+        total = self.total_stake()
+        if total == 0:
+            raise ValueError("No validator has a stake.")
+        # A 256-bit seed reduced modulo the total stake has a negligible bias
+        return self.find(seed_to_int(seed) % total)
+
+    def sample(self, count: int, seed: Union[str, bytes, int]) -> List[Hashable]:
+        """
+        Draws several validators with replacement, each with a probability proportional to its stake, in
+        O(count log n). The draws are reproducible from the seed.
+        :param count: Number of draws.
+        :param seed: The sampling seed.
+        :return: The drawn validator ids.
+        """
+        total = self.total_stake()
+        if total == 0:
+            raise ValueError("No validator has a stake.")
+        rng = random.Random(seed_to_int(seed))
+        return [self.find(rng.randrange(total)) for _ in range(count)]
+
+# Example usage
+if __name__ == "__main__":
+    registry = ValidatorRegistry({f"validator{i}": 100 + i for i in range(5000)})
+    registry.set_stake("validator42", 50000)
+    registry.remove("validator7")
+    print(f"Elected validator: {registry.elect('block_hash:1001')}")
+    print(f"Sampled committee: {registry.sample(5, seed='block_hash:1001')}")
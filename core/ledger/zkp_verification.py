@@ -1,12 +1,185 @@
 import hashlib
 import random
+import secrets
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Bits of the random weights of batch verification; a batch holding an invalid proof passes with probability about 2^-63
+BATCH_WEIGHT_BITS = 64
+
+# Batches at most this large are checked proof by proof when a batch fails
+BATCH_SPLIT_THRESHOLD = 4
+
+
+def multi_exponentiate(bases: Sequence[int], exponents: Sequence[int], modulus: int) -> int:
+    """
+    Computes the product of bases[i] ** exponents[i] mod modulus with Pippenger's bucket method.
+    The squarings are shared by every base, so n exponentiations cost about as much as a few single ones.
+    :param bases: The bases.
+    :param exponents: The non-negative exponents, one per base.
+    :param modulus: The modulus.
+    :return: The product of the powers.
+    """
+    bits = max((exponent.bit_length() for exponent in exponents), default=0)
+    if bits == 0:
+        return 1 % modulus
+    window = max(1, min(16, len(bases).bit_length() - 2))
+    mask = (1 << window) - 1
+    result = 1
+    for shift in range(((bits - 1) // window) * window, -1, -window):
+        for _ in range(window):
+            result = result * result % modulus
+        buckets = [1] * (mask + 1)
+        for base, exponent in zip(bases, exponents):
+            digit = (exponent >> shift) & mask
+            if digit:
+                buckets[digit] = buckets[digit] * base % modulus
+        # Running products give the product of buckets[d] ** d with 2 * mask multiplications
+        running, window_product = 1, 1
+        for digit in range(mask, 0, -1):
+            running = running * buckets[digit] % modulus
+            window_product = window_product * running % modulus
+        result = result * window_product % modulus
+    return result
+
+
+class FixedBaseTable:
+    def __init__(self, base: int, modulus: int, window: int = 6):
+        """
+        Initializes a windowed fixed-base exponentiation table. Row i holds base ** (d * 2 ** (window * i)) for every
+        window digit d, so base ** exponent takes one multiplication per window instead of a square-and-multiply.
+        Rows are built lazily, as far as the longest exponent seen so far requires.
+        :param base: The fixed base.
+        :param modulus: The modulus.
+        :param window: Number of exponent bits handled by one row.
+        """
+        self.base = base % modulus
+        self.modulus = modulus
+        self.window = window
+        self._rows: List[List[int]] = []
+        self._next_row_base = self.base  # base ** (2 ** (window * len(rows)))
+        self._entry_bytes = (modulus.bit_length() + 7) // 8 + 28  # Approximate size of one int object
+
+    def covered_bits(self) -> int:
+        """
+        Returns the length in bits of the longest exponent the built rows cover.
+        """
+        return len(self._rows) * self.window
+
+    def size_for(self, bits: int) -> int:
+        """
+        Returns the approximate memory in bytes of the table once it covers exponents of the given length.
+        """
+        rows = max(len(self._rows), -(-bits // self.window))
+        return rows * ((1 << self.window) - 1) * self._entry_bytes
+
+    def extend(self, bits: int):
+        """
+        Builds the rows needed for exponents of the given length.
+        """
+        while self.covered_bits() < bits:
+            row_base = self._next_row_base
+            row = [row_base]
+            for _ in range((1 << self.window) - 2):
+                row.append(row[-1] * row_base % self.modulus)
+            self._rows.append(row)
+            self._next_row_base = row[-1] * row_base % self.modulus
+
+    def pow(self, exponent: int) -> int:
+        """
+        Computes base ** exponent mod modulus; the rows must cover the exponent.
+        """
+        result = 1 % self.modulus
+        mask = (1 << self.window) - 1
+        row = 0
+        while exponent:
+            digit = exponent & mask
+            if digit:
+                result = result * self._rows[row][digit - 1] % self.modulus
+            exponent >>= self.window
+            row += 1
+        return result
+
+
+class FixedBaseCache:
+    def __init__(self, window: int = 6, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Initializes a cache of fixed-base exponentiation tables keyed by (base, modulus), shared by every
+        ZKPVerification instance of the process by default. Tables are built on first use and grown lazily;
+        the least recently used tables are evicted to keep the total size under max_bytes.
+        For a 2048-bit modulus, a 6-bit window table takes about 6 MB, costs about 13 exponentiations to build
+        and makes each exponentiation of the base about 5 times faster.
+        :param window: Number of exponent bits handled by one table row.
+        :param max_bytes: Approximate memory budget of all tables.
+        """
+        self.window = window
+        self.max_bytes = max_bytes
+        self._tables: "OrderedDict[Tuple[int, int], FixedBaseTable]" = OrderedDict()
+        self._sizes: Dict[Tuple[int, int], int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._tables)
+
+    def size_bytes(self) -> int:
+        """
+        Returns the approximate memory used by the cached tables.
+        """
+        return sum(self._sizes.values())
+
+    def pow(self, base: int, exponent: int, modulus: int) -> int:
+        """
+        Computes base ** exponent mod modulus from the table of (base, modulus), building or growing it as needed.
+        Falls back to the built-in pow for negative exponents or a table that does not fit in the budget.
+        :param base: The base.
+        :param exponent: The exponent.
+        :param modulus: The modulus.
+        :return: The power.
+        """
+        if exponent < 0:
+            return pow(base, exponent, modulus)
+        key = (base, modulus)
+        bits = exponent.bit_length()
+        with self._lock:
+            table = self._tables.get(key)
+            if table is None:
+                table = FixedBaseTable(base, modulus, self.window)
+                self._tables[key] = table
+                self._sizes[key] = 0
+            self._tables.move_to_end(key)
+            if table.covered_bits() < bits:
+                size = table.size_for(bits)
+                if size > self.max_bytes:
+                    return pow(base, exponent, modulus)
+                while self.size_bytes() - self._sizes[key] + size > self.max_bytes:
+                    evicted, _ = self._tables.popitem(last=False)
+                    del self._sizes[evicted]
+                table.extend(bits)
+                self._sizes[key] = size
+        # Rows are only ever appended, so the power can be computed outside the lock
+        return table.pow(exponent)
+
+    def clear(self):
+        """
+        Drops every table.
+        """
+        with self._lock:
+            self._tables.clear()
+            self._sizes.clear()
+
+# Fixed-base tables shared by the ZKPVerification instances of this process
+default_fixed_base_cache = FixedBaseCache()
+
 
 class ZKPVerification:
-    def __init__(self):
+    def __init__(self, fixed_base_cache: Optional[FixedBaseCache] = None):
         """
         Initializes the ZeroKnowledgeProof (ZKP) system for verifying computations without revealing inputs.
+        :param fixed_base_cache: Cache of fixed-base exponentiation tables used for powers of the base,
+                                 defaults to the cache shared by the whole process.
         """
-        pass
+        self.fixed_base_cache = fixed_base_cache if fixed_base_cache is not None else default_fixed_base_cache
 
     def generate_proof(self, secret: int, base: int, modulus: int) -> dict:
         """
@@ -16,9 +189,9 @@ class ZKPVerification:
         :param modulus: The modulus value used in modular exponentiation.
         :return: A dictionary containing the generated proof details.
         """
-        commitment = pow(base, secret, modulus)  # Compute the commitment
+        commitment = self.fixed_base_cache.pow(base, secret, modulus)  # Compute the commitment
         random_value = random.randint(1, modulus - 1)  # Random value for blinding
-        blinded_commitment = pow(base, random_value, modulus)  # Blinded commitment
+        blinded_commitment = self.fixed_base_cache.pow(base, random_value, modulus)  # Blinded commitment
 
         # Hashing the blinded commitment to create the challenge
         challenge = int(hashlib.sha256(str(blinded_commitment).encode()).hexdigest(), 16) % modulus
@@ -44,17 +217,71 @@ class ZKPVerification:
         :param modulus: The modulus value used in modular exponentiation.
         :return: True if the proof is valid, False otherwise.
         """
-        # Recalculate the expected commitment using the response and challenge
-        left_hand_side = pow(base, proof["response"], modulus)
-        right_hand_side = (proof["blinded_commitment"] * pow(proof["commitment"], proof["challenge"], modulus)) % modulus
-
-        is_valid = left_hand_side == right_hand_side
+        is_valid = self._equation_holds(proof, base, modulus)
         if is_valid:
             print("Proof verified successfully.")
         else:
             print("Proof verification failed.")
         return is_valid
-    
+
+    def _equation_holds(self, proof: dict, base: int, modulus: int) -> bool:
+        """
+        Checks the verification equation of one proof: base ** response == blinded_commitment * commitment ** challenge.
+        """
+        # Recalculate the expected commitment using the response and challenge
+        left_hand_side = self.fixed_base_cache.pow(base, proof["response"], modulus)
+        right_hand_side = (proof["blinded_commitment"] * pow(proof["commitment"], proof["challenge"], modulus)) % modulus
+        return left_hand_side == right_hand_side
+
+    def _batch_holds(self, proofs: Sequence[dict], base: int, modulus: int) -> bool:
+        """
+        Checks a random linear combination of the verification equations of several proofs:
+        base ** sum(w_i * response_i) == prod(blinded_commitment_i ** w_i * commitment_i ** (w_i * challenge_i)),
+        with fresh random weights w_i, so that invalid proofs cannot cancel each other out.
+        """
+        weights = [secrets.randbits(BATCH_WEIGHT_BITS) | 1 for _ in proofs]
+        left_hand_side = self.fixed_base_cache.pow(base, sum(weight * proof["response"] for weight, proof in zip(weights, proofs)), modulus)
+        bases = [proof["blinded_commitment"] for proof in proofs] + [proof["commitment"] for proof in proofs]
+        exponents = weights + [weight * proof["challenge"] for weight, proof in zip(weights, proofs)]
+        return left_hand_side == multi_exponentiate(bases, exponents, modulus)
+
+    def _locate_invalid(self, proofs: Sequence[dict], positions: List[int], base: int, modulus: int, results: List[bool]):
+        """
+        Finds the invalid proofs of a failed batch by splitting it in halves and batch-verifying each half,
+        down to BATCH_SPLIT_THRESHOLD proofs, which are checked one by one.
+        """
+        if len(positions) <= BATCH_SPLIT_THRESHOLD:
+            for position in positions:
+                results[position] = self._equation_holds(proofs[position], base, modulus)
+            return
+        middle = len(positions) // 2
+        first_half, second_half = positions[:middle], positions[middle:]
+        if self._batch_holds([proofs[position] for position in first_half], base, modulus):
+            # The whole batch failed, so the invalid proofs are in the second half
+            self._locate_invalid(proofs, second_half, base, modulus, results)
+            return
+        self._locate_invalid(proofs, first_half, base, modulus, results)
+        if not self._batch_holds([proofs[position] for position in second_half], base, modulus):
+            self._locate_invalid(proofs, second_half, base, modulus, results)
+
+    def verify_batch(self, proofs: Sequence[dict], base: int, modulus: int) -> List[bool]:
+        """
+        Verifies many proofs for the same base and modulus at once, e.g. all proofs submitted in a training round.
+        The verification equations are combined with small random weights and checked with one exponentiation of
+        the base and one multi-exponentiation, instead of two full exponentiations per proof. If the combined check
+        fails, the batch is split to locate the invalid proofs. The combined check is sound when base generates a
+        prime-order subgroup that holds the commitments, as in standard Schnorr groups.
+        :param proofs: The proofs, as returned by generate_proof.
+        :param base: The base value used in modular exponentiation.
+        :param modulus: The modulus value used in modular exponentiation.
+        :return: One verification result per proof, in order.
+        """
+        results = [True] * len(proofs)
+        if proofs and not self._batch_holds(proofs, base, modulus):
+            self._locate_invalid(proofs, list(range(len(proofs))), base, modulus, results)
+        print(f"Batch of {len(proofs)} proofs verified, {results.count(False)} invalid.")
+        return results
+
     def validate_agent_computation(self, agent_id, computation_data):
         # Method logic here
         pass
@@ -74,3 +301,9 @@ if __name__ == "__main__":
     # Verify the generated proof
     verification_result = zkp.verify_proof(proof, base, modulus)
     print(f"Verification result: {verification_result}")
+
+    # Verify a round of proofs at once with a larger prime modulus; the forged proof is located after the combined check fails
+    modulus = 2 ** 521 - 1
+    proofs = [zkp.generate_proof(agent_secret, base, modulus) for agent_secret in range(1, 6)]
+    proofs.append(dict(proofs[0], response=(proofs[0]["response"] + 1) % modulus))
+    print(f"Batch verification results: {zkp.verify_batch(proofs, base, modulus)}")
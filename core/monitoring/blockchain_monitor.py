@@ -1,19 +1,24 @@
 import logging
 import time
 import threading
-from typing import List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 import requests
+from core.communication.grpc_client import BlockchainClient
 
 
 class BlockchainMonitor:
-    def __init__(self, nodes: List[Tuple[str, int]], polling_interval: int = 10, logger: logging.Logger = None):
+    def __init__(self, nodes: List[Tuple[str, int]], polling_interval: int = 10, logger: logging.Logger = None,
+                 grpc_addresses: Optional[List[str]] = None):
         """
         Initializes the BlockchainMonitor for monitoring blockchain node status and metrics.
         :param nodes: A list of node addresses in the format (host, port).
         :param polling_interval: The time interval (in seconds) between polling each node.
         :param logger: Logger instance to log monitoring activities.
+        :param grpc_addresses: Optional gRPC addresses of blockchain services whose chain tips are tracked.
         """
         self.nodes = nodes
+        self.chain_clients = {address: BlockchainClient(address) for address in grpc_addresses or []}
+        self.chain_tips: Dict[str, Dict[str, Any]] = {}
         self.polling_interval = polling_interval
         self.logger = logger or logging.getLogger(__name__)
         self._stop_event = threading.Event()  # Thread-safe stop control
@@ -65,8 +70,28 @@ class BlockchainMonitor:
                         if retry_count == max_retries:
                             self.logger.error(f"Max retries reached for node {host}:{port}. Giving up.")
                     time.sleep(1)  # Small delay before retrying
+            self.poll_chain_tips()
             time.sleep(self.polling_interval)
 
+    def poll_chain_tips(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetches only the latest block height and hash from each gRPC node, instead of the whole chain,
+        and logs how many blocks each node produced since the previous poll.
+        :return: A mapping of node addresses to their last known tip.
+        """
+        for address, client in self.chain_clients.items():
+            tip = client.get_tip(timeout=5)
+            if tip is None:
+                self.logger.error(f"Failed to get the chain tip from node at {address}.")
+                continue
+            previous = self.chain_tips.get(address)
+            new_blocks = tip.height - previous["height"] if previous else 0
+            if previous and tip.height <= previous["height"] and tip.hash != previous["hash"]:
+                self.logger.warning(f"Node at {address} reorganised its chain at height {tip.height}.")
+            self.chain_tips[address] = {"height": tip.height, "hash": tip.hash, "new_blocks": new_blocks}
+            self.logger.info(f"Node at {address} is at height {tip.height} ({new_blocks} new blocks).")
+        return self.chain_tips
+
     def log_node_metrics(self, metrics_endpoint: str):
         """
         Logs detailed metrics for each node by querying the specified metrics endpoint.
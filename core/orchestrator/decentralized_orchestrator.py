@@ -1,17 +1,32 @@
-from typing import List, Dict
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import List, Dict, Optional
 from core.agents.training_agent import TrainingAgent
 from core.agents.identity_management import IdentityManagement
 from core.orchestrator.load_balancer import LoadBalancer
 
+# Terminal states of a task and of every agent assigned to it
+FINISHED_STATES = ("completed", "failed", "cancelled")
+
 class DecentralizedOrchestrator:
-    def __init__(self):
+    def __init__(self, max_workers: Optional[int] = None, agent_timeout: Optional[float] = None):
         """
         Initializes the decentralized orchestrator to manage training and collaboration among multiple agents.
+        :param max_workers: Maximum number of agents training concurrently, defaults to the ThreadPoolExecutor default.
+        :param agent_timeout: Default number of seconds an agent may train before it is marked as failed, None to wait indefinitely.
         """
         self.agents: Dict[str, TrainingAgent] = {}  # Registered agents
         self.identity_manager = IdentityManagement()  # Manage agent identities
         self.load_balancer = LoadBalancer()  # Load balancer to assign tasks to agents
         self.tasks: Dict[str, Dict] = {}  # Track tasks with assigned agents and their status
+        self.agent_timeout = agent_timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="orchestrator")
+        self._tasks_lock = threading.Lock()
+        self._task_futures: Dict[str, Future] = {}  # Resolved with the final task status
+        self._agent_futures: Dict[str, Dict[str, Future]] = {}
+        self._agent_timers: Dict[str, Dict[str, threading.Timer]] = {}
 
     def register_agent(self, agent: TrainingAgent) -> str:
         """
@@ -37,29 +52,173 @@ class DecentralizedOrchestrator:
         else:
             print(f"Agent {agent_id} not found for unregistration.")
 
-    def start_task(self, task_id: str, agent_ids: List[str], description: str):
+    def start_task(self, task_id: str, agent_ids: List[str], description: str,
+                   timeout: Optional[float] = None) -> Optional[Future]:
         """
-        Starts a task by allocating it to specific agents.
+        Starts a task by submitting the training of every assigned agent to the worker pool, so the agents train in
+        parallel and the call returns immediately. The task is pending until its first agent starts training, running
+        while agents train, and completed, failed or cancelled once every agent has finished.
         :param task_id: Unique identifier of the task.
         :param agent_ids: List of agent IDs to assign the task to.
         :param description: Task description.
+        :param timeout: Number of seconds each agent may train before it is marked as failed, defaults to agent_timeout.
+        :return: A future resolved with the final task status, or None if the task was not started.
         """
         if any(agent_id not in self.agents for agent_id in agent_ids):
             print(f"One or more agents specified for task {task_id} are not registered.")
-            return
+            return None
+
+        timeout = timeout if timeout is not None else self.agent_timeout
+        with self._tasks_lock:
+            if self.tasks.get(task_id, {}).get("status") in ("pending", "running"):
+                print(f"Task '{task_id}' is already in progress.")
+                return None
+            # Store the task details and status before any agent can report back
+            self.tasks[task_id] = {
+                "description": description,
+                "agents": list(agent_ids),
+                "status": "pending",
+                "agent_status": {agent_id: {"status": "pending", "error": None} for agent_id in agent_ids},
+                "timeout": timeout,
+                "submitted_at": time.time(),
+                "finished_at": None,
+            }
+            task_future = Future()
+            self._task_futures[task_id] = task_future
+            self._agent_futures[task_id] = {}
+            self._agent_timers[task_id] = {}
 
         for agent_id in agent_ids:
-            agent = self.agents[agent_id]
             print(f"Orchestrator is assigning task '{task_id}' to agent {agent_id}...")
-            agent.train()  # Simulate starting the training task
+            future = self._executor.submit(self._run_agent, task_id, agent_id, self.agents[agent_id], task_future)
+            with self._tasks_lock:
+                # The task may have been cancelled, or cancelled and restarted, meanwhile
+                if self._is_current_run(task_id, task_future) and task_id in self._agent_futures:
+                    self._agent_futures[task_id][agent_id] = future
+            future.add_done_callback(lambda done, agent_id=agent_id: self._agent_done(task_id, agent_id, done, task_future))
+        if not agent_ids:
+            self._finish_agent(task_id, None, None, None, task_future)
+        return task_future
 
-        # Store the task details and status
-        self.tasks[task_id] = {
-            "description": description,
-            "agents": agent_ids,
-            "status": "completed"
-        }
-        print(f"Task '{task_id}' completed successfully.")
+    def _is_current_run(self, task_id: str, run: Future) -> bool:
+        """
+        Tells whether run, the future returned by start_task, belongs to the latest run of the task. Workers and timers
+        of an earlier run that timed out or was cancelled may still report back after the task has been restarted.
+        Must be called with _tasks_lock held.
+        """
+        return self._task_futures.get(task_id) is run
+
+    def _run_agent(self, task_id: str, agent_id: str, agent: TrainingAgent, run: Future):
+        """
+        Trains one agent of a task on a worker thread, starting its timeout when training begins.
+        """
+        with self._tasks_lock:
+            if not self._is_current_run(task_id, run):
+                return  # The task was restarted while this agent was queued
+            task = self.tasks[task_id]
+            if task["agent_status"][agent_id]["status"] != "pending":
+                return  # Cancelled while queued
+            task["agent_status"][agent_id]["status"] = "running"
+            task["status"] = "running"
+            if task["timeout"] is not None:
+                timer = threading.Timer(task["timeout"], self._finish_agent,
+                                        args=(task_id, agent_id, "failed", f"Timed out after {task['timeout']} seconds.",
+                                              run))
+                timer.daemon = True
+                self._agent_timers[task_id][agent_id] = timer
+                timer.start()
+        agent.train()  # Start the training task
+
+    def _agent_done(self, task_id: str, agent_id: str, future: Future, run: Future):
+        """
+        Records the outcome of an agent's training once its worker returns.
+        """
+        if future.cancelled():
+            self._finish_agent(task_id, agent_id, "cancelled", "Cancelled before training started.", run)
+        elif future.exception() is not None:
+            self._finish_agent(task_id, agent_id, "failed", str(future.exception()), run)
+        else:
+            self._finish_agent(task_id, agent_id, "completed", None, run)
+
+    def _finish_agent(self, task_id: str, agent_id: Optional[str], status: Optional[str], error: Optional[str],
+                      run: Future):
+        """
+        Moves an agent to a terminal state, unless it already reached one, and finishes the task once every agent has.
+        A timed out or cancelled agent's thread cannot be interrupted, so whatever it returns later is ignored, even
+        once the task has been restarted under the same ID.
+        """
+        with self._tasks_lock:
+            if not self._is_current_run(task_id, run):
+                return
+            task = self.tasks[task_id]
+            if agent_id is not None:
+                agent_status = task["agent_status"][agent_id]
+                if agent_status["status"] in FINISHED_STATES:
+                    return
+                agent_status.update(status=status, error=error)
+                timer = self._agent_timers[task_id].pop(agent_id, None)
+                if timer is not None:
+                    timer.cancel()
+                if status != "completed":
+                    print(f"Agent {agent_id} did not complete task '{task_id}': {error}")
+            statuses = [agent_status["status"] for agent_status in task["agent_status"].values()]
+            if any(agent_status not in FINISHED_STATES for agent_status in statuses) or task["status"] in FINISHED_STATES:
+                return
+            if "failed" in statuses:
+                task["status"] = "failed"
+            elif "cancelled" in statuses:
+                task["status"] = "cancelled"
+            else:
+                task["status"] = "completed"
+            task["finished_at"] = time.time()
+            task_future = self._task_futures[task_id]
+            del self._agent_futures[task_id], self._agent_timers[task_id]
+            result = self._snapshot(task)
+        print(f"Task '{task_id}' {result['status']}.")
+        task_future.set_result(result)
+
+    def cancel_task(self, task_id: str) -> bool:
+        """
+        Cancels a pending or running task. Agents still queued never start, and agents already training are marked
+        as cancelled without waiting for them.
+        :param task_id: Unique identifier of the task.
+        :return: True if the task was in progress and is now cancelled, False otherwise.
+        """
+        with self._tasks_lock:
+            if self.tasks.get(task_id, {}).get("status") not in ("pending", "running"):
+                return False
+            run = self._task_futures[task_id]
+            agent_futures = dict(self._agent_futures[task_id])
+            agent_ids = list(self.tasks[task_id]["agent_status"])
+        for future in agent_futures.values():
+            future.cancel()
+        for agent_id in agent_ids:
+            self._finish_agent(task_id, agent_id, "cancelled", "Task cancelled.", run)
+        return True
+
+    def wait_for_task(self, task_id: str, timeout: Optional[float] = None) -> Dict:
+        """
+        Blocks until a task finishes.
+        :param task_id: Unique identifier of the task.
+        :param timeout: Maximum number of seconds to wait, None to wait indefinitely.
+        :return: Dictionary containing the task status details, which may still be in progress if the wait timed out.
+        """
+        future = self._task_futures.get(task_id)
+        if future is not None:
+            wait([future], timeout=timeout)
+        return self.get_task_status(task_id)
+
+    async def await_task(self, task_id: str) -> Dict:
+        """
+        Waits for a task to finish without blocking the event loop, e.g. from an async API handler.
+        :param task_id: Unique identifier of the task.
+        :return: Dictionary containing the final task status details.
+        """
+        future = self._task_futures.get(task_id)
+        if future is None:
+            return self.get_task_status(task_id)
+        # Shielded so that cancelling the caller does not cancel the task's own future
+        return await asyncio.shield(asyncio.wrap_future(future))
 
     def get_task_status(self, task_id: str) -> Dict:
         """
@@ -67,7 +226,18 @@ class DecentralizedOrchestrator:
         :param task_id: Unique identifier of the task.
         :return: Dictionary containing the task status details.
         """
-        return self.tasks.get(task_id, {})
+        with self._tasks_lock:
+            return self._snapshot(self.tasks.get(task_id, {}))
+
+    @staticmethod
+    def _snapshot(task: Dict) -> Dict:
+        """
+        Copies a task record so callers never see it change under them.
+        """
+        snapshot = dict(task)
+        if "agent_status" in task:
+            snapshot["agent_status"] = {agent_id: dict(status) for agent_id, status in task["agent_status"].items()}
+        return snapshot
 
     def list_agents(self) -> List[str]:
         """
@@ -79,6 +249,13 @@ class DecentralizedOrchestrator:
     def report_training_completion(self, agent_id: str):
         print("Training completed..."+ agent_id)
 
+    def shutdown(self, wait: bool = True):
+        """
+        Stops the worker pool, cancelling agents that have not started training.
+        :param wait: Whether to wait for agents already training to return.
+        """
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
 # Example usage
 if __name__ == "__main__":
     orchestrator = DecentralizedOrchestrator()
@@ -91,12 +268,15 @@ if __name__ == "__main__":
     agent_2_id = orchestrator.register_agent(agent_2)
 
     # Start a task with registered agents
-    orchestrator.start_task(task_id="task_1", agent_ids=[agent_1_id, agent_2_id], description="Federated Training Task")
+    orchestrator.start_task(task_id="task_1", agent_ids=[agent_1_id, agent_2_id], description="Federated Training Task",
+                            timeout=10.0)
+    print(f"Task Status: {orchestrator.get_task_status('task_1')['status']}")
 
-    # Retrieve task status
-    task_status = orchestrator.get_task_status("task_1")
+    # Wait for both agents, which train in parallel
+    task_status = orchestrator.wait_for_task("task_1")
     print(f"Task Status: {task_status}")
 
     # List registered agents
     registered_agents = orchestrator.list_agents()
     print(f"Registered Agents: {registered_agents}")
+    orchestrator.shutdown()
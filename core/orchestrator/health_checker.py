@@ -0,0 +1,317 @@
+import asyncio
+import logging
+import ssl
+import threading
+import time
+import yaml
+from typing import Callable, Dict, Optional
+from urllib.parse import urlsplit
+from core.orchestrator.load_balancer import LoadBalancer
+
+# Circuit breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 3, success_threshold: int = 2, reset_timeout: float = 10.0,
+                 max_reset_timeout: float = 300.0, clock: Callable[[], float] = time.monotonic):
+        """
+        Initializes a circuit breaker guarding one agent. A closed breaker lets tasks through; after failure_threshold
+        consecutive failures it opens and the agent is excluded. Once reset_timeout has passed the breaker is
+        half-open: the agent is probed again but receives no tasks until success_threshold consecutive successes
+        close the breaker. A failure while half-open opens it again with twice the reset timeout.
+        :param failure_threshold: Consecutive failures that open a closed breaker.
+        :param success_threshold: Consecutive successes that close a half-open breaker.
+        :param reset_timeout: Seconds an open breaker waits before turning half-open.
+        :param max_reset_timeout: Upper bound of the reset timeout as it doubles.
+        :param clock: Monotonic clock, replaceable in tests.
+        """
+        self.failure_threshold = failure_threshold
+        self.success_threshold = success_threshold
+        self.base_reset_timeout = reset_timeout
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.clock = clock
+        self._state = CLOSED
+        self.failures = 0  # Consecutive failures
+        self.successes = 0  # Consecutive successes
+        self.opened_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self.successes = 0
+        return self._state
+
+    def allow_request(self) -> bool:
+        """
+        Tells whether the agent may receive tasks.
+        """
+        return self.state == CLOSED
+
+    def should_probe(self) -> bool:
+        """
+        Tells whether the agent is due for a probe; open breakers are left alone until their reset timeout passes.
+        """
+        return self.state != OPEN
+
+    def record_success(self):
+        state = self.state
+        self.failures = 0
+        self.successes += 1
+        if state == HALF_OPEN and self.successes >= self.success_threshold:
+            self._state = CLOSED
+            self.reset_timeout = self.base_reset_timeout
+
+    def record_failure(self):
+        state = self.state
+        self.successes = 0
+        self.failures += 1
+        if state == HALF_OPEN:
+            self._open(min(self.reset_timeout * 2, self.max_reset_timeout))
+        elif state == CLOSED and self.failures >= self.failure_threshold:
+            self._open(self.base_reset_timeout)
+
+    def _open(self, reset_timeout: float):
+        self._state = OPEN
+        self.reset_timeout = reset_timeout
+        self.opened_at = self.clock()
+
+
+class HealthChecker:
+    def __init__(self, load_balancer: LoadBalancer, targets: Optional[Dict[str, str]] = None, path: str = "/health",
+                 method: str = "GET", expected_response_code: int = 200, interval: float = 10.0, timeout: float = 5.0,
+                 healthy_threshold: int = 2, unhealthy_threshold: int = 3, logger: Optional[logging.Logger] = None):
+        """
+        Initializes an active health checker that probes every target over HTTP at each interval, all targets
+        concurrently, and keeps a circuit breaker per agent. Agents whose breaker is not closed are excluded from
+        allocation by the load balancer.
+        A failed probe of a healthy agent is confirmed by up to unhealthy_threshold - 1 further probes within the
+        same interval, so a failing agent stops receiving tasks within one check interval rather than after
+        unhealthy_threshold intervals, while a single dropped probe does not exclude it.
+        :param load_balancer: The load balancer whose agents are checked.
+        :param targets: Mapping of agent IDs to their base addresses, e.g. "http://192.168.1.101:8000".
+        :param path: Path of the health endpoint.
+        :param method: HTTP method of the probes.
+        :param expected_response_code: Status code of a healthy response.
+        :param interval: Seconds between the starts of two checks.
+        :param timeout: Maximum seconds a probe may take.
+        :param healthy_threshold: Consecutive successful probes before an excluded agent is included again.
+        :param unhealthy_threshold: Consecutive failed probes before an agent is excluded.
+        :param logger: Logger instance to log agent health changes.
+        """
+        self.load_balancer = load_balancer
+        self.targets: Dict[str, str] = {}
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.path = path
+        self.method = method
+        self.expected_response_code = expected_response_code
+        self.interval = interval
+        self.timeout = timeout
+        self.healthy_threshold = healthy_threshold
+        self.unhealthy_threshold = unhealthy_threshold
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()  # Guards targets and breakers against changes from other threads
+        self._stopping = threading.Event()
+        self._stop_event: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        for agent_id, address in (targets or {}).items():
+            self.add_target(agent_id, address)
+
+    @classmethod
+    def from_config(cls, load_balancer: LoadBalancer, config_path: str = "configs/load_balancer_config.yaml",
+                    **kwargs) -> "HealthChecker":
+        """
+        Creates a health checker from the health_check section, the check interval and timeout of the load_balancer
+        section, and the addresses of the target nodes in the load balancer configuration.
+        :param load_balancer: The load balancer whose agents are checked.
+        :param config_path: Path of the load balancer configuration.
+        :param kwargs: Further arguments of the constructor, taking precedence over the configuration.
+        :return: The configured health checker.
+        """
+        with open(config_path) as file:
+            config = yaml.safe_load(file) or {}
+        health_check = config.get("health_check", {})
+        settings = config.get("load_balancer", {})
+        kwargs.setdefault("targets", {node["id"]: node["address"] for node in config.get("target_nodes", [])})
+        kwargs.setdefault("interval", settings.get("health_check_interval", 10.0))
+        kwargs.setdefault("timeout", settings.get("timeout", 5.0))
+        for key in ("path", "method", "expected_response_code", "healthy_threshold", "unhealthy_threshold"):
+            if key in health_check:
+                kwargs.setdefault(key, health_check[key])
+        return cls(load_balancer, **kwargs)
+
+    def add_target(self, agent_id: str, address: str):
+        """
+        Starts checking an agent at the given base address.
+        """
+        with self._lock:
+            self.targets[agent_id] = address
+            self.breakers[agent_id] = CircuitBreaker(failure_threshold=self.unhealthy_threshold,
+                                                     success_threshold=self.healthy_threshold, reset_timeout=self.interval)
+
+    def remove_target(self, agent_id: str):
+        """
+        Stops checking an agent and includes it in allocation again. A check of the agent still in flight is
+        discarded rather than applied.
+        """
+        with self._lock:
+            self.targets.pop(agent_id, None)
+            self.breakers.pop(agent_id, None)
+            self.load_balancer.set_agent_health(agent_id, True)
+
+    def states(self) -> Dict[str, str]:
+        """
+        Returns the circuit breaker state of every target.
+        """
+        with self._lock:
+            return {agent_id: breaker.state for agent_id, breaker in self.breakers.items()}
+
+    async def probe(self, address: str, timeout: Optional[float] = None) -> bool:
+        """
+        Sends one health request to an address.
+        :param address: Base address of the agent.
+        :param timeout: Maximum seconds the probe may take, defaults to the checker's timeout.
+        :return: True if the agent answered with the expected status code in time, False otherwise.
+        """
+        try:
+            return await asyncio.wait_for(self._request(address), timeout or self.timeout)
+        except (OSError, asyncio.TimeoutError, ValueError, IndexError):
+            return False
+
+    async def _request(self, address: str) -> bool:
+        target = urlsplit(address)
+        secure = target.scheme == "https"
+        port = target.port or (443 if secure else 80)
+        reader, writer = await asyncio.open_connection(target.hostname, port,
+                                                       ssl=ssl.create_default_context() if secure else None)
+        try:
+            path = target.path.rstrip("/") + self.path
+            writer.write(f"{self.method} {path} HTTP/1.1\r\nHost: {target.hostname}:{port}\r\n"
+                         f"Connection: close\r\n\r\n".encode())
+            await writer.drain()
+            status_line = await reader.readline()
+            return int(status_line.split()[1]) == self.expected_response_code
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    async def check(self, agent_id: str) -> Optional[str]:
+        """
+        Probes one agent, confirming a failure of a healthy agent within the first half of the interval, and
+        updates its breaker and its availability in the load balancer.
+        :param agent_id: The agent ID.
+        :return: The breaker state after the check, or None if the agent is not, or no longer, a target.
+        """
+        with self._lock:
+            breaker = self.breakers.get(agent_id)
+            address = self.targets.get(agent_id)
+        if breaker is None:
+            return None
+        if not breaker.should_probe():
+            return breaker.state
+        # The first probe may take half an interval and the confirmation probes of a failing agent share the
+        # other half, so the whole check ends within one interval
+        confirmation_timeout = min(self.timeout, self.interval / (2 * self.unhealthy_threshold))
+        healthy = await self.probe(address, min(self.timeout, self.interval / 2))
+        while not healthy:
+            breaker.record_failure()
+            if breaker.state != CLOSED:
+                break
+            await asyncio.sleep(confirmation_timeout / 2)
+            healthy = await self.probe(address, confirmation_timeout / 2)
+        if healthy:
+            breaker.record_success()
+        if not self._apply(agent_id, breaker):
+            return None
+        return breaker.state
+
+    async def check_all(self) -> Dict[str, str]:
+        """
+        Checks every target concurrently.
+        :return: The breaker state of every target after the check, leaving out targets removed meanwhile.
+        """
+        with self._lock:
+            agent_ids = list(self.targets)
+        states = await asyncio.gather(*(self.check(agent_id) for agent_id in agent_ids))
+        return {agent_id: state for agent_id, state in zip(agent_ids, states) if state is not None}
+
+    def _apply(self, agent_id: str, breaker: CircuitBreaker) -> bool:
+        """
+        Updates an agent's availability from its breaker, unless the agent was removed or re-added while it was
+        being probed. Holding the lock keeps remove_target from restoring the agent between the check and the update.
+        :return: Whether the breaker still belongs to a target.
+        """
+        with self._lock:
+            if self.breakers.get(agent_id) is not breaker:
+                return False
+            healthy = breaker.allow_request()
+            if healthy == (agent_id in self.load_balancer.unhealthy):
+                self.logger.warning(f"Agent {agent_id} is {'healthy' if healthy else 'unhealthy'}, circuit {breaker.state}.")
+                self.load_balancer.set_agent_health(agent_id, healthy)
+            return True
+
+    async def run(self):
+        """
+        Checks every target at each interval until stop is called.
+        """
+        self._stop_event = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        next_check = time.monotonic()
+        while not self._stopping.is_set():
+            try:
+                await self.check_all()
+            except Exception:
+                # A failed check must not end the loop, or agents would silently stop being checked
+                self.logger.exception("Health check failed, retrying at the next interval.")
+            next_check += self.interval
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), max(0.0, next_check - time.monotonic()))
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        """
+        Runs the checks on a background thread with its own event loop, for callers without one.
+        """
+        if self._thread is None:
+            self._stopping.clear()
+            self._thread = threading.Thread(target=asyncio.run, args=(self.run(),), daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """
+        Stops the periodic checks and waits for the background thread, if any.
+        """
+        self._stopping.set()
+        if self._loop is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._stop_event.set)
+            except RuntimeError:
+                pass  # The loop has already finished
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+# Example usage
+if __name__ == "__main__":
+    from core.agents.training_agent import TrainingAgent
+
+    load_balancer = LoadBalancer.from_config()
+    checker = HealthChecker.from_config(load_balancer, interval=2.0, timeout=0.5)
+    for agent_id in checker.targets:
+        load_balancer.register_agent(TrainingAgent(agent_id=agent_id, description=f"Training Agent {agent_id}"))
+
+    # The configured addresses are not reachable here, so every agent is excluded after the first check
+    print(f"Circuit breakers: {asyncio.run(checker.check_all())}")
+    try:
+        load_balancer.allocate_task("task_1")
+    except ValueError as e:
+        print(f"Allocation refused: {e}")
@@ -60,12 +60,17 @@ class HierarchicalOrchestrator:
                 else:
                     print(f"Cloud agent {agent_id} is not registered.")
         else:
-            # Allocate task to all edge orchestrators
+            # Allocate task to all edge orchestrators, which train their agents concurrently
+            edge_tasks = []
             for edge_orchestrator in self.edge_orchestrators:
                 print(f"Hierarchical orchestrator delegating task '{task_id}' to an edge orchestrator...")
                 # For simplicity, delegate to the first two agents managed by the edge orchestrator
                 agent_list = edge_orchestrator.list_agents()[:2]
-                edge_orchestrator.start_task(task_id, agent_list, description)
+                edge_task = edge_orchestrator.start_task(task_id, agent_list, description)
+                if edge_task is not None:
+                    edge_tasks.append(edge_task)
+            for edge_task in edge_tasks:
+                edge_task.result()
 
         # Store the task details and status
         self.tasks[task_id] = {
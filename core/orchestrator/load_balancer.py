@@ -1,60 +1,529 @@
+import bisect
+import hashlib
+import heapq
+import itertools
+import logging
+import math
 import random
-from typing import Dict, List
+import threading
+import yaml
+from typing import Callable, Dict, List, Optional
 from core.agents.training_agent import TrainingAgent
 
+
+class BalancingStrategy:
+    """
+    Picks the agent for the next task. Strategies keep their own index over the registered healthy agents, updated
+    as agents join, leave, fail or recover and as their number of in-flight tasks changes, so that a pick never scans
+    every agent.
+    """
+    name = None
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        self.rng = rng or random.Random()
+        self.agent_ids: List[str] = []  # Agents in no particular order, for O(1) sampling
+        self.positions: Dict[str, int] = {}
+        self.weights: Dict[str, float] = {}
+
+    def add_agent(self, agent_id: str, weight: float):
+        self.positions[agent_id] = len(self.agent_ids)
+        self.agent_ids.append(agent_id)
+        self.weights[agent_id] = weight
+
+    def remove_agent(self, agent_id: str):
+        # Swap the last agent into the freed slot so removal stays O(1)
+        position = self.positions.pop(agent_id)
+        last_agent_id = self.agent_ids.pop()
+        if last_agent_id != agent_id:
+            self.agent_ids[position] = last_agent_id
+            self.positions[last_agent_id] = position
+        del self.weights[agent_id]
+
+    def load_changed(self, agent_id: str, in_flight: int):
+        """
+        Called whenever an agent is assigned a task or finishes one.
+        """
+
+    def select(self, in_flight: Dict[str, int], available: Callable[[str], bool]) -> str:
+        """
+        Picks an available agent. The load balancer only calls this if at least one such agent exists.
+        :param in_flight: Number of in-flight tasks per agent.
+        :param available: Tells whether an agent is below max_requests_per_node.
+        :return: The selected agent ID.
+        """
+        raise NotImplementedError
+
+
+class RandomStrategy(BalancingStrategy):
+    """
+    Picks a uniformly random available agent.
+    """
+    name = "random"
+
+    def select(self, in_flight: Dict[str, int], available: Callable[[str], bool]) -> str:
+        while True:
+            agent_id = self.rng.choice(self.agent_ids)
+            if available(agent_id):
+                return agent_id
+
+
+class RoundRobinStrategy(BalancingStrategy):
+    """
+    Cycles through the agents, skipping unavailable ones.
+    """
+    name = "round_robin"
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        super().__init__(rng)
+        self.cursor = 0
+
+    def select(self, in_flight: Dict[str, int], available: Callable[[str], bool]) -> str:
+        while True:
+            agent_id = self.agent_ids[self.cursor % len(self.agent_ids)]
+            self.cursor = (self.cursor + 1) % len(self.agent_ids)
+            if available(agent_id):
+                return agent_id
+
+
+class LeastConnectionsStrategy(BalancingStrategy):
+    """
+    Picks the agent with the fewest in-flight tasks relative to its weight, from a heap keyed by in_flight / weight.
+    Entries are invalidated lazily: a change of load pushes a new entry and the outdated one is dropped once it
+    reaches the top, so every pick and every load change is O(log n) amortised. Ties go to the agent that has
+    been at its load the longest, which spreads equal agents round robin.
+    """
+    name = "least_connections"
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        super().__init__(rng)
+        self.heap = []
+        self.live_entries: Dict[str, int] = {}  # Sequence number of each agent's current heap entry
+        self.sequence = itertools.count()
+
+    def add_agent(self, agent_id: str, weight: float):
+        super().add_agent(agent_id, weight)
+        self.load_changed(agent_id, 0)
+
+    def remove_agent(self, agent_id: str):
+        super().remove_agent(agent_id)
+        del self.live_entries[agent_id]
+
+    def load_changed(self, agent_id: str, in_flight: int):
+        sequence = next(self.sequence)
+        self.live_entries[agent_id] = sequence
+        heapq.heappush(self.heap, (in_flight / self.weights[agent_id], sequence, agent_id))
+        if len(self.heap) > 2 * len(self.live_entries) + 64:
+            # Drop the outdated entries once they outnumber the live ones
+            self.heap = [entry for entry in self.heap if self.live_entries.get(entry[2]) == entry[1]]
+            heapq.heapify(self.heap)
+
+    def select(self, in_flight: Dict[str, int], available: Callable[[str], bool]) -> str:
+        skipped = []
+        try:
+            while True:
+                entry = heapq.heappop(self.heap)
+                if self.live_entries.get(entry[2]) != entry[1]:
+                    continue  # Outdated entry
+                if available(entry[2]):
+                    # The load balancer reports the agent's new load, which pushes its next entry
+                    return entry[2]
+                skipped.append(entry)
+        finally:
+            for entry in skipped:
+                heapq.heappush(self.heap, entry)
+
+
+class WeightedRoundRobinStrategy(BalancingStrategy):
+    """
+    Smooth weighted round robin by stride scheduling: every agent has a pass value advanced by 1 / weight each
+    time it is picked, and the agent with the lowest pass is picked next. An agent of weight 3 is picked three
+    times as often as an agent of weight 1, interleaved rather than in bursts, at O(log n) per pick.
+    """
+    name = "weighted_round_robin"
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        super().__init__(rng)
+        self.heap = []
+        self.live_entries: Dict[str, int] = {}  # Sequence number of each agent's current heap entry
+        self.virtual_time = 0.0  # Pass of the latest pick; new agents start here instead of catching up from 0
+        self.sequence = itertools.count()
+
+    def add_agent(self, agent_id: str, weight: float):
+        super().add_agent(agent_id, weight)
+        self._schedule(agent_id, self.virtual_time + 1 / weight)
+
+    def remove_agent(self, agent_id: str):
+        super().remove_agent(agent_id)
+        del self.live_entries[agent_id]
+        if len(self.heap) > 2 * len(self.live_entries) + 64:
+            self.heap = [entry for entry in self.heap if self.live_entries.get(entry[2]) == entry[1]]
+            heapq.heapify(self.heap)
+
+    def _schedule(self, agent_id: str, agent_pass: float):
+        sequence = next(self.sequence)
+        self.live_entries[agent_id] = sequence
+        heapq.heappush(self.heap, (agent_pass, sequence, agent_id))
+
+    def select(self, in_flight: Dict[str, int], available: Callable[[str], bool]) -> str:
+        while True:
+            agent_pass, sequence, agent_id = heapq.heappop(self.heap)
+            if self.live_entries.get(agent_id) != sequence:
+                continue  # Agent was removed
+            self.virtual_time = agent_pass
+            # Unavailable agents lose their turn, so they do not receive a burst of tasks once they free up
+            self._schedule(agent_id, agent_pass + 1 / self.weights[agent_id])
+            if available(agent_id):
+                return agent_id
+
+
+class PowerOfTwoChoicesStrategy(BalancingStrategy):
+    """
+    Samples two random agents and picks the one with fewer in-flight tasks relative to its weight. This keeps
+    the maximum load within O(log log n) of the average at O(1) per pick, without any shared index to maintain.
+    """
+    name = "power_of_two_choices"
+
+    def select(self, in_flight: Dict[str, int], available: Callable[[str], bool]) -> str:
+        while True:
+            if len(self.agent_ids) == 1:
+                candidates = self.agent_ids
+            else:
+                candidates = self.rng.sample(self.agent_ids, 2)
+            candidates = [agent_id for agent_id in candidates if available(agent_id)]
+            if candidates:
+                return min(candidates, key=lambda agent_id: in_flight[agent_id] / self.weights[agent_id])
+
+
+STRATEGIES = {strategy.name: strategy for strategy in (RandomStrategy, RoundRobinStrategy, LeastConnectionsStrategy,
+                                                       WeightedRoundRobinStrategy, PowerOfTwoChoicesStrategy)}
+
+
+class ConsistentHashRing:
+    """
+    Maps affinity keys, e.g. a dataset shard or model version, to agents on a hash ring. Every agent owns
+    virtual_nodes points per unit of weight, and a key belongs to the first agent clockwise from its hash, so adding
+    or removing one of n agents only moves about 1 / n of the keys and the other agents keep their caches warm.
+    """
+
+    def __init__(self, virtual_nodes: int = 100):
+        self.virtual_nodes = virtual_nodes
+        self.points: Dict[str, List[int]] = {}  # Ring points owned by each agent
+        self._hashes: List[int] = []  # Sorted ring points
+        self._owners: Dict[int, str] = {}
+        # Points added and removed since the last lookup, merged into the ring in one pass
+        self._added: List[int] = []
+        self._removed = set()
+
+    @staticmethod
+    def hash_key(key: str) -> int:
+        return int.from_bytes(hashlib.sha256(key.encode()).digest()[:8], "big")
+
+    def add_agent(self, agent_id: str, weight: float = 1):
+        points = [self.hash_key(f"{agent_id}#{replica}") for replica in range(max(1, round(self.virtual_nodes * weight)))]
+        self.points[agent_id] = points
+        for point in points:
+            self._owners[point] = agent_id
+        # Points removed since the last lookup are still in the ring or in _added, re-adding them cancels the removal
+        pending_removal = self._removed.intersection(points)
+        self._removed.difference_update(pending_removal)
+        self._added.extend(point for point in points if point not in pending_removal)
+
+    def remove_agent(self, agent_id: str):
+        for point in self.points.pop(agent_id, []):
+            del self._owners[point]
+            self._removed.add(point)
+
+    def _merge_changes(self):
+        if self._removed:
+            self._hashes = [point for point in self._hashes if point not in self._removed]
+            self._added = [point for point in self._added if point not in self._removed]
+            self._removed = set()
+        if self._added:
+            # The ring is already sorted, so sorting it with the new points appended is a single merge
+            self._hashes.extend(self._added)
+            self._hashes.sort()
+            self._added = []
+
+    def walk(self, key: str):
+        """
+        Yields the distinct agents in ring order starting from the owner of a key.
+        :param key: The affinity key.
+        """
+        self._merge_changes()
+        if not self._hashes:
+            return
+        start = bisect.bisect(self._hashes, self.hash_key(key))
+        seen = set()
+        for offset in range(len(self._hashes)):
+            agent_id = self._owners[self._hashes[(start + offset) % len(self._hashes)]]
+            if agent_id not in seen:
+                seen.add(agent_id)
+                yield agent_id
+                if len(seen) == len(self.points):
+                    return
+
+    def get_agent(self, key: str) -> Optional[str]:
+        """
+        Returns the agent owning a key, regardless of load.
+        """
+        return next(self.walk(key), None)
+
+
 class LoadBalancer:
-    def __init__(self):
+    def __init__(self, strategy: str = "random", weights: Optional[Dict[str, float]] = None,
+                 max_requests_per_node: Optional[int] = None, seed: Optional[int] = None,
+                 session_stickiness: bool = True, virtual_nodes: int = 100, affinity_load_factor: float = 1.25,
+                 logger: Optional[logging.Logger] = None):
         """
         Initializes the load balancer to manage task distribution among agents.
+        :param strategy: Name of the balancing strategy, one of STRATEGIES.
+        :param weights: Optional weights of agents by ID, agents without a weight default to 1.
+        :param max_requests_per_node: Maximum number of in-flight tasks per agent, None for no limit.
+        :param seed: Optional seed of the random choices, for reproducible allocation.
+        :param session_stickiness: Whether tasks with an affinity key are allocated by consistent hashing.
+        :param virtual_nodes: Number of points per unit of weight each agent owns on the consistent hash ring.
+        :param affinity_load_factor: Bound of an agent's in-flight tasks, relative to its weighted share of all
+                                     in-flight tasks, above which keyed tasks spill over to the next agent on the ring.
+        :param logger: Logger instance to log registrations and allocations.
         """
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown load balancing strategy {strategy}, expected one of {sorted(STRATEGIES)}.")
         self.agents: Dict[str, TrainingAgent] = {}  # Registered agents
+        self.weights: Dict[str, float] = dict(weights or {})
+        self.max_requests_per_node = max_requests_per_node
+        self.logger = logger or logging.getLogger(__name__)
+        self.strategy = STRATEGIES[strategy](random.Random(seed))
+        self.session_stickiness = session_stickiness
+        self.affinity_load_factor = affinity_load_factor
+        self.ring = ConsistentHashRing(virtual_nodes)
+        self.in_flight: Dict[str, int] = {}  # Number of tasks allocated and not yet completed, per agent
+        self.assignments: Dict[str, str] = {}  # Agent each in-flight task is allocated to
+        self.unhealthy = set()  # Agents excluded from allocation by health checks
+        self._unavailable = 0  # Number of registered agents unhealthy or at max_requests_per_node
+        self._total_weight = 0.0
+        self._agent_ids: Optional[List[str]] = None  # Registration order, rebuilt only after agents change
+        self._round_robin_index = 0
+        self._lock = threading.Lock()
 
-    def register_agent(self, agent: TrainingAgent):
+    @classmethod
+    def from_config(cls, load_balancer_config: str = "configs/load_balancer_config.yaml",
+                    performance_config: Optional[str] = "configs/performance_config.yaml", **kwargs) -> "LoadBalancer":
+        """
+        Creates a load balancer from the configuration files. The strategy and max_requests_per_node come from the
+        load_balancing section of the performance configuration, falling back to the load_balancer type, the
+        weights come from the target nodes and session stickiness from the load balancer policies.
+        :param load_balancer_config: Path of the load balancer configuration.
+        :param performance_config: Optional path of the performance configuration.
+        :param kwargs: Further arguments of the constructor, taking precedence over the configuration.
+        :return: The configured load balancer.
+        """
+        with open(load_balancer_config) as file:
+            config = yaml.safe_load(file) or {}
+        performance = {}
+        if performance_config:
+            with open(performance_config) as file:
+                performance = (yaml.safe_load(file) or {}).get("load_balancing", {})
+        kwargs.setdefault("strategy", performance.get("strategy", config.get("load_balancer", {}).get("type", "random")))
+        kwargs.setdefault("max_requests_per_node", performance.get("max_requests_per_node"))
+        kwargs.setdefault("weights", {node["id"]: node.get("weight", 1) for node in config.get("target_nodes", [])})
+        stickiness = config.get("policies", {}).get("session_stickiness", {})
+        kwargs.setdefault("session_stickiness", stickiness.get("enabled", True))
+        return cls(**kwargs)
+
+    def register_agent(self, agent: TrainingAgent, weight: Optional[float] = None):
         """
         Registers an agent to the load balancer.
         :param agent: The agent to be registered.
+        :param weight: Optional weight of the agent, overriding the configured one.
         """
-        if agent.agent_id not in self.agents:
+        with self._lock:
+            if agent.agent_id in self.agents:
+                return
+            if weight is not None:
+                self.weights[agent.agent_id] = weight
+            weight = self.weights.get(agent.agent_id, 1)
+            if weight <= 0:
+                raise ValueError(f"Weight of agent {agent.agent_id} must be positive.")
             self.agents[agent.agent_id] = agent
-            print(f"Agent {agent.agent_id} registered with load balancer.")
+            self.in_flight[agent.agent_id] = 0
+            if agent.agent_id not in self.unhealthy:
+                self._add_to_index(agent.agent_id)
+            self._unavailable += not self._is_available(agent.agent_id)
+            self._agent_ids = None
+        self.logger.info(f"Agent {agent.agent_id} registered with load balancer.")
 
     def unregister_agent(self, agent_id: str):
         """
-        Unregisters an agent from the load balancer.
+        Unregisters an agent from the load balancer, forgetting the tasks still allocated to it.
         :param agent_id: The ID of the agent to be unregistered.
         """
-        if agent_id in self.agents:
+        with self._lock:
+            if agent_id not in self.agents:
+                return
+            self._unavailable -= not self._is_available(agent_id)
+            if agent_id not in self.unhealthy:
+                self._remove_from_index(agent_id)
             del self.agents[agent_id]
-            print(f"Agent {agent_id} unregistered from load balancer.")
+            del self.in_flight[agent_id]
+            self.assignments = {task_id: assigned for task_id, assigned in self.assignments.items() if assigned != agent_id}
+            self._agent_ids = None
+        self.logger.info(f"Agent {agent_id} unregistered from load balancer.")
 
-    def allocate_task(self, task_id: str) -> str:
+    def allocate_task(self, task_id: str, affinity_key: Optional[str] = None) -> str:
         """
-        Allocates a task to an available agent based on a load balancing strategy.
+        Allocates a task to an available agent based on the load balancing strategy. The task counts towards the
+        agent's in-flight tasks until complete_task is called. Allocating a task that is still in flight returns
+        the agent it is already allocated to.
+        With session stickiness, tasks sharing an affinity key, e.g. a dataset shard or model version, go to the
+        agent owning the key on the consistent hash ring, so they hit the same agent's warm DataCache. An agent
+        holding more than affinity_load_factor times its share of the in-flight tasks passes keyed tasks on to the
+        next agent on the ring, which bounds the load a popular key can put on one agent.
         :param task_id: Unique identifier for the task to be allocated.
+        :param affinity_key: Optional key of the data or model the task works on.
         :return: The agent ID of the selected agent.
         """
-        if not self.agents:
-            raise ValueError("No agents available for task allocation.")
-
-        # Implement a simple load balancing strategy: random selection
-        selected_agent_id = random.choice(list(self.agents.keys()))
-        print(f"Task '{task_id}' has been allocated to agent {selected_agent_id}.")
+        with self._lock:
+            if task_id in self.assignments:
+                return self.assignments[task_id]
+            self._check_available()
+            if affinity_key is not None and self.session_stickiness:
+                selected_agent_id = self._select_by_affinity(affinity_key)
+            else:
+                selected_agent_id = self.strategy.select(self.in_flight, self._is_available)
+            self._assign(task_id, selected_agent_id)
+        self.logger.debug(f"Task '{task_id}' has been allocated to agent {selected_agent_id}.")
         return selected_agent_id
 
-    def allocate_task_round_robin(self, task_id: str, current_index: int = 0) -> str:
+    def _select_by_affinity(self, affinity_key: str) -> str:
+        """
+        Picks the first agent clockwise from the key on the hash ring that is below its bounded load.
+        """
+        total_in_flight = len(self.assignments) + 1
+        for agent_id in self.ring.walk(affinity_key):
+            bound = math.ceil(self.affinity_load_factor * total_in_flight * self.weights.get(agent_id, 1) / self._total_weight)
+            if self.in_flight[agent_id] < bound and self._is_available(agent_id):
+                return agent_id
+        # Every agent is at its bound, which rounding can cause with few tasks, so fall back to the strategy
+        return self.strategy.select(self.in_flight, self._is_available)
+
+    def get_affinity_agent(self, affinity_key: str) -> Optional[str]:
         """
-        Allocates a task using a round-robin strategy.
+        Returns the healthy agent owning an affinity key on the consistent hash ring, regardless of its load.
+        :param affinity_key: The affinity key.
+        :return: The agent ID, or None if no healthy agent is registered.
+        """
+        with self._lock:
+            return self.ring.get_agent(affinity_key)
+
+    def allocate_task_round_robin(self, task_id: str, current_index: Optional[int] = None) -> str:
+        """
+        Allocates a task using a round-robin strategy over the agents in registration order, skipping agents that
+        are unhealthy or at max_requests_per_node. Allocating a task that is still in flight returns the agent it
+        is already allocated to.
         :param task_id: Unique identifier for the task to be allocated.
-        :param current_index: The index of the last agent allocated.
+        :param current_index: The index of the agent to allocate to, or of the first agent to try if it is
+                              unavailable, None to continue from the previous allocation.
         :return: The agent ID of the selected agent.
         """
+        with self._lock:
+            if task_id in self.assignments:
+                return self.assignments[task_id]
+            self._check_available()
+            if self._agent_ids is None:
+                self._agent_ids = list(self.agents.keys())
+            agent_ids = self._agent_ids
+            if current_index is not None:
+                index = current_index
+                while not self._is_available(agent_ids[index % len(agent_ids)]):
+                    index += 1
+                selected_agent_id = agent_ids[index % len(agent_ids)]
+            else:
+                while True:
+                    selected_agent_id = agent_ids[self._round_robin_index % len(agent_ids)]
+                    self._round_robin_index = (self._round_robin_index + 1) % len(agent_ids)
+                    if self._is_available(selected_agent_id):
+                        break
+            self._assign(task_id, selected_agent_id)
+        self.logger.debug(f"Task '{task_id}' has been allocated to agent {selected_agent_id} using round-robin strategy.")
+        return selected_agent_id
+
+    def complete_task(self, task_id: str) -> Optional[str]:
+        """
+        Releases an allocated task, so its agent's in-flight count drops.
+        :param task_id: Unique identifier of the completed task.
+        :return: The agent ID the task was allocated to, or None if it was not in flight.
+        """
+        with self._lock:
+            agent_id = self.assignments.pop(task_id, None)
+            if agent_id is None:
+                return None
+            was_available = self._is_available(agent_id)
+            self.in_flight[agent_id] -= 1
+            self._unavailable -= self._is_available(agent_id) - was_available
+            self.strategy.load_changed(agent_id, self.in_flight[agent_id])
+            return agent_id
+
+    def get_load(self, agent_id: str) -> int:
+        """
+        Returns the number of in-flight tasks of an agent.
+        """
+        return self.in_flight.get(agent_id, 0)
+
+    def set_agent_health(self, agent_id: str, healthy: bool):
+        """
+        Includes or excludes an agent from allocation, e.g. from a HealthChecker. Unhealthy agents are taken out
+        of the strategy's index and off the hash ring, so picks never have to skip over them, and their keys move
+        to the next agent on the ring until they recover. Tasks already allocated to an unhealthy agent stay in
+        flight until they are completed.
+        :param agent_id: The agent ID, which may not be registered yet.
+        :param healthy: Whether the agent may receive tasks.
+        """
+        with self._lock:
+            if healthy == (agent_id not in self.unhealthy):
+                return
+            was_available = agent_id in self.agents and self._is_available(agent_id)
+            if healthy:
+                self.unhealthy.discard(agent_id)
+            else:
+                self.unhealthy.add(agent_id)
+            if agent_id in self.agents:
+                if healthy:
+                    self._add_to_index(agent_id)
+                else:
+                    self._remove_from_index(agent_id)
+                self._unavailable -= self._is_available(agent_id) - was_available
+        self.logger.info(f"Agent {agent_id} marked {'healthy' if healthy else 'unhealthy'} by the load balancer.")
+
+    def _add_to_index(self, agent_id: str):
+        weight = self.weights.get(agent_id, 1)
+        self.strategy.add_agent(agent_id, weight)
+        if self.in_flight[agent_id]:
+            self.strategy.load_changed(agent_id, self.in_flight[agent_id])
+        self.ring.add_agent(agent_id, weight)
+        self._total_weight += weight
+
+    def _remove_from_index(self, agent_id: str):
+        self.strategy.remove_agent(agent_id)
+        self.ring.remove_agent(agent_id)
+        self._total_weight -= self.weights.get(agent_id, 1)
+
+    def _check_available(self):
         if not self.agents:
             raise ValueError("No agents available for task allocation.")
+        if self._unavailable == len(self.agents):
+            raise ValueError("All agents are unhealthy or handling max_requests_per_node tasks.")
 
-        agent_ids = list(self.agents.keys())
-        selected_agent_id = agent_ids[current_index % len(agent_ids)]
-        print(f"Task '{task_id}' has been allocated to agent {selected_agent_id} using round-robin strategy.")
-        return selected_agent_id
+    def _is_available(self, agent_id: str) -> bool:
+        if agent_id in self.unhealthy:
+            return False
+        return self.max_requests_per_node is None or self.in_flight[agent_id] < self.max_requests_per_node
+
+    def _assign(self, task_id: str, agent_id: str):
+        self.assignments[task_id] = agent_id
+        was_available = self._is_available(agent_id)
+        self.in_flight[agent_id] += 1
+        self._unavailable -= self._is_available(agent_id) - was_available
+        self.strategy.load_changed(agent_id, self.in_flight[agent_id])
 
     def list_agents(self) -> List[str]:
         """
@@ -65,7 +534,7 @@ class LoadBalancer:
 
 # Example usage
 if __name__ == "__main__":
-    load_balancer = LoadBalancer()
+    load_balancer = LoadBalancer.from_config(strategy="least_connections")
 
     # Create and register agents
     agent_1 = TrainingAgent(agent_id="agent_1", description="Training Agent 1")
@@ -74,11 +543,17 @@ if __name__ == "__main__":
 
     load_balancer.register_agent(agent_1)
     load_balancer.register_agent(agent_2)
-    load_balancer.register_agent(agent_3)
+    load_balancer.register_agent(agent_3, weight=2)
+
+    # Allocate tasks to the least loaded agents, then complete one of them
+    for task_number in range(1, 6):
+        print(f"task_{task_number} allocated to {load_balancer.allocate_task(f'task_{task_number}')}")
+    load_balancer.complete_task("task_1")
+    print(f"In-flight tasks: {load_balancer.in_flight}")
+    load_balancer.allocate_task_round_robin("task_6")
 
-    # Allocate tasks
-    load_balancer.allocate_task("task_1")
-    load_balancer.allocate_task_round_robin("task_2", current_index=1)
+    # Tasks on the same dataset shard stick to the agent that has it cached
+    print(f"Shard 7 tasks allocated to {[load_balancer.allocate_task(f'shard_task_{i}', affinity_key='shard_7') for i in range(3)]}")
 
     # List registered agents
     registered_agents = load_balancer.list_agents()
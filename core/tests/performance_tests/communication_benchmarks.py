@@ -0,0 +1,54 @@
+import secrets
+import time
+from typing import Dict
+from py_ecc import bn128
+from core.communication.zk_proof_communication import ZKPCommunication, ZKPProofPool, g1_table
+
+# Micro-benchmarks for the communication layer, run directly with: python -m core.tests.performance_tests.communication_benchmarks
+
+
+def benchmark_zkp_communication(num_proofs: int = 2000, baseline_proofs: int = 20) -> Dict[str, float]:
+    """
+    Measures bn128 proof generation and verification with bn128.multiply, with the precomputed G1 table on the
+    calling thread, and with the process pool.
+    :param num_proofs: Number of proofs in the round.
+    :param baseline_proofs: Number of proofs timed with bn128.multiply, which is too slow for a full round.
+    :return: A dictionary of throughputs in proofs per second.
+    """
+    secret_values = [secrets.randbelow(bn128.curve_order) for _ in range(num_proofs)]
+    zkp = ZKPCommunication()
+    results = {}
+
+    start = time.perf_counter()
+    for secret in secret_values[:baseline_proofs]:
+        bn128.multiply(bn128.G1, secret)
+        bn128.multiply(bn128.G1, secrets.randbelow(bn128.curve_order))
+    results["bn128_multiply_generation"] = baseline_proofs / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    g1_table()
+    results["g1_table_build_seconds"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    proofs = [zkp.generate_proof(secret) for secret in secret_values]
+    results["table_generation"] = num_proofs / (time.perf_counter() - start)
+    start = time.perf_counter()
+    for proof, secret in zip(proofs, secret_values):
+        zkp.verify_proof(proof, secret)
+    results["table_verification"] = num_proofs / (time.perf_counter() - start)
+
+    proof_pool = ZKPProofPool()
+    # Start the workers and build their tables before timing
+    proof_pool.generate_proofs(secret_values[:proof_pool.workers])
+    proofs = proof_pool.generate_proofs(secret_values)
+    results[f"pool_generation_{proof_pool.workers}_workers"] = proof_pool.throughput()
+    proof_pool.verify_proofs(proofs, secret_values)
+    results[f"pool_verification_{proof_pool.workers}_workers"] = proof_pool.throughput()
+    proof_pool.shutdown()
+
+    for name, value in results.items():
+        print(f"bn128 proofs ({name}): {value:.2f}" + ("" if name.endswith("seconds") else " proofs/s"))
+    return results
+
+if __name__ == "__main__":
+    benchmark_zkp_communication()
@@ -0,0 +1,266 @@
+import random
+import shutil
+import tempfile
+import time
+from typing import Dict
+from core.ledger.block import Block
+from core.ledger.block_store import BlockStore
+from core.ledger.blockchain import Blockchain
+from core.ledger.chain_verifier import ChainVerifier
+from core.ledger.mining import MiningEngine
+from core.ledger.node_setup.node_init import NodeInitializer
+from core.ledger.sharded_ledger import ShardedLedger
+from core.ledger.validator_registry import ValidatorRegistry
+from core.ledger.zkp_verification import FixedBaseCache, ZKPVerification
+
+# 2048-bit MODP group prime from RFC 3526; 4 generates its subgroup of prime order (MODP_2048 - 1) / 2
+MODP_2048 = int(
+    "FFFFFFFFFFFFFFFFC90FDAA22168C234C4C6628B80DC1CD129024E088A67CC74020BBEA63B139B22514A08798E3404DDEF9519B3CD3A431B"
+    "302B0A6DF25F14374FE1356D6D51C245E485B576625E7EC6F44C42E9A637ED6B0BFF5CB6F406B7EDEE386BFB5A899FA5AE9F24117C4B1FE6"
+    "49286651ECE45B3DC2007CB8A163BF0598DA48361C55D39A69163FA8FD24CF5F83655D23DCA3AD961C62F356208552BB9ED529077096966D"
+    "670C354E4ABC9804F1746C08CA18217C32905E462E36CE3BE39E772C180E86039B2783A2EC07A28FB5C55DF06F4C52C9DE2BCBF695581718"
+    "3995497CEA956AE515D2261898FA051015728E5A8AACAA68FFFFFFFFFFFFFFFF", 16)
+
+# Micro-benchmarks for the ledger, run directly with: python -m core.tests.performance_tests.ledger_benchmarks
+
+
+def build_chain(num_blocks: int, payload_size: int = 256):
+    """
+    Builds a linked chain quickly by skipping proof of work.
+    :param num_blocks: Number of blocks after the genesis block.
+    :param payload_size: Size in characters of each block's data.
+    :return: The list of blocks.
+    """
+    chain = [Block(index=0, previous_hash="0", timestamp=time.time(), data="Genesis Block")]
+    for index in range(1, num_blocks + 1):
+        chain.append(Block(index=index, previous_hash=chain[-1].hash, timestamp=time.time(),
+                           data=f"{index}:" + "x" * payload_size))
+    return chain
+
+
+def benchmark_cold_start(num_blocks: int = 20000, payload_size: int = 256) -> Dict[str, float]:
+    """
+    Measures node restart time when loading the chain from a legacy JSON file, from the block store,
+    and from the header snapshot with lazily loaded block data.
+    :param num_blocks: Number of blocks in the chain.
+    :param payload_size: Size in characters of each block's data.
+    :return: A dictionary of load times in seconds.
+    """
+    data_dir = tempfile.mkdtemp()
+    try:
+        node = NodeInitializer("bench_node", [], data_dir, snapshot_interval=num_blocks + 2)
+        node.blockchain.chain = build_chain(num_blocks, payload_size)
+        node.export_blockchain_state()
+        node.save_blockchain_state()
+        node.block_store.close()
+
+        results = {}
+
+        # An empty block store makes the node fall back to the legacy blockchain.json file
+        legacy = NodeInitializer("bench_node", [], data_dir)
+        legacy.block_store.close()
+        legacy.block_store = BlockStore(tempfile.mkdtemp(dir=data_dir))
+        start = time.perf_counter()
+        legacy.load_blockchain_state()
+        results["legacy_json"] = time.perf_counter() - start
+        legacy.block_store.close()
+
+        full = NodeInitializer("bench_node", [], data_dir)
+        start = time.perf_counter()
+        full.load_blockchain_state()
+        results["block_store"] = time.perf_counter() - start
+        full.snapshot_blockchain_state()
+        full.block_store.close()
+
+        snapshot = NodeInitializer("bench_node", [], data_dir)
+        start = time.perf_counter()
+        snapshot.load_blockchain_state()
+        results["header_snapshot"] = time.perf_counter() - start
+        snapshot.block_store.close()
+    finally:
+        shutil.rmtree(data_dir)
+
+    for name, seconds in results.items():
+        print(f"Cold start ({name}, {num_blocks} blocks): {seconds:.3f} s")
+    return results
+
+
+def benchmark_transaction_throughput(num_transactions: int = 256, batch_sizes=(1, 16, 256), difficulty: int = 3) -> Dict[int, float]:
+    """
+    Measures how many transactions per second are recorded when each mined block carries a batch of transactions.
+    :param num_transactions: Number of transactions recorded for each batch size.
+    :param batch_sizes: Numbers of transactions per block to compare.
+    :param difficulty: Proof of work difficulty.
+    :return: A dictionary mapping batch sizes to transactions per second.
+    """
+    results = {}
+    for batch_size in batch_sizes:
+        blockchain = Blockchain(difficulty=difficulty)
+        transactions = [f"agent{i % 100}:reward:{i}" for i in range(num_transactions)]
+        start = time.perf_counter()
+        for offset in range(0, num_transactions, batch_size):
+            blockchain.add_transactions(transactions[offset:offset + batch_size])
+        results[batch_size] = num_transactions / (time.perf_counter() - start)
+
+    for batch_size, rate in results.items():
+        print(f"Throughput ({batch_size} transactions per block, difficulty {difficulty}): {rate:.0f} transactions/s")
+    return results
+
+
+def benchmark_full_verification(num_blocks: int = 1000000, payload_size: int = 64) -> Dict[str, float]:
+    """
+    Measures a full re-verification of the chain, one block after another and split over a process pool.
+    :param num_blocks: Number of blocks in the chain.
+    :param payload_size: Size in characters of each block's data.
+    :return: A dictionary of verification times in seconds.
+    """
+    blockchain = Blockchain(difficulty=1)
+    blockchain.chain = build_chain(num_blocks, payload_size)
+    results = {}
+
+    start = time.perf_counter()
+    blockchain.is_chain_valid()
+    results["sequential"] = time.perf_counter() - start
+
+    verifier = ChainVerifier()
+    start = time.perf_counter()
+    verifier.first_invalid_height(blockchain.chain)
+    results[f"parallel_{verifier.workers}_workers"] = time.perf_counter() - start
+
+    for name, seconds in results.items():
+        print(f"Full verification ({name}, {num_blocks} blocks): {seconds:.2f} s")
+    return results
+
+def benchmark_validator_election(num_validators: int = 10000, num_elections: int = 10000) -> Dict[str, float]:
+    """
+    Measures stake-weighted elections and stake updates across many validators, against a linear scan over the stakes.
+    :param num_validators: Number of registered validators.
+    :param num_elections: Number of elections and stake updates.
+    :return: A dictionary of times in microseconds per operation.
+    """
+    stakes = {f"validator{i}": 1000 + i for i in range(num_validators)}
+    registry = ValidatorRegistry(stakes)
+    results = {}
+
+    start = time.perf_counter()
+    for round_number in range(num_elections):
+        registry.elect(f"block:{round_number}")
+    results["registry_election"] = (time.perf_counter() - start) / num_elections * 1e6
+
+    start = time.perf_counter()
+    for round_number in range(num_elections):
+        registry.set_stake(f"validator{round_number % num_validators}", 2000 + round_number)
+    results["registry_update"] = (time.perf_counter() - start) / num_elections * 1e6
+
+    # Linear scan over cumulative stakes, as a weighted choice without an index has to do
+    linear_rounds = max(1, num_elections // 100)
+    start = time.perf_counter()
+    for round_number in range(linear_rounds):
+        point = hash(round_number) % sum(stakes.values())
+        for validator, stake in stakes.items():
+            point -= stake
+            if point < 0:
+                break
+    results["linear_scan_election"] = (time.perf_counter() - start) / linear_rounds * 1e6
+
+    for name, microseconds in results.items():
+        print(f"Validator election ({name}, {num_validators} validators): {microseconds:.1f} us/op")
+    return results
+
+def benchmark_sharded_throughput(num_blocks: int = 64, shard_counts=(1, 2, 4), difficulty: int = 4) -> Dict[int, float]:
+    """
+    Measures how many blocks per second the ledger appends when they are spread over independent shards,
+    each mined by its own single-process mining engine. Scaling is bounded by the number of CPU cores.
+    :param num_blocks: Number of blocks appended for each shard count.
+    :param shard_counts: Numbers of shards to compare.
+    :param difficulty: Proof of work difficulty.
+    :return: A dictionary mapping shard counts to blocks per second.
+    """
+    results = {}
+    for shard_count in shard_counts:
+        shard_ids = [f"shard{i}" for i in range(shard_count)]
+        engines = {shard_id: MiningEngine(workers=1) for shard_id in shard_ids}
+        ledger = ShardedLedger(shard_ids, difficulty=difficulty, mining_engines=engines)
+        # Start the worker processes before timing
+        ledger.add_blocks({shard_id: "warm-up" for shard_id in shard_ids})
+        start = time.perf_counter()
+        for round_number in range(num_blocks // shard_count):
+            ledger.add_blocks({shard_id: f"{shard_id}:update:{round_number}" for shard_id in shard_ids})
+        results[shard_count] = (num_blocks // shard_count) * shard_count / (time.perf_counter() - start)
+        ledger.close()
+        for engine in engines.values():
+            engine.shutdown()
+
+    for shard_count, rate in results.items():
+        print(f"Sharded throughput ({shard_count} shards, difficulty {difficulty}): {rate:.1f} blocks/s")
+    return results
+
+def benchmark_zkp_batch_verification(num_proofs: int = 256, base: int = 4, modulus: int = MODP_2048) -> Dict[str, float]:
+    """
+    Measures how many Schnorr proofs per second are verified one by one and in one batch.
+    :param num_proofs: Number of proofs in the round.
+    :param base: The group generator.
+    :param modulus: The group modulus.
+    :return: A dictionary of throughputs in proofs per second.
+    """
+    zkp = ZKPVerification()
+    proofs = [zkp.generate_proof(random.getrandbits(256), base, modulus) for _ in range(num_proofs)]
+    results = {}
+
+    start = time.perf_counter()
+    for proof in proofs:
+        zkp.verify_proof(proof, base, modulus)
+    results["per_proof"] = num_proofs / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    zkp.verify_batch(proofs, base, modulus)
+    results["batch"] = num_proofs / (time.perf_counter() - start)
+
+    # One forged proof makes the batch fall back to locating it
+    proofs[num_proofs // 2] = dict(proofs[num_proofs // 2], response=proofs[num_proofs // 2]["response"] + 1)
+    start = time.perf_counter()
+    zkp.verify_batch(proofs, base, modulus)
+    results["batch_with_invalid_proof"] = num_proofs / (time.perf_counter() - start)
+
+    for name, rate in results.items():
+        print(f"Proof verification ({name}, {num_proofs} proofs, {modulus.bit_length()}-bit modulus): {rate:.1f} proofs/s")
+    return results
+
+def benchmark_zkp_proof_generation(num_proofs: int = 64, base: int = 4, modulus: int = MODP_2048) -> Dict[str, float]:
+    """
+    Measures proof generation and verification with the built-in pow and with fixed-base precomputation tables.
+    :param num_proofs: Number of proofs generated and verified.
+    :param base: The group generator.
+    :param modulus: The group modulus.
+    :return: A dictionary of times in milliseconds per proof, and the table build time.
+    """
+    secrets_ = [random.getrandbits(256) for _ in range(num_proofs)]
+    results = {}
+    # A zero budget never builds a table, so every power falls back to the built-in pow
+    for name, cache in (("pow", FixedBaseCache(max_bytes=0)), ("fixed_base_table", FixedBaseCache())):
+        zkp = ZKPVerification(fixed_base_cache=cache)
+        # The first power builds the table, once per process
+        start = time.perf_counter()
+        cache.pow(base, modulus - 1, modulus)
+        results[f"{name}_first_power"] = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        proofs = [zkp.generate_proof(secret, base, modulus) for secret in secrets_]
+        results[f"{name}_generation"] = (time.perf_counter() - start) / num_proofs * 1000
+        start = time.perf_counter()
+        for proof in proofs:
+            zkp.verify_proof(proof, base, modulus)
+        results[f"{name}_verification"] = (time.perf_counter() - start) / num_proofs * 1000
+
+    for name, milliseconds in results.items():
+        print(f"Proof generation ({name}, {modulus.bit_length()}-bit modulus): {milliseconds:.2f} ms")
+    return results
+
+if __name__ == "__main__":
+    benchmark_cold_start()
+    benchmark_transaction_throughput()
+    benchmark_full_verification()
+    benchmark_validator_election()
+    benchmark_sharded_throughput()
+    benchmark_zkp_batch_verification()
+    benchmark_zkp_proof_generation()
@@ -0,0 +1,100 @@
+import random
+import time
+from collections import deque
+from typing import Dict
+from core.agents.training_agent import TrainingAgent
+from core.orchestrator.load_balancer import LoadBalancer, STRATEGIES
+
+# Micro-benchmarks for the orchestrator, run directly with: python -m core.tests.performance_tests.orchestrator_benchmarks
+
+
+def benchmark_load_balancer(num_agents: int = 10000, num_tasks: int = 200000, tasks_in_flight: int = 50000) -> Dict[str, float]:
+    """
+    Measures task allocation with every load balancing strategy while tasks complete in random order, and reports how
+    uneven the resulting loads are. The previous allocation, a random choice over a list rebuilt on every call, is the baseline.
+    :param num_agents: Number of registered agents.
+    :param num_tasks: Number of tasks allocated.
+    :param tasks_in_flight: Number of tasks kept in flight, the oldest random one completing before each new allocation.
+    :return: A dictionary of times in microseconds per allocation.
+    """
+    agents = [TrainingAgent(agent_id=f"agent_{i}", description=f"Training Agent {i}") for i in range(num_agents)]
+    weights = {agent.agent_id: 1 + i % 4 for i, agent in enumerate(agents)}
+    results = {}
+
+    baseline = {agent.agent_id: agent for agent in agents}
+    baseline_tasks = max(1, num_tasks // 100)
+    start = time.perf_counter()
+    for _ in range(baseline_tasks):
+        random.choice(list(baseline.keys()))
+    results["list_rebuild_random"] = (time.perf_counter() - start) / baseline_tasks * 1e6
+
+    for strategy in STRATEGIES:
+        load_balancer = LoadBalancer(strategy=strategy, weights=weights, seed=1)
+        for agent in agents:
+            load_balancer.register_agent(agent)
+        rng = random.Random(2)
+        in_flight = deque()
+        start = time.perf_counter()
+        for task_number in range(num_tasks):
+            if len(in_flight) >= tasks_in_flight:
+                # Complete a random task among the oldest ones, so completions arrive out of order
+                in_flight.rotate(-rng.randrange(16))
+                load_balancer.complete_task(in_flight.popleft())
+            task_id = f"task_{task_number}"
+            load_balancer.allocate_task(task_id)
+            in_flight.append(task_id)
+        results[strategy] = (time.perf_counter() - start) / num_tasks * 1e6
+        loads = [load_balancer.get_load(agent_id) / weights[agent_id] for agent_id in load_balancer.in_flight]
+        print(f"Load balancer ({strategy}): max weighted load {max(loads):.2f}, mean {sum(loads) / len(loads):.2f}")
+
+    for name, microseconds in results.items():
+        print(f"Task allocation ({name}, {num_agents} agents): {microseconds:.2f} us/op")
+    return results
+
+
+def benchmark_affinity_allocation(num_agents: int = 10000, num_keys: int = 100000, num_tasks: int = 100000) -> Dict[str, float]:
+    """
+    Measures consistent-hash allocation of keyed tasks, the share of keys moved when an agent joins, and how many
+    keyed tasks land on the agent owning their key, against random allocation.
+    :param num_agents: Number of registered agents.
+    :param num_keys: Number of distinct affinity keys, e.g. dataset shards.
+    :param num_tasks: Number of keyed tasks allocated.
+    :return: A dictionary of times in microseconds per allocation, the moved share of keys and the cache hit rates.
+    """
+    agents = [TrainingAgent(agent_id=f"agent_{i}", description=f"Training Agent {i}") for i in range(num_agents)]
+    rng = random.Random(3)
+    keys = [f"shard_{i}" for i in range(num_keys)]
+    task_keys = [rng.choice(keys) for _ in range(num_tasks)]
+    results = {}
+
+    for name, session_stickiness in (("random", False), ("consistent_hash", True)):
+        load_balancer = LoadBalancer(strategy="random", seed=1, session_stickiness=session_stickiness)
+        for agent in agents:
+            load_balancer.register_agent(agent)
+        load_balancer.get_affinity_agent(keys[0])  # Build the ring before timing
+        owners = {}
+        hits = 0
+        start = time.perf_counter()
+        for task_number, key in enumerate(task_keys):
+            agent_id = load_balancer.allocate_task(f"task_{task_number}", affinity_key=key)
+            hits += owners.get(key) == agent_id
+            owners.setdefault(key, agent_id)
+            load_balancer.complete_task(f"task_{task_number}")
+        results[name] = (time.perf_counter() - start) / num_tasks * 1e6
+        repeated = num_tasks - len(owners)
+        results[f"{name}_cache_hit_rate"] = hits / repeated if repeated else 0.0
+
+    before = {key: load_balancer.get_affinity_agent(key) for key in keys}
+    load_balancer.register_agent(TrainingAgent(agent_id="agent_new", description="New Training Agent"))
+    start = time.perf_counter()
+    load_balancer.get_affinity_agent(keys[0])
+    results["ring_rebuild_ms"] = (time.perf_counter() - start) * 1000
+    results["moved_key_share"] = sum(load_balancer.get_affinity_agent(key) != before[key] for key in keys) / num_keys
+
+    for name, value in results.items():
+        print(f"Affinity allocation ({name}, {num_agents} agents): {value:.4f}" + (" us/op" if name in ("random", "consistent_hash") else ""))
+    return results
+
+if __name__ == "__main__":
+    benchmark_load_balancer()
+    benchmark_affinity_allocation()
@@ -0,0 +1,222 @@
+import unittest
+import time
+import grpc
+from concurrent import futures
+from unittest.mock import patch
+import core.communication.grpc_server_pb2 as pb2
+from core.communication.grpc_client import BlockchainClient, proto_to_block
+from core.communication.grpc_server import BlockchainService, SerializedBlockCache, add_blockchain_service_to_server, block_to_proto
+from core.ledger.block import Block
+from core.ledger.blockchain import Blockchain
+
+
+def extend_chain(blockchain: Blockchain, count: int, payload: str = ""):
+    """
+    Appends linked blocks without proof of work.
+    """
+    for _ in range(count):
+        last_block = blockchain.get_last_block()
+        blockchain.chain.append(Block(index=last_block.index + 1, previous_hash=last_block.hash,
+                                      timestamp=time.time(), data=f"{last_block.index + 1}:{payload}"))
+
+
+class BlockchainStreamingTest(unittest.TestCase):
+    def setUp(self):
+        self.blockchain = Blockchain(difficulty=1)
+        self.service = BlockchainService(self.blockchain)
+        self.server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+        add_blockchain_service_to_server(self.service, self.server)
+        port = self.server.add_insecure_port("localhost:0")
+        self.server.start()
+        self.client = BlockchainClient(f"localhost:{port}")
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop(None)
+
+    def test_streaming_exceeds_message_limit(self):
+        """
+        Test that a range larger than the gRPC message limit is streamed block by block.
+        """
+        extend_chain(self.blockchain, 60, payload="x" * 100000)
+
+        self.assertIsNone(self.client.get_blockchain_state())
+        blocks = self.client.get_blocks(0, 60)
+        self.assertEqual([block.hash for block in blocks], [block.hash for block in self.blockchain.chain])
+
+    def test_range_is_clamped(self):
+        """
+        Test that ranges beyond the chain return only the existing blocks and headers.
+        """
+        extend_chain(self.blockchain, 5)
+
+        self.assertEqual([block.index for block in self.client.get_blocks(3, 100)], [3, 4, 5])
+        self.assertEqual(self.client.get_blocks(10, 20), [])
+        headers = self.client.get_headers(0, 5)
+        self.assertTrue(all(header.hash == header.compute_hash() for header in headers))
+
+    def test_poll_only_new_blocks(self):
+        """
+        Test that polling returns nothing when the tip is unchanged and only the appended blocks otherwise.
+        """
+        extend_chain(self.blockchain, 3)
+        common_height, blocks = self.client.get_new_blocks([])
+        self.assertEqual((common_height, len(blocks)), (-1, 4))
+
+        known = blocks
+        self.assertEqual(self.client.get_new_blocks(known), (3, []))
+
+        extend_chain(self.blockchain, 2)
+        common_height, blocks = self.client.get_new_blocks(known)
+        self.assertEqual(common_height, 3)
+        self.assertEqual([block.index for block in blocks], [4, 5])
+
+    def test_poll_after_reorganisation(self):
+        """
+        Test that polling after the server switched forks returns blocks from a common ancestor.
+        """
+        extend_chain(self.blockchain, 6)
+        _, known = self.client.get_new_blocks([])
+
+        del self.blockchain.chain[4:]
+        extend_chain(self.blockchain, 4, payload="fork")
+        common_height, blocks = self.client.get_new_blocks(known)
+
+        self.assertLessEqual(common_height, 3)
+        rebuilt = known[:common_height + 1] + blocks
+        self.assertEqual([block.hash for block in rebuilt], [block.hash for block in self.blockchain.chain])
+
+    def test_blockchain_state_from_cached_bytes(self):
+        """
+        Test that GetBlockchainState served from the cache matches freshly built messages.
+        """
+        extend_chain(self.blockchain, 3)
+        blocks = self.client.get_blockchain_state()
+        self.assertEqual(list(blocks), [block_to_proto(block) for block in self.blockchain.chain])
+
+class SerializedBlockCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.blockchain = Blockchain(difficulty=1)
+        extend_chain(self.blockchain, 5)
+        self.cache = SerializedBlockCache(self.blockchain)
+
+    def test_blocks_serialized_once(self):
+        """
+        Test that repeated requests and appends only serialize blocks that were not cached yet.
+        """
+        with patch('core.communication.grpc_server.block_to_proto', side_effect=block_to_proto) as mock_block_to_proto:
+            self.cache.serialized_state()
+            self.cache.serialized_state()
+            self.assertEqual(mock_block_to_proto.call_count, 6)
+
+            extend_chain(self.blockchain, 2)
+            state = pb2.BlockchainState.FromString(self.cache.serialized_state())
+            self.assertEqual(mock_block_to_proto.call_count, 8)
+        self.assertEqual(len(state.blocks), 8)
+
+    def test_reorganisation_invalidates_cache(self):
+        """
+        Test that blocks replaced by a fork are dropped from the cache and the new blocks are served.
+        """
+        self.cache.serialized_state()
+        fork = Blockchain(difficulty=1)
+        fork.chain = self.blockchain.chain[:3]
+        extend_chain(fork, 4, payload="fork")
+        self.blockchain.switch_to_fork(fork.chain, 2)
+
+        state = pb2.BlockchainState.FromString(self.cache.serialized_state())
+        self.assertEqual([block.hash for block in state.blocks], [block.hash for block in self.blockchain.chain])
+        self.assertEqual(self.cache.invalidations, 1)
+        self.assertEqual([pb2.Block.FromString(raw).index for raw in self.cache.serialized_range(5, 100)], [5, 6])
+
+    def test_pruned_blocks_carry_data_digest(self):
+        """
+        Test that blocks whose bodies were pruned are served with their data digest, so clients can verify them,
+        and are left out of block ranges.
+        """
+        self.cache.serialized_state()
+        for height in range(4):
+            self.blockchain.chain[height] = self.blockchain.chain[height].to_header()
+        self.blockchain.pruned_height = 4
+
+        state = pb2.BlockchainState.FromString(self.cache.serialized_state())
+        blocks = [proto_to_block(message) for message in state.blocks]
+        self.assertEqual([block.hash for block in blocks], [block.hash for block in self.blockchain.chain])
+        self.assertEqual([message.data for message in state.blocks[:4]], [""] * 4)
+        self.assertEqual(state.blocks[4].data, "4:")
+        self.assertEqual([pb2.Block.FromString(raw).index for raw in self.cache.serialized_range(0, 100)], [4, 5])
+
+    def test_refresh_reads_only_new_blocks(self):
+        """
+        Test that once the cache is warm, requests neither copy the chain nor the cache entries.
+        """
+        class RecordingChain(list):
+            def __init__(self, blocks):
+                super().__init__(blocks)
+                self.copied = []
+
+            def __getitem__(self, item):
+                if isinstance(item, slice):
+                    self.copied.append(len(range(*item.indices(len(self)))))
+                return super().__getitem__(item)
+
+        chain = RecordingChain(self.blockchain.chain)
+        self.blockchain.chain = chain
+        self.cache.serialized_state()
+        extend_chain(self.blockchain, 1)
+        chain.copied.clear()
+        self.assertEqual(len(self.cache.serialized_range(6, 6)), 1)
+        self.assertEqual(len(self.cache.serialized_range(0, 6)), 7)
+        self.assertLessEqual(max(chain.copied), 1)
+
+    def test_append_cost_independent_of_chain_length(self):
+        """
+        Test that serializing an appended block costs about the same on a long chain as on a short one.
+        """
+        def append_time(length: int) -> float:
+            blockchain = Blockchain(difficulty=1)
+            extend_chain(blockchain, length)
+            cache = SerializedBlockCache(blockchain)
+            cache.refresh()
+            times = []
+            for _ in range(50):
+                extend_chain(blockchain, 1)
+                start = time.perf_counter()
+                cache.refresh()
+                times.append(time.perf_counter() - start)
+            return sorted(times)[len(times) // 2]
+
+        self.assertLess(append_time(20000), 3 * append_time(500) + 0.0001)
+
+    def test_stored_bodies_not_cached(self):
+        """
+        Test that bodies read from disk are serialized on request rather than kept in the cache, including bodies
+        moved to disk after they were cached.
+        """
+        bodies = {block.hash: block.data for block in self.blockchain.chain}
+        reads = []
+
+        def load_data(height, block_hash):
+            reads.append(height)
+            return bodies[block_hash]
+
+        expected = self.cache.serialized_state()
+        for height in range(4):
+            self.blockchain.chain[height] = self.blockchain.chain[height].to_header(load_data)
+        self.assertEqual(self.cache.serialized_state(), expected)
+        self.assertEqual(reads, [0, 1, 2, 3])
+        self.assertEqual([serialized is None for _, _, serialized in self.cache._entries], [True] * 4 + [False] * 2)
+        self.assertEqual(pb2.Block.FromString(self.cache.serialized_range(2, 2)[0]).data, bodies[self.blockchain.chain[2].hash])
+
+    def test_replaced_chain_invalidates_cache(self):
+        """
+        Test that assigning a shorter chain drops the cached blocks above it.
+        """
+        self.cache.serialized_state()
+        self.blockchain.chain = self.blockchain.chain[:2]
+
+        state = pb2.BlockchainState.FromString(self.cache.serialized_state())
+        self.assertEqual(len(state.blocks), 2)
+
+if __name__ == '__main__':
+    unittest.main()
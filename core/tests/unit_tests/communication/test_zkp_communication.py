@@ -1,7 +1,8 @@
 import unittest
+import asyncio
 from unittest.mock import patch, MagicMock
 import logging
-from core.communication.zk_proof_communication import ZKPCommunication  # Correct import here
+from core.communication.zk_proof_communication import ZKPCommunication, ZKPProofPool, g1_multiply  # Correct import here
 from py_ecc import bn128
 import secrets
 
@@ -37,9 +38,9 @@ class TestZKPCommunication(unittest.TestCase):
         self.assertTrue(bn128.is_on_curve(proof["commitment"], bn128.b))
         self.logger.info("test_generate_proof passed")
 
-    @patch("core.communication.zk_proof_communication.bn128.multiply")
+    @patch("core.communication.zk_proof_communication.g1_multiply")
     def test_generate_proof_mock(self, mock_multiply):
-        # Mocking bn128.multiply to verify it is called with correct arguments
+        # Mocking g1_multiply to verify it is called with correct arguments
         secret_value = 42
         mock_multiply.return_value = (1, 2)  # Example return value on the curve (bn128 points are 2 values)
 
@@ -47,9 +48,39 @@ class TestZKPCommunication(unittest.TestCase):
         
         # Ensure multiply was called twice (once for public key, once for commitment)
         self.assertEqual(mock_multiply.call_count, 2)
-        mock_multiply.assert_any_call(bn128.G1, secret_value)
+        mock_multiply.assert_any_call(secret_value)
         self.logger.info("test_generate_proof_mock passed")
 
+    def test_g1_multiply_matches_bn128(self):
+        # Test that the precomputed table gives the same points as bn128.multiply
+        for scalar in [0, 1, 2, 255, 256, 2 ** 200 + 7, bn128.curve_order - 1, bn128.curve_order + 3, secrets.randbelow(bn128.curve_order)]:
+            expected = bn128.multiply(bn128.G1, scalar % bn128.curve_order)
+            self.assertEqual(g1_multiply(scalar), expected)
+        self.assertIsNone(g1_multiply(bn128.curve_order))
+
+    def test_proof_pool(self):
+        # Test that the process pool generates and verifies batches of proofs, blocking and from an event loop
+        proof_pool = ZKPProofPool(workers=2, batch_size=4)
+        try:
+            secret_values = [secrets.randbelow(bn128.curve_order) for _ in range(10)]
+            proofs = proof_pool.generate_proofs(secret_values)
+            self.assertEqual(len(proofs), 10)
+            self.assertTrue(all(self.zkp_comm.verify_proof(proof, secret) for proof, secret in zip(proofs, secret_values)))
+            self.assertEqual(proof_pool.last_stats["proofs"], 10)
+            self.assertGreater(proof_pool.throughput(), 0)
+
+            proofs[3]["commitment"] = (999999, 999999)
+            wrong_secrets = list(secret_values)
+            wrong_secrets[7] += 1
+            self.assertEqual(proof_pool.verify_proofs(proofs, wrong_secrets), [i not in (3, 7) for i in range(10)])
+
+            async def round_trip():
+                async_proofs = await proof_pool.generate_proofs_async(secret_values[:5])
+                return await proof_pool.verify_proofs_async(async_proofs, secret_values[:5])
+            self.assertEqual(asyncio.run(round_trip()), [True] * 5)
+        finally:
+            proof_pool.shutdown()
+
     def test_verify_proof_success(self):
         # Test successful verification of a generated proof
         secret_value = 42
@@ -0,0 +1,197 @@
+import unittest
+import shutil
+import tempfile
+import time
+import grpc
+from concurrent import futures
+import core.communication.grpc_server_pb2_grpc as pb2_grpc
+from core.communication.grpc_server import BlockchainService
+from core.ledger.blockchain import Blockchain
+from core.ledger.contract_state import ContractState
+from core.ledger.node_setup.chain_sync import ChainSynchronizer
+from core.ledger.node_setup.validator_node import ValidatorNode
+
+class CountingBlockchainService(BlockchainService):
+    """
+    Blockchain service that counts block downloads and can be made slow or dishonest.
+    """
+    def __init__(self, blockchain: Blockchain, delay: float = 0.0, tamper: bool = False):
+        super().__init__(blockchain)
+        self.delay = delay
+        self.tamper = tamper
+        self.block_requests = 0
+
+    def GetBlocks(self, request, context):
+        self.block_requests += 1
+        time.sleep(self.delay)
+        response = super().GetBlocks(request, context)
+        if self.tamper:
+            for block in response.blocks:
+                del block.transactions[:]
+                block.data = "Tampered Data"
+        return response
+
+class TestChainSynchronizer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """
+        Mine one peer chain shared by every test.
+        """
+        cls.peer_chain = Blockchain(difficulty=1)
+        for i in range(12):
+            if i % 3 == 0:
+                cls.peer_chain.add_transactions([f"agent{i}:reward:{i}", f"agent{i + 1}:reward:{i + 1}"])
+            else:
+                cls.peer_chain.add_block(f"Block {i + 1} Data")
+
+    def setUp(self):
+        self.servers = []
+        self.synchronizer = None
+
+    def tearDown(self):
+        if self.synchronizer is not None:
+            self.synchronizer.close()
+        for server in self.servers:
+            server.stop(None)
+
+    def start_peer(self, service: BlockchainService) -> str:
+        """
+        Starts an in-process gRPC server for the service and returns its address.
+        """
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+        pb2_grpc.add_BlockchainServicer_to_server(service, server)
+        port = server.add_insecure_port("localhost:0")
+        server.start()
+        self.servers.append(server)
+        return f"localhost:{port}"
+
+    def local_copy(self, height: int) -> Blockchain:
+        """
+        Builds a local blockchain holding the peer chain up to the given height.
+        """
+        local = Blockchain(difficulty=1)
+        local.chain = list(self.peer_chain.chain[:height + 1])
+        return local
+
+    def test_downloads_missing_blocks_from_several_peers(self):
+        """
+        Test that the missing range is split into chunks downloaded from every peer, keeping the local prefix.
+        """
+        services = {f"peer{i}": CountingBlockchainService(self.peer_chain) for i in range(3)}
+        addresses = {peer_id: self.start_peer(service) for peer_id, service in services.items()}
+        self.synchronizer = ChainSynchronizer(addresses, timeout=2.0, chunk_size=2)
+        local = self.local_copy(4)
+
+        candidate = self.synchronizer.sync(local.chain)
+
+        self.assertEqual([block.hash for block in candidate], [block.hash for block in self.peer_chain.chain])
+        self.assertIs(candidate[4], local.chain[4])
+        for service in services.values():
+            self.assertGreater(service.block_requests, 0)
+
+    def test_slow_peer_does_not_stall_sync(self):
+        """
+        Test that chunks assigned to a peer that exceeds the timeout are downloaded from another peer.
+        """
+        slow = CountingBlockchainService(self.peer_chain, delay=3.0)
+        addresses = {
+            "slow": self.start_peer(slow),
+            "fast": self.start_peer(CountingBlockchainService(self.peer_chain)),
+        }
+        self.synchronizer = ChainSynchronizer(addresses, timeout=0.5, chunk_size=3)
+
+        start = time.time()
+        candidate = self.synchronizer.sync(self.local_copy(0).chain)
+
+        self.assertEqual(candidate[-1].hash, self.peer_chain.get_last_block().hash)
+        self.assertLess(time.time() - start, 2.5)
+
+    def test_rejects_blocks_that_do_not_match_headers(self):
+        """
+        Test that tampered blocks are rejected and fetched again from an honest peer.
+        """
+        addresses = {
+            "dishonest": self.start_peer(CountingBlockchainService(self.peer_chain, tamper=True)),
+            "honest": self.start_peer(CountingBlockchainService(self.peer_chain)),
+        }
+        self.synchronizer = ChainSynchronizer(addresses, timeout=2.0, chunk_size=2)
+
+        candidate = self.synchronizer.sync(self.local_copy(2).chain)
+
+        self.assertEqual([block.data for block in candidate], [block.data for block in self.peer_chain.chain])
+
+    def test_finds_fork_point_beyond_header_window(self):
+        """
+        Test that a fork older than the header window is found by falling back to the full header range.
+        """
+        addresses = {"peer": self.start_peer(CountingBlockchainService(self.peer_chain))}
+        self.synchronizer = ChainSynchronizer(addresses, timeout=2.0, header_window=2)
+        local = self.local_copy(1)
+        for i in range(4):
+            local.add_block(f"Fork Block {i + 1}")
+
+        candidate = self.synchronizer.sync(local.chain)
+
+        self.assertEqual(candidate[-1].hash, self.peer_chain.get_last_block().hash)
+        self.assertIs(candidate[1], local.chain[1])
+
+    def test_no_sync_when_peers_are_not_ahead(self):
+        """
+        Test that nothing is downloaded when no reachable peer has a longer chain.
+        """
+        addresses = {
+            "peer": self.start_peer(CountingBlockchainService(self.peer_chain)),
+            "offline": "localhost:1",
+        }
+        self.synchronizer = ChainSynchronizer(addresses, timeout=0.5)
+
+        self.assertIsNone(self.synchronizer.sync(self.peer_chain.chain))
+
+    def test_validator_node_adopts_peer_chain(self):
+        """
+        Test that a validator node with peer addresses adopts the downloaded chain and persists it.
+        """
+        data_dir = tempfile.mkdtemp()
+        addresses = {"peer": self.start_peer(CountingBlockchainService(self.peer_chain))}
+        validator = ValidatorNode("validator1", ["peer"], data_dir, peer_addresses=addresses)
+        self.synchronizer = validator.chain_synchronizer
+        try:
+            validator.blockchain.chain = list(self.peer_chain.chain[:3])
+            validator.initiate_consensus_with_peers()
+
+            self.assertEqual(validator.blockchain.get_last_block().hash, self.peer_chain.get_last_block().hash)
+            self.assertEqual(len(validator.block_store), len(self.peer_chain.chain))
+        finally:
+            validator.block_store.close()
+            shutil.rmtree(data_dir)
+
+    def test_validator_node_bootstraps_from_checkpoint(self):
+        """
+        Test that a new validator node starts from a peer's state checkpoint and downloads only the blocks above it.
+        """
+        checkpoint_key = b"checkpoint-key"
+        peer = Blockchain(difficulty=1, contract_state=ContractState())
+        peer.chain = list(self.peer_chain.chain[:9])
+        peer.create_state_checkpoint(checkpoint_key)
+        peer.prune(retention=0)
+        peer.chain.extend(self.peer_chain.chain[9:])
+        service = CountingBlockchainService(peer)
+
+        data_dir = tempfile.mkdtemp()
+        validator = ValidatorNode("validator1", ["peer"], data_dir, peer_addresses={"peer": self.start_peer(service)},
+                                  checkpoint_key=checkpoint_key)
+        self.synchronizer = validator.chain_synchronizer
+        try:
+            self.assertTrue(validator.bootstrap_from_peers())
+
+            self.assertEqual(validator.blockchain.get_last_block().hash, self.peer_chain.get_last_block().hash)
+            self.assertEqual(validator.blockchain.pruned_height, 9)
+            self.assertEqual(validator.blockchain.chain[12].data, self.peer_chain.chain[12].data)
+            self.assertEqual(service.block_requests, 1)
+            self.assertEqual(validator.load_state_checkpoint()["hash"], self.peer_chain.chain[8].hash)
+        finally:
+            validator.block_store.close()
+            shutil.rmtree(data_dir)
+
+if __name__ == '__main__':
+    unittest.main()
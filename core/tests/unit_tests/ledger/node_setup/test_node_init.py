@@ -2,6 +2,8 @@ import unittest
 from unittest.mock import patch, mock_open, MagicMock
 import os
 import json
+import shutil
+import tempfile
 from core.ledger.blockchain import Blockchain
 from core.ledger.block import Block
 from core.ledger.node_setup.node_init import NodeInitializer
@@ -39,9 +41,9 @@ class TestNodeInitializer(unittest.TestCase):
 
     @patch("builtins.open", new_callable=mock_open)
     @patch("os.path.exists", return_value=True)
-    def test_save_blockchain_state(self, mock_exists, mock_file):
+    def test_export_blockchain_state(self, mock_exists, mock_file):
         """
-        Test that the blockchain state is saved to a file.
+        Test that the blockchain state is exported to a JSON file.
         """
         # Mock the blockchain and block data
         mock_block = MagicMock(spec=Block)
@@ -54,8 +56,8 @@ class TestNodeInitializer(unittest.TestCase):
         # Mock the chain in the blockchain
         self.node_initializer.blockchain.chain = [mock_block]
 
-        # Call save_blockchain_state
-        self.node_initializer.save_blockchain_state()
+        # Call export_blockchain_state
+        self.node_initializer.export_blockchain_state()
 
         # Check that the file was opened for writing
         mock_file.assert_called_once_with(os.path.join(self.data_dir, self.node_id, "blockchain.json"), 'w')
@@ -77,6 +79,56 @@ class TestNodeInitializer(unittest.TestCase):
         self.assertEqual(written_data[0]['data'], "Genesis Block")
         self.assertEqual(written_data[0]['nonce'], 0)
 
+    def test_save_blockchain_state_appends_only_new_blocks(self):
+        """
+        Test that saving writes only the blocks missing from the block store and that they load back.
+        """
+        data_dir = tempfile.mkdtemp()
+        try:
+            node = NodeInitializer("store_node", self.peers, data_dir)
+            node.blockchain.add_block("Block 1 Data")
+            node.save_blockchain_state()
+            self.assertEqual(len(node.block_store), 2)
+
+            with patch.object(node.block_store, 'append_blocks', wraps=node.block_store.append_blocks) as mock_append:
+                node.blockchain.add_block("Block 2 Data")
+                node.save_blockchain_state()
+                appended = mock_append.call_args[0][0]
+                self.assertEqual([block.index for block in appended], [2])
+            node.block_store.close()
+
+            restarted = NodeInitializer("store_node", self.peers, data_dir)
+            restarted.load_blockchain_state()
+            self.assertEqual([block.hash for block in restarted.blockchain.chain],
+                             [block.hash for block in node.blockchain.chain])
+            restarted.block_store.close()
+        finally:
+            shutil.rmtree(data_dir)
+
+    def test_save_blockchain_state_after_reorg(self):
+        """
+        Test that saving after the chain was replaced truncates the stored blocks above the fork point.
+        """
+        data_dir = tempfile.mkdtemp()
+        try:
+            node = NodeInitializer("reorg_node", self.peers, data_dir)
+            node.blockchain.add_block("Block 1 Data")
+            node.save_blockchain_state()
+
+            fork = node.blockchain.chain[:1]
+            peer = Blockchain()
+            peer.chain = list(fork)
+            peer.add_block("Peer Block 1")
+            peer.add_block("Peer Block 2")
+            node.blockchain.chain = peer.chain
+            node.save_blockchain_state()
+
+            self.assertEqual(len(node.block_store), 3)
+            self.assertEqual(node.block_store.read_record(1)["data"], "Peer Block 1")
+            node.block_store.close()
+        finally:
+            shutil.rmtree(data_dir)
+
     @patch("builtins.open", new_callable=mock_open)
     @patch('os.path.exists', return_value=True)
     def test_load_blockchain_state(self, mock_exists, mock_file):
@@ -100,6 +152,41 @@ class TestNodeInitializer(unittest.TestCase):
         self.assertEqual(self.node_initializer.blockchain.chain[0].data, "Genesis Block")
         print("Blockchain loaded successfully")
 
+    def test_load_legacy_blockchain_file(self):
+        """
+        Test that a blockchain.json written with the legacy string block hash is relinked to the binary header
+        hash on load, and that a file linking in neither format is refused.
+        """
+        # Blocks exported before the block hash moved to the binary header
+        legacy_data = [
+            {"index": 0, "previous_hash": "0", "timestamp": 1729249115.9918292, "data": "Genesis Block", "nonce": 0},
+            {"index": 1, "previous_hash": "505f8a67e164fceeca4b2f0d641374b07f080464e715ba36ea51d0887f1d2a02",
+             "timestamp": 1729249118.9932127, "data": "Mined by miner1 at 1729249118.9931948", "nonce": 215355},
+            {"index": 2, "previous_hash": "0000b7c77281e2c58a6ef5ff69ee3d82cad012f95b70797828a98b2a8630fa14",
+             "timestamp": 1729249122.2814019, "data": "Mined by miner1 at 1729249122.2813756", "nonce": 54207}
+        ]
+        data_dir = tempfile.mkdtemp()
+        try:
+            os.makedirs(os.path.join(data_dir, "legacy_node"))
+            blockchain_file = os.path.join(data_dir, "legacy_node", "blockchain.json")
+            with open(blockchain_file, "w") as file:
+                json.dump(legacy_data, file)
+            node = NodeInitializer("legacy_node", self.peers, data_dir)
+            node.load_blockchain_state()
+            self.assertEqual([block.data for block in node.blockchain.chain], [block["data"] for block in legacy_data])
+            self.assertTrue(node.blockchain.is_chain_valid())
+            node.block_store.close()
+
+            legacy_data[1]["data"] = "Tampered"
+            with open(blockchain_file, "w") as file:
+                json.dump(legacy_data, file)
+            node = NodeInitializer("legacy_node", self.peers, data_dir)
+            with self.assertRaises(ValueError):
+                node.load_blockchain_state()
+            node.block_store.close()
+        finally:
+            shutil.rmtree(data_dir)
+
     @patch("builtins.open", new_callable=mock_open)
     @patch('os.path.exists', return_value=False)
     def test_load_blockchain_state_no_file(self, mock_exists, mock_file):
@@ -0,0 +1,54 @@
+import unittest
+import time
+from core.ledger.block import Block, HEADER_SIZE, pack_nonce
+
+class TestBlock(unittest.TestCase):
+    def setUp(self):
+        """
+        Create a block with a large payload before each test.
+        """
+        self.block = Block(index=1, previous_hash="a" * 64, timestamp=time.time(), data="x" * 100000)
+
+    def test_header_has_fixed_size(self):
+        """
+        Test that the binary header size does not depend on the payload size.
+        """
+        small_block = Block(index=1, previous_hash="0", timestamp=time.time(), data="small")
+        self.assertEqual(len(self.block.header_bytes()), HEADER_SIZE)
+        self.assertEqual(len(small_block.header_bytes()), HEADER_SIZE)
+
+    def test_midstate_matches_full_hash(self):
+        """
+        Test that hashing the nonce on top of the cached midstate gives the same hash as compute_hash.
+        """
+        self.block.nonce = 12345
+        sha = self.block.header_midstate().copy()
+        sha.update(pack_nonce(self.block.nonce))
+        self.assertEqual(sha.hexdigest(), self.block.compute_hash())
+
+    def test_data_change_invalidates_hash(self):
+        """
+        Test that changing the data after construction is reflected in the computed hash.
+        """
+        original_hash = self.block.hash
+        self.block.data = "Tampered Data"
+        self.assertNotEqual(self.block.compute_hash(), original_hash)
+
+    def test_header_field_change_invalidates_hash(self):
+        """
+        Test that changing any header field changes the computed hash.
+        """
+        original_hash = self.block.hash
+        self.block.timestamp += 1
+        self.assertNotEqual(self.block.compute_hash(), original_hash)
+
+    def test_block_uses_slots(self):
+        """
+        Test that blocks do not carry a per-instance __dict__.
+        """
+        self.assertFalse(hasattr(self.block, "__dict__"))
+        with self.assertRaises(AttributeError):
+            self.block.unexpected_field = 1
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+import os
+import shutil
+import tempfile
+from core.ledger.blockchain import Blockchain
+from core.ledger.block_store import BlockStore, INDEX_ENTRY
+
+class TestBlockStore(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """
+        Mine one small chain shared by every test.
+        """
+        cls.blockchain = Blockchain(difficulty=1)
+        for i in range(5):
+            cls.blockchain.add_block(f"Block {i + 1} Data")
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_append_and_read(self):
+        """
+        Test that appended blocks are read back with the same contents and hash.
+        """
+        store = BlockStore(self.directory)
+        store.append_blocks(self.blockchain.chain)
+
+        self.assertEqual(len(store), len(self.blockchain.chain))
+        for block in self.blockchain.chain:
+            self.assertEqual(store.get_block(block.index).hash, block.hash)
+            self.assertEqual(store.get_hash(block.index), block.hash)
+        store.close()
+
+    def test_rejects_out_of_order_block(self):
+        """
+        Test that a block which does not extend the store is rejected.
+        """
+        store = BlockStore(self.directory)
+        with self.assertRaises(ValueError):
+            store.append(self.blockchain.chain[2])
+        store.close()
+
+    def test_segments_roll_over(self):
+        """
+        Test that records are spread over several fixed-size segments and remain readable after reopening.
+        """
+        store = BlockStore(self.directory, segment_size=256)
+        store.append_blocks(self.blockchain.chain)
+        store.close()
+
+        segments = [name for name in os.listdir(self.directory) if name.endswith(".seg")]
+        self.assertGreater(len(segments), 1)
+
+        reopened = BlockStore(self.directory, segment_size=256)
+        self.assertEqual(len(reopened), len(self.blockchain.chain))
+        self.assertEqual(reopened.read_record(4)["data"], "Block 4 Data")
+        reopened.close()
+
+    def test_truncate(self):
+        """
+        Test that truncating removes the blocks above the given height and allows appending again.
+        """
+        store = BlockStore(self.directory, segment_size=256)
+        store.append_blocks(self.blockchain.chain)
+        store.truncate(2)
+
+        self.assertEqual(len(store), 2)
+        store.append(self.blockchain.chain[2])
+        self.assertEqual(store.get_hash(2), self.blockchain.chain[2].hash)
+        store.close()
+
+    def test_recovery_truncates_torn_tail(self):
+        """
+        Test that a partially written record at the end of the log is truncated on reopen.
+        """
+        store = BlockStore(self.directory)
+        store.append_blocks(self.blockchain.chain, wait_for_sync=True)
+        store.close()
+
+        segment_path = os.path.join(self.directory, "00000000.seg")
+        intact_size = os.path.getsize(segment_path)
+        with open(segment_path, "ab") as segment_file:
+            segment_file.write(b"\x00\x00\x01\x00torn")
+
+        reopened = BlockStore(self.directory)
+        self.assertEqual(len(reopened), len(self.blockchain.chain))
+        self.assertEqual(os.path.getsize(segment_path), intact_size)
+        reopened.close()
+
+    def test_recovery_reindexes_unindexed_records(self):
+        """
+        Test that complete records whose index entries were lost are re-indexed, and a torn index entry is dropped.
+        """
+        store = BlockStore(self.directory)
+        store.append_blocks(self.blockchain.chain, wait_for_sync=True)
+        store.close()
+
+        index_path = os.path.join(self.directory, "index.idx")
+        os.truncate(index_path, 3 * INDEX_ENTRY.size + 7)
+
+        reopened = BlockStore(self.directory)
+        self.assertEqual(len(reopened), len(self.blockchain.chain))
+        self.assertEqual(os.path.getsize(index_path), len(self.blockchain.chain) * INDEX_ENTRY.size)
+        self.assertEqual(reopened.get_hash(5), self.blockchain.chain[5].hash)
+        reopened.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,5 @@
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 import time
 from core.ledger.block import Block
 from core.ledger.blockchain import Blockchain
@@ -121,5 +121,151 @@ class TestBlockchain(unittest.TestCase):
         # The chain should now be invalid
         self.assertFalse(self.blockchain.is_chain_valid())
 
+    def test_incremental_validation_checks_only_new_blocks(self):
+        """
+        Test that incremental validation resumes from the validated-height watermark.
+        """
+        self.blockchain.add_block("Block 1 Data")
+        self.assertTrue(self.blockchain.is_chain_valid(incremental=True))
+        self.assertEqual(self.blockchain.validated_height, 1)
+
+        # A block below the watermark is not rehashed by incremental validation, but a full audit catches it
+        self.blockchain.chain[1].data = "Tampered Data"
+        self.blockchain.add_block("Block 2 Data")
+        self.assertTrue(self.blockchain.is_chain_valid(incremental=True))
+        self.assertEqual(self.blockchain.validated_height, 2)
+        self.assertFalse(self.blockchain.is_chain_valid())
+        self.assertEqual(self.blockchain.validated_height, 0)
+
+    def test_incremental_validation_detects_invalid_new_block(self):
+        """
+        Test that incremental validation rejects a tampered block above the watermark.
+        """
+        self.blockchain.add_block("Block 1 Data")
+        self.assertTrue(self.blockchain.is_chain_valid(incremental=True))
+        self.blockchain.add_block("Block 2 Data")
+        self.blockchain.chain[2].data = "Tampered Data"
+
+        self.assertFalse(self.blockchain.is_chain_valid(incremental=True))
+        self.assertEqual(self.blockchain.validated_height, 1)
+
+    def test_chain_replacement_resets_watermark(self):
+        """
+        Test that assigning a different chain invalidates the watermark.
+        """
+        self.blockchain.add_block("Block 1 Data")
+        self.assertTrue(self.blockchain.is_chain_valid(incremental=True))
+
+        another_blockchain = Blockchain()
+        another_blockchain.add_block("Block 1 Data from another chain")
+        self.blockchain.chain = another_blockchain.chain
+        self.assertEqual(self.blockchain.validated_height, 0)
+
+        another_blockchain.chain[1].data = "Tampered Data"
+        self.assertFalse(self.blockchain.is_chain_valid(incremental=True))
+
+    def test_consensus_marks_adopted_chain_validated(self):
+        """
+        Test that a chain adopted through consensus does not need to be validated again.
+        """
+        another_blockchain = Blockchain()
+        another_blockchain.add_block("Block 1 Data from another chain")
+        self.blockchain.consensus([another_blockchain.chain])
+        self.assertEqual(self.blockchain.validated_height, 1)
+
+    def test_signed_checkpoint(self):
+        """
+        Test that a signed checkpoint advances the watermark of another node with the same chain.
+        """
+        self.blockchain.add_block("Block 1 Data")
+        self.assertTrue(self.blockchain.is_chain_valid())
+        checkpoint = self.blockchain.create_checkpoint(b"checkpoint-key")
+
+        follower = Blockchain()
+        follower.chain = list(self.blockchain.chain)
+        self.assertFalse(follower.apply_checkpoint(checkpoint, b"wrong-key"))
+        self.assertEqual(follower.validated_height, 0)
+        self.assertTrue(follower.apply_checkpoint(checkpoint, b"checkpoint-key"))
+        self.assertEqual(follower.validated_height, 1)
+
+    def test_find_fork_point(self):
+        """
+        Test that the common ancestor of two chains sharing a prefix is found.
+        """
+        self.blockchain.add_block("Shared Block 1")
+        peer = Blockchain()
+        peer.chain = list(self.blockchain.chain)
+        peer.add_block("Peer Block 2")
+        self.blockchain.add_block("Local Block 2")
+
+        self.assertEqual(self.blockchain.find_fork_point(peer.chain), 1)
+        self.assertEqual(self.blockchain.find_fork_point(Blockchain().chain), -1)
+
+    def test_consensus_validates_only_divergent_suffix(self):
+        """
+        Test that consensus rehashes only the blocks after the fork point and reorganises the chain in place.
+        """
+        self.blockchain.add_block("Shared Block 1")
+        peer = Blockchain()
+        peer.chain = list(self.blockchain.chain)
+        peer.add_block("Peer Block 2")
+        peer.add_block("Peer Block 3")
+        self.blockchain.add_block("Local Block 2")
+
+        local_chain = self.blockchain.chain
+        with patch.object(Block, 'compute_hash', autospec=True, side_effect=Block.compute_hash) as mock_compute_hash:
+            self.blockchain.consensus([peer.chain])
+
+        self.assertEqual(mock_compute_hash.call_count, 2)
+        self.assertIs(self.blockchain.chain, local_chain)
+        self.assertEqual([block.hash for block in self.blockchain.chain], [block.hash for block in peer.chain])
+        self.assertTrue(self.blockchain.is_chain_valid())
+
+    def test_consensus_rejects_invalid_suffix(self):
+        """
+        Test that a longer chain with a tampered block after the fork point is rejected.
+        """
+        peer = Blockchain()
+        peer.chain = list(self.blockchain.chain)
+        peer.add_block("Peer Block 1")
+        peer.add_block("Peer Block 2")
+        peer.chain[2].data = "Tampered Data"
+
+        original_hashes = [block.hash for block in self.blockchain.chain]
+        self.blockchain.consensus([peer.chain])
+        self.assertEqual([block.hash for block in self.blockchain.chain], original_hashes)
+
+    def test_add_transactions(self):
+        """
+        Test that a block stores a batch of transactions committed to by their Merkle root.
+        """
+        transactions = ["agent1:contribution:0.8", "agent2:model:ab12", "agent3:reward:10"]
+        block = self.blockchain.add_transactions(transactions)
+
+        self.assertEqual(block.transactions, transactions)
+        self.assertTrue(self.blockchain.is_chain_valid())
+        with self.assertRaises(ValueError):
+            self.blockchain.add_transactions([])
+
+    def test_transaction_proof(self):
+        """
+        Test that a transaction inclusion proof verifies against the block header and tampering is detected.
+        """
+        self.blockchain.add_transactions([f"agent{i}:reward:{i}" for i in range(5)])
+        transaction_proof = self.blockchain.get_transaction_proof(1, 3)
+        self.assertEqual(transaction_proof["transaction"], "agent3:reward:3")
+        self.assertTrue(self.blockchain.verify_transaction_proof(transaction_proof))
+
+        forged = dict(transaction_proof, transaction="agent3:reward:3000")
+        self.assertFalse(self.blockchain.verify_transaction_proof(forged))
+
+    def test_tampered_transaction_invalidates_chain(self):
+        """
+        Test that replacing a transaction in a mined block breaks the block hash.
+        """
+        block = self.blockchain.add_transactions(["agent1:reward:1", "agent2:reward:2"])
+        block.data = ["agent1:reward:1", "agent2:reward:200"]
+        self.assertFalse(self.blockchain.is_chain_valid())
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+import threading
+import time
+from core.ledger.block import Block
+from core.ledger.blockchain import Blockchain
+from core.ledger.chain_verifier import ChainVerifier
+
+
+def build_chain(num_blocks: int):
+    """
+    Builds a linked chain without proof of work.
+    """
+    chain = [Block(index=0, previous_hash="0", timestamp=time.time(), data="Genesis Block")]
+    for index in range(1, num_blocks + 1):
+        chain.append(Block(index=index, previous_hash=chain[-1].hash, timestamp=time.time(), data=f"Block {index} Data"))
+    return chain
+
+
+class TestChainVerifier(unittest.TestCase):
+    def setUp(self):
+        self.chain = build_chain(1000)
+        self.verifier = ChainVerifier(workers=2, range_size=100)
+
+    def test_valid_chain(self):
+        """
+        Test that a valid chain split over several ranges is reported as valid.
+        """
+        self.assertEqual(self.verifier.first_invalid_height(self.chain), -1)
+        self.assertEqual(self.verifier.last_stats["blocks"], 1000)
+
+    def test_first_invalid_hash(self):
+        """
+        Test that the lowest tampered height is reported when several ranges hold invalid blocks.
+        """
+        self.chain[750].data = "Tampered Data"
+        self.chain[420].data = "Tampered Data"
+        self.assertEqual(self.verifier.first_invalid_height(self.chain), 420)
+
+    def test_broken_link_at_range_boundary(self):
+        """
+        Test that a broken link on the first block of a range is detected by stitching ranges together.
+        """
+        self.chain[300].previous_hash = "0" * 64
+        self.chain[300].hash = self.chain[300].compute_hash()
+        self.assertEqual(self.verifier.first_invalid_height(self.chain), 300)
+
+    def test_spawned_workers(self):
+        """
+        Test that ranges shipped to spawned workers give the same result as forked workers.
+        """
+        self.chain[555].data = "Tampered Data"
+        self.verifier.start_method = "spawn"
+        self.assertEqual(self.verifier.first_invalid_height(self.chain), 555)
+
+    def test_no_fork_while_threads_run(self):
+        """
+        Test that workers are not forked by default once the process runs other threads, e.g. gRPC server threads.
+        """
+        release = threading.Event()
+        thread = threading.Thread(target=release.wait)
+        thread.start()
+        try:
+            self.assertNotEqual(self.verifier._start_method(), "fork")
+            self.chain[555].data = "Tampered Data"
+            self.assertEqual(self.verifier.first_invalid_height(self.chain), 555)
+        finally:
+            release.set()
+            thread.join()
+        self.assertEqual(ChainVerifier(start_method="spawn")._start_method(), "spawn")
+
+    def test_tampered_stored_body(self):
+        """
+        Test that a body read from disk that no longer matches its header digest is reported, in every worker mode.
+        """
+        stored = {block.index: block.data for block in self.chain}
+        lazy_chain = [block.to_header(lambda height, block_hash: stored[height]) for block in self.chain]
+        stored[640] = "Tampered Data"
+        stored[820] = "Tampered Data"
+        for start_method in ("fork", "spawn"):
+            verifier = ChainVerifier(workers=2, range_size=100, start_method=start_method)
+            self.assertEqual(verifier.first_invalid_height(lazy_chain), 640, start_method)
+        self.assertEqual(ChainVerifier(workers=1).first_invalid_height(lazy_chain), 640)
+
+    def test_blockchain_audit_updates_watermark(self):
+        """
+        Test that a blockchain audit returns the first invalid height and moves the watermark below it.
+        """
+        blockchain = Blockchain(difficulty=1)
+        blockchain.chain = self.chain
+        self.assertEqual(blockchain.first_invalid_height(workers=2), -1)
+        self.assertEqual(blockchain.validated_height, 1000)
+
+        self.chain[10].data = "Tampered Data"
+        self.assertEqual(blockchain.first_invalid_height(workers=2), 10)
+        self.assertEqual(blockchain.validated_height, 9)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 from unittest.mock import patch, MagicMock
-from core.ledger.blockchain_ledger import Blockchain, Block
+from core.ledger.blockchain import Blockchain
 from core.ledger.consensus_mechanism import ConsensusMechanism
 
 
@@ -42,7 +42,7 @@ class TestConsensusMechanism(unittest.TestCase):
             self.assertEqual(len(node.chain), 4)
             self.assertEqual(node.chain, self.node3.chain)
 
-    @patch('core.ledger.blockchain_ledger.Blockchain.is_chain_valid', return_value=False)
+    @patch('core.ledger.blockchain.Blockchain.is_chain_valid', return_value=False)
     def test_longest_chain_rule_invalid_chain(self, mock_is_chain_valid):
         """
         Test that an invalid chain is not selected as the longest chain.
@@ -87,6 +87,23 @@ class TestConsensusMechanism(unittest.TestCase):
         # In case of equal stakes, the first node should be selected
         self.assertEqual(selected_node, self.node1)
 
+    def test_proof_of_stake_seeded_election(self):
+        """
+        Test that a seeded proof_of_stake election is stake-weighted and reproducible.
+        """
+        stake_distribution = {
+            id(self.node1): 50,
+            id(self.node2): 0,
+            id(self.node3): 20
+        }
+
+        selected_node = self.consensus.proof_of_stake(stake_distribution, seed="block:1")
+
+        self.assertIn(selected_node, [self.node1, self.node3])
+        self.assertEqual(self.consensus.proof_of_stake(seed="block:1"), selected_node)
+        elected = {self.consensus.proof_of_stake(seed=f"block:{height}") for height in range(50)}
+        self.assertEqual(elected, {self.node1, self.node3})
+
     def test_proof_of_authority(self):
         """
         Test the proof_of_authority method to ensure the correct authority node is selected.
@@ -135,7 +152,7 @@ class TestConsensusMechanism(unittest.TestCase):
         # Ensure no chains are replaced
         self.assertEqual(selected_node.chain, self.node1.chain)
 
-    @patch('core.ledger.blockchain_ledger.Blockchain.is_chain_valid', return_value=True)
+    @patch('core.ledger.blockchain.Blockchain.is_chain_valid', return_value=True)
     def test_longest_chain_with_invalid_nodes(self, mock_is_chain_valid):
         """
         Test longest_chain_rule when there are nodes with invalid chains.
@@ -0,0 +1,147 @@
+import unittest
+import os
+import shutil
+import tempfile
+import time
+from core.ledger.block import Block
+from core.ledger.blockchain import Blockchain
+from core.ledger.contract_state import (ContractState, contract_call, AGGREGATION_CONTRACT, REGISTRATION_CONTRACT,
+                                        REWARDS_CONTRACT)
+from core.ledger.node_setup.node_init import NodeInitializer
+
+
+def append_transactions(blockchain: Blockchain, transactions):
+    """
+    Appends a transaction block without proof of work.
+    """
+    last_block = blockchain.get_last_block()
+    blockchain.chain.append(Block(index=last_block.index + 1, previous_hash=last_block.hash,
+                                  timestamp=time.time(), data=list(transactions)))
+
+
+def register(agent_id: str) -> str:
+    return contract_call(REGISTRATION_CONTRACT, "registerAgent", agent_id, agent_name=agent_id.title())
+
+
+def reward(agent_id: str, amount) -> str:
+    return contract_call(REWARDS_CONTRACT, "distributeReward", "orchestrator", agent=agent_id, reward_amount=amount)
+
+
+class TestContractState(unittest.TestCase):
+    def setUp(self):
+        self.contract_state = ContractState(undo_depth=3)
+        self.blockchain = Blockchain(difficulty=1, contract_state=self.contract_state)
+        append_transactions(self.blockchain, [register("agent1"), reward("agent1", 10), "plain transaction"])
+        append_transactions(self.blockchain, [register("agent2"), reward("agent1", 5),
+                                              contract_call(AGGREGATION_CONTRACT, "addContribution", "agent2",
+                                                            model_hash="ab12", weight=3)])
+
+    def test_contract_semantics(self):
+        """
+        Test that registration, rewards and contributions follow the Solidity contracts.
+        """
+        state = self.blockchain.get_contract_state()
+        self.assertTrue(state.is_agent_registered("agent1"))
+        self.assertFalse(state.is_agent_registered("agent3"))
+        self.assertEqual(state.get_agent_details("agent2")["agent_name"], "Agent2")
+        self.assertEqual(state.get_reward_balance("agent1"), 15)
+        self.assertEqual(state.get_contribution("agent2")["model_hash"], "ab12")
+
+        append_transactions(self.blockchain, [contract_call(REWARDS_CONTRACT, "withdrawReward", "agent1")])
+        state = self.blockchain.get_contract_state()
+        self.assertEqual(state.get_reward_balance("agent1"), 0)
+        self.assertEqual(state.get_withdrawn_rewards("agent1"), 15)
+
+    def test_reverted_calls_leave_state_unchanged(self):
+        """
+        Test that failed require checks revert only their own call.
+        """
+        append_transactions(self.blockchain, [register("agent1"), reward("agent2", 0), reward("agent2", 4),
+                                              contract_call(REWARDS_CONTRACT, "withdrawReward", "agent3")])
+        state = self.blockchain.get_contract_state()
+        self.assertEqual(state.reverted, 3)
+        self.assertEqual(state.get_reward_balance("agent2"), 4)
+        self.assertEqual(state.get_withdrawn_rewards("agent3"), 0)
+
+    def test_reorganisation_rolls_back_state(self):
+        """
+        Test that switching to a fork undoes the replaced blocks and applies the new ones.
+        """
+        root_before = self.blockchain.get_contract_state().state_root()
+        fork = Blockchain(difficulty=1)
+        fork.chain = self.blockchain.chain[:2]
+        append_transactions(fork, [register("agent3")])
+        append_transactions(fork, [reward("agent3", 7)])
+
+        self.blockchain.switch_to_fork(fork.chain, 1)
+
+        state = self.blockchain.get_contract_state()
+        self.assertFalse(state.is_agent_registered("agent2"))
+        self.assertEqual(state.get_reward_balance("agent1"), 10)
+        self.assertEqual(state.get_reward_balance("agent3"), 7)
+        self.assertNotEqual(state.state_root(), root_before)
+
+        replayed = ContractState()
+        replayed.sync(self.blockchain.chain)
+        self.assertEqual(replayed.state_root(), state.state_root())
+
+    def test_deep_reorganisation_rebuilds_state(self):
+        """
+        Test that a fork deeper than the undo logs rebuilds the state from genesis.
+        """
+        for height in range(3, 8):
+            append_transactions(self.blockchain, [reward("agent1", height)])
+        self.blockchain.get_contract_state()
+        fork = Blockchain(difficulty=1)
+        fork.chain = self.blockchain.chain[:2]
+        append_transactions(fork, [reward("agent1", 100)])
+
+        self.blockchain.replace_chain(fork.chain)
+
+        self.assertEqual(self.blockchain.get_contract_state().get_reward_balance("agent1"), 110)
+        self.assertFalse(self.contract_state.is_agent_registered("agent2"))
+
+    def test_rebuild_from_snapshot_and_tail(self):
+        """
+        Test that a node restores the state from its snapshot and applies only the blocks appended afterwards.
+        """
+        data_dir = tempfile.mkdtemp()
+        try:
+            node = NodeInitializer("state_node", [], data_dir)
+            node.blockchain.chain = self.blockchain.chain
+            node.save_blockchain_state()
+            node.snapshot_blockchain_state()
+            append_transactions(node.blockchain, [reward("agent2", 9)])
+            node.save_blockchain_state()
+            node.block_store.close()
+
+            restarted = NodeInitializer("state_node", [], data_dir)
+            restarted.load_blockchain_state()
+            self.assertEqual(len(restarted.contract_state), 3)
+            state = restarted.blockchain.get_contract_state()
+            self.assertEqual(len(state), 4)
+            self.assertEqual(state.get_reward_balance("agent2"), 9)
+            self.assertTrue(state.is_agent_registered("agent1"))
+            restarted.block_store.close()
+        finally:
+            shutil.rmtree(data_dir)
+
+    def test_corrupt_snapshot_ignored(self):
+        """
+        Test that a snapshot whose tables do not match its state root is rejected.
+        """
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "contract_state.json")
+            self.blockchain.get_contract_state().save(path)
+            with open(path) as state_file:
+                content = state_file.read()
+            with open(path, "w") as state_file:
+                state_file.write(content.replace('"agent1": 15', '"agent1": 1500'))
+
+            self.assertFalse(ContractState().load(path))
+        finally:
+            shutil.rmtree(directory)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+import os
+import shutil
+import tempfile
+from core.ledger.block import LazyBlock
+from core.ledger.node_setup.node_init import NodeInitializer
+
+class TestHeaderSnapshot(unittest.TestCase):
+    def setUp(self):
+        """
+        Create a node with a few persisted blocks and a header snapshot.
+        """
+        self.data_dir = tempfile.mkdtemp()
+        self.node = NodeInitializer("snapshot_node", ["peer1"], self.data_dir, snapshot_interval=2)
+        self.node.blockchain.difficulty = 1
+        for i in range(3):
+            self.node.blockchain.add_block(f"Block {i + 1} Data")
+        self.node.save_blockchain_state()
+        self.node.block_store.close()
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def restart(self) -> NodeInitializer:
+        restarted = NodeInitializer("snapshot_node", ["peer1"], self.data_dir, snapshot_interval=2)
+        restarted.load_blockchain_state()
+        self.addCleanup(restarted.block_store.close)
+        return restarted
+
+    def test_startup_loads_headers_lazily(self):
+        """
+        Test that restarting from a snapshot yields lazy blocks with the original hashes and data.
+        """
+        restarted = self.restart()
+        chain = restarted.blockchain.chain
+
+        self.assertEqual(restarted.snapshot_height, 4)
+        self.assertTrue(all(isinstance(block, LazyBlock) for block in chain))
+        self.assertEqual([block.hash for block in chain], [block.hash for block in self.node.blockchain.chain])
+        self.assertEqual(chain[2].data, "Block 2 Data")
+        self.assertTrue(restarted.blockchain.is_chain_valid())
+
+    def test_tampered_lazy_block_detected(self):
+        """
+        Test that replacing the data of a lazily loaded block is caught by validation.
+        """
+        restarted = self.restart()
+        restarted.blockchain.chain[1].data = "Tampered Data"
+        self.assertFalse(restarted.blockchain.is_chain_valid())
+
+    def tamper_stored_body(self, node: NodeInitializer, height: int, original: bytes, tampered: bytes):
+        segment, offset, _ = node.block_store.location(height)
+        segment_path = os.path.join(node.block_store.directory, f"{segment:08d}.seg")
+        with open(segment_path, "r+b") as segment_file:
+            segment_file.seek(offset)
+            record = segment_file.read()
+            segment_file.seek(offset + record.index(original))
+            segment_file.write(tampered)
+
+    def test_tampered_stored_body_detected(self):
+        """
+        Test that a block body rewritten on disk is refused when the lazy block reads it.
+        """
+        restarted = self.restart()
+        self.tamper_stored_body(restarted, 2, b"Block 2 Data", b"Block 9 Data")
+
+        self.assertEqual(restarted.blockchain.chain[1].data, "Block 1 Data")
+        with self.assertRaises(ValueError):
+            restarted.blockchain.chain[2].data
+
+    def test_audit_detects_tampered_stored_body(self):
+        """
+        Test that a full audit hashes the stored bodies, although the headers alone still verify.
+        """
+        restarted = self.restart()
+        self.assertEqual(restarted.blockchain.first_invalid_height(workers=1), -1)
+        self.tamper_stored_body(restarted, 2, b"Block 2 Data", b"Block 9 Data")
+
+        self.assertTrue(restarted.blockchain.is_chain_valid())
+        self.assertEqual(restarted.blockchain.first_invalid_height(workers=1), 2)
+        self.assertEqual(restarted.blockchain.validated_height, 1)
+
+    def test_blocks_after_snapshot_loaded_from_store(self):
+        """
+        Test that blocks appended after the last snapshot are read from the block store.
+        """
+        restarted = self.restart()
+        restarted.blockchain.difficulty = 1
+        restarted.blockchain.add_block("Block 4 Data")
+        restarted.save_blockchain_state()
+        restarted.block_store.close()
+
+        again = self.restart()
+        self.assertEqual(len(again.blockchain.chain), 5)
+        self.assertEqual(again.blockchain.chain[4].data, "Block 4 Data")
+        self.assertTrue(again.blockchain.is_chain_valid())
+
+    def test_corrupt_snapshot_ignored(self):
+        """
+        Test that a corrupt snapshot falls back to loading every block from the store.
+        """
+        snapshot_path = os.path.join(self.data_dir, "snapshot_node", "headers.snap")
+        with open(snapshot_path, "ab") as snapshot_file:
+            snapshot_file.write(b"garbage")
+
+        restarted = self.restart()
+        self.assertEqual(restarted.snapshot_height, 0)
+        self.assertEqual([block.hash for block in restarted.blockchain.chain],
+                         [block.hash for block in self.node.blockchain.chain])
+
+if __name__ == '__main__':
+    unittest.main()
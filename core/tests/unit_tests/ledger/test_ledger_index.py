@@ -0,0 +1,112 @@
+import unittest
+import json
+import os
+import shutil
+import tempfile
+import time
+from core.ledger.block import Block
+from core.ledger.blockchain import Blockchain
+from core.ledger.ledger_index import LedgerIndex
+from core.ledger.node_setup.node_init import NodeInitializer
+
+
+def append_transactions(blockchain: Blockchain, transactions):
+    """
+    Appends a transaction block without proof of work.
+    """
+    last_block = blockchain.get_last_block()
+    blockchain.chain.append(Block(index=last_block.index + 1, previous_hash=last_block.hash,
+                                  timestamp=time.time(), data=list(transactions)))
+
+
+def event(agent_id: str, **fields) -> str:
+    return json.dumps(dict(agent_id=agent_id, **fields))
+
+
+class TestLedgerIndex(unittest.TestCase):
+    def setUp(self):
+        self.ledger_index = LedgerIndex(extractors={"kind": lambda transaction: transaction.split(":")[:1]})
+        self.blockchain = Blockchain(difficulty=1, ledger_index=self.ledger_index)
+        append_transactions(self.blockchain, [event("agent1", reward=10), event("agent2", model_hash="ab12")])
+        append_transactions(self.blockchain, [event("agent1", model_hash="cd34"), "reward:agent3"])
+
+    def test_hash_lookup(self):
+        """
+        Test that blocks are found by hash and unknown hashes return None.
+        """
+        for block in self.blockchain.chain:
+            self.assertIs(self.blockchain.get_block_by_hash(block.hash), block)
+        self.assertIsNone(self.blockchain.get_block_by_hash("0" * 64))
+
+    def test_secondary_lookups(self):
+        """
+        Test that JSON fields and custom extractors are indexed per transaction.
+        """
+        self.assertEqual(self.blockchain.find_transactions("agent_id", "agent1"), [(1, 0), (2, 0)])
+        self.assertEqual(self.blockchain.find_transactions("model_hash", "ab12"), [(1, 1)])
+        self.assertEqual(self.blockchain.find_transactions("kind", "reward"), [(2, 1)])
+        self.assertEqual(self.blockchain.find_transactions("agent_id", "nobody"), [])
+        with self.assertRaises(KeyError):
+            self.blockchain.find_transactions("reward", "10")
+
+    def test_reorganisation_updates_indexes(self):
+        """
+        Test that switching to a fork removes the replaced blocks from every index and adds the new ones.
+        """
+        self.blockchain.find_transactions("agent_id", "agent1")
+        fork = Blockchain(difficulty=1)
+        fork.chain = self.blockchain.chain[:2]
+        append_transactions(fork, [event("agent4")])
+        append_transactions(fork, [event("agent1")])
+        replaced_hash = self.blockchain.chain[2].hash
+
+        self.blockchain.switch_to_fork(fork.chain, 1)
+
+        self.assertEqual(self.blockchain.find_transactions("agent_id", "agent1"), [(1, 0), (3, 0)])
+        self.assertEqual(self.blockchain.find_transactions("model_hash", "cd34"), [])
+        self.assertIsNone(self.blockchain.get_block_by_hash(replaced_hash))
+        self.assertEqual(len(self.ledger_index), 4)
+
+    def test_save_and_load(self):
+        """
+        Test that a persisted index is restored, and rejected when built with other indexes.
+        """
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "ledger_index.json")
+            self.ledger_index.sync(self.blockchain.chain)
+            self.ledger_index.save(path)
+
+            restored = LedgerIndex(extractors={"kind": lambda transaction: []})
+            self.assertTrue(restored.load(path))
+            self.assertEqual(restored.lookup("agent_id", "agent1"), [(1, 0), (2, 0)])
+            self.assertEqual(restored.height_of(self.blockchain.chain[2].hash), 2)
+            self.assertEqual(restored.sync(self.blockchain.chain), 0)
+
+            self.assertFalse(LedgerIndex(fields=["agent_id"]).load(path))
+        finally:
+            shutil.rmtree(directory)
+
+    def test_node_restores_index_and_indexes_new_blocks(self):
+        """
+        Test that a node persists its index with the snapshot and only indexes blocks appended afterwards on restart.
+        """
+        data_dir = tempfile.mkdtemp()
+        try:
+            node = NodeInitializer("index_node", [], data_dir, snapshot_interval=1)
+            node.blockchain.chain = self.blockchain.chain[:]
+            node.save_blockchain_state()
+            append_transactions(node.blockchain, [event("agent1", reward=1)])
+            node.snapshot_interval = 100
+            node.save_blockchain_state()
+            node.block_store.close()
+
+            restarted = NodeInitializer("index_node", [], data_dir)
+            restarted.load_blockchain_state()
+            self.assertEqual(restarted.blockchain.find_transactions("agent_id", "agent1"), [(1, 0), (2, 0), (3, 0)])
+            restarted.block_store.close()
+        finally:
+            shutil.rmtree(data_dir)
+
+if __name__ == '__main__':
+    unittest.main()
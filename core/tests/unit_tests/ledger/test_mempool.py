@@ -0,0 +1,190 @@
+import unittest
+import time
+import grpc
+from concurrent import futures
+import core.communication.grpc_server_pb2_grpc as pb2_grpc
+from core.communication.grpc_client import BlockchainClient
+from core.communication.grpc_server import BlockchainService
+from core.ledger.blockchain import Blockchain
+from core.ledger.mempool import BlockAssembler, Mempool, CONFIRMED, PENDING, UNKNOWN
+
+class TestMempool(unittest.TestCase):
+    def setUp(self):
+        self.mempool = Mempool(max_size=10)
+
+    def test_batch_sealed_by_size(self):
+        """
+        Test that a full batch is returned immediately, in submission order.
+        """
+        transaction_ids = [self.mempool.submit(f"tx{i}") for i in range(5)]
+        batch = self.mempool.wait_for_batch(max_count=3, max_delay=60.0, timeout=1.0)
+
+        self.assertEqual(batch, [(transaction_ids[i], f"tx{i}") for i in range(3)])
+        self.assertEqual(len(self.mempool), 2)
+
+    def test_batch_sealed_by_deadline(self):
+        """
+        Test that a partial batch is returned once its oldest transaction has waited the maximum delay.
+        """
+        self.mempool.submit("tx0")
+        start = time.monotonic()
+        batch = self.mempool.wait_for_batch(max_count=100, max_delay=0.2, timeout=5.0)
+
+        self.assertEqual(len(batch), 1)
+        self.assertGreaterEqual(time.monotonic() - start, 0.15)
+
+    def test_wait_for_batch_times_out_when_empty(self):
+        """
+        Test that waiting on an empty pool returns an empty batch after the timeout.
+        """
+        self.assertEqual(self.mempool.wait_for_batch(max_count=1, max_delay=0.0, timeout=0.05), [])
+
+    def test_requeue_keeps_order(self):
+        """
+        Test that a requeued batch goes back in front of newer transactions.
+        """
+        for i in range(3):
+            self.mempool.submit(f"tx{i}")
+        batch = self.mempool.wait_for_batch(max_count=2, max_delay=60.0)
+        self.mempool.requeue(batch)
+
+        self.assertEqual([transaction for _, transaction in self.mempool.wait_for_batch(3, 60.0)], ["tx0", "tx1", "tx2"])
+
+    def test_full_mempool_rejects_submissions(self):
+        """
+        Test that submissions beyond the maximum size are rejected.
+        """
+        for i in range(10):
+            self.mempool.submit(f"tx{i}")
+        with self.assertRaises(RuntimeError):
+            self.mempool.submit("overflow")
+
+    def test_status_and_unknown_transaction(self):
+        """
+        Test that submitted transactions are pending and unknown ids are reported as such.
+        """
+        transaction_id = self.mempool.submit("tx0")
+        self.assertEqual(self.mempool.status(transaction_id)["status"], PENDING)
+        self.assertEqual(self.mempool.status("missing")["status"], UNKNOWN)
+
+class TestBlockAssembler(unittest.TestCase):
+    def setUp(self):
+        self.blockchain = Blockchain(difficulty=1)
+        self.assembler = BlockAssembler(self.blockchain, max_block_transactions=4, max_block_delay=0.1)
+
+    def tearDown(self):
+        self.assembler.stop()
+
+    def test_transactions_confirmed_in_batches(self):
+        """
+        Test that submitted transactions are sealed into blocks of at most the maximum size and confirmed.
+        """
+        transaction_ids = [self.assembler.submit(f"agent{i}:reward:{i}") for i in range(10)]
+        statuses = [self.assembler.mempool.wait_for_confirmation(transaction_id, timeout=10) for transaction_id in transaction_ids]
+
+        self.assertTrue(all(status["status"] == CONFIRMED for status in statuses))
+        self.assertEqual(sum(len(block.transactions) for block in self.blockchain.chain[1:]), 10)
+        self.assertTrue(all(len(block.transactions) <= 4 for block in self.blockchain.chain[1:]))
+        last = statuses[-1]
+        self.assertEqual(self.blockchain.chain[last["height"]].transactions[last["position"]], "agent9:reward:9")
+
+    def test_lost_race_requeues_batch(self):
+        """
+        Test that a batch whose block loses the race for the chain tip is requeued.
+        """
+        self.blockchain.add_transactions = lambda transactions: None
+        self.assembler.mempool.submit("tx0")
+        batch = self.assembler.mempool.wait_for_batch(1, 0.0)
+
+        self.assertIsNone(self.assembler.seal_block(batch))
+        self.assertEqual(len(self.assembler.mempool), 1)
+
+    def test_failed_seal_requeues_and_backs_off(self):
+        """
+        Test that a batch whose sealing raises is requeued and retried after a delay rather than in a tight loop.
+        """
+        attempts = []
+
+        def failing_add_transactions(transactions):
+            attempts.append(transactions)
+            raise RuntimeError("disk full")
+
+        self.blockchain.add_transactions = failing_add_transactions
+        with self.assertLogs("core.ledger.mempool", level="ERROR"):
+            transaction_id = self.assembler.submit("tx0")
+            time.sleep(0.5)
+
+        self.assertTrue(self.assembler._thread.is_alive())
+        self.assertLessEqual(len(attempts), 4)
+        self.assertEqual(self.assembler.mempool.status(transaction_id)["status"], PENDING)
+        del self.blockchain.add_transactions
+        self.assertEqual(self.assembler.mempool.wait_for_confirmation(transaction_id, timeout=10)["status"], CONFIRMED)
+
+    def test_non_proposer_leaves_batches_pending(self):
+        """
+        Test that in Proof of Authority mode no batch is taken while another authority proposes the next block.
+        """
+        class OtherAuthority:
+            def is_proposer(self, height):
+                return False
+
+        self.blockchain.authority = OtherAuthority()
+        self.blockchain.add_transactions = lambda transactions: self.fail("Sealed on a non-proposer node.")
+        transaction_ids = [self.assembler.submit(f"tx{i}") for i in range(4)]
+        time.sleep(0.3)
+        self.assertEqual(len(self.assembler.mempool), 4)
+        self.assertEqual({self.assembler.mempool.status(transaction_id)["status"] for transaction_id in transaction_ids}, {PENDING})
+
+    def test_dropped_block_transactions_pending_again(self):
+        """
+        Test that transactions confirmed in a block dropped by a switch to a fork are pending and sealed again.
+        """
+        transaction_ids = [self.assembler.mempool.submit(f"tx{i}") for i in range(2)]
+        block = self.assembler.seal_block(self.assembler.mempool.wait_for_batch(2, 0.0))
+        self.assertEqual(self.assembler.mempool.status(transaction_ids[0])["status"], CONFIRMED)
+
+        fork = Blockchain(difficulty=1)
+        fork.chain = self.blockchain.chain[:1]
+        fork.add_block("Peer block 1")
+        fork.add_block("Peer block 2")
+        self.blockchain.switch_to_fork(fork.chain, 0)
+        self.assertEqual(self.assembler.requeue_dropped(), 2)
+        self.assertEqual(self.assembler.requeue_dropped(), 0)
+        self.assertEqual(self.assembler.mempool.status(transaction_ids[0])["status"], PENDING)
+
+        self.assembler.start()
+        status = self.assembler.mempool.wait_for_confirmation(transaction_ids[1], timeout=10)
+        self.assertEqual(status["status"], CONFIRMED)
+        self.assertNotEqual(status["block_hash"], block.hash)
+        self.assertEqual(self.blockchain.chain[status["height"]].transactions[status["position"]], "tx1")
+
+class TestAddBlockRpc(unittest.TestCase):
+    def setUp(self):
+        self.blockchain = Blockchain(difficulty=5)
+        self.service = BlockchainService(self.blockchain, BlockAssembler(self.blockchain, max_block_delay=0.1))
+        self.server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+        pb2_grpc.add_BlockchainServicer_to_server(self.service, self.server)
+        port = self.server.add_insecure_port("localhost:0")
+        self.server.start()
+        self.client = BlockchainClient(f"localhost:{port}")
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop(None)
+        self.service.stop()
+
+    def test_submission_does_not_wait_for_mining(self):
+        """
+        Test that AddBlock returns a transaction id before the block is mined, and the client can wait for confirmation.
+        """
+        start = time.monotonic()
+        transaction_ids = [self.client.add_block(f"Block data {i}") for i in range(5)]
+        submission_time = time.monotonic() - start
+
+        status = self.client.wait_for_transaction(transaction_ids[-1], timeout=60)
+        self.assertEqual(status.status, CONFIRMED)
+        self.assertLess(submission_time, 1.0)
+        self.assertEqual(self.blockchain.chain[status.height].transactions[status.position], "Block data 4")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+from core.ledger.merkle import hash_leaf, merkle_proof, merkle_root, verify_merkle_proof
+
+class TestMerkle(unittest.TestCase):
+    def setUp(self):
+        self.transactions = [f"agent{i}:reward:{i * 10}" for i in range(7)]
+
+    def test_single_transaction_root_is_its_leaf(self):
+        """
+        Test that the root of a single transaction is its leaf hash.
+        """
+        self.assertEqual(merkle_root(["only"]), hash_leaf("only"))
+
+    def test_root_depends_on_every_transaction(self):
+        """
+        Test that changing, reordering or duplicating transactions changes the root.
+        """
+        root = merkle_root(self.transactions)
+        self.assertNotEqual(merkle_root(self.transactions[:-1] + ["agent6:reward:0"]), root)
+        self.assertNotEqual(merkle_root(list(reversed(self.transactions))), root)
+        self.assertNotEqual(merkle_root(self.transactions + self.transactions[-1:]), root)
+
+    def test_proofs_verify_for_every_position(self):
+        """
+        Test that the inclusion proof of every transaction verifies against the root, for odd and even counts.
+        """
+        for count in (1, 2, 5, 8):
+            transactions = self.transactions[:count] if count <= len(self.transactions) else self.transactions + ["extra"]
+            root = merkle_root(transactions)
+            for position, transaction in enumerate(transactions):
+                proof = merkle_proof(transactions, position)
+                self.assertTrue(verify_merkle_proof(transaction, proof, root))
+
+    def test_proof_rejects_other_transaction(self):
+        """
+        Test that a proof does not verify for a different transaction or against a different root.
+        """
+        root = merkle_root(self.transactions)
+        proof = merkle_proof(self.transactions, 3)
+        self.assertFalse(verify_merkle_proof("agent3:reward:9999", proof, root))
+        self.assertFalse(verify_merkle_proof(self.transactions[3], proof, merkle_root(self.transactions[:6])))
+
+    def test_empty_and_out_of_range(self):
+        """
+        Test that an empty transaction list has no root and proofs require a valid position.
+        """
+        with self.assertRaises(ValueError):
+            merkle_root([])
+        with self.assertRaises(IndexError):
+            merkle_proof(self.transactions, len(self.transactions))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+import threading
+import time
+from core.ledger.block import Block
+from core.ledger.blockchain import Blockchain
+from core.ledger.mining import MiningEngine
+
+class TestMiningEngine(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """
+        Share one engine across tests so the worker processes are started only once.
+        """
+        cls.engine = MiningEngine(workers=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.engine.shutdown()
+
+    def test_mine_finds_valid_nonce(self):
+        """
+        Test that the parallel search returns a block whose hash meets the difficulty and matches its contents.
+        """
+        block = Block(index=1, previous_hash="0", timestamp=time.time(), data="Parallel block")
+        mined_block = self.engine.mine(block, difficulty=3)
+
+        self.assertIsNotNone(mined_block)
+        self.assertTrue(mined_block.hash.startswith("000"))
+        self.assertEqual(mined_block.hash, mined_block.compute_hash())
+
+    def test_hash_rate_reported(self):
+        """
+        Test that the engine reports the hashes computed and the resulting hash rate.
+        """
+        block = Block(index=1, previous_hash="0", timestamp=time.time(), data="Hash rate block")
+        self.engine.mine(block, difficulty=3)
+
+        self.assertGreater(self.engine.last_stats["hashes"], 0)
+        self.assertGreater(self.engine.hash_rate(), 0)
+
+    def test_cancel_stops_mining(self):
+        """
+        Test that cancelling from another thread abandons an unreachable difficulty.
+        """
+        block = Block(index=1, previous_hash="0", timestamp=time.time(), data="Cancelled block")
+        timer = threading.Timer(0.5, self.engine.cancel)
+        timer.start()
+
+        start = time.time()
+        result = self.engine.mine(block, difficulty=64)
+        timer.join()
+
+        self.assertIsNone(result)
+        self.assertLess(time.time() - start, 10)
+
+    def test_cancel_before_mining_starts(self):
+        """
+        Test that cancelling a tip before its block is mined is not lost, and that mining another tip clears it.
+        """
+        self.engine.cancel("tip")
+        start = time.time()
+        self.assertIsNone(self.engine.mine(Block(index=1, previous_hash="tip", timestamp=time.time(), data="Stale block"), difficulty=64))
+        self.assertLess(time.time() - start, 1)
+
+        self.assertIsNotNone(self.engine.mine(Block(index=2, previous_hash="peer", timestamp=time.time(), data="Next block"), difficulty=1))
+        self.assertIsNotNone(self.engine.mine(Block(index=1, previous_hash="tip", timestamp=time.time(), data="Fork block"), difficulty=1))
+
+    def test_blockchain_uses_mining_engine(self):
+        """
+        Test that a blockchain configured with an engine mines valid blocks through it.
+        """
+        blockchain = Blockchain(mining_engine=self.engine, difficulty=3)
+        new_block = blockchain.add_block("Engine mined block")
+
+        self.assertIs(blockchain.get_last_block(), new_block)
+        self.assertTrue(new_block.hash.startswith("000"))
+        self.assertTrue(blockchain.is_chain_valid())
+
+if __name__ == '__main__':
+    unittest.main()
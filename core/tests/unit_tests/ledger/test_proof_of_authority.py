@@ -0,0 +1,114 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from core.ledger.blockchain import Blockchain
+from core.ledger.block_store import BlockStore
+from core.ledger.header_snapshot import HeaderSnapshot
+from core.ledger.proof_of_authority import ProofOfAuthority, generate_authority_key
+
+AUTHORITY_IDS = ["authority1", "authority2", "authority3"]
+
+
+class TestProofOfAuthority(unittest.TestCase):
+    def setUp(self):
+        self.keys = {authority: generate_authority_key() for authority in AUTHORITY_IDS}
+        self.public_keys = {authority: public_key for authority, (_, public_key) in self.keys.items()}
+        self.producers = {
+            authority: Blockchain(authority=ProofOfAuthority(self.public_keys, authority, signing_key))
+            for authority, (signing_key, _) in self.keys.items()
+        }
+        self.chain = self.producers["authority1"].chain
+
+    def produce(self, count: int):
+        """
+        Lets the authorities append blocks to the shared chain in turn.
+        """
+        for _ in range(count):
+            producer = self.producers[AUTHORITY_IDS[len(self.chain) % len(AUTHORITY_IDS)]]
+            producer.chain = self.chain
+            self.assertIsNotNone(producer.add_block(f"Block {len(self.chain)}"))
+
+    def test_rotation(self):
+        """
+        Test that authorities take turns by height.
+        """
+        authority = ProofOfAuthority(self.public_keys)
+        self.assertEqual([authority.proposer(height) for height in range(1, 5)],
+                         ["authority2", "authority3", "authority1", "authority2"])
+        self.assertFalse(authority.is_proposer(1))
+
+    def test_blocks_signed_without_proof_of_work(self):
+        """
+        Test that PoA blocks are signed by their proposer and never run proof of work.
+        """
+        with patch.object(Blockchain, 'proof_of_work') as mock_proof_of_work:
+            self.produce(4)
+        mock_proof_of_work.assert_not_called()
+        self.assertTrue(all(block.nonce == 0 and block.signature for block in self.chain[1:]))
+
+        follower = Blockchain(authority=ProofOfAuthority(self.public_keys))
+        follower.consensus([self.chain])
+        self.assertEqual(follower.chain[-1].hash, self.chain[-1].hash)
+        self.assertTrue(follower.is_chain_valid())
+
+    def test_out_of_turn_block_rejected(self):
+        """
+        Test that an authority does not produce a block out of turn.
+        """
+        self.producers["authority1"].chain = self.chain
+        self.assertIsNone(self.producers["authority1"].add_block("Out of turn"))
+        self.assertEqual(len(self.chain), 1)
+
+    def test_forged_signature_rejected(self):
+        """
+        Test that followers reject blocks signed by the wrong authority or not signed at all.
+        """
+        self.produce(3)
+        authority = ProofOfAuthority(self.public_keys)
+        self.assertEqual(authority.first_invalid_height(self.chain), -1)
+
+        # Authority 3 signs the block of authority 1's turn at height 3
+        self.chain[3].signature = self.keys["authority3"][0].sign(bytes.fromhex(self.chain[3].hash)).hex()
+        self.assertEqual(authority.first_invalid_height(self.chain), 3)
+        follower = Blockchain(authority=authority)
+        follower.consensus([self.chain])
+        self.assertEqual(len(follower.chain), 1)
+
+        self.chain[2].signature = None
+        self.assertEqual(authority.first_invalid_height(self.chain), 2)
+
+    def test_signature_bound_to_header(self):
+        """
+        Test that a tampered block fails validation even though its signature is unchanged.
+        """
+        self.produce(2)
+        blockchain = Blockchain(authority=ProofOfAuthority(self.public_keys))
+        blockchain.chain = self.chain
+        self.chain[2].data = "Tampered"
+        self.chain[2].hash = self.chain[2].compute_hash()
+        self.assertFalse(blockchain.is_chain_valid())
+        self.assertEqual(blockchain.first_invalid_height(workers=1), 2)
+
+    def test_signatures_persisted(self):
+        """
+        Test that signatures survive the block store and header snapshot.
+        """
+        self.produce(3)
+        data_dir = tempfile.mkdtemp()
+        try:
+            block_store = BlockStore(os.path.join(data_dir, "blocks"))
+            block_store.append_blocks(self.chain, wait_for_sync=True)
+            snapshot = HeaderSnapshot(os.path.join(data_dir, "headers.snapshot"))
+            snapshot.write(self.chain[:2])
+
+            loaded = snapshot.load(block_store) + [block_store.get_block(height) for height in range(2, len(self.chain))]
+            self.assertEqual([block.signature for block in loaded], [block.signature for block in self.chain])
+            self.assertEqual(ProofOfAuthority(self.public_keys).first_invalid_height(loaded), -1)
+            block_store.close()
+        finally:
+            shutil.rmtree(data_dir)
+
+if __name__ == '__main__':
+    unittest.main()
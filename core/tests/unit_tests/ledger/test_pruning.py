@@ -0,0 +1,146 @@
+import unittest
+import os
+import shutil
+import tempfile
+import time
+from core.ledger.block import Block, LazyBlock
+from core.ledger.block_store import BlockStore
+from core.ledger.blockchain import Blockchain
+from core.ledger.contract_state import ContractState, contract_call, REGISTRATION_CONTRACT, REWARDS_CONTRACT
+from core.ledger.node_setup.node_init import NodeInitializer
+
+CHECKPOINT_KEY = b"checkpoint-key"
+
+
+def append_transactions(blockchain: Blockchain, transactions):
+    """
+    Appends a transaction block without proof of work.
+    """
+    last_block = blockchain.get_last_block()
+    blockchain.chain.append(Block(index=last_block.index + 1, previous_hash=last_block.hash,
+                                  timestamp=time.time(), data=list(transactions)))
+
+
+def reward(agent_id: str, amount) -> str:
+    return contract_call(REWARDS_CONTRACT, "distributeReward", "orchestrator", agent=agent_id, reward_amount=amount)
+
+
+class TestPruning(unittest.TestCase):
+    def setUp(self):
+        self.blockchain = Blockchain(difficulty=1, contract_state=ContractState())
+        append_transactions(self.blockchain, [contract_call(REGISTRATION_CONTRACT, "registerAgent", "agent1",
+                                                            agent_name="Agent1")])
+        for height in range(2, 11):
+            append_transactions(self.blockchain, [reward("agent1", height)])
+
+    def test_prune_keeps_headers_and_state(self):
+        """
+        Test that pruning drops the bodies behind the state checkpoint and keeps the chain valid.
+        """
+        self.assertEqual(self.blockchain.prune(retention=3), 0)
+        checkpoint = self.blockchain.create_state_checkpoint(CHECKPOINT_KEY)
+        self.assertEqual(checkpoint["height"], 10)
+
+        self.assertEqual(self.blockchain.prune(retention=3), 8)
+        self.assertEqual(self.blockchain.pruned_height, 8)
+        self.assertIsInstance(self.blockchain.chain[7], LazyBlock)
+        self.assertIsNone(self.blockchain.chain[7].data)
+        self.assertIsNotNone(self.blockchain.chain[8].data)
+        self.assertTrue(self.blockchain.is_chain_valid())
+
+        append_transactions(self.blockchain, [reward("agent1", 100)])
+        self.assertTrue(self.blockchain.is_chain_valid(incremental=True))
+        self.assertEqual(self.blockchain.get_contract_state().get_reward_balance("agent1"), 154)
+        # Blocks above the checkpoint keep their bodies until a newer checkpoint is created
+        self.assertEqual(self.blockchain.prune(retention=0), 3)
+        self.assertNotIsInstance(self.blockchain.chain[11], LazyBlock)
+
+    def test_checkpoint_signature_and_root_verified(self):
+        """
+        Test that checkpoints with a wrong key, signature or state tables are rejected.
+        """
+        checkpoint = self.blockchain.create_state_checkpoint(CHECKPOINT_KEY)
+        self.assertTrue(self.blockchain.verify_state_checkpoint(checkpoint, CHECKPOINT_KEY))
+        self.assertFalse(self.blockchain.verify_state_checkpoint(checkpoint, b"other-key"))
+
+        forged = dict(checkpoint, state={**checkpoint["state"], "rewards": {"agent1": 10 ** 6}})
+        self.assertFalse(self.blockchain.verify_state_checkpoint(forged, CHECKPOINT_KEY))
+
+    def test_fork_below_checkpoint_rejected(self):
+        """
+        Test that consensus refuses a longer chain that forks below the state checkpoint.
+        """
+        self.blockchain.create_state_checkpoint(CHECKPOINT_KEY)
+        fork = Blockchain(difficulty=1)
+        fork.chain = self.blockchain.chain[:5]
+        for height in range(5, 15):
+            append_transactions(fork, [reward("agent1", 1000)])
+
+        self.blockchain.consensus([fork.chain])
+        self.assertEqual(len(self.blockchain.chain), 11)
+
+        extension = Blockchain(difficulty=1)
+        extension.chain = list(self.blockchain.chain)
+        append_transactions(extension, [reward("agent1", 1)])
+        self.blockchain.consensus([extension.chain])
+        self.assertEqual(len(self.blockchain.chain), 12)
+
+    def test_bootstrap_from_checkpoint(self):
+        """
+        Test that a new node adopts headers and the checkpoint state instead of replaying from genesis.
+        """
+        append_transactions(self.blockchain, [reward("agent1", 1)])
+        checkpoint = self.blockchain.create_state_checkpoint(CHECKPOINT_KEY)
+        append_transactions(self.blockchain, [reward("agent1", 2)])
+        chain = [block.to_header() for block in self.blockchain.chain[:checkpoint["height"] + 1]] + self.blockchain.chain[-1:]
+
+        node = Blockchain(difficulty=1, contract_state=ContractState())
+        self.assertFalse(node.bootstrap_from_checkpoint(checkpoint, chain, b"other-key"))
+        self.assertFalse(node.bootstrap_from_checkpoint(checkpoint, chain[:5], CHECKPOINT_KEY))
+        self.assertEqual(len(node.chain), 1)
+
+        self.assertTrue(node.bootstrap_from_checkpoint(checkpoint, chain, CHECKPOINT_KEY))
+        self.assertEqual(node.pruned_height, checkpoint["height"] + 1)
+        self.assertEqual(node.get_contract_state().state_root(), self.blockchain.get_contract_state().state_root())
+
+        # A tampered header below the checkpoint breaks the hash links
+        chain[3] = LazyBlock(3, chain[3].previous_hash, chain[3].timestamp + 1, chain[3].data_digest, 0, chain[3].hash, None)
+        self.assertFalse(Blockchain(contract_state=ContractState()).bootstrap_from_checkpoint(checkpoint, chain, CHECKPOINT_KEY))
+
+    def test_block_store_prune_and_restart(self):
+        """
+        Test that a node pruning its block store deletes old segments and restarts from its checkpoint.
+        """
+        data_dir = tempfile.mkdtemp()
+        try:
+            node = NodeInitializer("pruning_node", [], data_dir, snapshot_interval=1, pruning_retention=2,
+                                   prune_block_store=True, checkpoint_key=CHECKPOINT_KEY)
+            node.block_store.close()
+            node.block_store = BlockStore(os.path.join(data_dir, "pruning_node", "blocks"), segment_size=512)
+            node.blockchain.chain = self.blockchain.chain
+            node.save_blockchain_state()
+
+            store_pruned_height = node.block_store.pruned_height
+            self.assertGreater(store_pruned_height, 0)
+            self.assertLessEqual(store_pruned_height, node.blockchain.pruned_height)
+            with self.assertRaises(LookupError):
+                node.block_store.get_block(0)
+            with self.assertRaises(ValueError):
+                node.block_store.truncate(0)
+            node.block_store.close()
+
+            restarted = NodeInitializer("pruning_node", [], data_dir, checkpoint_key=CHECKPOINT_KEY)
+            restarted.load_blockchain_state()
+            self.assertEqual(restarted.blockchain.get_last_block().hash, self.blockchain.get_last_block().hash)
+            self.assertEqual(restarted.blockchain.pruned_height, store_pruned_height)
+            self.assertEqual(restarted.blockchain.state_checkpoint["height"], 10)
+
+            append_transactions(restarted.blockchain, [reward("agent1", 7)])
+            self.assertTrue(restarted.blockchain.is_chain_valid(incremental=True))
+            self.assertEqual(restarted.blockchain.get_contract_state().get_reward_balance("agent1"), 61)
+            restarted.block_store.close()
+        finally:
+            shutil.rmtree(data_dir)
+
+if __name__ == '__main__':
+    unittest.main()
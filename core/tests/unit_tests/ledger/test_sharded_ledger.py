@@ -0,0 +1,157 @@
+import unittest
+import threading
+import time
+from core.ledger.block import Block
+from core.ledger.sharded_ledger import ShardedLedger, anchor_transaction, parse_anchor
+
+
+class TestShardedLedger(unittest.TestCase):
+    def setUp(self):
+        self.ledger = ShardedLedger(["task-a", "task-b", "task-c"], difficulty=1, anchor_interval=3)
+
+    def tearDown(self):
+        self.ledger.close()
+
+    def test_shards_are_independent_chains(self):
+        """
+        Test that blocks appended to a shard only extend that shard.
+        """
+        results = self.ledger.add_blocks({"task-a": ["a:update:1"], "task-b": "b:update:1"})
+        self.ledger.add_block("task-a", ["a:update:2"])
+
+        self.assertEqual(results["task-a"].data, ["a:update:1"])
+        self.assertEqual(self.ledger.stats(), {
+            "task-a": {"height": 2, "anchored_height": 0},
+            "task-b": {"height": 1, "anchored_height": 0},
+            "task-c": {"height": 0, "anchored_height": 0},
+        })
+        with self.assertRaises(ValueError):
+            self.ledger.add_block("task-d", "unknown shard")
+
+    def test_shard_routing_is_stable(self):
+        """
+        Test that keys are routed to the same shard regardless of the order the shards were created in.
+        """
+        other = ShardedLedger(["task-c", "task-a", "task-b"], difficulty=1)
+        keys = [f"agent{i}" for i in range(50)]
+        self.assertEqual([self.ledger.shard_for(key) for key in keys], [other.shard_for(key) for key in keys])
+        self.assertEqual(set(self.ledger.shard_for(key) for key in keys), {"task-a", "task-b", "task-c"})
+        other.close()
+
+    def test_periodic_anchoring(self):
+        """
+        Test that a shard anchors its tip into the root chain every anchor_interval blocks.
+        """
+        for i in range(7):
+            self.ledger.add_block("task-a", f"a:update:{i}")
+            self.ledger.wait_for_anchors()
+
+        anchor = self.ledger.get_anchor("task-a")
+        self.assertEqual(anchor["height"], 6)
+        self.assertEqual(anchor["hash"], self.ledger.get_shard("task-a").chain[6].hash)
+        self.assertEqual(len(self.ledger.root_chain.chain), 3)
+        self.assertIsNone(self.ledger.get_anchor("task-b"))
+
+        proof = self.ledger.get_anchor_proof("task-a")
+        self.assertEqual(parse_anchor(proof["transaction"])["height"], 6)
+        self.assertTrue(self.ledger.root_chain.verify_transaction_proof(proof))
+
+    def test_anchor_batches_shard_tips(self):
+        """
+        Test that anchoring all shards puts every new tip in one root block and skips shards already anchored.
+        """
+        self.ledger.add_blocks({shard_id: f"{shard_id}:update" for shard_id in ("task-a", "task-b")})
+        root_block = self.ledger.anchor()
+
+        self.assertEqual(len(root_block.transactions), 2)
+        self.assertIsNone(self.ledger.anchor())
+        self.assertEqual(self.ledger.anchored_height("task-b"), 1)
+        self.assertTrue(self.ledger.is_valid())
+
+    def test_appends_do_not_wait_for_anchors(self):
+        """
+        Test that appends continue while an anchor is mined, and that shards due meanwhile share one root block.
+        """
+        root_chain = self.ledger.root_chain
+        mining = threading.Event()
+        release = threading.Event()
+        add_transactions = root_chain.add_transactions
+
+        def slow_add_transactions(transactions):
+            mining.set()
+            release.wait(5)
+            return add_transactions(transactions)
+
+        root_chain.add_transactions = slow_add_transactions
+        for i in range(3):
+            self.ledger.add_block("task-a", f"a:update:{i}")
+        self.assertTrue(mining.wait(5))
+
+        for i in range(3):
+            self.ledger.add_blocks({"task-b": f"b:update:{i}", "task-c": f"c:update:{i}"})
+        self.assertEqual(len(root_chain.chain), 1)
+        release.set()
+        self.ledger.wait_for_anchors()
+
+        self.assertEqual([len(block.transactions) for block in root_chain.chain[1:]], [1, 2])
+        self.assertEqual({shard_id: stats["anchored_height"] for shard_id, stats in self.ledger.stats().items()},
+                         {"task-a": 3, "task-b": 3, "task-c": 3})
+
+    def test_fork_below_anchor_rejected(self):
+        """
+        Test that shard consensus refuses forks below the anchored height but accepts forks above it.
+        """
+        for i in range(4):
+            self.ledger.add_block("task-a", f"a:update:{i}")
+            self.ledger.wait_for_anchors()
+        shard = self.ledger.get_shard("task-a")
+
+        deep_fork = self.fork(shard.chain[:2], 6)
+        self.ledger.consensus("task-a", [deep_fork])
+        self.assertEqual(len(shard.chain), 5)
+
+        shallow_fork = self.fork(shard.chain[:4], 3)
+        self.ledger.consensus("task-a", [shallow_fork])
+        self.assertEqual(shard.get_last_block().hash, shallow_fork[-1].hash)
+        self.assertTrue(self.ledger.is_valid())
+
+    def test_rewritten_shard_fails_anchor(self):
+        """
+        Test that a shard whose anchored block was replaced no longer validates.
+        """
+        for i in range(3):
+            self.ledger.add_block("task-b", f"b:update:{i}")
+        self.ledger.wait_for_anchors()
+        shard = self.ledger.get_shard("task-b")
+        shard.chain = self.fork(shard.chain[:1], 4)
+
+        self.assertFalse(self.ledger.verify_anchor("task-b"))
+        self.assertFalse(self.ledger.is_valid())
+
+    def test_root_reorganisation_rescans_anchors(self):
+        """
+        Test that anchors of root blocks dropped by a root chain reorganisation are forgotten.
+        """
+        self.ledger.add_block("task-c", "c:update")
+        self.ledger.anchor()
+        self.assertEqual(self.ledger.anchored_height("task-c"), 1)
+
+        root_fork = self.fork(self.ledger.root_chain.chain[:1], 2, [anchor_transaction("task-a", 0, "00")])
+        self.ledger.root_chain.consensus([root_fork])
+
+        self.assertIsNone(self.ledger.get_anchor("task-c"))
+        self.assertEqual(self.ledger.get_anchor("task-a")["hash"], "00")
+
+    @staticmethod
+    def fork(prefix, count, data=None):
+        """
+        Extends a copy of a chain prefix with count blocks, without proof of work.
+        """
+        chain = list(prefix)
+        for i in range(count):
+            chain.append(Block(index=len(chain), previous_hash=chain[-1].hash, timestamp=time.time(),
+                               data=data or f"Fork Block {i}"))
+        return chain
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+from collections import Counter
+from core.ledger.validator_registry import ValidatorRegistry
+
+
+class TestValidatorRegistry(unittest.TestCase):
+    def setUp(self):
+        self.stakes = {f"validator{i}": i + 1 for i in range(1000)}
+        self.registry = ValidatorRegistry(self.stakes)
+
+    def test_find_matches_stake_intervals(self):
+        """
+        Test that every point of the total stake maps to the validator whose interval contains it.
+        """
+        registry = ValidatorRegistry({"a": 2, "b": 0, "c": 3})
+        self.assertEqual([registry.find(point) for point in range(5)], ["a", "a", "c", "c", "c"])
+        with self.assertRaises(ValueError):
+            registry.find(5)
+
+    def test_updates_keep_totals(self):
+        """
+        Test that stake updates, removals and new registrations keep the prefix sums exact.
+        """
+        self.registry.set_stake("validator10", 5000)
+        self.registry.remove("validator20")
+        self.registry.set_stake("newcomer", 77)
+        self.stakes.update({"validator10": 5000, "newcomer": 77})
+        del self.stakes["validator20"]
+
+        self.assertEqual(self.registry.total_stake(), sum(self.stakes.values()))
+        self.assertEqual(len(self.registry), len(self.stakes))
+        self.assertEqual(self.registry.stake_of("validator20"), 0)
+        self.assertNotIn("validator20", self.registry)
+
+        # Every validator owns exactly as many points as its stake
+        owned = Counter(self.registry.find(point) for point in range(self.registry.total_stake()))
+        self.assertEqual(dict(owned), self.stakes)
+
+    def test_registry_grows_from_empty(self):
+        """
+        Test that validators registered one by one give the same intervals as a registry built at once.
+        """
+        registry = ValidatorRegistry()
+        for validator, stake in self.stakes.items():
+            registry.set_stake(validator, stake)
+        points = range(0, self.registry.total_stake(), 97)
+        self.assertEqual([registry.find(point) for point in points], [self.registry.find(point) for point in points])
+
+    def test_election_reproducible_from_seed(self):
+        """
+        Test that elections and samples depend only on the seed and the stakes.
+        """
+        other = ValidatorRegistry(dict(reversed(list(self.stakes.items()))))
+        self.assertEqual(self.registry.elect("block:42"), self.registry.elect("block:42"))
+        self.assertEqual(self.registry.sample(20, seed=7), self.registry.sample(20, seed=7))
+        self.assertNotEqual(self.registry.sample(20, seed=7), self.registry.sample(20, seed=8))
+        self.assertIn(other.elect("block:42"), self.stakes)
+
+    def test_sampling_proportional_to_stake(self):
+        """
+        Test that a validator holding half of the stake is drawn about half of the time.
+        """
+        registry = ValidatorRegistry({"whale": 300, "a": 100, "b": 100, "c": 100})
+        draws = Counter(registry.sample(4000, seed="distribution"))
+        self.assertAlmostEqual(draws["whale"] / 4000, 0.5, delta=0.05)
+        self.assertEqual(set(draws), {"whale", "a", "b", "c"})
+
+    def test_invalid_stakes_rejected(self):
+        """
+        Test that negative or fractional stakes are rejected and elections need a stake.
+        """
+        with self.assertRaises(ValueError):
+            self.registry.set_stake("validator1", -1)
+        with self.assertRaises(ValueError):
+            self.registry.set_stake("validator1", 1.5)
+        with self.assertRaises(ValueError):
+            ValidatorRegistry().elect("seed")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,12 @@
 import unittest
+import random
 from unittest.mock import patch, MagicMock
-from core.ledger.zkp_verification import ZKPVerification
+from core.ledger.zkp_verification import FixedBaseCache, ZKPVerification, multi_exponentiate
+
+# 512-bit safe prime; 4 generates its subgroup of prime order (modulus - 1) / 2
+SCHNORR_MODULUS = int("bf6974d460c5d0d101f21a9aa9bdf25a4effd1c5168d3cc00d7aa084b601584e"
+                      "899f4a63182ab7e2aed13f9abfc572f30ffd3efe0673803d209ce89eff324b1f", 16)
+SCHNORR_BASE = 4
 
 class TestZKPVerification(unittest.TestCase):
     def setUp(self):
@@ -106,6 +112,92 @@ class TestZKPVerification(unittest.TestCase):
         # Ensure the exception message matches
         self.assertTrue("Invalid agent" in str(context.exception))
 
+    def test_multi_exponentiate(self):
+        """
+        Test that the multi-exponentiation matches the product of single exponentiations.
+        """
+        rng = random.Random(1)
+        bases = [rng.randrange(2, SCHNORR_MODULUS) for _ in range(40)]
+        exponents = [rng.getrandbits(rng.choice([1, 64, 300])) for _ in range(40)]
+        expected = 1
+        for base, exponent in zip(bases, exponents):
+            expected = expected * pow(base, exponent, SCHNORR_MODULUS) % SCHNORR_MODULUS
+        self.assertEqual(multi_exponentiate(bases, exponents, SCHNORR_MODULUS), expected)
+        self.assertEqual(multi_exponentiate(bases[:1], [0], SCHNORR_MODULUS), 1)
+
+    def test_verify_batch_accepts_valid_proofs(self):
+        """
+        Test that a batch of valid proofs is accepted and matches per-proof verification.
+        """
+        proofs = [self.zkp_verifier.generate_proof(random.getrandbits(64), SCHNORR_BASE, SCHNORR_MODULUS)
+                  for _ in range(20)]
+        self.assertTrue(all(self.zkp_verifier.verify_proof(proof, SCHNORR_BASE, SCHNORR_MODULUS) for proof in proofs))
+        self.assertEqual(self.zkp_verifier.verify_batch(proofs, SCHNORR_BASE, SCHNORR_MODULUS), [True] * 20)
+        self.assertEqual(self.zkp_verifier.verify_batch([], SCHNORR_BASE, SCHNORR_MODULUS), [])
+
+    def test_verify_batch_locates_invalid_proofs(self):
+        """
+        Test that the invalid proofs of a failed batch are located, including forgeries that cancel out in an
+        unweighted product.
+        """
+        proofs = [self.zkp_verifier.generate_proof(random.getrandbits(64), SCHNORR_BASE, SCHNORR_MODULUS)
+                  for _ in range(20)]
+        proofs[3] = dict(proofs[3], response=proofs[3]["response"] + 1)
+        proofs[11] = dict(proofs[11], response=proofs[11]["response"] - 1)
+        proofs[17] = dict(proofs[17], commitment=proofs[16]["commitment"])
+
+        results = self.zkp_verifier.verify_batch(proofs, SCHNORR_BASE, SCHNORR_MODULUS)
+
+        self.assertEqual([position for position, valid in enumerate(results) if not valid], [3, 11, 17])
+
+    def test_fixed_base_cache_matches_pow(self):
+        """
+        Test that powers from the fixed-base tables match the built-in pow, including exponents that grow the table.
+        """
+        cache = FixedBaseCache(window=5)
+        for bits in (1, 7, 64, 512, 600):
+            exponent = random.getrandbits(bits)
+            self.assertEqual(cache.pow(SCHNORR_BASE, exponent, SCHNORR_MODULUS), pow(SCHNORR_BASE, exponent, SCHNORR_MODULUS))
+        self.assertEqual(cache.pow(SCHNORR_BASE, 0, SCHNORR_MODULUS), 1)
+        self.assertEqual(cache.pow(SCHNORR_BASE, -3, SCHNORR_MODULUS), pow(SCHNORR_BASE, -3, SCHNORR_MODULUS))
+        self.assertEqual(len(cache), 1)
+
+    def test_fixed_base_cache_bounded(self):
+        """
+        Test that the least recently used tables are evicted to stay within the memory budget.
+        """
+        table_size = 86 * 63 * (64 + 28)  # 86 rows of 63 entries cover 512-bit exponents
+        cache = FixedBaseCache(window=6, max_bytes=2 * table_size)
+        for base in (2, 3, 2, 5):
+            cache.pow(base, SCHNORR_MODULUS - 2, SCHNORR_MODULUS)
+        self.assertEqual(len(cache), 2)
+        self.assertLessEqual(cache.size_bytes(), 2 * table_size)
+        self.assertEqual(cache.pow(3, SCHNORR_MODULUS - 2, SCHNORR_MODULUS), pow(3, SCHNORR_MODULUS - 2, SCHNORR_MODULUS))
+
+        # A table larger than the whole budget is never built
+        small_cache = FixedBaseCache(window=6, max_bytes=table_size // 2)
+        self.assertEqual(small_cache.pow(7, SCHNORR_MODULUS - 2, SCHNORR_MODULUS), pow(7, SCHNORR_MODULUS - 2, SCHNORR_MODULUS))
+        self.assertEqual(small_cache.size_bytes(), 0)
+
+    def test_proofs_reuse_fixed_base_table(self):
+        """
+        Test that proof generation and verification build the table of a base once and reuse it afterwards.
+        """
+        cache = FixedBaseCache()
+        zkp = ZKPVerification(fixed_base_cache=cache)
+        proof = zkp.generate_proof(random.getrandbits(64), SCHNORR_BASE, SCHNORR_MODULUS)
+        self.assertTrue(zkp.verify_proof(proof, SCHNORR_BASE, SCHNORR_MODULUS))
+        # Blinding values and responses are reduced modulo the modulus, so this covers every later exponent
+        cache.pow(SCHNORR_BASE, SCHNORR_MODULUS - 1, SCHNORR_MODULUS)
+        size = cache.size_bytes()
+
+        with patch("core.ledger.zkp_verification.FixedBaseTable.extend") as mock_extend:
+            for _ in range(3):
+                proof = zkp.generate_proof(random.getrandbits(64), SCHNORR_BASE, SCHNORR_MODULUS)
+                self.assertTrue(zkp.verify_proof(proof, SCHNORR_BASE, SCHNORR_MODULUS))
+        mock_extend.assert_not_called()
+        self.assertEqual(cache.size_bytes(), size)
+
     def tearDown(self):
         """
         Clean up after each test.
@@ -1,4 +1,7 @@
 import unittest
+import asyncio
+import threading
+import time
 from unittest.mock import MagicMock, patch
 from core.agents.training_agent import TrainingAgent
 from core.agents.identity_management import IdentityManagement
@@ -15,6 +18,9 @@ class TestDecentralizedOrchestrator(unittest.TestCase):
         self.orchestrator.identity_manager = self.identity_manager
         self.orchestrator.load_balancer = self.load_balancer
 
+    def tearDown(self):
+        self.orchestrator.shutdown(wait=False)
+
     @patch.object(IdentityManagement, 'generate_agent_id', return_value='agent_1')
     def test_register_agent(self, mock_generate_agent_id):
         """Test registering an agent."""
@@ -51,6 +57,7 @@ class TestDecentralizedOrchestrator(unittest.TestCase):
 
         with patch('builtins.print') as mock_print:
             self.orchestrator.start_task(task_id='task_1', agent_ids=['agent_1', 'agent_2'], description='Test Task')
+            self.orchestrator.wait_for_task('task_1', timeout=5)
             agent_1.train.assert_called_once()
             agent_2.train.assert_called_once()
             self.assertIn('task_1', self.orchestrator.tasks, "Task should be stored in orchestrator's tasks.")
@@ -68,6 +75,113 @@ class TestDecentralizedOrchestrator(unittest.TestCase):
             mock_print.assert_called_once_with("One or more agents specified for task task_1 are not registered.")
             self.assertNotIn('task_1', self.orchestrator.tasks, "Task should not be stored since one or more agents are not registered.")
 
+    def test_start_task_trains_agents_in_parallel(self):
+        """Test that a task is pending or running until all agents, which train concurrently, have finished."""
+        release = threading.Event()
+        for agent_id in ('agent_1', 'agent_2', 'agent_3'):
+            agent = MagicMock(spec=TrainingAgent)
+            agent.train.side_effect = lambda: release.wait(5)
+            self.orchestrator.agents[agent_id] = agent
+
+        with patch('builtins.print'):
+            task = self.orchestrator.start_task(task_id='task_1', agent_ids=['agent_1', 'agent_2', 'agent_3'],
+                                                description='Test Task')
+            self.assertIn(self.orchestrator.get_task_status('task_1')['status'], ('pending', 'running'))
+            self.assertIsNone(self.orchestrator.start_task(task_id='task_1', agent_ids=['agent_1'], description='Again'))
+            # Every agent must be training at once before any of them is released
+            deadline = time.time() + 5
+            while time.time() < deadline and any(agent.train.call_count == 0 for agent in self.orchestrator.agents.values()):
+                time.sleep(0.01)
+            self.assertEqual(self.orchestrator.get_task_status('task_1')['status'], 'running')
+            release.set()
+            result = task.result(timeout=5)
+
+        self.assertEqual(result['status'], 'completed')
+        self.assertEqual({status['status'] for status in result['agent_status'].values()}, {'completed'})
+        self.assertIsNotNone(result['finished_at'])
+
+    def test_start_task_agent_failure_and_timeout(self):
+        """Test that a task fails when an agent raises or trains for longer than the timeout."""
+        release = threading.Event()
+        slow_agent = MagicMock(spec=TrainingAgent)
+        slow_agent.train.side_effect = lambda: release.wait(5)
+        failing_agent = MagicMock(spec=TrainingAgent)
+        failing_agent.train.side_effect = RuntimeError("out of memory")
+        self.orchestrator.agents.update(agent_1=slow_agent, agent_2=failing_agent, agent_3=MagicMock(spec=TrainingAgent))
+
+        with patch('builtins.print'):
+            self.orchestrator.start_task(task_id='task_1', agent_ids=['agent_1', 'agent_2', 'agent_3'],
+                                         description='Test Task', timeout=0.2)
+            result = self.orchestrator.wait_for_task('task_1', timeout=5)
+        release.set()
+
+        self.assertEqual(result['status'], 'failed')
+        self.assertEqual(result['agent_status']['agent_1']['status'], 'failed')
+        self.assertIn('Timed out', result['agent_status']['agent_1']['error'])
+        self.assertEqual(result['agent_status']['agent_2'], {'status': 'failed', 'error': 'out of memory'})
+        self.assertEqual(result['agent_status']['agent_3']['status'], 'completed')
+
+    def test_restart_timed_out_task_ignores_stale_run(self):
+        """Test that a worker left over from a timed out run does not report into a restarted task."""
+        release_first, release_second = threading.Event(), threading.Event()
+        agent = MagicMock(spec=TrainingAgent)
+        runs = iter([release_first, release_second])
+        agent.train.side_effect = lambda: next(runs).wait(5)
+        self.orchestrator.agents['agent_1'] = agent
+
+        with patch('builtins.print'):
+            self.orchestrator.start_task(task_id='task_1', agent_ids=['agent_1'], description='Run 1', timeout=0.1)
+            self.assertEqual(self.orchestrator.wait_for_task('task_1', timeout=5)['status'], 'failed')
+            second = self.orchestrator.start_task(task_id='task_1', agent_ids=['agent_1'], description='Run 2')
+            deadline = time.time() + 5
+            while time.time() < deadline and agent.train.call_count < 2:
+                time.sleep(0.01)
+            # The first run's worker returns while the second run is still training
+            release_first.set()
+            time.sleep(0.1)
+            status = self.orchestrator.get_task_status('task_1')
+            self.assertEqual(status['status'], 'running')
+            self.assertEqual(status['agent_status']['agent_1']['status'], 'running')
+            release_second.set()
+            result = second.result(timeout=5)
+
+        self.assertEqual(result['status'], 'completed')
+        self.assertEqual(result['description'], 'Run 2')
+        self.assertEqual(agent.train.call_count, 2)
+
+    def test_cancel_task(self):
+        """Test that cancelling a task skips queued agents and stops waiting for running ones."""
+        orchestrator = DecentralizedOrchestrator(max_workers=1)
+        release = threading.Event()
+        running_agent = MagicMock(spec=TrainingAgent)
+        running_agent.train.side_effect = lambda: release.wait(5)
+        queued_agent = MagicMock(spec=TrainingAgent)
+        orchestrator.agents.update(agent_1=running_agent, agent_2=queued_agent)
+
+        with patch('builtins.print'):
+            task = orchestrator.start_task(task_id='task_1', agent_ids=['agent_1', 'agent_2'], description='Test Task')
+            self.assertTrue(orchestrator.cancel_task('task_1'))
+            result = task.result(timeout=5)
+            self.assertFalse(orchestrator.cancel_task('task_1'))
+            release.set()
+            orchestrator.shutdown()
+
+        self.assertEqual(result['status'], 'cancelled')
+        queued_agent.train.assert_not_called()
+        self.assertEqual(orchestrator.get_task_status('task_1')['status'], 'cancelled')
+
+    def test_await_task(self):
+        """Test awaiting a task from an event loop."""
+        self.orchestrator.agents['agent_1'] = MagicMock(spec=TrainingAgent)
+
+        async def run_task():
+            self.orchestrator.start_task(task_id='task_1', agent_ids=['agent_1'], description='Test Task')
+            return await self.orchestrator.await_task('task_1')
+
+        with patch('builtins.print'):
+            result = asyncio.run(asyncio.wait_for(run_task(), timeout=5))
+        self.assertEqual(result['status'], 'completed')
+
     def test_get_task_status(self):
         """Test retrieving the status of a specific task."""
         self.orchestrator.tasks['task_1'] = {
@@ -0,0 +1,223 @@
+import unittest
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from core.agents.training_agent import TrainingAgent
+from core.orchestrator.health_checker import CircuitBreaker, HealthChecker, CLOSED, OPEN, HALF_OPEN
+from core.orchestrator.load_balancer import LoadBalancer
+
+
+class HealthStandIn:
+    """
+    Local HTTP server standing in for an agent's health endpoint.
+    """
+
+    def __init__(self, status: int = 200, delay: float = 0.0):
+        self.status = status
+        self.delay = delay
+        self.requests = 0
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stand_in.requests += 1
+                time.sleep(stand_in.delay)
+                self.send_response(stand_in.status if self.path == "/health" else 404)
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.address = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_breaker_transitions(self):
+        """
+        Test the closed, open and half-open transitions and the growing reset timeout.
+        """
+        now = [0.0]
+        breaker = CircuitBreaker(failure_threshold=3, success_threshold=2, reset_timeout=10, clock=lambda: now[0])
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CLOSED)
+        breaker.record_failure()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+        self.assertFalse(breaker.should_probe())
+
+        now[0] = 10
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertFalse(breaker.allow_request())
+        breaker.record_failure()
+        self.assertEqual((breaker.state, breaker.reset_timeout), (OPEN, 20))
+
+        now[0] = 30
+        breaker.record_success()
+        self.assertEqual(breaker.state, HALF_OPEN)
+        breaker.record_success()
+        self.assertEqual((breaker.state, breaker.reset_timeout), (CLOSED, 10))
+        self.assertTrue(breaker.allow_request())
+
+
+class TestHealthChecker(unittest.TestCase):
+    def setUp(self):
+        self.stand_ins = {f"agent_{i}": HealthStandIn() for i in range(3)}
+        self.load_balancer = LoadBalancer(strategy="round_robin")
+        for agent_id in self.stand_ins:
+            self.load_balancer.register_agent(TrainingAgent(agent_id=agent_id, description=f"Training Agent {agent_id}"))
+        self.checker = HealthChecker(self.load_balancer, {agent_id: stand_in.address for agent_id, stand_in in self.stand_ins.items()},
+                                     interval=1.0, timeout=0.5, healthy_threshold=2, unhealthy_threshold=3)
+
+    def tearDown(self):
+        self.checker.stop()
+        for stand_in in self.stand_ins.values():
+            stand_in.close()
+
+    def allocated_agents(self, count: int = 6):
+        return {self.load_balancer.allocate_task_round_robin(f"task_{time.monotonic()}_{i}") for i in range(count)}
+
+    def test_probes_run_concurrently(self):
+        """
+        Test that one check probes all targets at once rather than one after another.
+        """
+        for stand_in in self.stand_ins.values():
+            stand_in.delay = 0.2
+        start = time.monotonic()
+        states = asyncio.run(self.checker.check_all())
+        self.assertLess(time.monotonic() - start, 0.45)
+        self.assertEqual(set(states.values()), {CLOSED})
+
+    def test_failing_agent_excluded_within_one_interval(self):
+        """
+        Test that an agent answering with errors is confirmed unhealthy and excluded within one check.
+        """
+        self.stand_ins["agent_1"].status = 503
+        start = time.monotonic()
+        states = asyncio.run(self.checker.check_all())
+
+        self.assertLess(time.monotonic() - start, self.checker.interval)
+        self.assertEqual(states["agent_1"], OPEN)
+        self.assertEqual(self.stand_ins["agent_1"].requests, 3)
+        self.assertEqual(self.allocated_agents(), {"agent_0", "agent_2"})
+
+    def test_unreachable_and_slow_agents(self):
+        """
+        Test that refused connections and probes exceeding the timeout count as failures.
+        """
+        self.stand_ins["agent_0"].close()
+        self.stand_ins["agent_2"].delay = 0.6
+        states = asyncio.run(self.checker.check_all())
+        self.stand_ins["agent_2"].delay = 0
+        self.assertEqual(states, {"agent_0": OPEN, "agent_1": CLOSED, "agent_2": OPEN})
+        self.assertEqual(self.allocated_agents(), {"agent_1"})
+
+        self.checker.remove_target("agent_2")
+        self.assertEqual(self.allocated_agents(), {"agent_1", "agent_2"})
+
+    def test_agent_recovers_after_half_open_successes(self):
+        """
+        Test that an excluded agent is included again after healthy_threshold successful probes once half-open.
+        """
+        self.stand_ins["agent_1"].status = 500
+        asyncio.run(self.checker.check_all())
+        self.stand_ins["agent_1"].status = 200
+        breaker = self.checker.breakers["agent_1"]
+
+        # Open breakers are not probed until their reset timeout passes
+        requests = self.stand_ins["agent_1"].requests
+        asyncio.run(self.checker.check_all())
+        self.assertEqual(self.stand_ins["agent_1"].requests, requests)
+
+        breaker.opened_at -= breaker.reset_timeout
+        self.assertEqual(asyncio.run(self.checker.check_all())["agent_1"], HALF_OPEN)
+        self.assertNotIn("agent_1", self.allocated_agents())
+        self.assertEqual(asyncio.run(self.checker.check_all())["agent_1"], CLOSED)
+        self.assertIn("agent_1", self.allocated_agents())
+
+    def test_flapping_agent_keeps_affinity_keys(self):
+        """
+        Test that an agent excluded and included again between two affinity lookups gets its keys back.
+        """
+        keys = [f"shard_{i}" for i in range(300)]
+        owners = {key: self.load_balancer.get_affinity_agent(key) for key in keys}
+        self.stand_ins["agent_1"].status = 500
+        asyncio.run(self.checker.check_all())
+        self.assertIn("agent_1", self.load_balancer.unhealthy)
+
+        self.stand_ins["agent_1"].status = 200
+        breaker = self.checker.breakers["agent_1"]
+        breaker.opened_at -= breaker.reset_timeout
+        asyncio.run(self.checker.check_all())
+        asyncio.run(self.checker.check_all())
+        self.assertNotIn("agent_1", self.load_balancer.unhealthy)
+        self.assertEqual({key: self.load_balancer.get_affinity_agent(key) for key in keys}, owners)
+        self.assertIn("agent_1", owners.values())
+
+    def test_target_removed_during_check(self):
+        """
+        Test that a check still in flight when its target is removed neither fails nor excludes the agent.
+        """
+        self.stand_ins["agent_1"].status = 503
+        self.stand_ins["agent_1"].delay = 0.2
+
+        async def remove_while_probing():
+            check = asyncio.ensure_future(self.checker.check_all())
+            await asyncio.sleep(0.1)
+            await asyncio.get_running_loop().run_in_executor(None, self.checker.remove_target, "agent_1")
+            return await check
+
+        states = asyncio.run(remove_while_probing())
+        self.assertEqual(states, {"agent_0": CLOSED, "agent_2": CLOSED})
+        self.assertNotIn("agent_1", self.load_balancer.unhealthy)
+        self.assertIsNone(asyncio.run(self.checker.check("agent_1")))
+
+    def test_background_checks_survive_errors(self):
+        """
+        Test that an exception raised by one check does not stop the background checks.
+        """
+        self.checker.interval = 0.1
+        calls = []
+        check_all = self.checker.check_all
+
+        async def flaky_check_all():
+            calls.append(None)
+            if len(calls) == 1:
+                raise RuntimeError("probe crashed")
+            return await check_all()
+
+        self.checker.check_all = flaky_check_all
+        with self.assertLogs("core.orchestrator.health_checker", level="ERROR"):
+            self.checker.start()
+            deadline = time.monotonic() + 2
+            while time.monotonic() < deadline and len(calls) < 3:
+                time.sleep(0.02)
+        self.checker.stop()
+        self.assertGreaterEqual(len(calls), 3)
+
+    def test_background_checks(self):
+        """
+        Test that the background checker excludes an agent that starts failing within about one interval.
+        """
+        self.checker.interval = 0.3
+        self.checker.start()
+        time.sleep(0.1)
+        self.stand_ins["agent_2"].status = 500
+        deadline = time.monotonic() + 2 * self.checker.interval
+        while time.monotonic() < deadline and "agent_2" not in self.load_balancer.unhealthy:
+            time.sleep(0.02)
+        self.assertIn("agent_2", self.load_balancer.unhealthy)
+        self.checker.stop()
+        self.assertNotIn("agent_2", self.allocated_agents())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,228 @@
+import unittest
+import os
+import tempfile
+from collections import Counter
+from core.agents.training_agent import TrainingAgent
+from core.orchestrator.load_balancer import LoadBalancer, STRATEGIES
+
+
+def make_balancer(strategy: str, num_agents: int, **kwargs) -> LoadBalancer:
+    load_balancer = LoadBalancer(strategy=strategy, seed=7, **kwargs)
+    for i in range(num_agents):
+        load_balancer.register_agent(TrainingAgent(agent_id=f"agent_{i}", description=f"Training Agent {i}"))
+    return load_balancer
+
+
+class TestLoadBalancer(unittest.TestCase):
+    def test_least_connections_follows_in_flight_tasks(self):
+        """
+        Test that least-connections allocates to the agent with the fewest in-flight tasks.
+        """
+        load_balancer = make_balancer("least_connections", 3)
+        allocated = [load_balancer.allocate_task(f"task_{i}") for i in range(6)]
+        self.assertEqual(Counter(allocated), {"agent_0": 2, "agent_1": 2, "agent_2": 2})
+
+        load_balancer.complete_task("task_0")
+        load_balancer.complete_task("task_3")
+        freed_agent = allocated[0]
+        self.assertEqual(load_balancer.get_load(freed_agent), 0)
+        self.assertEqual(load_balancer.allocate_task("task_6"), freed_agent)
+        # A task still in flight keeps its agent
+        self.assertEqual(load_balancer.allocate_task("task_6"), freed_agent)
+        self.assertEqual(load_balancer.get_load(freed_agent), 1)
+
+    def test_weighted_strategies_respect_weights(self):
+        """
+        Test that weighted round robin and weighted least-connections share tasks in proportion to the weights.
+        """
+        weights = {"agent_0": 1, "agent_1": 2, "agent_2": 3}
+        round_robin = make_balancer("weighted_round_robin", 3, weights=weights)
+        counts = Counter(round_robin.allocate_task(f"task_{i}") for i in range(60))
+        self.assertEqual(counts, {"agent_0": 10, "agent_1": 20, "agent_2": 30})
+
+        least_connections = make_balancer("least_connections", 3, weights=weights)
+        counts = Counter(least_connections.allocate_task(f"task_{i}") for i in range(60))
+        self.assertEqual(counts, {"agent_0": 10, "agent_1": 20, "agent_2": 30})
+
+    def test_max_requests_per_node(self):
+        """
+        Test that no strategy allocates more than max_requests_per_node tasks to an agent.
+        """
+        for strategy in STRATEGIES:
+            load_balancer = make_balancer(strategy, 4, max_requests_per_node=2)
+            allocated = Counter(load_balancer.allocate_task(f"task_{i}") for i in range(8))
+            self.assertEqual(set(allocated.values()), {2}, strategy)
+            with self.assertRaises(ValueError):
+                load_balancer.allocate_task("task_8")
+
+            load_balancer.complete_task("task_5")
+            self.assertEqual(load_balancer.allocate_task("task_8"), load_balancer.assignments.get("task_8"))
+            self.assertEqual(max(load_balancer.in_flight.values()), 2, strategy)
+
+    def test_power_of_two_choices_balances_load(self):
+        """
+        Test that power-of-two-choices keeps the maximum load close to the average.
+        """
+        load_balancer = make_balancer("power_of_two_choices", 100)
+        for i in range(1000):
+            load_balancer.allocate_task(f"task_{i}")
+        self.assertLessEqual(max(load_balancer.in_flight.values()), 14)
+
+    def test_unregister_agent(self):
+        """
+        Test that unregistered agents are no longer allocated and their in-flight tasks are forgotten.
+        """
+        for strategy in STRATEGIES:
+            load_balancer = make_balancer(strategy, 3, max_requests_per_node=10)
+            for i in range(6):
+                load_balancer.allocate_task(f"task_{i}")
+            load_balancer.unregister_agent("agent_1")
+
+            self.assertNotIn("agent_1", load_balancer.assignments.values())
+            allocated = {load_balancer.allocate_task(f"task_{i}") for i in range(6, 14)}
+            self.assertEqual(allocated, {"agent_0", "agent_2"}, strategy)
+
+        with self.assertRaises(ValueError):
+            LoadBalancer(strategy="shortest_queue")
+        with self.assertRaises(ValueError):
+            LoadBalancer(strategy="least_connections").allocate_task("task_0")
+
+    def test_unhealthy_agents_leave_strategy_index(self):
+        """
+        Test that unhealthy agents are removed from the strategy and the hash ring, and return once healthy.
+        """
+        for strategy in STRATEGIES:
+            load_balancer = make_balancer(strategy, 10)
+            load_balancer.allocate_task("task_0")
+            busy_agent = load_balancer.assignments["task_0"]
+            for i in range(1, 10):
+                load_balancer.set_agent_health(f"agent_{i}", False)
+            load_balancer.set_agent_health(busy_agent, False)
+            load_balancer.set_agent_health("agent_0", True)
+
+            self.assertEqual(load_balancer.strategy.agent_ids, ["agent_0"], strategy)
+            self.assertEqual(set(load_balancer.ring.points), {"agent_0"}, strategy)
+            self.assertEqual({load_balancer.allocate_task(f"task_{i}") for i in range(1, 5)}, {"agent_0"}, strategy)
+            self.assertEqual(load_balancer.allocate_task("keyed_task", affinity_key="shard_3"), "agent_0", strategy)
+
+            for i in range(10):
+                load_balancer.set_agent_health(f"agent_{i}", True)
+            self.assertEqual(sorted(load_balancer.strategy.agent_ids), sorted(load_balancer.agents), strategy)
+            load_balancer.unregister_agent("agent_5")
+            self.assertNotIn("agent_5", load_balancer.strategy.agent_ids, strategy)
+
+        # Least-connections picks up the in-flight tasks an agent kept while it was unhealthy
+        load_balancer = make_balancer("least_connections", 2)
+        load_balancer.allocate_task("task_0")
+        load_balancer.set_agent_health("agent_0", False)
+        load_balancer.set_agent_health("agent_0", True)
+        self.assertEqual(load_balancer.allocate_task("task_1"), "agent_1")
+
+        # Keys owned by an unhealthy agent move on the ring and come back once it recovers
+        load_balancer = make_balancer("random", 10)
+        owner = load_balancer.get_affinity_agent("shard_3")
+        load_balancer.set_agent_health(owner, False)
+        self.assertNotEqual(load_balancer.get_affinity_agent("shard_3"), owner)
+        load_balancer.set_agent_health(owner, True)
+        self.assertEqual(load_balancer.get_affinity_agent("shard_3"), owner)
+
+        # Agents marked unhealthy before registering never enter the index
+        load_balancer = LoadBalancer(strategy="random")
+        load_balancer.set_agent_health("agent_0", False)
+        load_balancer.register_agent(TrainingAgent(agent_id="agent_0", description="Training Agent 0"))
+        self.assertEqual(load_balancer.strategy.agent_ids, [])
+        load_balancer.unregister_agent("agent_0")
+
+    def test_allocate_task_round_robin(self):
+        """
+        Test that round-robin allocation cycles through the agents without a caller supplied index.
+        """
+        load_balancer = make_balancer("random", 3)
+        allocated = [load_balancer.allocate_task_round_robin(f"task_{i}") for i in range(4)]
+        self.assertEqual(allocated, ["agent_0", "agent_1", "agent_2", "agent_0"])
+        self.assertEqual(load_balancer.allocate_task_round_robin("task_4", current_index=1), "agent_1")
+        # A task still in flight keeps its agent
+        self.assertEqual(load_balancer.allocate_task_round_robin("task_1"), "agent_1")
+        self.assertEqual(load_balancer.allocate_task_round_robin("task_4", current_index=2), "agent_1")
+        self.assertEqual(load_balancer.get_load("agent_1"), 2)
+
+        # An explicit index moves on past unhealthy agents and agents at max_requests_per_node
+        load_balancer = make_balancer("random", 3, max_requests_per_node=1)
+        load_balancer.set_agent_health("agent_1", False)
+        self.assertEqual(load_balancer.allocate_task_round_robin("task_0", current_index=1), "agent_2")
+        self.assertEqual(load_balancer.allocate_task_round_robin("task_1", current_index=1), "agent_0")
+        with self.assertRaises(ValueError):
+            load_balancer.allocate_task_round_robin("task_2", current_index=0)
+
+    def test_affinity_keys_stick_to_agents(self):
+        """
+        Test that tasks with the same affinity key go to the same agent while it is below its bounded load.
+        """
+        load_balancer = make_balancer("least_connections", 10)
+        for i in range(50):
+            load_balancer.allocate_task(f"task_{i}")
+        owner = load_balancer.get_affinity_agent("shard_3")
+        self.assertEqual({load_balancer.allocate_task(f"shard_task_{i}", affinity_key="shard_3") for i in range(2)}, {owner})
+
+        # A key hot enough to exceed the bound spills over to the next agents on the ring
+        allocated = Counter(load_balancer.allocate_task(f"hot_task_{i}", affinity_key="shard_3") for i in range(100))
+        total_in_flight = len(load_balancer.assignments)
+        self.assertGreater(len(allocated), 1)
+        self.assertLessEqual(max(load_balancer.in_flight.values()), 1.25 * total_in_flight / 10 + 1)
+
+        load_balancer.session_stickiness = False
+        self.assertNotEqual({load_balancer.allocate_task(f"loose_task_{i}", affinity_key="shard_3") for i in range(10)}, {owner})
+
+    def test_adding_agent_remaps_few_keys(self):
+        """
+        Test that adding or removing one agent moves about 1 / n of the affinity keys.
+        """
+        load_balancer = make_balancer("random", 10)
+        keys = [f"shard_{i}" for i in range(5000)]
+        before = {key: load_balancer.get_affinity_agent(key) for key in keys}
+        self.assertEqual(len(set(before.values())), 10)
+
+        load_balancer.register_agent(TrainingAgent(agent_id="agent_10", description="Training Agent 10"))
+        after = {key: load_balancer.get_affinity_agent(key) for key in keys}
+        moved = [key for key in keys if after[key] != before[key]]
+        self.assertLess(len(moved) / len(keys), 0.15)
+        self.assertEqual({after[key] for key in moved}, {"agent_10"})
+
+        load_balancer.unregister_agent("agent_10")
+        self.assertEqual({key: load_balancer.get_affinity_agent(key) for key in keys}, before)
+
+    def test_re_adding_agent_before_lookup(self):
+        """
+        Test that an agent removed and added again between two lookups owns the same keys as before.
+        """
+        load_balancer = make_balancer("random", 10)
+        keys = [f"shard_{i}" for i in range(1000)]
+        before = {key: load_balancer.get_affinity_agent(key) for key in keys}
+
+        load_balancer.unregister_agent("agent_3")
+        load_balancer.register_agent(TrainingAgent(agent_id="agent_3", description="Training Agent 3"))
+        self.assertEqual({key: load_balancer.get_affinity_agent(key) for key in keys}, before)
+        self.assertEqual(len(load_balancer.ring._hashes), len(set(load_balancer.ring._hashes)))
+
+    def test_from_config(self):
+        """
+        Test that the strategy, weights and max_requests_per_node are read from the configuration files.
+        """
+        with tempfile.TemporaryDirectory() as config_dir:
+            load_balancer_config = os.path.join(config_dir, "load_balancer_config.yaml")
+            performance_config = os.path.join(config_dir, "performance_config.yaml")
+            with open(load_balancer_config, "w") as file:
+                file.write("load_balancer:\n  type: round_robin\ntarget_nodes:\n  - id: agent_1\n    weight: 3\n"
+                           "policies:\n  session_stickiness:\n    enabled: false\n")
+            with open(performance_config, "w") as file:
+                file.write("load_balancing:\n  strategy: least_connections\n  max_requests_per_node: 100\n")
+
+            load_balancer = LoadBalancer.from_config(load_balancer_config, performance_config)
+            self.assertEqual(load_balancer.strategy.name, "least_connections")
+            self.assertEqual(load_balancer.max_requests_per_node, 100)
+            self.assertEqual(load_balancer.weights, {"agent_1": 3})
+            self.assertFalse(load_balancer.session_stickiness)
+            self.assertEqual(LoadBalancer.from_config(load_balancer_config, None).strategy.name, "round_robin")
+
+if __name__ == '__main__':
+    unittest.main()
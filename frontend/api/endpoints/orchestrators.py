@@ -1,6 +1,6 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 from core.orchestrator.decentralized_orchestrator import DecentralizedOrchestrator
 
 # Initialize Router and Orchestrator with type hints
@@ -11,6 +11,7 @@ class StartTaskRequest(BaseModel):
     task_id: str
     agent_ids: List[str]
     description: str
+    timeout: Optional[float] = None  # Seconds each agent may train before it is marked as failed
 
 class TaskStatusResponse(BaseModel):
     task_id: str
@@ -19,8 +20,13 @@ class TaskStatusResponse(BaseModel):
 
 async def start_task(request: StartTaskRequest) -> TaskStatusResponse:
     try:
-        orchestrator.start_task(task_id=request.task_id, agent_ids=request.agent_ids, description=request.description)
-        return TaskStatusResponse(task_id=request.task_id, status="Task Started", description=request.description)
+        # Agents train on the orchestrator's worker pool, so the request returns as soon as the task is submitted
+        task = orchestrator.start_task(task_id=request.task_id, agent_ids=request.agent_ids,
+                                       description=request.description, timeout=request.timeout)
+        if task is None:
+            raise ValueError(f"Task {request.task_id} could not be started: unknown agents or task already in progress.")
+        status = orchestrator.get_task_status(request.task_id)
+        return TaskStatusResponse(task_id=request.task_id, status=status["status"], description=request.description)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -30,8 +36,17 @@ async def get_task_status(task_id: str) -> TaskStatusResponse:
     status = orchestrator.get_task_status(task_id)
     if not status:
         raise HTTPException(status_code=404, detail="Task not found")
-    return TaskStatusResponse(task_id=task_id, status=status.status, description=status.description)
+    return TaskStatusResponse(task_id=task_id, status=status["status"], description=status["description"])
 
-# Expose start-task and get-task-status endpoints on the router
+async def cancel_task(task_id: str) -> TaskStatusResponse:
+    if not orchestrator.get_task_status(task_id):
+        raise HTTPException(status_code=404, detail="Task not found")
+    if not orchestrator.cancel_task(task_id):
+        raise HTTPException(status_code=409, detail="Task is not in progress")
+    status = orchestrator.get_task_status(task_id)
+    return TaskStatusResponse(task_id=task_id, status=status["status"], description=status["description"])
+
+# Expose start-task, get-task-status and cancel-task endpoints on the router
 router.post("/start-task", response_model=TaskStatusResponse)(start_task)
 router.get("/task-status/{task_id}", response_model=TaskStatusResponse)(get_task_status)
+router.post("/cancel-task/{task_id}", response_model=TaskStatusResponse)(cancel_task)